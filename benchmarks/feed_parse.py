@@ -0,0 +1,104 @@
+"""RSSフィード解析の処理時間ベンチマーク。
+
+エントリ数を変えたフィードについて、ツリー全体を構築して名前空間付きパスで
+find する従来の解析と、iter_feed() による逐次解析（全件・先頭1件で打ち切り）の
+処理時間を比較する。打ち切りは前回までに処理済みの動画に到達した場合に相当する。
+
+実行方法（リポジトリのルートで）:
+    python -m benchmarks.feed_parse
+    python -m benchmarks.feed_parse 15 100 1000
+"""
+import sys
+import time
+import xml.etree.ElementTree as ET
+from datetime import datetime, timedelta, timezone
+from itertools import islice
+
+from src.models import VideoEntry
+from src.rss_checker import NS, iter_feed
+
+DEFAULT_SIZES = (15, 50, 200, 1000)
+REPEAT_SECONDS = 0.5
+
+
+def _build_feed(n: int) -> bytes:
+    now = datetime(2026, 3, 1, tzinfo=timezone.utc)
+    entries = "".join(
+        f"""
+ <entry>
+  <id>yt:video:vid{i:08d}</id>
+  <yt:videoId>vid{i:08d}</yt:videoId>
+  <yt:channelId>UCxxxxxxxxxxxxxxxxxxxxxx</yt:channelId>
+  <title>ベンチマーク用の動画タイトル {i}</title>
+  <link rel="alternate" href="https://www.youtube.com/watch?v=vid{i:08d}"/>
+  <author><name>チャンネル</name><uri>https://www.youtube.com/channel/UCxxxxxxxxxxxxxxxxxxxxxx</uri></author>
+  <published>{(now - timedelta(hours=i)).isoformat()}</published>
+  <updated>{(now - timedelta(hours=i)).isoformat()}</updated>
+  <media:group>
+   <media:title>ベンチマーク用の動画タイトル {i}</media:title>
+   <media:description>{"動画の説明文。" * 40}</media:description>
+   <media:community><media:starRating count="100" average="5.00"/></media:community>
+  </media:group>
+ </entry>"""
+        for i in range(n)
+    )
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?>\n'
+        '<feed xmlns:yt="http://www.youtube.com/xml/schemas/2015" '
+        'xmlns:media="http://search.yahoo.com/mrss/" xmlns="http://www.w3.org/2005/Atom">'
+        f"{entries}\n</feed>"
+    ).encode("utf-8")
+
+
+def _parse_tree(xml: bytes, channel_id: str) -> list[VideoEntry]:
+    """ツリー全体を構築する従来の解析（比較用）"""
+    root = ET.fromstring(xml)
+    videos = []
+    for entry in root.findall("atom:entry", NS):
+        video_id_elem = entry.find("yt:videoId", NS)
+        title_elem = entry.find("atom:title", NS)
+        link_elem = entry.find("atom:link[@rel='alternate']", NS)
+        published_elem = entry.find("atom:published", NS)
+        channel_id_elem = entry.find("yt:channelId", NS)
+        if video_id_elem is None or title_elem is None:
+            continue
+        videos.append(
+            VideoEntry(
+                video_id=video_id_elem.text or "",
+                title=title_elem.text or "",
+                url=link_elem.get("href", "") if link_elem is not None else "",
+                published=datetime.fromisoformat(published_elem.text),
+                channel_id=channel_id_elem.text if channel_id_elem is not None else channel_id,
+            )
+        )
+    videos.sort(key=lambda v: v.published, reverse=True)
+    return videos
+
+
+def _measure(func) -> float:
+    """REPEAT_SECONDS 秒以上繰り返し実行し、1回あたりの秒数を返す"""
+    count = 0
+    start = time.perf_counter()
+    while True:
+        func()
+        count += 1
+        elapsed = time.perf_counter() - start
+        if elapsed >= REPEAT_SECONDS:
+            return elapsed / count
+
+
+def main(sizes: tuple[int, ...]) -> None:
+    print(f"{'entries':>8} {'size':>9} {'tree':>11} {'stream':>11} {'stream(1)':>11}")
+    for n in sizes:
+        xml = _build_feed(n)
+        tree = _measure(lambda: _parse_tree(xml, "UC"))
+        stream = _measure(lambda: list(iter_feed(xml, "UC")))
+        first = _measure(lambda: list(islice(iter_feed(xml, "UC"), 1)))
+        print(
+            f"{n:>8,} {len(xml) / 1024:>6.0f} KB "
+            f"{tree * 1e6:>8.0f} µs {stream * 1e6:>8.0f} µs {first * 1e6:>8.0f} µs"
+        )
+
+
+if __name__ == "__main__":
+    main(tuple(int(arg) for arg in sys.argv[1:]) or DEFAULT_SIZES)
@@ -0,0 +1,50 @@
+"""通知履歴の保持期間クリーンアップの処理時間ベンチマーク。
+
+履歴の件数を変えながら、期限切れが数件だけある状態で
+cleanup_old_entries() にかかる時間を計測する。ヒープによる保持期間
+インデックスにより、処理時間は履歴の件数によらずほぼ一定になる。
+
+実行方法（リポジトリのルートで）:
+    python -m benchmarks.history_cleanup
+    python -m benchmarks.history_cleanup 10000 100000 1000000
+"""
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+
+from src.history_manager import HistoryManager
+
+DEFAULT_SIZES = (10_000, 100_000, 1_000_000)
+EXPIRED_PER_RUN = 5
+RETENTION_DAYS = 90
+
+
+def _build(n: int) -> HistoryManager:
+    now = datetime.now(timezone.utc)
+    manager = HistoryManager("/dev/null")
+    manager.replace_entries({
+        f"vid{i:08d}": {
+            "title": "",
+            "channel_id": "UCxxxxxxxxxxxxxxxxxxxxxx",
+            # 先頭の数件だけが保持期間を過ぎている
+            "notified_at": (
+                now - timedelta(days=RETENTION_DAYS + 10 if i < EXPIRED_PER_RUN else 1, seconds=i)
+            ).isoformat(),
+        }
+        for i in range(n)
+    })
+    return manager
+
+
+def main(sizes: tuple[int, ...]) -> None:
+    print(f"{'entries':>10} {'removed':>8} {'cleanup':>12}")
+    for n in sizes:
+        manager = _build(n)
+        start = time.perf_counter()
+        removed = manager.cleanup_old_entries(RETENTION_DAYS)
+        elapsed = time.perf_counter() - start
+        print(f"{n:>10,} {removed:>8} {elapsed * 1e6:>9.1f} µs")
+
+
+if __name__ == "__main__":
+    main(tuple(int(arg) for arg in sys.argv[1:]) or DEFAULT_SIZES)
@@ -0,0 +1,66 @@
+"""通知履歴のメモリ使用量ベンチマーク。
+
+従来の dict-of-dicts 表現と HistoryManager のコンパクト表現について、
+1エントリあたりのメモリ使用量を tracemalloc で計測する。
+
+実行方法（リポジトリのルートで）:
+    python -m benchmarks.history_memory
+    python -m benchmarks.history_memory 100000 1000000
+"""
+import gc
+import sys
+import tracemalloc
+from datetime import datetime, timedelta, timezone
+
+from src.history_manager import HistoryManager
+
+DEFAULT_SIZES = (100_000, 1_000_000)
+CHANNEL_COUNT = 50
+
+
+def _entries(n: int):
+    """notified.json の読み込み結果と同じ形式のエントリを生成する。"""
+    base = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    for i in range(n):
+        yield f"vid{i:08d}", {
+            "title": f"【解説】サンプル動画タイトル その{i}",
+            "channel_id": f"UC{i % CHANNEL_COUNT:022d}",
+            "notified_at": (base + timedelta(seconds=i)).isoformat(),
+        }
+
+
+def _measure(build) -> int:
+    gc.collect()
+    tracemalloc.start()
+    obj = build()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del obj
+    gc.collect()
+    return current
+
+
+def _build_dict_of_dicts(n: int) -> dict:
+    # json.load() と同様に、エントリごとに別の文字列オブジェクトを持つ
+    return {video_id: dict(info) for video_id, info in _entries(n)}
+
+
+def _build_compact(n: int) -> HistoryManager:
+    manager = HistoryManager("/dev/null")
+    manager.replace_entries(dict(_entries(n)))
+    return manager
+
+
+def main(sizes: tuple[int, ...]) -> None:
+    print(f"{'entries':>10} {'dict-of-dicts':>16} {'compact':>16} {'ratio':>7}")
+    for n in sizes:
+        baseline = _measure(lambda: _build_dict_of_dicts(n))
+        compact = _measure(lambda: _build_compact(n))
+        print(
+            f"{n:>10,} {baseline / n:>11.1f} B/件 {compact / n:>11.1f} B/件 "
+            f"{compact / baseline:>6.0%}"
+        )
+
+
+if __name__ == "__main__":
+    main(tuple(int(arg) for arg in sys.argv[1:]) or DEFAULT_SIZES)
@@ -1,3 +1,45 @@
-from src.main import main
+import argparse
 
-main()
+from src.exceptions import ConfigError
+from src.sharding import resolve_shard
+
+parser = argparse.ArgumentParser(prog="python -m src")
+parser.add_argument(
+    "command",
+    nargs="?",
+    choices=("run", "daemon", "async"),
+    default="run",
+    help=(
+        "run: 1回だけ実行する（デフォルト） / daemon: 常駐して定期的に実行する"
+        " / async: 1回だけ asyncio で実行する"
+    ),
+)
+parser.add_argument(
+    "--shard-index",
+    type=int,
+    help="担当するシャードの番号（0始まり、省略時は環境変数 SHARD_INDEX）",
+)
+parser.add_argument(
+    "--shard-count",
+    type=int,
+    help="チャンネルを分けるシャード数（省略時は環境変数 SHARD_COUNT、未設定なら分けない）",
+)
+args = parser.parse_args()
+
+try:
+    shard = resolve_shard(args.shard_index, args.shard_count)
+except ConfigError as e:
+    parser.error(str(e))
+
+if args.command == "daemon":
+    from src.daemon import run_daemon
+
+    run_daemon(shard)
+elif args.command == "async":
+    from src.main import run_async
+
+    run_async(shard)
+else:
+    from src.main import main
+
+    main(shard)
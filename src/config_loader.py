@@ -4,6 +4,7 @@ from pathlib import Path
 import yaml
 
 from src.exceptions import ConfigError
+from src.history_manager import HISTORY_BACKENDS
 from src.models import AppSettings, ChannelConfig
 
 logger = logging.getLogger(__name__)
@@ -97,9 +98,97 @@ def _parse_settings(data: dict) -> AppSettings:
             f"settings.history_retention_daysは1以上で指定してください: {history_retention_days}"
         )
 
+    oembed_cache_ttl_hours = raw_settings.get("oembed_cache_ttl_hours", 168)
+    if oembed_cache_ttl_hours < 0:
+        raise ConfigError(
+            f"settings.oembed_cache_ttl_hoursは0以上で指定してください: {oembed_cache_ttl_hours}"
+        )
+
+    oembed_cache_max_entries = raw_settings.get("oembed_cache_max_entries", 5000)
+    if oembed_cache_max_entries < 1:
+        raise ConfigError(
+            f"settings.oembed_cache_max_entriesは1以上で指定してください: {oembed_cache_max_entries}"
+        )
+
+    gemini_requests_per_minute = raw_settings.get("gemini_requests_per_minute", 15)
+    if gemini_requests_per_minute < 1:
+        raise ConfigError(
+            f"settings.gemini_requests_per_minuteは1以上で指定してください: {gemini_requests_per_minute}"
+        )
+
+    gemini_tokens_per_minute = raw_settings.get("gemini_tokens_per_minute", 250000)
+    if gemini_tokens_per_minute < 1:
+        raise ConfigError(
+            f"settings.gemini_tokens_per_minuteは1以上で指定してください: {gemini_tokens_per_minute}"
+        )
+
+    positive_settings = {}
+    for key, default in (
+        ("summarize_concurrency", 2),
+        ("notify_concurrency", 1),
+        ("pipeline_queue_size", 2),
+        ("summary_cache_max_entries", 200),
+        ("summary_cache_max_age_days", 7),
+        ("min_poll_interval_minutes", 5),
+        ("max_poll_interval_minutes", 360),
+        ("watermark_window_minutes", 180),
+        ("http_pool_connections", 10),
+        ("http_pool_maxsize", 16),
+        ("http_connect_timeout_seconds", 30),
+        ("http_read_timeout_seconds", 30),
+    ):
+        value = raw_settings.get(key, default)
+        if value < 1:
+            raise ConfigError(f"settings.{key}は1以上で指定してください: {value}")
+        positive_settings[key] = value
+
+    # 省略時は画像生成時にCPU数と空きメモリから決める
+    render_concurrency = raw_settings.get("render_concurrency")
+    if render_concurrency is not None and render_concurrency < 1:
+        raise ConfigError(f"settings.render_concurrencyは1以上で指定してください: {render_concurrency}")
+
+    if positive_settings["max_poll_interval_minutes"] < positive_settings["min_poll_interval_minutes"]:
+        raise ConfigError(
+            "settings.max_poll_interval_minutesはmin_poll_interval_minutes以上で指定してください: "
+            f"{positive_settings['max_poll_interval_minutes']}"
+        )
+
+    history_backend = raw_settings.get("history_backend", "json")
+    if history_backend not in HISTORY_BACKENDS:
+        raise ConfigError(
+            f"settings.history_backendは{' / '.join(HISTORY_BACKENDS)}のいずれかで指定してください: "
+            f"{history_backend}"
+        )
+
+    websub_callback_url = raw_settings.get("websub_callback_url") or ""
+    if websub_callback_url and not websub_callback_url.startswith(("http://", "https://")):
+        raise ConfigError(
+            f"settings.websub_callback_urlはhttp://またはhttps://で始まるURLで指定してください: "
+            f"{websub_callback_url}"
+        )
+
+    websub_port = raw_settings.get("websub_port", 8080)
+    if not (1 <= websub_port <= 65535):
+        raise ConfigError(f"settings.websub_portは1〜65535の範囲で指定してください: {websub_port}")
+
+    check_interval_minutes = raw_settings.get("check_interval_minutes", 5)
+    if check_interval_minutes < 1:
+        raise ConfigError(
+            f"settings.check_interval_minutesは1以上で指定してください: {check_interval_minutes}"
+        )
+
     return AppSettings(
-        check_interval_minutes=raw_settings.get("check_interval_minutes", 5),
+        check_interval_minutes=check_interval_minutes,
         max_summary_length=max_summary_length,
         history_retention_days=history_retention_days,
         default_prompt_template=default_prompt,
+        oembed_cache_ttl_hours=oembed_cache_ttl_hours,
+        oembed_cache_max_entries=oembed_cache_max_entries,
+        gemini_requests_per_minute=gemini_requests_per_minute,
+        gemini_tokens_per_minute=gemini_tokens_per_minute,
+        history_backend=history_backend,
+        websub_callback_url=websub_callback_url,
+        websub_port=websub_port,
+        render_concurrency=render_concurrency,
+        **positive_settings,
     )
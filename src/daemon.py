@@ -0,0 +1,298 @@
+import heapq
+import logging
+import queue
+import random
+import signal
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional
+
+from src.exceptions import WebSubError
+from src.main import (
+    Notifier,
+    create_http_session,
+    create_notifier,
+    load_config_or_exit,
+    load_environment,
+    load_shard_or_exit,
+)
+from src.models import VideoEntry
+from src.sharding import Shard
+from src.websub import WebSubServer, WebSubSubscriber
+
+logger = logging.getLogger(__name__)
+
+# 取得間隔に加える揺らぎの割合（±10%）。チャンネルの取得時刻が揃わないようにする
+DEFAULT_JITTER_RATIO = 0.1
+# キャッシュ・履歴を定期的に書き出す間隔
+DEFAULT_SAVE_INTERVAL_SECONDS = 300
+# 次の取得予定が先でも、この秒数ごとに停止要求と定期保存を確認する
+MAX_IDLE_SECONDS = 60
+# WebSubの購読要求を同時に送る数（要求はメインループとは別のスレッドで送る）
+DEFAULT_RENEW_CONCURRENCY = 4
+
+
+class ChannelScheduler:
+    """チャンネルごとの次回フィード取得時刻を管理する。
+
+    取得予定時刻の早い順に並べたヒープで保持し、取得後は
+    取得間隔に揺らぎ（jitter）を加えた時刻に再登録する。
+    """
+
+    def __init__(
+        self,
+        interval_seconds: float,
+        jitter_ratio: float = DEFAULT_JITTER_RATIO,
+        clock: Callable[[], float] = time.monotonic,
+        rng: Optional[random.Random] = None,
+    ):
+        self._interval = interval_seconds
+        self._jitter_ratio = jitter_ratio
+        self._clock = clock
+        self._rng = rng or random.Random()
+        self._heap: list[tuple[float, str]] = []
+
+    def add(self, channel_id: str, delay_seconds: float = 0.0) -> None:
+        """チャンネルを delay_seconds 秒後の取得予定として登録する。"""
+        heapq.heappush(self._heap, (self._clock() + delay_seconds, channel_id))
+
+    def due(self) -> list[str]:
+        """取得予定時刻を過ぎたチャンネルを取り出して返す。"""
+        now = self._clock()
+        channel_ids = []
+        while self._heap and self._heap[0][0] <= now:
+            channel_ids.append(heapq.heappop(self._heap)[1])
+        return channel_ids
+
+    def reschedule(self, channel_id: str, interval_seconds: Optional[float] = None) -> float:
+        """チャンネルを次回の取得予定として登録し、次回までの秒数を返す。"""
+        interval = self._interval if interval_seconds is None else interval_seconds
+        jitter = self._rng.uniform(-self._jitter_ratio, self._jitter_ratio)
+        delay = max(0.0, interval * (1 + jitter))
+        self.add(channel_id, delay)
+        return delay
+
+    def seconds_until_next(self) -> Optional[float]:
+        """次の取得予定までの秒数を返す。登録がなければNoneを返す。"""
+        if not self._heap:
+            return None
+        return max(0.0, self._heap[0][0] - self._clock())
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+
+class Daemon:
+    """設定・履歴・HTTP接続・ブラウザをメモリ上に保持したまま定期的に新着動画を処理する。
+
+    パイプライン（画像生成段のブラウザを含む）は起動時に1度だけ作り、
+    取得予定時刻を迎えたチャンネルのフィードだけを取得して投入する。
+    履歴は周期ごと、キャッシュは一定間隔ごとに書き出し、停止時にもすべて書き出す。
+
+    websub を指定した場合は、WebSubで通知された動画を push() で受け取って即座に投入する。
+    購読が有効なチャンネルのフィード取得は通知漏れに備えた補助として取得間隔の上限で行う。
+    ハブへの購読要求は応答が遅いと周期処理を止めてしまうため、別スレッドで送る。
+    """
+
+    def __init__(
+        self,
+        notifier: Notifier,
+        scheduler: ChannelScheduler,
+        save_interval_seconds: float = DEFAULT_SAVE_INTERVAL_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+        websub: Optional[WebSubSubscriber] = None,
+        renew_concurrency: int = DEFAULT_RENEW_CONCURRENCY,
+    ):
+        self._notifier = notifier
+        self._scheduler = scheduler
+        self._save_interval = save_interval_seconds
+        self._clock = clock
+        self._websub = websub
+        self._stop = threading.Event()
+        # WebSubで通知された (channel_id, 動画リスト)。パイプラインへの投入はメインスレッドで行う
+        self._pushed: queue.Queue[tuple[str, list[VideoEntry]]] = queue.Queue()
+        self._wakeup = threading.Event()
+        # 購読要求を送るスレッドと、要求中（投入済み）のチャンネルID
+        self._renewals: Optional[ThreadPoolExecutor] = None
+        if websub is not None:
+            self._renewals = ThreadPoolExecutor(
+                max_workers=max(1, renew_concurrency), thread_name_prefix="websub-renew"
+            )
+        self._renewing: set[str] = set()
+        self._renewing_lock = threading.Lock()
+
+    def request_stop(self, *_args) -> None:
+        """停止を要求する。処理中の動画を最後まで処理してから終了する。"""
+        if not self._stop.is_set():
+            logger.info("停止要求を受け付けました。処理中の動画の完了後に終了します")
+        self._stop.set()
+        self._wakeup.set()
+
+    def push(self, channel_id: str, videos: list[VideoEntry]) -> None:
+        """WebSubで通知された動画を受け取る（コールバックサーバーのスレッドから呼ばれる）。"""
+        self._pushed.put((channel_id, videos))
+        self._wakeup.set()
+
+    def run(self) -> None:
+        """停止が要求されるまで処理を繰り返す。"""
+        notifier = self._notifier
+        last_saved = self._clock()
+
+        with notifier.render_pool, notifier.processor.build_pipeline() as pipeline:
+            while not self._stop.is_set():
+                self.renew_subscriptions()
+                self.ingest_pushed(pipeline)
+
+                channel_ids = self._scheduler.due()
+                if channel_ids:
+                    self.run_cycle(pipeline, channel_ids)
+
+                if self._clock() - last_saved >= self._save_interval:
+                    notifier.log_filter_stats()
+                    notifier.save_history()
+                    notifier.save_caches()
+                    last_saved = self._clock()
+
+                wait = self._scheduler.seconds_until_next()
+                self._wakeup.wait(MAX_IDLE_SECONDS if wait is None else min(wait, MAX_IDLE_SECONDS))
+                self._wakeup.clear()
+
+        self.shutdown_renewals()
+        notifier.log_filter_stats()
+        notifier.save_history()
+        notifier.save_caches()
+        logger.info("常駐モードを終了しました")
+
+    def run_cycle(self, pipeline, channel_ids: list[str]) -> None:
+        """取得予定時刻を迎えたチャンネルを処理し、次回の取得予定を登録する。"""
+        started = self._clock()
+        notifier = self._notifier
+
+        # 前の周期でレートリミットにより残った動画・失敗した動画を再開する
+        # （サーバーから指示された待機が過ぎるまではレートリミットを解除しない）
+        notifier.processor.reset_rate_limit()
+        notifier.resume_jobs(pipeline)
+        try:
+            notifier.poll(pipeline, channel_ids)
+        finally:
+            # 投稿頻度から求めた取得間隔で次回の取得予定を登録する
+            for channel_id in channel_ids:
+                self._scheduler.reschedule(channel_id, self._poll_interval(channel_id))
+        notifier.save_history()
+
+        logger.info(
+            "周期処理完了 - チャンネル数: %d, 所要時間: %.0fms",
+            len(channel_ids),
+            (self._clock() - started) * 1000,
+        )
+
+    def ingest_pushed(self, pipeline) -> int:
+        """WebSubで通知された動画をパイプラインに投入し、処理した通知数を返す。"""
+        count = 0
+        while True:
+            try:
+                channel_id, videos = self._pushed.get_nowait()
+            except queue.Empty:
+                return count
+            self._notifier.ingest(pipeline, channel_id, videos)
+            count += 1
+
+    def renew_subscriptions(self) -> int:
+        """未購読・有効期間の残り少ないチャンネルのWebSub購読要求を別スレッドに投入する。
+
+        メインループでは対象の判定だけを行い、ハブの応答を待たない。
+        要求中のチャンネルは重ねて投入しない。
+
+        Returns:
+            投入した購読要求の数
+        """
+        if self._websub is None or self._renewals is None:
+            return 0
+        due = self._websub.renewal_due(self._notifier.channels_by_id)
+        with self._renewing_lock:
+            channel_ids = [channel_id for channel_id in due if channel_id not in self._renewing]
+            self._renewing.update(channel_ids)
+        for channel_id in channel_ids:
+            self._renewals.submit(self._renew, channel_id)
+        return len(channel_ids)
+
+    def shutdown_renewals(self) -> None:
+        """購読要求のスレッドを終了する。未送信の要求は破棄し、送信中の要求は完了を待つ。"""
+        if self._renewals is not None:
+            self._renewals.shutdown(wait=True, cancel_futures=True)
+
+    def _renew(self, channel_id: str) -> None:
+        try:
+            if self._stop.is_set():
+                return
+            self._websub.subscribe(channel_id)
+        except WebSubError as e:
+            # 購読できなくてもフィードの取得で新着を検出する
+            logger.warning("%s", e)
+        finally:
+            with self._renewing_lock:
+                self._renewing.discard(channel_id)
+
+    def _poll_interval(self, channel_id: str) -> float:
+        poll_scheduler = self._notifier.poll_scheduler
+        if self._websub is not None and self._websub.is_active(channel_id):
+            return poll_scheduler.max_interval
+        return poll_scheduler.interval(channel_id)
+
+
+def run_daemon(shard: Optional[Shard] = None) -> None:
+    """常駐モードのエントリーポイント（python -m src daemon）。"""
+    gemini_api_key, discord_webhook_url = load_environment()
+    if shard is None:
+        shard = load_shard_or_exit()
+
+    channels, settings = load_config_or_exit(discord_webhook_url)
+    # 全モジュールで共有する接続プール付きHTTPセッション（常駐中は接続を使い回す）
+    http_session = create_http_session(settings)
+
+    notifier = create_notifier(
+        channels,
+        settings,
+        gemini_api_key=gemini_api_key,
+        discord_webhook_url=discord_webhook_url,
+        http_session=http_session,
+        shard=shard,
+    )
+    channels = list(notifier.channels_by_id.values())
+
+    # 前回までの取得予定を引き継ぎ、以降はチャンネルごとの投稿頻度に応じた間隔で取得する
+    scheduler = ChannelScheduler(settings.check_interval_minutes * 60)
+    for channel in channels:
+        scheduler.add(
+            channel.channel_id,
+            notifier.poll_scheduler.seconds_until_due(channel.channel_id),
+        )
+
+    # コールバックURLが設定されていればWebSubで新着の通知を受け取る
+    websub = None
+    server = None
+    if settings.websub_callback_url:
+        websub = WebSubSubscriber(settings.websub_callback_url, session=http_session)
+
+    daemon = Daemon(notifier, scheduler, websub=websub)
+    signal.signal(signal.SIGTERM, daemon.request_stop)
+    signal.signal(signal.SIGINT, daemon.request_stop)
+
+    if websub is not None:
+        server = WebSubServer(websub, daemon.push, port=settings.websub_port)
+        server.start()
+
+    logger.info(
+        "常駐モード開始 - 監視チャンネル数: %d, 取得間隔: %d〜%d分, WebSub: %s",
+        len(channels),
+        settings.min_poll_interval_minutes,
+        settings.max_poll_interval_minutes,
+        "有効" if websub is not None else "無効",
+    )
+    try:
+        daemon.run()
+    finally:
+        if server is not None:
+            server.stop()
+        http_session.close()
@@ -1,12 +1,16 @@
+import asyncio
 import json
 import logging
 import re
 import time
 from datetime import datetime, timezone
+from typing import Callable, Optional
 
+import aiohttp
 import requests
 
 from src.exceptions import DiscordNotifyError
+from src.http_client import get_session
 from src.models import VideoEntry
 
 logger = logging.getLogger(__name__)
@@ -30,6 +34,7 @@ def send_notification(
     video: VideoEntry,
     channel_name: str,
     summary: str,
+    session: Optional[requests.Session] = None,
 ) -> None:
     """動画の要約をDiscordに通知する。
 
@@ -40,6 +45,7 @@ def send_notification(
         video: 動画情報
         channel_name: チャンネル表示名
         summary: 要約テキスト
+        session: HTTPセッション。省略時はプロセス共通のセッションを使う
 
     Raises:
         DiscordNotifyError: Webhook送信失敗時
@@ -82,7 +88,7 @@ def send_notification(
         if len(embeds) >= MAX_EMBEDS_PER_MESSAGE:
             break
 
-    _send_webhook(webhook_url, {"embeds": embeds})
+    _send_webhook(webhook_url, {"embeds": embeds}, session)
     logger.info("通知送信完了 - 動画「%s」", video.title)
 
 
@@ -91,6 +97,7 @@ def send_image_notification(
     video: VideoEntry,
     channel_name: str,
     image_path: str,
+    session: Optional[requests.Session] = None,
 ) -> None:
     """動画の要約インフォグラフィック画像をDiscordに送信する。
 
@@ -102,6 +109,7 @@ def send_image_notification(
         video: 動画情報
         channel_name: チャンネル表示名
         image_path: インフォグラフィックPNG画像のパス
+        session: HTTPセッション。省略時はプロセス共通のセッションを使う
 
     Raises:
         DiscordNotifyError: Webhook送信失敗時
@@ -110,7 +118,7 @@ def send_image_notification(
         "content": f"**{channel_name}** の新着動画\n<{video.url}>",
     }
 
-    _send_webhook_with_file(webhook_url, payload, image_path)
+    _send_webhook_with_file(webhook_url, payload, image_path, session)
     logger.info("画像通知送信完了 - 動画「%s」", video.title)
 
 
@@ -118,6 +126,7 @@ def send_error_notification(
     webhook_url: str,
     error_title: str,
     error_detail: str,
+    session: Optional[requests.Session] = None,
 ) -> None:
     """エラー情報をDiscordに通知する（赤色Embed）。
 
@@ -125,6 +134,7 @@ def send_error_notification(
         webhook_url: Discord Webhook URL
         error_title: エラーの種類
         error_detail: エラーの詳細メッセージ
+        session: HTTPセッション。省略時はプロセス共通のセッションを使う
 
     Raises:
         DiscordNotifyError: Webhook送信失敗時
@@ -137,13 +147,54 @@ def send_error_notification(
     }
 
     try:
-        _send_webhook(webhook_url, {"embeds": [embed]})
+        _send_webhook(webhook_url, {"embeds": [embed]}, session)
         logger.info("エラー通知送信完了: %s", error_title)
     except DiscordNotifyError as e:
         # エラー通知の送信自体が失敗した場合はログのみ
         logger.error("エラー通知の送信に失敗: %s: %s", error_title, e)
 
 
+async def send_image_notification_async(
+    webhook_url: str,
+    video: VideoEntry,
+    channel_name: str,
+    image_path: str,
+    session: aiohttp.ClientSession,
+) -> None:
+    """send_image_notification の asyncio 版。
+
+    Raises:
+        DiscordNotifyError: Webhook送信失敗時
+    """
+    payload = {
+        "content": f"**{channel_name}** の新着動画\n<{video.url}>",
+    }
+
+    await _send_webhook_with_file_async(webhook_url, payload, image_path, session)
+    logger.info("画像通知送信完了 - 動画「%s」", video.title)
+
+
+async def send_error_notification_async(
+    webhook_url: str,
+    error_title: str,
+    error_detail: str,
+    session: aiohttp.ClientSession,
+) -> None:
+    """send_error_notification の asyncio 版。送信に失敗してもログのみ出力する。"""
+    embed = {
+        "title": error_title,
+        "description": error_detail[:MAX_EMBED_DESCRIPTION],
+        "color": COLOR_ERROR,
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+    }
+
+    try:
+        await _send_webhook_async(webhook_url, {"embeds": [embed]}, session)
+        logger.info("エラー通知送信完了: %s", error_title)
+    except DiscordNotifyError as e:
+        logger.error("エラー通知の送信に失敗: %s: %s", error_title, e)
+
+
 def _split_summary_into_embeds(
     summary: str, max_length: int = MAX_EMBED_DESCRIPTION
 ) -> list[str]:
@@ -200,13 +251,19 @@ def _split_by_length(text: str, max_length: int) -> list[str]:
     return parts
 
 
-def _send_webhook(webhook_url: str, payload: dict) -> None:
+def _send_webhook(
+    webhook_url: str,
+    payload: dict,
+    session: Optional[requests.Session] = None,
+) -> None:
     """Discord Webhookにペイロードを送信する（リトライ付き）。"""
+    if session is None:
+        session = get_session()
     last_error = None
 
     for attempt in range(MAX_RETRIES):
         try:
-            response = requests.post(
+            response = session.post(
                 webhook_url,
                 json=payload,
                 timeout=30,
@@ -263,8 +320,11 @@ def _send_webhook_with_file(
     webhook_url: str,
     payload: dict,
     image_path: str,
+    session: Optional[requests.Session] = None,
 ) -> None:
     """Discord Webhookに画像ファイル付きペイロードを送信する（リトライ付き）。"""
+    if session is None:
+        session = get_session()
     last_error = None
 
     for attempt in range(MAX_RETRIES):
@@ -274,7 +334,7 @@ def _send_webhook_with_file(
                     "payload_json": (None, json.dumps(payload), "application/json"),
                     "files[0]": ("summary.png", f, "image/png"),
                 }
-                response = requests.post(
+                response = session.post(
                     webhook_url,
                     files=files,
                     timeout=30,
@@ -319,17 +379,115 @@ def _send_webhook_with_file(
     raise last_error
 
 
+async def _send_webhook_async(
+    webhook_url: str,
+    payload: dict,
+    session: aiohttp.ClientSession,
+) -> None:
+    """_send_webhook の asyncio 版。"""
+    await _post_with_retry_async(webhook_url, session, lambda: {"json": payload})
+
+
+async def _send_webhook_with_file_async(
+    webhook_url: str,
+    payload: dict,
+    image_path: str,
+    session: aiohttp.ClientSession,
+) -> None:
+    """_send_webhook_with_file の asyncio 版。"""
+    with open(image_path, "rb") as f:
+        image = f.read()
+
+    def form() -> dict:
+        # FormData は送信ごとに作り直す（再送時に使い回せないため）
+        data = aiohttp.FormData()
+        data.add_field("payload_json", json.dumps(payload), content_type="application/json")
+        data.add_field("files[0]", image, filename="summary.png", content_type="image/png")
+        return {"data": data}
+
+    await _post_with_retry_async(webhook_url, session, form)
+
+
+async def _post_with_retry_async(
+    webhook_url: str,
+    session: aiohttp.ClientSession,
+    make_request_kwargs: Callable[[], dict],
+) -> None:
+    """Discord Webhookに送信する（リトライ付き）。応答ごとの扱いは同期版と同じ。"""
+    last_error = None
+
+    for attempt in range(MAX_RETRIES):
+        try:
+            async with session.post(
+                webhook_url,
+                timeout=aiohttp.ClientTimeout(total=30),
+                **make_request_kwargs(),
+            ) as response:
+                status = response.status
+                headers = response.headers
+                text = await response.text()
+
+            if status in (200, 204):
+                return
+
+            if status == 429:
+                try:
+                    data = json.loads(text)
+                except ValueError:
+                    data = None
+                retry_after = _retry_after_from(headers, data)
+                logger.warning(
+                    "Discord レートリミット - %d秒待機", retry_after
+                )
+                await asyncio.sleep(retry_after)
+                continue
+
+            if 400 <= status < 500:
+                raise DiscordNotifyError(
+                    f"Discord Webhookエラー(HTTP {status}): {text[:200]}"
+                )
+
+            last_error = DiscordNotifyError(f"Discord Webhookエラー(HTTP {status})")
+
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            last_error = DiscordNotifyError(
+                f"Discord Webhookネットワークエラー: {e}"
+            )
+
+        if attempt < MAX_RETRIES - 1:
+            wait = BACKOFF_SECONDS[attempt]
+            logger.warning(
+                "Discord Webhookリトライ %d/%d - %d秒待機",
+                attempt + 1,
+                MAX_RETRIES,
+                wait,
+            )
+            await asyncio.sleep(wait)
+
+    raise last_error
+
+
 def _get_retry_after(response: requests.Response) -> int:
     """Retry-Afterヘッダから待機秒数を取得する。"""
+    if response.headers.get("Retry-After"):
+        return _retry_after_from(response.headers, None)
+    try:
+        data = response.json()
+    except ValueError:
+        return 5
+    return _retry_after_from(response.headers, data)
+
+
+def _retry_after_from(headers, data) -> int:
+    """ヘッダまたはJSON本文から待機秒数を取得する（同期版・非同期版で共通）。"""
     try:
         # ヘッダから取得
-        retry_after = response.headers.get("Retry-After")
+        retry_after = headers.get("Retry-After")
         if retry_after:
             return int(float(retry_after)) + 1
 
         # JSONボディから取得
-        data = response.json()
         retry_after_ms = data.get("retry_after", 5000)
         return int(retry_after_ms / 1000) + 1
-    except (ValueError, KeyError, TypeError):
+    except (ValueError, KeyError, TypeError, AttributeError):
         return 5
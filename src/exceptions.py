@@ -1,3 +1,6 @@
+from typing import Optional
+
+
 class AppError(Exception):
     """アプリケーション基底例外"""
     pass
@@ -15,6 +18,15 @@ class SummarizerError(AppError):
 
 class RateLimitError(SummarizerError):
     """Gemini APIレートリミット超過"""
+
+    def __init__(self, message: str = "", retry_after: Optional[float] = None):
+        super().__init__(message)
+        # サーバーが指示した再試行までの秒数（不明な場合はNone）
+        self.retry_after = retry_after
+
+
+class SummarizerUnavailableError(SummarizerError):
+    """Gemini APIを利用できない（サーバーエラー・ネットワークエラー・APIキー無効など動画によらない失敗）"""
     pass
 
 
@@ -36,3 +48,8 @@ class ConfigError(AppError):
 class ImageGenerationError(AppError):
     """インフォグラフィック画像生成失敗"""
     pass
+
+
+class WebSubError(AppError):
+    """WebSub（PubSubHubbub）の購読要求失敗"""
+    pass
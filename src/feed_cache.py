@@ -0,0 +1,132 @@
+import json
+import logging
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Iterable, Optional
+
+from src.models import VideoEntry
+
+logger = logging.getLogger(__name__)
+
+# 公開から遅れてフィードに現れる動画を取りこぼさないよう、前回の取得時刻からさかのぼる秒数
+DEFAULT_WATERMARK_WINDOW_SECONDS = 3 * 60 * 60
+
+
+class FeedCache:
+    """チャンネルごとのRSSフィード検証子（ETag / Last-Modified）とウォーターマークを管理する。
+
+    条件付きGETに使う検証子だけを保持し、フィード本文は保存しない。
+    ウォーターマークは処理済みの最新の動画（公開日時・動画ID）と、フィードを最後まで
+    処理した時刻を記録する。公開日時が「前回の処理時刻 - watermark_window_seconds」より
+    前の動画は前回までにフィードに現れて処理済みのため、解析・新着判定を省略できる。
+    並列取得中に複数スレッドから更新されるため、操作はロックで保護する。
+    """
+
+    def __init__(
+        self,
+        data_path: str = "data/feed_cache.json",
+        watermark_window_seconds: float = DEFAULT_WATERMARK_WINDOW_SECONDS,
+    ):
+        self._path = Path(data_path)
+        self._watermark_window = watermark_window_seconds
+        self._channels: dict[str, dict] = {}
+        # channel_id -> {"published": エポック秒, "video_id": str, "checked_at": エポック秒}
+        self._watermarks: dict[str, dict] = {}
+        self._lock = threading.Lock()
+
+    def load(self) -> None:
+        """キャッシュファイルを読み込む。存在しない・破損している場合は空で初期化する。"""
+        if not self._path.exists():
+            self._channels = {}
+            self._watermarks = {}
+            return
+
+        try:
+            with open(self._path, encoding="utf-8") as f:
+                data = json.load(f)
+            self._channels = data.get("channels", {})
+            self._watermarks = data.get("watermarks", {})
+            logger.info("フィードキャッシュ読み込み完了 - チャンネル数: %d", len(self._channels))
+        except (json.JSONDecodeError, AttributeError) as e:
+            logger.warning("フィードキャッシュが破損しています。空の状態で初期化します: %s", e)
+            self._channels = {}
+            self._watermarks = {}
+
+    def conditional_headers(self, channel_id: str) -> dict[str, str]:
+        """条件付きGET用のリクエストヘッダを返す。検証子がなければ空の辞書を返す。"""
+        with self._lock:
+            entry = self._channels.get(channel_id, {})
+            headers = {}
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+            return headers
+
+    def update(
+        self,
+        channel_id: str,
+        etag: Optional[str],
+        last_modified: Optional[str],
+    ) -> None:
+        """レスポンスヘッダの検証子を記録する。どちらもなければエントリを削除する。"""
+        with self._lock:
+            if not etag and not last_modified:
+                self._channels.pop(channel_id, None)
+                return
+            self._channels[channel_id] = {
+                "etag": etag or "",
+                "last_modified": last_modified or "",
+            }
+
+    def discard(self, channel_id: str) -> None:
+        """チャンネルの検証子を破棄し、次回は必ずフィード全体を取得させる。"""
+        with self._lock:
+            self._channels.pop(channel_id, None)
+
+    def seen_until(self, channel_id: str) -> Optional[datetime]:
+        """これより前に公開された動画は処理済みとみなせる日時を返す。記録がなければNoneを返す。"""
+        with self._lock:
+            checked_at = self._watermarks.get(channel_id, {}).get("checked_at")
+        if checked_at is None:
+            return None
+        return datetime.fromtimestamp(checked_at - self._watermark_window, timezone.utc)
+
+    def newer_than_watermark(self, channel_id: str, videos: list[VideoEntry]) -> list[VideoEntry]:
+        """ウォーターマークの動画（前回処理した最新の動画）を除いた動画を返す。"""
+        with self._lock:
+            video_id = self._watermarks.get(channel_id, {}).get("video_id")
+        if video_id is None:
+            return videos
+        return [v for v in videos if v.video_id != video_id]
+
+    def advance_watermark(
+        self,
+        channel_id: str,
+        videos: Iterable[VideoEntry],
+        checked_at: float,
+    ) -> None:
+        """フィードを最後まで処理したことを記録し、最新の動画でウォーターマークを進める。
+
+        Args:
+            channel_id: YouTubeチャンネルID
+            videos: 処理した動画（304 Not Modified などで空の場合は処理時刻のみ更新する）
+            checked_at: フィードの取得を開始した時刻（エポック秒）
+        """
+        newest = max(videos, key=lambda v: v.published, default=None)
+        with self._lock:
+            entry = self._watermarks.setdefault(channel_id, {})
+            entry["checked_at"] = max(entry.get("checked_at", 0), int(checked_at))
+            if newest is not None and int(newest.published.timestamp()) >= entry.get("published", 0):
+                entry["published"] = int(newest.published.timestamp())
+                entry["video_id"] = newest.video_id
+
+    def save(self) -> None:
+        """キャッシュをファイルに保存する。"""
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            data = {"channels": dict(self._channels), "watermarks": dict(self._watermarks)}
+        with open(self._path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+        logger.info("フィードキャッシュ保存完了 - チャンネル数: %d", len(data["channels"]))
@@ -1,39 +1,95 @@
+import heapq
 import json
 import logging
+import os
+import sqlite3
+import sys
+import tempfile
+import threading
+from collections.abc import Iterator, Mapping
 from datetime import datetime, timezone
 from pathlib import Path
+from typing import Optional, Union
 
 from src.models import VideoEntry
 
 logger = logging.getLogger(__name__)
 
+# settings.history_backend で選択できる保存形式
+HISTORY_BACKENDS = ("json", "sqlite", "journal")
+
+# ジャーナルの行数がこれを超えたら保存時にスナップショットへ畳み込む
+DEFAULT_COMPACT_THRESHOLD = 500
+
+# SQLiteの1文で指定できるパラメータ数の上限（古いSQLiteの既定値）に合わせて分割する
+_SQLITE_MAX_PARAMS = 900
+
+
+class HistoryRecord:
+    """通知履歴1件分。タイトルは件数が多いと嵩むため HistoryManager が別に保持する。"""
+
+    __slots__ = ("channel_id", "notified_at")
+
+    def __init__(self, channel_id: str, notified_at: int):
+        self.channel_id = channel_id     # sys.intern() 済みのチャンネルID
+        self.notified_at = notified_at   # 通知日時（UNIXエポック秒）
+
 
 class HistoryManager:
-    """通知済み動画の履歴を管理する。"""
+    """通知済み動画の履歴を管理する。
+
+    メモリ上では動画ID → HistoryRecord（__slots__、チャンネルIDはintern済み、
+    通知日時は整数のエポック秒）と、動画ID → タイトルの2つの辞書で保持する。
+    通知済み判定は動画IDだけ、保持期間の判定は通知日時だけで行い、
+    タイトルはファイルへの保存時にのみ参照する。
+
+    保持期間の判定用に (通知日時, 動画ID) のヒープを併せて持ち、
+    cleanup_old_entries() は期限切れのエントリだけを取り出す。
+    削除・再登録で古くなったヒープの要素は取り出した時点で読み捨てる。
+    """
 
     def __init__(self, data_path: str = "data/notified.json"):
         self._path = Path(data_path)
-        self._notified: dict[str, dict] = {}
+        self._records: dict[str, HistoryRecord] = {}
+        self._titles: dict[str, str] = {}
+        self._expiry_heap: list[tuple[int, str]] = []
+
+    def replace_entries(self, entries: Mapping[str, dict]) -> None:
+        """notified.json の notified_videos と同じ形式の辞書で履歴を置き換える。
+
+        変更は save() でファイルに保存する。
+        """
+        self._records = {}
+        self._titles = {}
+        for video_id, info in entries.items():
+            self._put(
+                video_id,
+                info.get("title", ""),
+                info.get("channel_id", ""),
+                _parse_epoch(info.get("notified_at")),
+                index=False,
+            )
+        self._rebuild_expiry_heap()
 
     def load(self) -> None:
         """履歴ファイルを読み込む。ファイルが存在しない場合は空の状態で初期化する。"""
         if not self._path.exists():
             logger.info("履歴ファイルが存在しないため新規作成します: %s", self._path)
-            self._notified = {}
+            self.replace_entries({})
             return
 
         try:
             with open(self._path, encoding="utf-8") as f:
                 data = json.load(f)
-            self._notified = data.get("notified_videos", {})
-            logger.info("履歴ファイル読み込み完了 - 登録数: %d", len(self._notified))
-        except (json.JSONDecodeError, KeyError) as e:
+            self.replace_entries(data.get("notified_videos", {}))
+            logger.info("履歴ファイル読み込み完了 - 登録数: %d", len(self._records))
+        except (json.JSONDecodeError, KeyError, AttributeError) as e:
             logger.warning("履歴ファイルが破損しています。空の状態で初期化します: %s", e)
-            self._notified = {}
+            self.replace_entries({})
 
     def is_notified(self, video_id: str) -> bool:
         """指定した動画IDが通知済みかどうかを返す。"""
-        return video_id in self._notified
+        return video_id in self._records
 
     def filter_new(self, videos: list[VideoEntry]) -> list[VideoEntry]:
         """通知済み動画を除外して新着のみ返す。"""
@@ -43,11 +99,33 @@ class HistoryManager:
 
     def mark_notified(self, video: VideoEntry) -> None:
         """動画を通知済みとして記録する。"""
-        self._notified[video.video_id] = {
-            "title": video.title,
-            "channel_id": video.channel_id,
-            "notified_at": datetime.now(timezone.utc).isoformat(),
-        }
+        self._put(
+            video.video_id,
+            video.title,
+            video.channel_id,
+            int(datetime.now(timezone.utc).timestamp()),
+        )
+
+    def entries(self) -> Iterator[tuple[str, dict]]:
+        """(動画ID, notified.json の notified_videos と同じ形式のエントリ) を順に返す。"""
+        for video_id in list(self._records):
+            yield video_id, self._entry(video_id)
+
+    def adopt(self, video_id: str, info: Mapping) -> bool:
+        """他の履歴のエントリを通知日時を保ったまま取り込む。登録済みなら何もしない。
+
+        Returns:
+            取り込んだかどうか
+        """
+        if video_id in self._records:
+            return False
+        self._put(
+            video_id,
+            info.get("title", ""),
+            info.get("channel_id", ""),
+            _parse_epoch(info.get("notified_at")),
+        )
+        return True
 
     def cleanup_old_entries(self, retention_days: int = 90) -> int:
         """指定日数以上前のエントリを削除する。
@@ -55,34 +133,470 @@ class HistoryManager:
         Returns:
             削除したエントリ数
         """
-        now = datetime.now(timezone.utc)
-        to_remove = []
-
-        for video_id, info in self._notified.items():
-            notified_at_str = info.get("notified_at", "")
-            try:
-                notified_at = datetime.fromisoformat(notified_at_str)
-                if (now - notified_at).days >= retention_days:
-                    to_remove.append(video_id)
-            except (ValueError, TypeError):
-                # パースできないエントリは削除対象
-                to_remove.append(video_id)
-
-        for video_id in to_remove:
-            del self._notified[video_id]
-
-        if to_remove:
-            logger.info("古いエントリを%d件削除しました", len(to_remove))
-        return len(to_remove)
+        removed = self._expire(retention_days)
+        if removed:
+            logger.info("古いエントリを%d件削除しました", len(removed))
+        return len(removed)
 
     def save(self) -> None:
         """履歴をファイルに保存する。"""
         self._path.parent.mkdir(parents=True, exist_ok=True)
         with open(self._path, "w", encoding="utf-8") as f:
             json.dump(
-                {"notified_videos": self._notified},
+                {"notified_videos": dict(self.entries())},
                 f,
                 ensure_ascii=False,
                 indent=2,
             )
-        logger.info("履歴ファイル保存完了 - 登録数: %d", len(self._notified))
+        logger.info("履歴ファイル保存完了 - 登録数: %d", len(self._records))
+
+    def _entry(self, video_id: str) -> dict:
+        record = self._records[video_id]
+        return {
+            "title": self._titles.get(video_id, ""),
+            "channel_id": record.channel_id,
+            "notified_at": _format_epoch(record.notified_at),
+        }
+
+    def _expire(self, retention_days: int) -> list[str]:
+        """保持期間を過ぎたエントリを削除し、削除した動画IDを返す。"""
+        cutoff = int(datetime.now(timezone.utc).timestamp()) - retention_days * 24 * 60 * 60
+        heap = self._expiry_heap
+        removed = []
+        while heap and heap[0][0] <= cutoff:
+            notified_at, video_id = heapq.heappop(heap)
+            record = self._records.get(video_id)
+            # 削除済み・再登録済みの要素は読み捨てる
+            if record is None or record.notified_at != notified_at:
+                continue
+            self._remove(video_id)
+            removed.append(video_id)
+        return removed
+
+    def _put(
+        self,
+        video_id: str,
+        title: str,
+        channel_id: str,
+        notified_at: int,
+        index: bool = True,
+    ) -> None:
+        self._records[video_id] = HistoryRecord(sys.intern(channel_id), notified_at)
+        if title:
+            self._titles[video_id] = title
+        else:
+            self._titles.pop(video_id, None)
+        if index:
+            heapq.heappush(self._expiry_heap, (notified_at, video_id))
+            # 再登録で読み捨て待ちの要素が増えすぎたら作り直す
+            if len(self._expiry_heap) > 2 * len(self._records) + 64:
+                self._rebuild_expiry_heap()
+
+    def _rebuild_expiry_heap(self) -> None:
+        self._expiry_heap = [
+            (record.notified_at, video_id) for video_id, record in self._records.items()
+        ]
+        heapq.heapify(self._expiry_heap)
+
+    def _remove(self, video_id: str) -> None:
+        self._records.pop(video_id, None)
+        self._titles.pop(video_id, None)
+
+
+class JournaledHistoryManager(HistoryManager):
+    """スナップショットと追記専用ジャーナルで通知履歴を管理する。
+
+    スナップショットは HistoryManager と同じ形式の notified.json。
+    mark_notified() と cleanup_old_entries() の変更はジャーナル（JSON Lines）に
+    1行ずつ追記してすぐに fsync するため、書き込み量は履歴全体ではなく
+    変更件数に比例する。save() ではジャーナルが閾値を超えた場合のみ
+    スナップショットへ畳み込み（コンパクション）、ジャーナルを空にする。
+    load() はスナップショットを読み込んだ後にジャーナルを先頭から再生する。
+    """
+
+    def __init__(
+        self,
+        data_path: str = "data/notified.json",
+        journal_path: str = "data/notified.journal",
+        compact_threshold: int = DEFAULT_COMPACT_THRESHOLD,
+    ):
+        super().__init__(data_path)
+        self._journal_path = Path(journal_path)
+        self._compact_threshold = compact_threshold
+        self._journal_lines = 0
+        # replace_entries() でジャーナルにない変更があり、スナップショットの書き直しが必要か
+        self._snapshot_stale = False
+
+    def load(self) -> None:
+        """スナップショットを読み込み、ジャーナルの変更を順に適用する。"""
+        super().load()
+        self._journal_lines = 0
+        self._snapshot_stale = False
+        if not self._journal_path.exists():
+            return
+
+        with open(self._journal_path, encoding="utf-8") as f:
+            for line_no, line in enumerate(f, start=1):
+                if not line.strip():
+                    continue
+                self._journal_lines += 1
+                try:
+                    self._apply(json.loads(line))
+                except (json.JSONDecodeError, KeyError, TypeError) as e:
+                    # 書き込み途中で中断された末尾の行などは読み飛ばす
+                    logger.warning("ジャーナルの%d行目を読み飛ばします: %s", line_no, e)
+        logger.info(
+            "ジャーナル適用完了 - %d行, 登録数: %d", self._journal_lines, len(self._records)
+        )
+
+    def mark_notified(self, video: VideoEntry) -> None:
+        """動画を通知済みとして記録し、ジャーナルに追記する。"""
+        super().mark_notified(video)
+        self._append({"op": "add", "video_id": video.video_id, **self._entry(video.video_id)})
+
+    def adopt(self, video_id: str, info: Mapping) -> bool:
+        """他の履歴のエントリを取り込み、ジャーナルに追記する。"""
+        if not super().adopt(video_id, info):
+            return False
+        self._append({"op": "add", "video_id": video_id, **self._entry(video_id)})
+        return True
+
+    def replace_entries(self, entries: Mapping[str, dict]) -> None:
+        """履歴を置き換える。次の save() でスナップショットへ書き出し、ジャーナルを空にする。"""
+        super().replace_entries(entries)
+        self._snapshot_stale = True
+
+    def cleanup_old_entries(self, retention_days: int = 90) -> int:
+        """指定日数以上前のエントリを削除し、削除したIDをジャーナルに追記する。
+
+        Returns:
+            削除したエントリ数
+        """
+        removed = self._expire(retention_days)
+        if removed:
+            logger.info("古いエントリを%d件削除しました", len(removed))
+            self._append({"op": "remove", "video_ids": sorted(removed)})
+        return len(removed)
+
+    def save(self) -> None:
+        """ジャーナルが閾値を超えていればスナップショットへ畳み込む。
+
+        変更は記録時にジャーナルへ書き出し済みのため、閾値以下では何もしない。
+        """
+        if (
+            self._journal_lines <= self._compact_threshold
+            and self._path.exists()
+            and not self._snapshot_stale
+        ):
+            logger.info(
+                "履歴ジャーナル - %d行（コンパクション閾値: %d）",
+                self._journal_lines,
+                self._compact_threshold,
+            )
+            return
+        self.compact()
+
+    def compact(self) -> None:
+        """スナップショットを書き直してジャーナルを空にする。
+
+        スナップショットを置き換えてからジャーナルを消すため、途中で中断されても
+        次回の load() でジャーナルを再生すれば同じ状態に戻る。
+        """
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self._path.parent, prefix=".tmp_")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(
+                    {"notified_videos": dict(self.entries())},
+                    f,
+                    ensure_ascii=False,
+                    indent=2,
+                )
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self._path)
+        except BaseException:
+            Path(tmp_path).unlink(missing_ok=True)
+            raise
+        self._journal_path.unlink(missing_ok=True)
+        logger.info(
+            "履歴コンパクション完了 - ジャーナル%d行を畳み込み, 登録数: %d",
+            self._journal_lines,
+            len(self._records),
+        )
+        self._journal_lines = 0
+        self._snapshot_stale = False
+
+    def _append(self, record: dict) -> None:
+        self._journal_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self._journal_path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        self._journal_lines += 1
+
+    def _apply(self, record: dict) -> None:
+        if record["op"] == "add":
+            self._put(
+                record["video_id"],
+                record.get("title", ""),
+                record.get("channel_id", ""),
+                _parse_epoch(record.get("notified_at")),
+            )
+        elif record["op"] == "remove":
+            for video_id in record["video_ids"]:
+                self._remove(video_id)
+        else:
+            raise KeyError(f"不明な操作です: {record['op']}")
+
+
+class SQLiteHistoryManager:
+    """通知済み動画の履歴をSQLiteで管理する。
+
+    HistoryManager と同じインターフェースを持つ。notified_at（UNIXエポック秒）に
+    インデックスを張り、保持期間を過ぎたエントリは範囲指定の1文で削除する。
+    データベースが未作成の状態で JSON 形式の履歴ファイルがあれば、初回の load() で
+    取り込む（以降は JSON ファイルを参照しない）。
+    パイプラインの複数スレッドから呼ばれるため、接続はロックで保護する。
+    """
+
+    def __init__(
+        self,
+        db_path: str = "data/notified.db",
+        json_path: Optional[str] = "data/notified.json",
+    ):
+        self._path = Path(db_path)
+        self._json_path = Path(json_path) if json_path else None
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    def load(self) -> None:
+        """データベースを開く。存在しない場合は作成し、JSON形式の履歴を取り込む。"""
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self._path), check_same_thread=False)
+        with self._lock:
+            self._conn.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS notified_videos (
+                    video_id    TEXT PRIMARY KEY,
+                    title       TEXT NOT NULL,
+                    channel_id  TEXT NOT NULL,
+                    notified_at REAL NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS idx_notified_at
+                    ON notified_videos (notified_at);
+                CREATE TABLE IF NOT EXISTS meta (
+                    key   TEXT PRIMARY KEY,
+                    value TEXT NOT NULL
+                );
+                """
+            )
+            migrated = self._conn.execute(
+                "SELECT value FROM meta WHERE key = 'migrated_from_json'"
+            ).fetchone()
+            if migrated is None:
+                self._migrate_from_json()
+            count = self._conn.execute("SELECT COUNT(*) FROM notified_videos").fetchone()[0]
+        logger.info("履歴データベース読み込み完了 - 登録数: %d", count)
+
+    def is_notified(self, video_id: str) -> bool:
+        """指定した動画IDが通知済みかどうかを返す。"""
+        with self._lock:
+            row = self._connection().execute(
+                "SELECT 1 FROM notified_videos WHERE video_id = ?", (video_id,)
+            ).fetchone()
+        return row is not None
+
+    def filter_new(self, videos: list[VideoEntry]) -> list[VideoEntry]:
+        """通知済み動画を除外して新着のみ返す。"""
+        notified: set[str] = set()
+        ids = [v.video_id for v in videos]
+        with self._lock:
+            conn = self._connection()
+            for i in range(0, len(ids), _SQLITE_MAX_PARAMS):
+                chunk = ids[i:i + _SQLITE_MAX_PARAMS]
+                placeholders = ",".join("?" * len(chunk))
+                notified.update(
+                    row[0]
+                    for row in conn.execute(
+                        f"SELECT video_id FROM notified_videos WHERE video_id IN ({placeholders})",
+                        chunk,
+                    )
+                )
+        new_videos = [v for v in videos if v.video_id not in notified]
+        logger.info("新着動画: %d件（全%d件中）", len(new_videos), len(videos))
+        return new_videos
+
+    def mark_notified(self, video: VideoEntry) -> None:
+        """動画を通知済みとして記録する。"""
+        with self._lock:
+            self._connection().execute(
+                "INSERT OR REPLACE INTO notified_videos (video_id, title, channel_id, notified_at)"
+                " VALUES (?, ?, ?, ?)",
+                (
+                    video.video_id,
+                    video.title,
+                    video.channel_id,
+                    datetime.now(timezone.utc).timestamp(),
+                ),
+            )
+
+    def entries(self) -> Iterator[tuple[str, dict]]:
+        """(動画ID, notified.json の notified_videos と同じ形式のエントリ) を順に返す。"""
+        with self._lock:
+            rows = self._connection().execute(
+                "SELECT video_id, title, channel_id, notified_at FROM notified_videos"
+            ).fetchall()
+        for video_id, title, channel_id, notified_at in rows:
+            yield video_id, {
+                "title": title,
+                "channel_id": channel_id,
+                "notified_at": _format_epoch(int(notified_at)),
+            }
+
+    def adopt(self, video_id: str, info: Mapping) -> bool:
+        """他の履歴のエントリを通知日時を保ったまま取り込む。登録済みなら何もしない。
+
+        Returns:
+            取り込んだかどうか
+        """
+        with self._lock:
+            cursor = self._connection().execute(
+                "INSERT OR IGNORE INTO notified_videos (video_id, title, channel_id, notified_at)"
+                " VALUES (?, ?, ?, ?)",
+                _entry_row(video_id, info),
+            )
+        return cursor.rowcount > 0
+
+    def replace_entries(self, entries: Mapping[str, dict]) -> None:
+        """notified.json の notified_videos と同じ形式の辞書で履歴を置き換える。
+
+        変更は save() でコミットする。
+        """
+        with self._lock:
+            conn = self._connection()
+            conn.execute("DELETE FROM notified_videos")
+            conn.executemany(
+                "INSERT INTO notified_videos (video_id, title, channel_id, notified_at)"
+                " VALUES (?, ?, ?, ?)",
+                [_entry_row(video_id, info) for video_id, info in entries.items()],
+            )
+
+    def cleanup_old_entries(self, retention_days: int = 90) -> int:
+        """指定日数以上前のエントリを削除する。
+
+        Returns:
+            削除したエントリ数
+        """
+        cutoff = datetime.now(timezone.utc).timestamp() - retention_days * 24 * 60 * 60
+        with self._lock:
+            cursor = self._connection().execute(
+                "DELETE FROM notified_videos WHERE notified_at <= ?", (cutoff,)
+            )
+            removed = cursor.rowcount
+        if removed:
+            logger.info("古いエントリを%d件削除しました", removed)
+        return removed
+
+    def save(self) -> None:
+        """未確定の変更をコミットする。"""
+        with self._lock:
+            conn = self._connection()
+            conn.commit()
+            count = conn.execute("SELECT COUNT(*) FROM notified_videos").fetchone()[0]
+        logger.info("履歴データベース保存完了 - 登録数: %d", count)
+
+    def close(self) -> None:
+        """データベース接続を閉じる。"""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            raise RuntimeError("load() を呼び出してから使用してください")
+        return self._conn
+
+    def _migrate_from_json(self) -> None:
+        """JSON形式の履歴ファイルを取り込む。呼び出し元でロックを取得していること。"""
+        conn = self._connection()
+        rows = []
+        if self._json_path is not None and self._json_path.exists():
+            try:
+                with open(self._json_path, encoding="utf-8") as f:
+                    notified = json.load(f).get("notified_videos", {})
+                rows = [_entry_row(video_id, info) for video_id, info in notified.items()]
+            except (json.JSONDecodeError, AttributeError) as e:
+                logger.warning("JSON形式の履歴ファイルが破損しているため取り込みません: %s", e)
+
+        with conn:
+            conn.executemany(
+                "INSERT OR IGNORE INTO notified_videos (video_id, title, channel_id, notified_at)"
+                " VALUES (?, ?, ?, ?)",
+                rows,
+            )
+            conn.execute(
+                "INSERT INTO meta (key, value) VALUES ('migrated_from_json', ?)",
+                (datetime.now(timezone.utc).isoformat(),),
+            )
+        if rows:
+            logger.info("JSON形式の履歴を%d件取り込みました: %s", len(rows), self._json_path)
+
+
+# 履歴マネージャーの型（どの保存形式も同じインターフェースを持つ）
+HistoryBackend = Union[HistoryManager, JournaledHistoryManager, SQLiteHistoryManager]
+
+
+def create_history_manager(backend: str = "json", data_dir: str = "data") -> HistoryBackend:
+    """settings.history_backend に応じた履歴マネージャーを生成する。
+
+    Args:
+        backend: 保存形式（HISTORY_BACKENDS のいずれか）
+        data_dir: 履歴ファイルを置くディレクトリ
+    """
+    paths = history_paths(backend, data_dir)
+    if backend == "sqlite":
+        return SQLiteHistoryManager(str(paths[0]), str(Path(data_dir) / "notified.json"))
+    if backend == "journal":
+        return JournaledHistoryManager(str(paths[0]), str(paths[1]))
+    if backend == "json":
+        return HistoryManager(str(paths[0]))
+    raise ValueError(f"不明な履歴の保存形式です: {backend}")
+
+
+def history_paths(backend: str, data_dir: str = "data") -> list[Path]:
+    """保存形式ごとの履歴ファイルのパスを返す。"""
+    base = Path(data_dir)
+    if backend == "sqlite":
+        return [base / "notified.db"]
+    if backend == "journal":
+        return [base / "notified.json", base / "notified.journal"]
+    if backend == "json":
+        return [base / "notified.json"]
+    raise ValueError(f"不明な履歴の保存形式です: {backend}")
+
+
+def _entry_row(video_id: str, info: Mapping) -> tuple[str, str, str, int]:
+    """notified.json 形式のエントリを notified_videos テーブルの行に変換する。"""
+    return (
+        video_id,
+        info.get("title", ""),
+        info.get("channel_id", ""),
+        _parse_epoch(info.get("notified_at")),
+    )
+
+
+def _parse_epoch(value) -> int:
+    """ISO 8601 の通知日時をエポック秒に変換する。パースできない場合は0（次回削除対象）。"""
+    try:
+        notified_at = datetime.fromisoformat(value)
+    except (ValueError, TypeError):
+        return 0
+    if notified_at.tzinfo is None:
+        notified_at = notified_at.replace(tzinfo=timezone.utc)
+    return int(notified_at.timestamp())
+
+
+def _format_epoch(value: int) -> str:
+    return datetime.fromtimestamp(value, timezone.utc).isoformat()
@@ -0,0 +1,120 @@
+import logging
+import threading
+from typing import Optional, Union
+
+import aiohttp
+import requests
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+# 接続プール設定のデフォルト値（settings.http_* で変更できる）
+# pool_connections: プールを保持するホスト数、pool_maxsize: ホストごとの最大接続数
+DEFAULT_POOL_CONNECTIONS = 10
+DEFAULT_POOL_MAXSIZE = 16
+DEFAULT_CONNECT_TIMEOUT_SECONDS = 30
+DEFAULT_READ_TIMEOUT_SECONDS = 30
+DEFAULT_TIMEOUT = (DEFAULT_CONNECT_TIMEOUT_SECONDS, DEFAULT_READ_TIMEOUT_SECONDS)
+
+# 秒数、または (接続タイムアウト秒数, 読み取りタイムアウト秒数)。requests の timeout と同じ形式
+Timeout = Union[float, tuple[float, float]]
+
+_shared_session: Optional[requests.Session] = None
+_shared_session_lock = threading.Lock()
+
+
+class PooledSession(requests.Session):
+    """ホストごとの接続プールとデフォルトタイムアウトを持つセッション。
+
+    Keep-Alive で接続を再利用するため、同一ホストへの連続リクエストで
+    TCP/TLSハンドシェイクが発生しない。リトライは各モジュールが
+    独自に行うため、アダプタ側ではリトライしない。
+    """
+
+    def __init__(
+        self,
+        pool_connections: int = DEFAULT_POOL_CONNECTIONS,
+        pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+        timeout: Timeout = DEFAULT_TIMEOUT,
+    ):
+        super().__init__()
+        self.default_timeout = timeout
+        adapter = HTTPAdapter(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            max_retries=0,
+        )
+        self.mount("https://", adapter)
+        self.mount("http://", adapter)
+
+    def request(self, method, url, **kwargs):
+        kwargs.setdefault("timeout", self.default_timeout)
+        return super().request(method, url, **kwargs)
+
+
+def create_session(
+    pool_connections: int = DEFAULT_POOL_CONNECTIONS,
+    pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+    timeout: Timeout = DEFAULT_TIMEOUT,
+) -> requests.Session:
+    """接続プール付きのHTTPセッションを生成する。
+
+    Args:
+        pool_connections: 接続プールを保持するホスト数
+        pool_maxsize: ホストごとの最大同時接続数（並列取得の同時実行数以上にする）
+        timeout: リクエストで timeout を省略した場合のタイムアウト秒数
+            （(接続, 読み取り) のタプルで別々に指定できる）
+
+    Returns:
+        接続プール付きセッション
+    """
+    return PooledSession(
+        pool_connections=pool_connections,
+        pool_maxsize=pool_maxsize,
+        timeout=timeout,
+    )
+
+
+def create_async_session(
+    limit: int = DEFAULT_POOL_CONNECTIONS * DEFAULT_POOL_MAXSIZE,
+    limit_per_host: int = DEFAULT_POOL_MAXSIZE,
+    timeout: Timeout = DEFAULT_TIMEOUT,
+) -> aiohttp.ClientSession:
+    """asyncio 版の接続プール付きHTTPセッションを生成する。
+
+    1つのイベントループ上で全リクエストの接続を共有する。
+    イベントループ内で生成し、使用後は close() する（async with で使う）。
+
+    Args:
+        limit: 全ホスト合計の最大同時接続数
+        limit_per_host: ホストごとの最大同時接続数
+        timeout: リクエストで timeout を省略した場合のタイムアウト秒数
+            （create_session と同じく接続・読み取りそれぞれの上限）
+    """
+    connect_timeout, read_timeout = timeout if isinstance(timeout, tuple) else (timeout, timeout)
+    connector = aiohttp.TCPConnector(limit=limit, limit_per_host=limit_per_host)
+    return aiohttp.ClientSession(
+        connector=connector,
+        timeout=aiohttp.ClientTimeout(sock_connect=connect_timeout, sock_read=read_timeout),
+    )
+
+
+def get_session() -> requests.Session:
+    """プロセス共通のHTTPセッションを返す。初回呼び出し時に生成する。
+
+    各モジュールでセッションが注入されなかった場合のデフォルトとして使う。
+    """
+    global _shared_session
+    with _shared_session_lock:
+        if _shared_session is None:
+            _shared_session = create_session()
+        return _shared_session
+
+
+def close_session() -> None:
+    """プロセス共通のHTTPセッションを閉じる。"""
+    global _shared_session
+    with _shared_session_lock:
+        if _shared_session is not None:
+            _shared_session.close()
+            _shared_session = None
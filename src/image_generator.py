@@ -1,8 +1,27 @@
+import asyncio
+import atexit
+import hashlib
+import json
 import logging
+import multiprocessing
+import os
 import tempfile
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from pathlib import Path
+from typing import Optional, Union
+from urllib.parse import urlparse
 
-from playwright.sync_api import sync_playwright
+from playwright.async_api import Browser as AsyncBrowser
+from playwright.async_api import Page as AsyncPage
+from playwright.async_api import Playwright as AsyncPlaywright
+from playwright.async_api import Route as AsyncRoute
+from playwright.async_api import TimeoutError as AsyncPlaywrightTimeoutError
+from playwright.async_api import async_playwright
+from playwright.sync_api import Browser, Page, Playwright, Route, sync_playwright
+from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
 
 from src.exceptions import ImageGenerationError
 
@@ -11,31 +30,371 @@ logger = logging.getLogger(__name__)
 VIEWPORT_WIDTH = 1200
 DEVICE_SCALE_FACTOR = 2
 
+# ブラウザを再起動するまでのレンダリング回数（メモリ肥大化対策）
+DEFAULT_MAX_RENDERS_PER_BROWSER = 50
+
+# 描画完了（フォント読み込み・レイアウト安定）を待つ上限時間
+DEFAULT_READY_TIMEOUT_MS = 10000
+READY_POLLING_MS = 100
+
+# フォント読み込み完了（document.fonts.ready 相当）かつ、
+# 前回のポーリング時からページの高さが変化していなければ描画完了とみなす
+_READY_SCRIPT = """() => {
+    if (document.fonts.status !== "loaded") {
+        return false;
+    }
+    const height = document.documentElement.scrollHeight;
+    const stable = window.__renderLastHeight === height;
+    window.__renderLastHeight = height;
+    return stable;
+}"""
+
+# Google Fontsのホスト（ローカルキャッシュから配信する）。それ以外の外部通信は遮断する
+FONT_HOSTS = ("fonts.googleapis.com", "fonts.gstatic.com")
+DEFAULT_FONT_CACHE_DIR = "data/font_cache"
+
+# 並列レンダリング時にChromium 1プロセスあたり見込むメモリ量
+BROWSER_MEMORY_MB = 500
+
+_thread_local = threading.local()
+
+
+class FontCache:
+    """Google FontsのCSS・フォントファイルをURLごとにディスクへ保存する。
+
+    複数プロセスから同時に書き込まれても壊れないよう、一時ファイル経由で置き換える。
+    """
+
+    def __init__(self, cache_dir: str = DEFAULT_FONT_CACHE_DIR):
+        self._dir = Path(cache_dir)
+
+    def get(self, url: str) -> Optional[tuple[bytes, str]]:
+        """キャッシュ済みの (本文, Content-Type) を返す。未登録の場合はNoneを返す。"""
+        body_path, meta_path = self._paths(url)
+        try:
+            meta = json.loads(meta_path.read_text(encoding="utf-8"))
+            return body_path.read_bytes(), meta.get("content_type", "")
+        except (OSError, ValueError):
+            return None
+
+    def put(self, url: str, body: bytes, content_type: str) -> None:
+        """レスポンス本文とContent-Typeを保存する。"""
+        body_path, meta_path = self._paths(url)
+        try:
+            self._dir.mkdir(parents=True, exist_ok=True)
+            _write_atomic(body_path, body)
+            meta = {"url": url, "content_type": content_type}
+            _write_atomic(meta_path, json.dumps(meta, ensure_ascii=False).encode("utf-8"))
+        except OSError as e:
+            logger.warning("フォントキャッシュの保存に失敗: %s: %s", url, e)
+
+    def _paths(self, url: str) -> tuple[Path, Path]:
+        key = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        return self._dir / f"{key}.body", self._dir / f"{key}.json"
+
+
+def _write_atomic(path: Path, data: bytes) -> None:
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=".tmp_")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        Path(tmp_path).unlink(missing_ok=True)
+        raise
+
+
+class BrowserRenderer:
+    """ヘッドレスChromiumを起動したまま保持し、HTMLをPNGにレンダリングする。
+
+    ブラウザはプロセス（スレッド）内で一度だけ起動し、レンダリングごとに
+    新しいブラウザコンテキストとページを使う。max_renders 回ごと、または
+    ブラウザのクラッシュを検知した場合はブラウザを再起動する。
+
+    Google Fontsへのリクエストはローカルのフォントキャッシュから配信し
+    （初回のみ取得して保存）、それ以外の外部リクエストは遮断する。
+
+    Playwrightの同期APIはスレッドをまたいで使えないため、
+    インスタンスは生成したスレッドからのみ使うこと。
+    """
+
+    def __init__(
+        self,
+        max_renders: int = DEFAULT_MAX_RENDERS_PER_BROWSER,
+        ready_timeout_ms: int = DEFAULT_READY_TIMEOUT_MS,
+        font_cache: Optional[FontCache] = None,
+    ):
+        self._max_renders = max_renders
+        self._ready_timeout_ms = ready_timeout_ms
+        self._font_cache = font_cache if font_cache is not None else FontCache()
+        self._playwright: Optional[Playwright] = None
+        self._browser: Optional[Browser] = None
+        self._render_count = 0
+
+    def render(self, html_content: str, output_path: str) -> None:
+        """HTMLをレンダリングしてPNGを保存する。
+
+        レンダリング中にブラウザがクラッシュした場合は再起動して一度だけ再試行する。
+        """
+        for attempt in range(2):
+            browser = self._ensure_browser()
+            try:
+                _render_page(
+                    browser,
+                    html_content,
+                    output_path,
+                    self._ready_timeout_ms,
+                    self._font_cache,
+                )
+                break
+            except Exception:
+                if browser.is_connected():
+                    raise
+                logger.warning("Chromiumのクラッシュを検知 - ブラウザを再起動します")
+                self._close_browser()
+                if attempt == 1:
+                    raise
+
+        self._render_count += 1
+        if self._render_count >= self._max_renders:
+            logger.info("レンダリング%d回に達したためブラウザを再起動します", self._render_count)
+            self._close_browser()
+
+    def close(self) -> None:
+        """ブラウザとPlaywrightを終了する。"""
+        self._close_browser()
+        if self._playwright is not None:
+            try:
+                self._playwright.stop()
+            except Exception as e:
+                logger.warning("Playwrightの終了に失敗: %s", e)
+            self._playwright = None
+
+    def __enter__(self) -> "BrowserRenderer":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _ensure_browser(self) -> Browser:
+        if self._browser is not None and self._browser.is_connected():
+            return self._browser
+
+        self._close_browser()
+        if self._playwright is None:
+            self._playwright = sync_playwright().start()
+        self._browser = self._playwright.chromium.launch(headless=True)
+        self._render_count = 0
+        logger.info("Chromiumを起動しました")
+        return self._browser
+
+    def _close_browser(self) -> None:
+        if self._browser is None:
+            return
+        try:
+            self._browser.close()
+        except Exception as e:
+            logger.warning("Chromiumの終了に失敗: %s", e)
+        self._browser = None
+
+
+class AsyncBrowserRenderer:
+    """BrowserRenderer の asyncio 版（Playwrightの非同期APIを使う）。
+
+    1つのChromiumを複数のコルーチンで共有し、レンダリングごとに
+    新しいブラウザコンテキストを使う。ブラウザの起動・再起動はロックで直列化する。
+    インスタンスは生成したイベントループからのみ使うこと。
+    """
+
+    def __init__(
+        self,
+        max_renders: int = DEFAULT_MAX_RENDERS_PER_BROWSER,
+        ready_timeout_ms: int = DEFAULT_READY_TIMEOUT_MS,
+        font_cache: Optional[FontCache] = None,
+    ):
+        self._max_renders = max_renders
+        self._ready_timeout_ms = ready_timeout_ms
+        self._font_cache = font_cache if font_cache is not None else FontCache()
+        self._playwright: Optional[AsyncPlaywright] = None
+        self._browser: Optional[AsyncBrowser] = None
+        self._render_count = 0
+        self._lock = asyncio.Lock()
+        # 差し替え後、使用中のコンテキストの終了を待って閉じるブラウザ
+        self._retiring: set[asyncio.Task] = set()
+
+    async def render(self, html_content: str, output_path: str) -> None:
+        """HTMLをレンダリングしてPNGを保存する。
+
+        レンダリング中にブラウザがクラッシュした場合は再起動して一度だけ再試行する。
+        """
+        for attempt in range(2):
+            browser = await self._ensure_browser()
+            try:
+                await _render_page_async(
+                    browser,
+                    html_content,
+                    output_path,
+                    self._ready_timeout_ms,
+                    self._font_cache,
+                )
+                break
+            except Exception:
+                if browser.is_connected():
+                    raise
+                logger.warning("Chromiumのクラッシュを検知 - ブラウザを再起動します")
+                async with self._lock:
+                    if self._browser is browser:
+                        await self._close_browser()
+                if attempt == 1:
+                    raise
+
+        async with self._lock:
+            self._render_count += 1
+            if self._render_count >= self._max_renders and self._browser is browser:
+                # 他のコルーチンが使用中のコンテキストごと閉じないよう、新しいブラウザに差し替える
+                logger.info("レンダリング%d回に達したためブラウザを再起動します", self._render_count)
+                self._browser = None
+                task = asyncio.create_task(_close_when_idle(browser))
+                self._retiring.add(task)
+                task.add_done_callback(self._retiring.discard)
+
+    async def close(self) -> None:
+        """ブラウザとPlaywrightを終了する。"""
+        if self._retiring:
+            await asyncio.gather(*self._retiring)
+        async with self._lock:
+            await self._close_browser()
+            if self._playwright is not None:
+                try:
+                    await self._playwright.stop()
+                except Exception as e:
+                    logger.warning("Playwrightの終了に失敗: %s", e)
+                self._playwright = None
+
+    async def __aenter__(self) -> "AsyncBrowserRenderer":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    async def _ensure_browser(self) -> AsyncBrowser:
+        async with self._lock:
+            if self._browser is not None and self._browser.is_connected():
+                return self._browser
+
+            await self._close_browser()
+            if self._playwright is None:
+                self._playwright = await async_playwright().start()
+            self._browser = await self._playwright.chromium.launch(headless=True)
+            self._render_count = 0
+            logger.info("Chromiumを起動しました")
+            return self._browser
+
+    async def _close_browser(self) -> None:
+        if self._browser is None:
+            return
+        try:
+            await self._browser.close()
+        except Exception as e:
+            logger.warning("Chromiumの終了に失敗: %s", e)
+        self._browser = None
+
+
+async def _close_when_idle(browser: AsyncBrowser, timeout_seconds: float = 60.0) -> None:
+    """使用中のコンテキストがなくなってから（最大 timeout_seconds 秒待って）ブラウザを閉じる。"""
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout_seconds
+    while browser.contexts and loop.time() < deadline:
+        await asyncio.sleep(0.5)
+    try:
+        await browser.close()
+    except Exception as e:
+        logger.warning("Chromiumの終了に失敗: %s", e)
+
+
+def get_default_renderer() -> BrowserRenderer:
+    """現在のスレッド用の共有レンダラーを返す。初回呼び出し時に生成する。"""
+    renderer = getattr(_thread_local, "renderer", None)
+    if renderer is None:
+        renderer = BrowserRenderer()
+        _thread_local.renderer = renderer
+    return renderer
+
+
+def close_default_renderer() -> None:
+    """現在のスレッド用の共有レンダラーを終了する。"""
+    renderer = getattr(_thread_local, "renderer", None)
+    if renderer is not None:
+        renderer.close()
+        _thread_local.renderer = None
+
 
 def generate_infographic(
     html_content: str,
     video_title: str,
+    renderer: Optional[BrowserRenderer] = None,
+    output_dir: Optional[str] = None,
 ) -> str:
     """Geminiが生成したHTMLからインフォグラフィック画像（PNG）を生成する。
 
     Args:
         html_content: Geminiが生成した完全なHTMLドキュメント
         video_title: ログ用の動画タイトル
+        renderer: 使用するレンダラー。省略時は現在のスレッドの共有レンダラーを使う
+        output_dir: 画像を保存するディレクトリ。省略時はOSの一時ディレクトリ
 
     Returns:
-        生成されたPNG画像のファイルパス（一時ファイル）
+        生成されたPNG画像のファイルパス（一時ファイル、output_dir 指定時は output_dir 以下のパス）
+
+    Raises:
+        ImageGenerationError: 画像生成に失敗した場合
+    """
+    try:
+        tmp = tempfile.NamedTemporaryFile(
+            suffix=".png", prefix="yt_summary_", dir=output_dir, delete=False
+        )
+        tmp.close()
+        output_path = _output_path(tmp.name, output_dir)
+
+        if renderer is None:
+            renderer = get_default_renderer()
+        renderer.render(html_content, output_path)
+
+        file_size = Path(output_path).stat().st_size
+        logger.info(
+            "インフォグラフィック生成完了 - 動画「%s」 (%.1f KB)",
+            video_title,
+            file_size / 1024,
+        )
+        return output_path
+
+    except ImageGenerationError:
+        raise
+    except Exception as e:
+        raise ImageGenerationError(
+            f"インフォグラフィック生成失敗: {video_title}: {e}"
+        ) from e
+
+
+async def generate_infographic_async(
+    html_content: str,
+    video_title: str,
+    renderer: AsyncBrowserRenderer,
+    output_dir: Optional[str] = None,
+) -> str:
+    """generate_infographic の asyncio 版。
 
     Raises:
         ImageGenerationError: 画像生成に失敗した場合
     """
     try:
         tmp = tempfile.NamedTemporaryFile(
-            suffix=".png", prefix="yt_summary_", delete=False
+            suffix=".png", prefix="yt_summary_", dir=output_dir, delete=False
         )
         tmp.close()
-        output_path = tmp.name
+        output_path = _output_path(tmp.name, output_dir)
 
-        _render_html_to_png(html_content, output_path)
+        await renderer.render(html_content, output_path)
 
         file_size = Path(output_path).stat().st_size
         logger.info(
@@ -53,6 +412,169 @@ def generate_infographic(
         ) from e
 
 
+def _output_path(path: str, output_dir: Optional[str]) -> str:
+    # 保存先を指定した場合は、ジョブファイルに記録して別の環境でも使えるよう指定どおりのパスにする
+    if output_dir is None:
+        return path
+    return os.path.join(output_dir, os.path.basename(path))
+
+
+def generate_infographics(
+    items: list[tuple[str, str]],
+    max_concurrency: Optional[int] = None,
+) -> list[Union[str, ImageGenerationError]]:
+    """複数のHTMLからインフォグラフィック画像（PNG）を並列に生成する。
+
+    RenderPool を一時的に起動して一括で生成する。1件の失敗は他の生成に影響しない。
+
+    Args:
+        items: (HTMLドキュメント, ログ用の動画タイトル) のリスト
+        max_concurrency: 同時に起動するワーカープロセス数の上限。
+            省略時はCPU数と空きメモリから決める
+
+    Returns:
+        入力と同じ順序の、PNG画像のファイルパスまたは ImageGenerationError のリスト
+    """
+    if not items:
+        return []
+
+    if max_concurrency is None:
+        max_concurrency = default_render_concurrency()
+    workers = max(1, min(max_concurrency, len(items)))
+
+    if workers > 1:
+        logger.info("インフォグラフィック並列生成開始 - %d件 (ワーカー数: %d)", len(items), workers)
+    with RenderPool(workers) as pool:
+        return pool.map(items)
+
+
+class RenderPool:
+    """インフォグラフィックの生成をワーカープロセスに分散する上限付きのプール。
+
+    ワーカープロセスごとにChromiumを1つ起動し、プロセス内で使い回す。
+    同時実行数（起動するブラウザ数）の省略時はCPU数と空きメモリから決める。
+    同時実行数が1の場合はワーカープロセスを使わず、呼び出し元のスレッドで生成する。
+    render() は複数のスレッドから同時に呼んでよい。
+    """
+
+    def __init__(self, max_workers: Optional[int] = None):
+        if max_workers is None:
+            max_workers = default_render_concurrency()
+        self.max_workers = max(1, max_workers)
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def render(
+        self, html_content: str, video_title: str, output_dir: Optional[str] = None
+    ) -> str:
+        """HTMLからインフォグラフィック画像（PNG）を生成し、ファイルパスを返す。
+
+        Args:
+            output_dir: 画像を保存するディレクトリ。省略時はOSの一時ディレクトリ
+
+        Raises:
+            ImageGenerationError: 画像生成に失敗した場合
+        """
+        if self.max_workers == 1:
+            return generate_infographic(html_content, video_title, output_dir=output_dir)
+        result = self._wait(self._submit(html_content, video_title, output_dir), video_title)
+        if isinstance(result, ImageGenerationError):
+            raise result
+        return result
+
+    def map(self, items: list[tuple[str, str]]) -> list[Union[str, ImageGenerationError]]:
+        """複数のHTMLから並列に画像を生成する。1件の失敗は他の生成に影響しない。
+
+        Returns:
+            入力と同じ順序の、PNG画像のファイルパスまたは ImageGenerationError のリスト
+        """
+        if self.max_workers == 1:
+            return [_generate_or_error(html, title) for html, title in items]
+        submitted = [self._submit(html, title) for html, title in items]
+        return [self._wait(each, title) for each, (_, title) in zip(submitted, items)]
+
+    def close(self) -> None:
+        """ワーカープロセスを終了する（各プロセスのブラウザも閉じる）。"""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown()
+
+    def __enter__(self) -> "RenderPool":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _submit(
+        self, html_content: str, video_title: str, output_dir: Optional[str] = None
+    ) -> tuple[ProcessPoolExecutor, Future]:
+        with self._lock:
+            if self._executor is None:
+                logger.info("画像生成ワーカー起動 - ワーカー数: %d", self.max_workers)
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    # Playwrightのスレッドを引き継がないよう fork ではなく spawn で起動する
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_render_worker,
+                )
+            executor = self._executor
+            return executor, executor.submit(
+                _generate_or_error, html_content, video_title, output_dir
+            )
+
+    def _wait(
+        self, submitted: tuple[ProcessPoolExecutor, Future], video_title: str
+    ) -> Union[str, ImageGenerationError]:
+        executor, future = submitted
+        try:
+            return future.result()
+        except BrokenProcessPool as e:
+            # 異常終了したプールは使えないため破棄し、次の生成で起動し直す
+            with self._lock:
+                if self._executor is executor:
+                    self._executor = None
+            executor.shutdown(wait=False)
+            return ImageGenerationError(
+                f"インフォグラフィック生成失敗(ワーカー異常終了): {video_title}: {e}"
+            )
+
+
+def default_render_concurrency() -> int:
+    """CPU数と空きメモリから並列レンダリングの同時実行数を決める。"""
+    cpu_count = os.cpu_count() or 1
+    available_mb = _available_memory_mb()
+    if available_mb is None:
+        return max(1, min(cpu_count, 2))
+    return max(1, min(cpu_count, available_mb // BROWSER_MEMORY_MB))
+
+
+def _available_memory_mb() -> Optional[int]:
+    """利用可能なメモリ量（MB）を返す。取得できない環境ではNoneを返す。"""
+    try:
+        with open("/proc/meminfo", encoding="ascii") as f:
+            for line in f:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) // 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    return None
+
+
+def _init_render_worker() -> None:
+    """ワーカープロセス終了時にブラウザを閉じるよう登録する。"""
+    atexit.register(close_default_renderer)
+
+
+def _generate_or_error(
+    html_content: str, video_title: str, output_dir: Optional[str] = None
+) -> Union[str, ImageGenerationError]:
+    try:
+        return generate_infographic(html_content, video_title, output_dir=output_dir)
+    except ImageGenerationError as e:
+        return e
+
+
 def cleanup_temp_image(image_path: str) -> None:
     """一時画像ファイルを削除する。"""
     try:
@@ -64,20 +586,180 @@ def cleanup_temp_image(image_path: str) -> None:
         logger.warning("一時画像ファイルの削除に失敗: %s: %s", image_path, e)
 
 
-def _render_html_to_png(html_content: str, output_path: str) -> None:
-    """PlaywrightでHTMLをレンダリングしPNGスクリーンショットを取得する。"""
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=True)
-        page = browser.new_page(
-            viewport={"width": VIEWPORT_WIDTH, "height": 800},
-            device_scale_factor=DEVICE_SCALE_FACTOR,
-        )
-        page.set_content(html_content, wait_until="networkidle")
+def _render_page(
+    browser: Browser,
+    html_content: str,
+    output_path: str,
+    ready_timeout_ms: int = DEFAULT_READY_TIMEOUT_MS,
+    font_cache: Optional[FontCache] = None,
+) -> None:
+    """新しいブラウザコンテキストでHTMLをレンダリングしPNGスクリーンショットを取得する。"""
+    context = browser.new_context(
+        viewport={"width": VIEWPORT_WIDTH, "height": 800},
+        device_scale_factor=DEVICE_SCALE_FACTOR,
+    )
+    try:
+        if font_cache is not None:
+            context.route("**/*", lambda route: _handle_route(route, font_cache))
+        page = context.new_page()
+        page.set_content(html_content, wait_until="domcontentloaded")
 
-        # Google Fontsの読み込み待ち
-        page.wait_for_timeout(2000)
+        # ネットワーク・Google Fonts・レイアウトが落ち着くまで待つ
+        _wait_until_ready(page, ready_timeout_ms)
 
         # ページ全体をフルページスクリーンショット
         page.screenshot(path=output_path, full_page=True)
+    finally:
+        try:
+            context.close()
+        except Exception as e:
+            # クラッシュ時はコンテキストを閉じられないため、元の例外を優先する
+            logger.debug("ブラウザコンテキストの終了に失敗: %s", e)
+
+
+def _handle_route(route: Route, font_cache: FontCache) -> None:
+    """Google Fontsはキャッシュから配信し、それ以外の外部リクエストは遮断する。"""
+    url = route.request.url
+    parsed = urlparse(url)
+    if parsed.scheme not in ("http", "https"):
+        route.continue_()
+        return
+    if parsed.hostname not in FONT_HOSTS:
+        logger.debug("外部リクエストを遮断: %s", url)
+        route.abort()
+        return
+
+    cached = font_cache.get(url)
+    if cached is not None:
+        body, content_type = cached
+        route.fulfill(
+            status=200,
+            body=body,
+            headers={
+                "Content-Type": content_type,
+                # CSSから読み込まれるフォントファイルはCORSヘッダが必要
+                "Access-Control-Allow-Origin": "*",
+            },
+        )
+        return
+
+    try:
+        response = route.fetch()
+    except Exception as e:
+        logger.warning("フォントの取得に失敗: %s: %s", url, e)
+        route.abort()
+        return
+
+    if response.ok:
+        font_cache.put(url, response.body(), response.headers.get("content-type", ""))
+        logger.info("フォントをキャッシュに保存: %s", url)
+    route.fulfill(response=response)
+
+
+def _wait_until_ready(page: Page, timeout_ms: int) -> float:
+    """ネットワークアイドル・フォント読み込み完了・レイアウト安定を待つ。
+
+    上限時間を超えた場合は警告を出してそのまま続行する（描画途中でも撮影する）。
+
+    Returns:
+        待機した秒数
+    """
+    start = time.monotonic()
+    deadline = start + timeout_ms / 1000
+    try:
+        page.wait_for_load_state("networkidle", timeout=timeout_ms)
+        remaining_ms = max(1, int((deadline - time.monotonic()) * 1000))
+        page.wait_for_function(_READY_SCRIPT, polling=READY_POLLING_MS, timeout=remaining_ms)
+    except PlaywrightTimeoutError:
+        logger.warning("描画完了の待機が上限(%dms)に達したため撮影します", timeout_ms)
+
+    waited = time.monotonic() - start
+    logger.info("描画完了待機: %.0fms", waited * 1000)
+    return waited
+
+
+async def _render_page_async(
+    browser: AsyncBrowser,
+    html_content: str,
+    output_path: str,
+    ready_timeout_ms: int = DEFAULT_READY_TIMEOUT_MS,
+    font_cache: Optional[FontCache] = None,
+) -> None:
+    """_render_page の asyncio 版。"""
+    context = await browser.new_context(
+        viewport={"width": VIEWPORT_WIDTH, "height": 800},
+        device_scale_factor=DEVICE_SCALE_FACTOR,
+    )
+    try:
+        if font_cache is not None:
+            await context.route("**/*", lambda route: _handle_route_async(route, font_cache))
+        page = await context.new_page()
+        await page.set_content(html_content, wait_until="domcontentloaded")
+
+        await _wait_until_ready_async(page, ready_timeout_ms)
+
+        await page.screenshot(path=output_path, full_page=True)
+    finally:
+        try:
+            await context.close()
+        except Exception as e:
+            logger.debug("ブラウザコンテキストの終了に失敗: %s", e)
+
+
+async def _handle_route_async(route: AsyncRoute, font_cache: FontCache) -> None:
+    """_handle_route の asyncio 版。"""
+    url = route.request.url
+    parsed = urlparse(url)
+    if parsed.scheme not in ("http", "https"):
+        await route.continue_()
+        return
+    if parsed.hostname not in FONT_HOSTS:
+        logger.debug("外部リクエストを遮断: %s", url)
+        await route.abort()
+        return
+
+    # キャッシュはファイルI/Oのため、イベントループを止めないようスレッドで読み書きする
+    cached = await asyncio.to_thread(font_cache.get, url)
+    if cached is not None:
+        body, content_type = cached
+        await route.fulfill(
+            status=200,
+            body=body,
+            headers={
+                "Content-Type": content_type,
+                "Access-Control-Allow-Origin": "*",
+            },
+        )
+        return
+
+    try:
+        response = await route.fetch()
+    except Exception as e:
+        logger.warning("フォントの取得に失敗: %s: %s", url, e)
+        await route.abort()
+        return
+
+    if response.ok:
+        await asyncio.to_thread(
+            font_cache.put, url, await response.body(), response.headers.get("content-type", "")
+        )
+        logger.info("フォントをキャッシュに保存: %s", url)
+    await route.fulfill(response=response)
+
+
+async def _wait_until_ready_async(page: AsyncPage, timeout_ms: int) -> float:
+    """_wait_until_ready の asyncio 版。"""
+    start = time.monotonic()
+    deadline = start + timeout_ms / 1000
+    try:
+        await page.wait_for_load_state("networkidle", timeout=timeout_ms)
+        remaining_ms = max(1, int((deadline - time.monotonic()) * 1000))
+        await page.wait_for_function(
+            _READY_SCRIPT, polling=READY_POLLING_MS, timeout=remaining_ms
+        )
+    except AsyncPlaywrightTimeoutError:
+        logger.warning("描画完了の待機が上限(%dms)に達したため撮影します", timeout_ms)
 
-        browser.close()
+    waited = time.monotonic() - start
+    logger.info("描画完了待機: %.0fms", waited * 1000)
+    return waited
@@ -0,0 +1,211 @@
+import json
+import logging
+import os
+import tempfile
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Iterable, Optional
+
+from src.models import JobRecord, VideoEntry
+
+logger = logging.getLogger(__name__)
+
+# 動画ごとの処理段階（この順に進む）
+DISCOVERED = "discovered"   # RSSで未通知の動画として検出
+FILTERED = "filtered"       # Shorts・ライブ・公開日時のフィルタを通過
+SUMMARIZED = "summarized"   # 要約HTMLを生成（HTMLは要約キャッシュに保存）
+RENDERED = "rendered"       # インフォグラフィック画像を生成
+POSTED = "posted"           # Discordへの通知が完了
+SKIPPED = "skipped"         # 通知せずに完了扱い（トークン上限超過など）
+
+STAGES = (DISCOVERED, FILTERED, SUMMARIZED, RENDERED, POSTED, SKIPPED)
+FINISHED_STAGES = (POSTED, SKIPPED)
+
+# 同じジョブの要約・画像生成がこの回数失敗したら再開をやめて完了扱いにする
+# （Discord・ネットワークの一時的な障害は数えない）
+DEFAULT_MAX_FAILURES = 3
+
+
+class JobStore:
+    """動画ごとの処理段階を永続化するジョブストア。
+
+    段階が進むたびにファイルへ書き出す（一時ファイルに書いてから置き換える）ため、
+    実行が途中で中断されても完了済みの段階は失われない。次回起動時は
+    未完了のジョブを途中の段階から再開し、通知済み・完了扱いのジョブは
+    履歴に反映してから削除する。
+    """
+
+    def __init__(self, data_path: str = "data/jobs.json"):
+        self._path = Path(data_path)
+        self._jobs: dict[str, dict] = {}
+        self._lock = threading.Lock()
+
+    def load(self) -> None:
+        """ジョブファイルを読み込む。存在しない・破損している場合は空で初期化する。"""
+        if not self._path.exists():
+            self._jobs = {}
+            return
+
+        try:
+            with open(self._path, encoding="utf-8") as f:
+                data = json.load(f)
+            self._jobs = data.get("jobs", {})
+            logger.info("ジョブファイル読み込み完了 - ジョブ数: %d", len(self._jobs))
+        except (json.JSONDecodeError, AttributeError) as e:
+            logger.warning("ジョブファイルが破損しています。空の状態で初期化します: %s", e)
+            self._jobs = {}
+
+    def discover(self, videos: list[VideoEntry]) -> list[VideoEntry]:
+        """未登録の動画を discovered 段階で登録する。
+
+        Returns:
+            新たに登録した動画（登録済みの動画は含まない）
+        """
+        with self._lock:
+            added = [v for v in videos if v.video_id not in self._jobs]
+            for video in added:
+                self._jobs[video.video_id] = {
+                    "video": _video_to_dict(video),
+                    "stage": DISCOVERED,
+                    "updated_at": _now(),
+                }
+            if added:
+                self._checkpoint()
+        return added
+
+    def advance(
+        self,
+        video_id: str,
+        stage: str,
+        image_path: Optional[str] = None,
+    ) -> None:
+        """ジョブの段階を進めて書き出す。記録済みの段階より前には戻さない。"""
+        if stage not in STAGES:
+            raise ValueError(f"不明な処理段階です: {stage}")
+        with self._lock:
+            entry = self._jobs.get(video_id)
+            if entry is None:
+                logger.warning("ジョブが登録されていません: %s", video_id)
+                return
+            if STAGES.index(stage) < STAGES.index(entry.get("stage", DISCOVERED)):
+                return
+            entry["stage"] = stage
+            entry["updated_at"] = _now()
+            if image_path is not None:
+                entry["image_path"] = image_path
+            self._checkpoint()
+
+    def record_failure(self, video_id: str) -> int:
+        """ジョブの失敗回数を加算して書き出す。
+
+        Returns:
+            加算後の失敗回数（ジョブが登録されていない場合は0）
+        """
+        with self._lock:
+            entry = self._jobs.get(video_id)
+            if entry is None:
+                return 0
+            entry["failures"] = int(entry.get("failures", 0)) + 1
+            self._checkpoint()
+            return entry["failures"]
+
+    def discard(self, video_ids: Iterable[str]) -> None:
+        """ジョブを削除して書き出す。"""
+        with self._lock:
+            removed = [vid for vid in video_ids if self._jobs.pop(vid, None) is not None]
+            if removed:
+                self._checkpoint()
+
+    def discard_published_before(self, cutoff: datetime) -> int:
+        """公開日時が cutoff より前の未完了ジョブを削除する。
+
+        Returns:
+            削除したジョブ数
+        """
+        stale = [
+            job.video.video_id
+            for job in self.unfinished()
+            if job.video.published < cutoff
+        ]
+        self.discard(stale)
+        if stale:
+            logger.info("古い未完了ジョブを%d件削除しました", len(stale))
+        return len(stale)
+
+    def unfinished(self) -> list[JobRecord]:
+        """未完了のジョブを登録順に返す。"""
+        return [job for job in self._records() if job.stage not in FINISHED_STAGES]
+
+    def finished(self) -> list[JobRecord]:
+        """通知済み・完了扱いのジョブを返す。"""
+        return [job for job in self._records() if job.stage in FINISHED_STAGES]
+
+    def get(self, video_id: str) -> Optional[JobRecord]:
+        with self._lock:
+            entry = self._jobs.get(video_id)
+            return _entry_to_record(entry) if entry is not None else None
+
+    def __contains__(self, video_id: str) -> bool:
+        with self._lock:
+            return video_id in self._jobs
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._jobs)
+
+    def _records(self) -> list[JobRecord]:
+        with self._lock:
+            entries = list(self._jobs.values())
+        records = []
+        for entry in entries:
+            try:
+                records.append(_entry_to_record(entry))
+            except (KeyError, TypeError, ValueError) as e:
+                logger.warning("ジョブの形式が不正なため無視します: %s", e)
+        return records
+
+    def _checkpoint(self) -> None:
+        """ジョブをファイルに書き出す。呼び出し元でロックを取得していること。"""
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self._path.parent, prefix=".tmp_")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump({"jobs": self._jobs}, f, ensure_ascii=False, indent=2)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self._path)
+        except BaseException:
+            Path(tmp_path).unlink(missing_ok=True)
+            raise
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+def _video_to_dict(video: VideoEntry) -> dict:
+    return {
+        "video_id": video.video_id,
+        "title": video.title,
+        "url": video.url,
+        "published": video.published.isoformat(),
+        "channel_id": video.channel_id,
+    }
+
+
+def _entry_to_record(entry: dict) -> JobRecord:
+    video = entry["video"]
+    return JobRecord(
+        video=VideoEntry(
+            video_id=video["video_id"],
+            title=video["title"],
+            url=video["url"],
+            published=datetime.fromisoformat(video["published"]),
+            channel_id=video["channel_id"],
+        ),
+        stage=entry["stage"],
+        updated_at=entry.get("updated_at", ""),
+        image_path=entry.get("image_path"),
+        failures=int(entry.get("failures", 0)),
+    )
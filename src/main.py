@@ -1,12 +1,23 @@
+import asyncio
 import logging
 import os
 import sys
+import threading
 import time
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Optional, Union
 
+import aiohttp
+import requests
 from dotenv import load_dotenv
 
 from src.config_loader import load_config
-from src.discord_notifier import send_error_notification, send_image_notification
+from src.discord_notifier import (
+    send_error_notification,
+    send_error_notification_async,
+    send_image_notification,
+    send_image_notification_async,
+)
 from src.exceptions import (
     ConfigError,
     DiscordNotifyError,
@@ -14,13 +25,38 @@ from src.exceptions import (
     RateLimitError,
     RSSFetchError,
     SummarizerError,
+    SummarizerUnavailableError,
     TokenLimitError,
 )
-from src.image_generator import cleanup_temp_image, generate_infographic
-from src.history_manager import HistoryManager
-from src.rss_checker import fetch_feed
-from src.summarizer import summarize
-from src.video_filter import filter_videos
+from src.feed_cache import FeedCache
+from src.image_generator import (
+    AsyncBrowserRenderer,
+    RenderPool,
+    cleanup_temp_image,
+    close_default_renderer,
+    generate_infographic_async,
+)
+from src.history_manager import HistoryBackend, create_history_manager
+from src.http_client import create_async_session, create_session
+from src.job_store import (
+    DEFAULT_MAX_FAILURES,
+    DISCOVERED,
+    FILTERED,
+    POSTED,
+    RENDERED,
+    SKIPPED,
+    SUMMARIZED,
+    JobStore,
+)
+from src.models import AppSettings, ChannelConfig, FilterStats, VideoEntry, VideoJob
+from src.oembed_cache import OEmbedCache
+from src.pipeline import AsyncStagedPipeline, Stage, StagedPipeline
+from src.poll_scheduler import PollScheduler
+from src.rss_checker import fetch_feeds, fetch_feeds_async
+from src.sharding import Shard, import_history, resolve_shard, shard_settings
+from src.summarizer import MODEL, RateLimiter, summarize, summarize_async
+from src.summary_cache import SummaryCache
+from src.video_filter import filter_videos, filter_videos_async
 
 logging.basicConfig(
     level=logging.INFO,
@@ -30,20 +66,775 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
-def main() -> None:
-    """メイン処理フロー。
+# 失敗が続いた動画の処理を打ち切った際のエラー通知の見出し
+GIVE_UP_TITLE = f"\u26a0\ufe0f {DEFAULT_MAX_FAILURES}回失敗したため通知を打ち切り"
 
-    1. 環境変数の検証
-    2. 設定読み込み
-    3. 履歴読み込み
-    4. チャンネルごとにRSS取得 → フィルタ → 要約 → 通知
-    5. 古いエントリの削除
-    6. 履歴保存
+
+def _counts_as_failure(error: Exception) -> bool:
+    """動画ごとに再現する失敗（要約・画像生成）かどうか。打ち切りまでの回数に数える。"""
+    if isinstance(error, (RateLimitError, TokenLimitError, SummarizerUnavailableError)):
+        return False
+    return isinstance(error, (SummarizerError, ImageGenerationError))
+
+
+class VideoProcessor:
+    """新着動画の要約 → 画像生成 → Discord通知の各段の処理とエラー処理。
+
+    各段は StagedPipeline のワーカースレッドから並行に呼ばれる。
+    *_async のメソッドは AsyncStagedPipeline で1つのイベントループ上から呼ばれる。
+    """
+
+    def __init__(
+        self,
+        settings: AppSettings,
+        history: HistoryBackend,
+        gemini_api_key: str,
+        discord_webhook_url: str,
+        http_session: Optional[requests.Session],
+        rate_limiter: RateLimiter,
+        summary_cache: Optional[SummaryCache] = None,
+        job_store: Optional[JobStore] = None,
+        render_pool: Optional[RenderPool] = None,
+        image_dir: Optional[str] = None,
+    ):
+        self._settings = settings
+        self._history = history
+        self._gemini_api_key = gemini_api_key
+        self._discord_webhook_url = discord_webhook_url
+        self._http_session = http_session
+        self._rate_limiter = rate_limiter
+        self._summary_cache = summary_cache
+        self._job_store = job_store
+        self._render_pool = render_pool or RenderPool(settings.render_concurrency)
+        self._image_dir = image_dir
+        self._rate_limited = threading.Event()
+        self._in_flight: set[str] = set()
+        self._lock = threading.Lock()
+
+    @property
+    def rate_limited(self) -> bool:
+        """レートリミット超過により、以降の要約を打ち切ったかどうか"""
+        return self._rate_limited.is_set()
+
+    @property
+    def history_lock(self) -> threading.Lock:
+        """履歴の更新を通知段のワーカーと排他するロック"""
+        return self._lock
+
+    def reset_rate_limit(self) -> None:
+        """レートリミットによる打ち切りを解除する（常駐モードで次の周期から再開する）。
+
+        サーバーから指示された待機（1日の上限超過など）が残っている間は解除しない。
+        """
+        remaining = self._rate_limiter.deferred_seconds()
+        if remaining > 0:
+            if self._rate_limited.is_set():
+                logger.info("レートリミット中のため要約を再開しません（残り%.0f秒）", remaining)
+            return
+        self._rate_limited.clear()
+
+    def submit(self, pipeline: StagedPipeline, job: VideoJob) -> bool:
+        """パイプラインに動画を投入する。レートリミット中・処理中の動画は投入しない。
+
+        Returns:
+            投入したかどうか
+        """
+        if not self._reserve(job):
+            return False
+        pipeline.submit(job)
+        return True
+
+    async def submit_async(self, pipeline: AsyncStagedPipeline, job: VideoJob) -> bool:
+        """submit の asyncio 版。"""
+        if not self._reserve(job):
+            return False
+        await pipeline.submit(job)
+        return True
+
+    def _reserve(self, job: VideoJob) -> bool:
+        """投入できる動画を処理中として記録する。"""
+        video_id = job.video.video_id
+        # レートリミット中の動画はジョブストアに残し、次回（次の周期）に再開する
+        if self.rate_limited:
+            logger.warning("レートリミット中のためスキップ: %s", job.video.title)
+            return False
+        with self._lock:
+            if video_id in self._in_flight:
+                return False
+            self._in_flight.add(video_id)
+        return True
+
+    def build_pipeline(self) -> StagedPipeline:
+        """要約・画像生成・通知の3段パイプラインを生成する。"""
+        return StagedPipeline(
+            [
+                Stage("summarize", self.summarize, self._settings.summarize_concurrency),
+                Stage(
+                    "render",
+                    self.render,
+                    # 画像生成のワーカープロセス数（起動するブラウザ数）だけ並行に待つ
+                    self._render_pool.max_workers,
+                    # ワーカープロセスを使わない場合に画像生成スレッドで起動したブラウザを終了する
+                    on_worker_exit=close_default_renderer,
+                ),
+                Stage("notify", self.notify, self._settings.notify_concurrency),
+            ],
+            queue_size=self._settings.pipeline_queue_size,
+            on_error=self.on_error,
+        )
+
+    def build_async_pipeline(
+        self,
+        session: aiohttp.ClientSession,
+        renderer: AsyncBrowserRenderer,
+    ) -> AsyncStagedPipeline:
+        """build_pipeline の asyncio 版。各段は同時実行数の数だけタスクで処理する。"""
+        return AsyncStagedPipeline(
+            [
+                Stage(
+                    "summarize",
+                    lambda job: self.summarize_async(job, session),
+                    self._settings.summarize_concurrency,
+                ),
+                Stage(
+                    "render",
+                    lambda job: self.render_async(job, renderer),
+                    self._render_pool.max_workers,
+                ),
+                Stage(
+                    "notify",
+                    lambda job: self.notify_async(job, session),
+                    self._settings.notify_concurrency,
+                ),
+            ],
+            queue_size=self._settings.pipeline_queue_size,
+            on_error=lambda stage_name, job, error: self.on_error_async(
+                stage_name, job, error, session
+            ),
+        )
+
+    def summarize(self, job: VideoJob) -> VideoJob:
+        if self._use_cached_summary(job):
+            return job
+        job.html_content = summarize(
+            video_url=job.video.url,
+            prompt_template=job.prompt_template,
+            api_key=self._gemini_api_key,
+            max_length=self._settings.max_summary_length,
+            session=self._http_session,
+            rate_limiter=self._rate_limiter,
+        )
+        self._store_summary(job)
+        return job
+
+    async def summarize_async(self, job: VideoJob, session: aiohttp.ClientSession) -> VideoJob:
+        # キャッシュの読み書き・ジョブストアの書き出し（fsync）はイベントループを止めないよう別スレッドで行う
+        if await asyncio.to_thread(self._use_cached_summary, job):
+            return job
+        job.html_content = await summarize_async(
+            video_url=job.video.url,
+            prompt_template=job.prompt_template,
+            api_key=self._gemini_api_key,
+            session=session,
+            max_length=self._settings.max_summary_length,
+            rate_limiter=self._rate_limiter,
+        )
+        await asyncio.to_thread(self._store_summary, job)
+        return job
+
+    def _use_cached_summary(self, job: VideoJob) -> bool:
+        """生成済みの画像・HTMLがあれば要約を省いてTrueを返す（HTMLはジョブに設定する）。
+
+        Raises:
+            RateLimitError: キャッシュがなく、レートリミット中の場合
+        """
+        # 前回の実行で画像まで生成済みであれば、要約キャッシュの有無によらず要約は不要
+        if job.image_path and os.path.exists(job.image_path):
+            return True
+        # 前回の実行で生成済みのHTMLがあればGemini APIを呼ばない
+        if self._summary_cache is not None:
+            cached = self._summary_cache.get(job.video.video_id, job.prompt_template, MODEL)
+            if cached is not None:
+                logger.info("要約キャッシュを使用: %s", job.video.title)
+                job.html_content = cached
+                self._advance(job, SUMMARIZED)
+                return True
+
+        if self.rate_limited:
+            raise RateLimitError("レートリミット中のためスキップ")
+        return False
+
+    def _store_summary(self, job: VideoJob) -> None:
+        if self._summary_cache is not None:
+            self._summary_cache.put(
+                job.video.video_id,
+                job.channel.channel_id,
+                job.prompt_template,
+                MODEL,
+                job.html_content,
+            )
+        self._advance(job, SUMMARIZED)
+
+    def render(self, job: VideoJob) -> VideoJob:
+        if self._has_rendered_image(job):
+            return job
+        job.image_path = self._render_pool.render(
+            job.html_content, job.video.title, output_dir=self._image_dir
+        )
+        self._advance(job, RENDERED, image_path=job.image_path)
+        return job
+
+    async def render_async(self, job: VideoJob, renderer: AsyncBrowserRenderer) -> VideoJob:
+        if self._has_rendered_image(job):
+            return job
+        job.image_path = await generate_infographic_async(
+            html_content=job.html_content,
+            video_title=job.video.title,
+            renderer=renderer,
+            output_dir=self._image_dir,
+        )
+        await asyncio.to_thread(self._advance, job, RENDERED, image_path=job.image_path)
+        return job
+
+    def _has_rendered_image(self, job: VideoJob) -> bool:
+        # 前回の実行で生成した画像が残っていれば再利用する
+        if job.image_path and os.path.exists(job.image_path):
+            logger.info("生成済みの画像を使用: %s", job.video.title)
+            return True
+        return False
+
+    def notify(self, job: VideoJob) -> None:
+        try:
+            send_image_notification(
+                webhook_url=self._discord_webhook_url,
+                video=job.video,
+                channel_name=job.channel.name,
+                image_path=job.image_path,
+                session=self._http_session,
+            )
+        finally:
+            cleanup_temp_image(job.image_path)
+        self._complete(job)
+
+    async def notify_async(self, job: VideoJob, session: aiohttp.ClientSession) -> None:
+        try:
+            await send_image_notification_async(
+                webhook_url=self._discord_webhook_url,
+                video=job.video,
+                channel_name=job.channel.name,
+                image_path=job.image_path,
+                session=session,
+            )
+        finally:
+            cleanup_temp_image(job.image_path)
+        await asyncio.to_thread(self._complete, job)
+
+    def _complete(self, job: VideoJob) -> None:
+        # 通知成功 → ジョブを完了として書き出してから履歴に記録
+        self._advance(job, POSTED)
+        with self._lock:
+            self._history.mark_notified(job.video)
+            self._in_flight.discard(job.video.video_id)
+
+    def on_error(self, stage_name: str, job: VideoJob, error: Exception) -> None:
+        title = self._handle_error(stage_name, job, error)
+        if title is not None:
+            self._notify_error(title, job.channel, job.video, error)
+        if self._record_failure(job, error):
+            self._notify_error(GIVE_UP_TITLE, job.channel, job.video, error)
+
+    async def on_error_async(
+        self,
+        stage_name: str,
+        job: VideoJob,
+        error: Exception,
+        session: aiohttp.ClientSession,
+    ) -> None:
+        title = await asyncio.to_thread(self._handle_error, stage_name, job, error)
+        if title is not None:
+            await self._notify_error_async(title, job.channel, job.video, error, session)
+        if await asyncio.to_thread(self._record_failure, job, error):
+            await self._notify_error_async(GIVE_UP_TITLE, job.channel, job.video, error, session)
+
+    def _handle_error(self, stage_name: str, job: VideoJob, error: Exception) -> Optional[str]:
+        """エラーを記録し、Discordにエラー通知する場合はその見出しを返す。"""
+        video = job.video
+        with self._lock:
+            self._in_flight.discard(video.video_id)
+
+        if isinstance(error, TokenLimitError):
+            logger.warning("トークン上限超過のためスキップ: %s: %s", video.title, error)
+            self._skip(job)
+            return None
+
+        if isinstance(error, RateLimitError):
+            if self._rate_limited.is_set():
+                logger.warning("レートリミット中のためスキップ: %s", video.title)
+            else:
+                logger.warning("Gemini APIレートリミット: %s - 残りは次回実行時に処理", error)
+                self._rate_limited.set()
+        elif isinstance(error, SummarizerError):
+            logger.error("要約生成失敗: %s: %s", video.title, error)
+            return "\u26a0\ufe0f 要約生成エラー"
+        elif isinstance(error, ImageGenerationError):
+            logger.error("画像生成失敗: %s: %s", video.title, error)
+            return "\u26a0\ufe0f 画像生成エラー"
+        elif isinstance(error, DiscordNotifyError):
+            logger.error("Discord通知失敗: %s: %s", video.title, error)
+        else:
+            logger.exception("予期しないエラー(%s): %s: %s", stage_name, video.title, error)
+        return None
+
+    def _record_failure(self, job: VideoJob, error: Exception) -> bool:
+        """動画ごとに再現する失敗の回数を記録し、上限に達したら完了扱いにする。
+
+        Discord・ネットワーク・Gemini APIの一時的な障害は回数に数えず、
+        公開日時が保持期間を過ぎるまで次回以降に再開する。
+
+        Returns:
+            処理を打ち切った（通知せずに完了扱いにした）かどうか
+        """
+        if not _counts_as_failure(error) or self._job_store is None:
+            return False
+        failures = self._job_store.record_failure(job.video.video_id)
+        if failures < DEFAULT_MAX_FAILURES:
+            return False
+        logger.error("%d回失敗したため通知せずに処理を打ち切ります: %s", failures, job.video.title)
+        self._skip(job)
+        return True
+
+    def _skip(self, job: VideoJob) -> None:
+        """動画を通知せずに完了扱いにする。"""
+        self._advance(job, SKIPPED)
+        with self._lock:
+            self._history.mark_notified(job.video)
+
+    def _advance(self, job: VideoJob, stage: str, image_path: Optional[str] = None) -> None:
+        if self._job_store is not None:
+            self._job_store.advance(job.video.video_id, stage, image_path=image_path)
+
+    def _notify_error(
+        self, title: str, channel: ChannelConfig, video: VideoEntry, error: Exception
+    ) -> None:
+        try:
+            send_error_notification(
+                self._discord_webhook_url,
+                title,
+                self._error_detail(channel, video, error),
+                session=self._http_session,
+            )
+        except Exception:
+            pass
+
+    async def _notify_error_async(
+        self,
+        title: str,
+        channel: ChannelConfig,
+        video: VideoEntry,
+        error: Exception,
+        session: aiohttp.ClientSession,
+    ) -> None:
+        try:
+            await send_error_notification_async(
+                self._discord_webhook_url,
+                title,
+                self._error_detail(channel, video, error),
+                session=session,
+            )
+        except Exception:
+            pass
+
+    @staticmethod
+    def _error_detail(channel: ChannelConfig, video: VideoEntry, error: Exception) -> str:
+        return f"チャンネル: {channel.name}\n動画: {video.title}\n{error}"
+
+
+class Notifier:
+    """監視対象チャンネルの新着動画を検出し、パイプラインに投入する。
+
+    設定・履歴・ジョブストア・各キャッシュ・HTTPセッションを保持し、
+    1回実行（main）と常駐モード（src.daemon）の両方から使う。
+    *_async のメソッドは asyncio 版の1回実行（async_main）から使う。
     """
+
+    def __init__(
+        self,
+        channels: list[ChannelConfig],
+        settings: AppSettings,
+        gemini_api_key: str,
+        discord_webhook_url: str,
+        http_session: Optional[requests.Session],
+        data_dir: str = "data",
+    ):
+        self.settings = settings
+        self.channels_by_id = {channel.channel_id: channel for channel in channels}
+        self.http_session = http_session
+        self.filter_stats = FilterStats()
+
+        # 履歴の読み込み
+        self.history = create_history_manager(settings.history_backend, data_dir)
+        self.history.load()
+
+        # 動画ごとの処理段階を記録するジョブストア
+        self.job_store = JobStore(os.path.join(data_dir, "jobs.json"))
+        self.job_store.load()
+
+        # 条件付きGET用のフィード検証子と、チャンネルごとの処理済みの範囲（ウォーターマーク）
+        self.feed_cache = FeedCache(
+            os.path.join(data_dir, "feed_cache.json"),
+            watermark_window_seconds=settings.watermark_window_minutes * 60,
+        )
+        self.feed_cache.load()
+
+        # チャンネルごとの投稿頻度から決めるフィードの取得間隔
+        self.poll_scheduler = PollScheduler(
+            os.path.join(data_dir, "poll_schedule.json"),
+            min_interval_seconds=settings.min_poll_interval_minutes * 60,
+            max_interval_seconds=settings.max_poll_interval_minutes * 60,
+            default_interval_seconds=settings.check_interval_minutes * 60,
+        )
+        self.poll_scheduler.load()
+
+        # Shorts・ライブ判定用のoEmbedキャッシュ
+        self.oembed_cache = OEmbedCache(
+            os.path.join(data_dir, "oembed_cache.json"),
+            ttl_seconds=settings.oembed_cache_ttl_hours * 3600,
+            max_entries=settings.oembed_cache_max_entries,
+        )
+        self.oembed_cache.load()
+
+        # 生成済みHTMLのキャッシュ（画像生成・通知失敗時の再処理でGemini APIを再度呼ばない）
+        self.summary_cache = SummaryCache(
+            os.path.join(data_dir, "summary_cache"),
+            max_entries=settings.summary_cache_max_entries,
+            max_age_days=settings.summary_cache_max_age_days,
+        )
+        self.summary_cache.load()
+        self.summary_cache.invalidate_changed_prompts(
+            {channel.channel_id: self._prompt_for(channel) for channel in channels}
+        )
+
+        # 画像生成のワーカープロセス（同時実行数の省略時はCPU数と空きメモリから決める）
+        self.render_pool = RenderPool(settings.render_concurrency)
+        # 生成した画像は通知後に削除する。中断時に次回の実行で再利用できるよう
+        # OSの一時ディレクトリではなくデータディレクトリ（ワークフローのキャッシュ対象）に置く
+        image_dir = os.path.join(data_dir, "rendered")
+        os.makedirs(image_dir, exist_ok=True)
+
+        # 要約 → 画像生成 → 通知 を段ごとに並行処理するパイプラインの各段
+        self.processor = VideoProcessor(
+            settings=settings,
+            history=self.history,
+            gemini_api_key=gemini_api_key,
+            discord_webhook_url=discord_webhook_url,
+            http_session=http_session,
+            # Gemini APIのリクエスト数・トークン数の毎分上限を守るレートリミッター
+            rate_limiter=RateLimiter(
+                requests_per_minute=settings.gemini_requests_per_minute,
+                tokens_per_minute=settings.gemini_tokens_per_minute,
+            ),
+            summary_cache=self.summary_cache,
+            job_store=self.job_store,
+            render_pool=self.render_pool,
+            image_dir=image_dir,
+        )
+
+    def published_cutoff(self) -> datetime:
+        """これより前に公開された動画は履歴から削除済みの可能性があるため対象外とする。"""
+        return datetime.now(timezone.utc) - timedelta(days=self.settings.history_retention_days)
+
+    def reconcile_jobs(self) -> None:
+        """前回までに通知済みになったが履歴に保存されなかった動画を履歴に反映する。"""
+        for job in self.job_store.finished():
+            if not self.history.is_notified(job.video.video_id):
+                logger.info("通知済みジョブを履歴に反映: %s", job.video.title)
+                self.history.mark_notified(job.video)
+        self.job_store.discard_published_before(self.published_cutoff())
+
+    def resume_jobs(self, pipeline: StagedPipeline) -> None:
+        """中断された未完了ジョブを途中の段階から再開する。"""
+        jobs, discovered = self._resumable_jobs()
+        for stage, job in jobs:
+            if self.processor.submit(pipeline, job):
+                logger.info("中断されたジョブを再開(%s): %s", stage, job.video.title)
+        for channel_id, videos in discovered.items():
+            self._filter_and_submit(pipeline, self.channels_by_id[channel_id], videos)
+
+    async def resume_jobs_async(
+        self, pipeline: AsyncStagedPipeline, session: aiohttp.ClientSession
+    ) -> None:
+        """resume_jobs の asyncio 版。"""
+        jobs, discovered = await asyncio.to_thread(self._resumable_jobs)
+        for stage, job in jobs:
+            if await self.processor.submit_async(pipeline, job):
+                logger.info("中断されたジョブを再開(%s): %s", stage, job.video.title)
+        for channel_id, videos in discovered.items():
+            await self._filter_and_submit_async(
+                pipeline, session, self.channels_by_id[channel_id], videos
+            )
+
+    def _resumable_jobs(self) -> tuple[list[tuple[str, VideoJob]], dict[str, list[VideoEntry]]]:
+        """再開する (段階, ジョブ) と、フィルタ前に中断されたチャンネルごとの動画を返す。"""
+        jobs: list[tuple[str, VideoJob]] = []
+        discovered: dict[str, list[VideoEntry]] = {}
+        for job in self.job_store.unfinished():
+            channel = self.channels_by_id.get(job.video.channel_id)
+            if channel is None:
+                # 監視対象から外れたチャンネルのジョブは破棄する
+                self.job_store.discard([job.video.video_id])
+                continue
+            if job.stage == DISCOVERED:
+                discovered.setdefault(channel.channel_id, []).append(job.video)
+                continue
+            jobs.append(
+                (
+                    job.stage,
+                    VideoJob(
+                        video=job.video,
+                        channel=channel,
+                        prompt_template=self._prompt_for(channel),
+                        image_path=job.image_path if job.stage == RENDERED else None,
+                    ),
+                )
+            )
+        return jobs, discovered
+
+    def poll(self, pipeline: StagedPipeline, channel_ids: Optional[list[str]] = None) -> None:
+        """RSSフィードを並列取得し、取得できたチャンネルから順に新着動画を投入する。
+
+        Args:
+            pipeline: 新着動画を投入するパイプライン
+            channel_ids: 取得するチャンネルID（省略時は取得予定時刻を過ぎたチャンネル）
+        """
+        channel_ids = self._channels_to_poll(channel_ids)
+        started = time.time()
+
+        for channel_id, feed_result in fetch_feeds(
+            channel_ids,
+            cache=self.feed_cache,
+            session=self.http_session,
+            stop_at=self._processed_predicate(),
+        ):
+            videos = self._accept_feed(channel_id, feed_result)
+            if videos is None:
+                continue
+            self.ingest(pipeline, channel_id, self.feed_cache.newer_than_watermark(channel_id, videos))
+            # 新着をジョブストアに記録してからウォーターマークを進める
+            self.feed_cache.advance_watermark(channel_id, videos, checked_at=started)
+
+    async def poll_async(
+        self,
+        pipeline: AsyncStagedPipeline,
+        session: aiohttp.ClientSession,
+        channel_ids: Optional[list[str]] = None,
+    ) -> None:
+        """poll の asyncio 版。フィードの取得・oEmbed判定を1つのイベントループ上で並行に行う。
+
+        履歴・ジョブストアの読み書き（fsync）は別スレッドで行い、その間も他のチャンネルの
+        取得や後段の処理を進める。
+        """
+        channel_ids = self._channels_to_poll(channel_ids)
+        started = time.time()
+
+        async for channel_id, feed_result in fetch_feeds_async(
+            channel_ids,
+            session,
+            cache=self.feed_cache,
+            stop_at=self._processed_predicate(),
+        ):
+            videos = self._accept_feed(channel_id, feed_result)
+            if videos is None:
+                continue
+            await self.ingest_async(
+                pipeline, session, channel_id, self.feed_cache.newer_than_watermark(channel_id, videos)
+            )
+            self.feed_cache.advance_watermark(channel_id, videos, checked_at=started)
+
+    def _channels_to_poll(self, channel_ids: Optional[list[str]]) -> list[str]:
+        if channel_ids is not None:
+            return channel_ids
+        channel_ids = self.poll_scheduler.due(self.channels_by_id)
+        logger.info(
+            "取得対象チャンネル: %d（全%d中、残りは投稿頻度に応じて次回以降に取得）",
+            len(channel_ids),
+            len(self.channels_by_id),
+        )
+        return channel_ids
+
+    def _processed_predicate(self) -> Callable[[VideoEntry], bool]:
+        cutoff = self.published_cutoff()
+
+        def processed(video: VideoEntry) -> bool:
+            # フィードは新しい順のため、前回までに処理済みの範囲に入った動画以降は解析しない
+            seen_until = self.feed_cache.seen_until(video.channel_id)
+            if seen_until is None:
+                # ウォーターマークがない（初回・キャッシュ消失時）は通知済みの動画では打ち切らない。
+                # 更新されて上位に並んだ古い動画の後ろに未通知の新着が続くことがあるため
+                return video.published < cutoff
+            return video.published < max(cutoff, seen_until)
+
+        return processed
+
+    def _accept_feed(
+        self, channel_id: str, feed_result: Union[list[VideoEntry], RSSFetchError]
+    ) -> Optional[list[VideoEntry]]:
+        """取得結果を取得スケジュールに反映し、取得できた動画を返す（失敗時はNone）。"""
+        channel = self.channels_by_id[channel_id]
+        logger.info("チャンネル処理開始: %s (%s)", channel.name, channel.channel_id)
+
+        if isinstance(feed_result, RSSFetchError):
+            logger.warning("RSSフィード取得失敗: %s: %s", channel.name, feed_result)
+            self.poll_scheduler.record_failure(channel_id)
+            return None
+        self.poll_scheduler.observe(channel_id, [v.published for v in feed_result])
+        return feed_result
+
+    def ingest(self, pipeline: StagedPipeline, channel_id: str, videos: list[VideoEntry]) -> None:
+        """取得（またはWebSubで通知）された動画から新着を判定し、パイプラインに投入する。"""
+        discovered = self._discover(channel_id, videos)
+        if discovered:
+            self._filter_and_submit(pipeline, self.channels_by_id[channel_id], discovered)
+
+    async def ingest_async(
+        self,
+        pipeline: AsyncStagedPipeline,
+        session: aiohttp.ClientSession,
+        channel_id: str,
+        videos: list[VideoEntry],
+    ) -> None:
+        """ingest の asyncio 版。"""
+        discovered = await asyncio.to_thread(self._discover, channel_id, videos)
+        if discovered:
+            await self._filter_and_submit_async(
+                pipeline, session, self.channels_by_id[channel_id], discovered
+            )
+
+    def _discover(self, channel_id: str, videos: list[VideoEntry]) -> list[VideoEntry]:
+        """履歴・ジョブストアにない動画をジョブストアに記録して返す。"""
+        channel = self.channels_by_id.get(channel_id)
+        if channel is None:
+            return []
+
+        # 新着判定（ローカルの履歴で先に除外し、oEmbed APIの呼び出しを減らす）
+        unnotified = self.history.filter_new(videos)
+        self.filter_stats.history_skipped += len(videos) - len(unnotified)
+
+        # 処理中のジョブとして記録済みの動画は再開済みのため除外する
+        discovered = self.job_store.discover(unnotified)
+        if not discovered:
+            logger.info("新着動画なし: %s", channel.name)
+        return discovered
+
+    def log_filter_stats(self) -> None:
+        stats = self.filter_stats
+        logger.info(
+            "フィルタ統計 - 除外(通知済み): %d, 除外(公開日時): %d, 除外(タイトルでライブ判定): %d, "
+            "oEmbedキャッシュ: %d, oEmbed API呼び出し: %d, 省略したAPI呼び出し: %d",
+            stats.history_skipped,
+            stats.too_old_skipped,
+            stats.title_live_skipped,
+            stats.oembed_cache_hits,
+            stats.oembed_requests,
+            stats.oembed_calls_avoided,
+        )
+
+    def save_history(self) -> None:
+        """古いエントリを削除して履歴を保存し、履歴に反映済みの完了ジョブを削除する。"""
+        with self.processor.history_lock:
+            # 通知済みとして履歴に記録されたジョブのみ、保存後に削除する
+            saved = [
+                job.video.video_id
+                for job in self.job_store.finished()
+                if self.history.is_notified(job.video.video_id)
+            ]
+            self.history.cleanup_old_entries(self.settings.history_retention_days)
+            self.history.save()
+        self.job_store.discard(saved)
+
+    def save_caches(self) -> None:
+        self.feed_cache.save()
+        self.poll_scheduler.save()
+        self.oembed_cache.save()
+        self.summary_cache.save()
+
+    def _filter_and_submit(
+        self,
+        pipeline: StagedPipeline,
+        channel: ChannelConfig,
+        videos: list[VideoEntry],
+    ) -> None:
+        """フィルタを通過した動画を記録し、パイプラインに投入する。"""
+        unclassified: list[VideoEntry] = []
+        new_videos = filter_videos(
+            videos,
+            session=self.http_session,
+            cache=self.oembed_cache,
+            published_after=self.published_cutoff(),
+            stats=self.filter_stats,
+            unclassified=unclassified,
+        )
+        for job in self._record_filtered(channel, videos, new_videos, unclassified):
+            self.processor.submit(pipeline, job)
+
+    async def _filter_and_submit_async(
+        self,
+        pipeline: AsyncStagedPipeline,
+        session: aiohttp.ClientSession,
+        channel: ChannelConfig,
+        videos: list[VideoEntry],
+    ) -> None:
+        """_filter_and_submit の asyncio 版。"""
+        unclassified: list[VideoEntry] = []
+        new_videos = await filter_videos_async(
+            videos,
+            session,
+            cache=self.oembed_cache,
+            published_after=self.published_cutoff(),
+            stats=self.filter_stats,
+            unclassified=unclassified,
+        )
+        for job in await asyncio.to_thread(
+            self._record_filtered, channel, videos, new_videos, unclassified
+        ):
+            await self.processor.submit_async(pipeline, job)
+
+    def _record_filtered(
+        self,
+        channel: ChannelConfig,
+        videos: list[VideoEntry],
+        new_videos: list[VideoEntry],
+        unclassified: list[VideoEntry],
+    ) -> list[VideoJob]:
+        """フィルタ結果をジョブストアに記録し、投入するジョブを返す。
+
+        oEmbedの制限時間内に判定できなかった動画は discovered のまま残し、次回に判定し直す。
+        """
+        kept = {v.video_id for v in new_videos} | {v.video_id for v in unclassified}
+        self.job_store.discard(v.video_id for v in videos if v.video_id not in kept)
+        for video in unclassified:
+            logger.info("Shorts・ライブの判定を次回に持ち越します: %s", video.title)
+        for video in new_videos:
+            self.job_store.advance(video.video_id, FILTERED)
+
+        if not new_videos:
+            logger.info("新着動画なし: %s", channel.name)
+            return []
+
+        prompt_template = self._prompt_for(channel)
+        return [
+            VideoJob(video=video, channel=channel, prompt_template=prompt_template)
+            for video in new_videos
+        ]
+
+    def _prompt_for(self, channel: ChannelConfig) -> str:
+        return channel.prompt_template or self.settings.default_prompt_template
+
+
+def load_environment() -> tuple[str, str]:
+    """環境変数から Gemini APIキーと Discord Webhook URL を読み込む。未設定なら終了する。"""
     # .envファイルから環境変数を読み込み（存在しない場合は無視）
     load_dotenv()
 
-    # 環境変数の検証
     gemini_api_key = os.environ.get("GEMINI_API_KEY", "")
     discord_webhook_url = os.environ.get("DISCORD_WEBHOOK_URL", "")
 
@@ -53,13 +844,64 @@ def main() -> None:
     if not discord_webhook_url:
         logger.error("環境変数 DISCORD_WEBHOOK_URL が設定されていません")
         sys.exit(1)
+    return gemini_api_key, discord_webhook_url
 
-    # 設定ファイルの読み込み
+
+def load_shard_or_exit() -> Shard:
+    """環境変数 SHARD_INDEX / SHARD_COUNT から担当シャードを決める。不正な値なら終了する。"""
+    try:
+        return resolve_shard()
+    except ConfigError as e:
+        logger.error("シャード指定エラー: %s", e)
+        sys.exit(1)
+
+
+def create_notifier(
+    channels: list[ChannelConfig],
+    settings: AppSettings,
+    gemini_api_key: str,
+    discord_webhook_url: str,
+    http_session: Optional[requests.Session],
+    shard: Shard,
+) -> Notifier:
+    """担当シャードのチャンネルと状態ファイルで Notifier を生成し、前回までの状態を反映する。
+
+    シャードごとに履歴・ジョブ・キャッシュを別のディレクトリに保存するため、
+    複数のワーカーが同時に実行しても互いの状態を上書きしない。
+    """
+    if shard.enabled:
+        logger.info(
+            "シャード %s - 担当チャンネル数: %d（全%d中）",
+            shard,
+            len(shard.select(channels)),
+            len(channels),
+        )
+    # 全シャードで同じAPIキーを使うため、Gemini APIの毎分上限はシャード数で分ける
+    settings = shard_settings(settings, shard)
+    notifier = Notifier(
+        shard.select(channels),
+        settings,
+        gemini_api_key=gemini_api_key,
+        discord_webhook_url=discord_webhook_url,
+        http_session=http_session,
+        data_dir=shard.data_dir(),
+    )
+    # シャード数の変更で担当が移ったチャンネルの通知済み動画を引き継ぐ
+    import_history(
+        notifier.history, shard, settings.history_backend, settings.history_retention_days
+    )
+    notifier.reconcile_jobs()
+    return notifier
+
+
+def load_config_or_exit(discord_webhook_url: str) -> tuple[list[ChannelConfig], AppSettings]:
+    """設定ファイルを読み込む。設定エラーの場合はDiscordに通知して終了する。"""
     try:
-        channels, settings = load_config()
+        return load_config()
     except ConfigError as e:
         logger.error("設定エラー: %s", e)
         try:
+            # 設定を読めないため、デフォルト設定のプロセス共通セッションで通知する
             send_error_notification(
                 discord_webhook_url,
                 "\u26a0\ufe0f 設定ファイルエラー",
@@ -69,125 +911,121 @@ def main() -> None:
             pass
         sys.exit(1)
 
-    # 履歴の読み込み
-    history = HistoryManager()
-    history.load()
 
-    logger.info("処理開始 - 監視チャンネル数: %d", len(channels))
+def create_http_session(settings: AppSettings) -> requests.Session:
+    """設定の接続プール・タイムアウトで、全モジュールで共有するHTTPセッションを生成する。"""
+    return create_session(
+        pool_connections=settings.http_pool_connections,
+        pool_maxsize=settings.http_pool_maxsize,
+        timeout=(settings.http_connect_timeout_seconds, settings.http_read_timeout_seconds),
+    )
 
-    # Gemini API 15RPM対策: 呼び出し間に4秒のディレイを入れる
-    API_CALL_DELAY_SECONDS = 4
-    rate_limited = False
-    is_first_summary = True
 
-    for channel in channels:
-        if rate_limited:
-            logger.warning("レートリミット中のためスキップ: %s", channel.name)
-            continue
+def create_async_http_session(settings: AppSettings) -> aiohttp.ClientSession:
+    """create_http_session の asyncio 版。イベントループ内で呼ぶ。"""
+    return create_async_session(
+        limit=settings.http_pool_connections * settings.http_pool_maxsize,
+        limit_per_host=settings.http_pool_maxsize,
+        timeout=(settings.http_connect_timeout_seconds, settings.http_read_timeout_seconds),
+    )
 
-        logger.info("チャンネル処理開始: %s (%s)", channel.name, channel.channel_id)
 
-        # RSSフィード取得
-        try:
-            videos = fetch_feed(channel.channel_id)
-        except RSSFetchError as e:
-            logger.warning("RSSフィード取得失敗: %s: %s", channel.name, e)
-            continue
+def main(shard: Optional[Shard] = None) -> None:
+    """メイン処理フロー。
 
-        # フィルタリング
-        filtered = filter_videos(videos)
+    1. 環境変数の検証
+    2. 設定読み込み（シャード指定時は担当チャンネルのみ）
+    3. 履歴・ジョブストア読み込み（完了済みジョブを履歴に反映）
+    4. 前回中断された未完了ジョブを再開
+    5. RSSを並列取得し、取得できたチャンネルから順にフィルタ
+       → 要約 → 画像生成 → 通知（段ごとに並行処理、段階ごとにジョブを書き出し）
+    6. 古いエントリの削除
+    7. 履歴保存・完了ジョブの削除
+    """
+    gemini_api_key, discord_webhook_url = load_environment()
+    if shard is None:
+        shard = load_shard_or_exit()
 
-        # 新着判定
-        new_videos = history.filter_new(filtered)
+    # 設定ファイルの読み込み
+    channels, settings = load_config_or_exit(discord_webhook_url)
 
-        if not new_videos:
-            logger.info("新着動画なし: %s", channel.name)
-            continue
+    # 全モジュールで共有する接続プール付きHTTPセッション
+    http_session = create_http_session(settings)
 
-        # プロンプトの決定
-        prompt_template = channel.prompt_template or settings.default_prompt_template
+    notifier = create_notifier(
+        channels,
+        settings,
+        gemini_api_key=gemini_api_key,
+        discord_webhook_url=discord_webhook_url,
+        http_session=http_session,
+        shard=shard,
+    )
 
-        # 新着動画ごとに要約・通知
-        for video in new_videos:
-            # Gemini APIレートリミット対策: 連続呼び出し間にディレイ
-            if not is_first_summary:
-                logger.info("%d秒待機（API レートリミット対策）", API_CALL_DELAY_SECONDS)
-                time.sleep(API_CALL_DELAY_SECONDS)
-            is_first_summary = False
-
-            # 要約生成
-            try:
-                summary = summarize(
-                    video_url=video.url,
-                    prompt_template=prompt_template,
-                    api_key=gemini_api_key,
-                    max_length=settings.max_summary_length,
-                )
-            except RateLimitError as e:
-                logger.warning("Gemini APIレートリミット: %s - 残りは次回実行時に処理", e)
-                rate_limited = True
-                break
-            except TokenLimitError as e:
-                logger.warning("トークン上限超過のためスキップ: %s: %s", video.title, e)
-                history.mark_notified(video)
-                continue
-            except SummarizerError as e:
-                logger.error("要約生成失敗: %s: %s", video.title, e)
-                try:
-                    send_error_notification(
-                        discord_webhook_url,
-                        "\u26a0\ufe0f 要約生成エラー",
-                        f"チャンネル: {channel.name}\n動画: {video.title}\n{e}",
-                    )
-                except Exception:
-                    pass
-                continue
+    logger.info("処理開始 - 監視チャンネル数: %d", len(notifier.channels_by_id))
 
-            # インフォグラフィック画像生成
-            image_path = None
-            try:
-                image_path = generate_infographic(
-                    html_content=summary,
-                    video_title=video.title,
-                )
-            except ImageGenerationError as e:
-                logger.error("画像生成失敗: %s: %s", video.title, e)
-                try:
-                    send_error_notification(
-                        discord_webhook_url,
-                        "\u26a0\ufe0f 画像生成エラー",
-                        f"チャンネル: {channel.name}\n動画: {video.title}\n{e}",
-                    )
-                except Exception:
-                    pass
-                continue
+    # パイプラインの終了後に画像生成のワーカープロセスを終了する
+    with notifier.render_pool, notifier.processor.build_pipeline() as pipeline:
+        # 前回の実行で中断された未完了ジョブを途中の段階から再開する
+        notifier.resume_jobs(pipeline)
+        notifier.poll(pipeline)
 
-            # Discord画像通知
-            try:
-                send_image_notification(
-                    webhook_url=discord_webhook_url,
-                    video=video,
-                    channel_name=channel.name,
-                    image_path=image_path,
-                )
-            except DiscordNotifyError as e:
-                logger.error("Discord通知失敗: %s: %s", video.title, e)
-                continue
-            finally:
-                if image_path:
-                    cleanup_temp_image(image_path)
+    notifier.log_filter_stats()
 
-            # 通知成功 → 履歴に記録
-            history.mark_notified(video)
+    # 履歴・キャッシュの保存（履歴の保存後に完了ジョブを削除する）
+    notifier.save_history()
+    notifier.save_caches()
+    http_session.close()
 
-    # 古いエントリの削除
-    history.cleanup_old_entries(settings.history_retention_days)
+    logger.info("処理完了")
 
-    # 履歴の保存
-    history.save()
+
+async def async_main(shard: Optional[Shard] = None) -> None:
+    """main の asyncio 版（python -m src async）。
+
+    フィード取得・oEmbed判定・要約・画像生成・通知をすべて1つのイベントループ上で
+    並行に行う。待機中のリクエストがスレッドを占有しないため、多数のチャンネルの
+    取得や時間のかかる要約を少ないメモリで同時に進められる。
+    """
+    gemini_api_key, discord_webhook_url = load_environment()
+    if shard is None:
+        shard = load_shard_or_exit()
+
+    channels, settings = load_config_or_exit(discord_webhook_url)
+
+    # 通信はすべて aiohttp のセッションで行うため、同期用のHTTPセッションは作らない
+    # 履歴・ジョブストア・キャッシュの読み込みと保存はファイルI/Oのため別スレッドで行う
+    notifier = await asyncio.to_thread(
+        create_notifier,
+        channels,
+        settings,
+        gemini_api_key=gemini_api_key,
+        discord_webhook_url=discord_webhook_url,
+        http_session=None,
+        shard=shard,
+    )
+
+    logger.info("処理開始(asyncio) - 監視チャンネル数: %d", len(notifier.channels_by_id))
+
+    async with create_async_http_session(settings) as session, AsyncBrowserRenderer() as renderer:
+        async with notifier.processor.build_async_pipeline(session, renderer) as pipeline:
+            await notifier.resume_jobs_async(pipeline, session)
+            await notifier.poll_async(pipeline, session)
+
+    notifier.log_filter_stats()
+
+    # 履歴の保存とキャッシュの保存は別のファイルのため並行に書き出す
+    await asyncio.gather(
+        asyncio.to_thread(notifier.save_history),
+        asyncio.to_thread(notifier.save_caches),
+    )
 
     logger.info("処理完了")
 
 
+def run_async(shard: Optional[Shard] = None) -> None:
+    """asyncio 版の1回実行のエントリーポイント。"""
+    asyncio.run(async_main(shard))
+
+
 if __name__ == "__main__":
     main()
@@ -18,6 +18,26 @@ class AppSettings:
     max_summary_length: int
     history_retention_days: int
     default_prompt_template: str
+    oembed_cache_ttl_hours: int = 168
+    oembed_cache_max_entries: int = 5000
+    gemini_requests_per_minute: int = 15
+    gemini_tokens_per_minute: int = 250000
+    summarize_concurrency: int = 2
+    render_concurrency: Optional[int] = None  # 省略時はCPU数と空きメモリから決める
+    notify_concurrency: int = 1
+    pipeline_queue_size: int = 2
+    summary_cache_max_entries: int = 200
+    summary_cache_max_age_days: int = 7
+    history_backend: str = "json"
+    min_poll_interval_minutes: int = 5
+    max_poll_interval_minutes: int = 360
+    watermark_window_minutes: int = 180
+    websub_callback_url: str = ""
+    websub_port: int = 8080
+    http_pool_connections: int = 10
+    http_pool_maxsize: int = 16
+    http_connect_timeout_seconds: int = 30
+    http_read_timeout_seconds: int = 30
 
 
 @dataclass
@@ -28,3 +48,43 @@ class VideoEntry:
     url: str
     published: datetime
     channel_id: str
+
+
+@dataclass
+class VideoJob:
+    """要約・画像生成・通知パイプラインで処理する動画1件分の作業"""
+    video: VideoEntry
+    channel: ChannelConfig
+    prompt_template: str
+    html_content: Optional[str] = None   # 要約段で設定
+    image_path: Optional[str] = None     # 画像生成段で設定
+
+
+@dataclass
+class JobRecord:
+    """ジョブストアに記録された動画1件分の処理状況"""
+    video: VideoEntry
+    stage: str                           # discovered / filtered / summarized / rendered / posted / skipped
+    updated_at: str                      # 最後に段が進んだ日時（ISO 8601 UTC）
+    image_path: Optional[str] = None     # rendered 段で生成した画像のパス
+    failures: int = 0                    # 処理に失敗した回数
+
+
+@dataclass
+class FilterStats:
+    """フィルタ段階ごとの除外件数とoEmbed API呼び出し件数"""
+    history_skipped: int = 0       # 通知済みのため除外
+    too_old_skipped: int = 0       # 公開日時が古いため除外
+    title_live_skipped: int = 0    # タイトルのみでライブ配信と判定して除外
+    oembed_cache_hits: int = 0     # oEmbedキャッシュで判定
+    oembed_requests: int = 0       # oEmbed APIを呼び出した件数
+
+    @property
+    def oembed_calls_avoided(self) -> int:
+        """ローカル判定・キャッシュにより省略できたoEmbed API呼び出し件数"""
+        return (
+            self.history_skipped
+            + self.too_old_skipped
+            + self.title_live_skipped
+            + self.oembed_cache_hits
+        )
@@ -0,0 +1,99 @@
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+# Shorts・ライブ判定に必要な oEmbed フィールドのみ保存する
+CACHED_FIELDS = ("thumbnail_url", "width", "height", "title")
+
+DEFAULT_TTL_SECONDS = 7 * 24 * 60 * 60
+DEFAULT_MAX_ENTRIES = 5000
+
+
+class OEmbedCache:
+    """oEmbed APIの取得結果を動画IDごとにキャッシュする。
+
+    有効期限（TTL）切れのエントリは参照時に破棄し、件数が上限を超えた場合は
+    最も長く参照されていないエントリから削除する（LRU）。
+    """
+
+    def __init__(
+        self,
+        data_path: str = "data/oembed_cache.json",
+        ttl_seconds: float = DEFAULT_TTL_SECONDS,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+    ):
+        self._path = Path(data_path)
+        self._ttl_seconds = ttl_seconds
+        self._max_entries = max_entries
+        # video_id -> {"fetched_at": epoch秒, "oembed": {...}}（先頭ほど参照が古い）
+        self._entries: OrderedDict[str, dict] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def load(self) -> None:
+        """キャッシュファイルを読み込む。存在しない・破損している場合は空で初期化する。"""
+        if not self._path.exists():
+            self._entries = OrderedDict()
+            return
+
+        try:
+            with open(self._path, encoding="utf-8") as f:
+                data = json.load(f)
+            self._entries = OrderedDict(data.get("videos", {}))
+            logger.info("oEmbedキャッシュ読み込み完了 - 登録数: %d", len(self._entries))
+        except (json.JSONDecodeError, AttributeError, TypeError, ValueError) as e:
+            logger.warning("oEmbedキャッシュが破損しています。空の状態で初期化します: %s", e)
+            self._entries = OrderedDict()
+
+    def get(self, video_id: str) -> Optional[dict]:
+        """キャッシュ済みのoEmbed情報を返す。未登録または期限切れの場合はNoneを返す。"""
+        with self._lock:
+            entry = self._entries.get(video_id)
+            if entry is None:
+                return None
+            if self._is_expired(entry, time.time()):
+                del self._entries[video_id]
+                return None
+            self._entries.move_to_end(video_id)
+            return dict(entry.get("oembed", {}))
+
+    def put(self, video_id: str, oembed: dict) -> None:
+        """oEmbed情報を記録する。上限を超えた場合は古いエントリから削除する。"""
+        with self._lock:
+            self._entries[video_id] = {
+                "fetched_at": time.time(),
+                "oembed": {k: oembed[k] for k in CACHED_FIELDS if k in oembed},
+            }
+            self._entries.move_to_end(video_id)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+    def save(self) -> None:
+        """期限切れのエントリを除いてキャッシュをファイルに保存する。"""
+        now = time.time()
+        with self._lock:
+            for video_id in [
+                k for k, v in self._entries.items() if self._is_expired(v, now)
+            ]:
+                del self._entries[video_id]
+            data = {"videos": dict(self._entries)}
+
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self._path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False)
+        logger.info("oEmbedキャッシュ保存完了 - 登録数: %d", len(data["videos"]))
+
+    def _is_expired(self, entry: dict, now: float) -> bool:
+        try:
+            return now - float(entry["fetched_at"]) >= self._ttl_seconds
+        except (KeyError, TypeError, ValueError):
+            return True
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
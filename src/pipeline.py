@@ -0,0 +1,236 @@
+import asyncio
+import inspect
+import logging
+import queue
+import threading
+from dataclasses import dataclass
+from typing import Any, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_QUEUE_SIZE = 2
+
+# ワーカーに入力の終了を伝える番兵
+_SENTINEL = object()
+
+
+@dataclass
+class Stage:
+    """パイプラインの1段"""
+    name: str
+    func: Callable[[Any], Any]   # 戻り値が次段の入力になる。Noneを返すとその要素は破棄
+    concurrency: int = 1
+    on_worker_exit: Optional[Callable[[], None]] = None  # ワーカースレッド終了時に呼ぶ
+
+
+class StagedPipeline:
+    """段ごとにワーカースレッドを持つパイプライン。
+
+    段と段の間は上限付きキューでつなぎ、後段が詰まった場合は前段
+    （最終的には submit() の呼び出し元）を待たせる（バックプレッシャー）。
+    各段は最大 concurrency 件を同時に処理するため、ある要素が後段で
+    処理されている間に次の要素を前段で処理できる。
+
+    段の処理で例外が発生した場合は on_error(段の名前, 要素, 例外) を呼び、
+    その要素は以降の段に渡さない。
+    """
+
+    def __init__(
+        self,
+        stages: list[Stage],
+        queue_size: int = DEFAULT_QUEUE_SIZE,
+        on_error: Optional[Callable[[str, Any, Exception], None]] = None,
+    ):
+        if not stages:
+            raise ValueError("stagesが空です")
+        self._stages = stages
+        self._queues: list[queue.Queue] = [
+            queue.Queue(maxsize=max(1, queue_size)) for _ in stages
+        ]
+        self._on_error = on_error
+        self._threads: list[threading.Thread] = []
+        self._remaining_workers = [max(1, stage.concurrency) for stage in stages]
+        self._lock = threading.Lock()
+        self._started = False
+        self._closed = False
+
+    def start(self) -> None:
+        """全段のワーカースレッドを起動する。"""
+        if self._started:
+            return
+        self._started = True
+        for index, stage in enumerate(self._stages):
+            for n in range(max(1, stage.concurrency)):
+                thread = threading.Thread(
+                    target=self._run_worker,
+                    args=(index,),
+                    name=f"pipeline-{stage.name}-{n}",
+                    daemon=True,
+                )
+                thread.start()
+                self._threads.append(thread)
+
+    def submit(self, item: Any) -> None:
+        """先頭の段に要素を投入する。キューが一杯の場合は空くまで待つ。"""
+        if self._closed:
+            raise RuntimeError("close() 後のパイプラインには投入できません")
+        self._queues[0].put(item)
+
+    def close(self) -> None:
+        """入力の終了を通知する。投入済みの要素は最後の段まで処理される。"""
+        if self._closed:
+            return
+        self._closed = True
+        for _ in range(self._remaining_workers[0]):
+            self._queues[0].put(_SENTINEL)
+
+    def join(self) -> None:
+        """全要素の処理が終わり、全ワーカーが終了するまで待つ。"""
+        self.close()
+        for thread in self._threads:
+            thread.join()
+
+    def __enter__(self) -> "StagedPipeline":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.join()
+
+    def _run_worker(self, index: int) -> None:
+        stage = self._stages[index]
+        in_queue = self._queues[index]
+        out_queue = self._queues[index + 1] if index + 1 < len(self._stages) else None
+
+        try:
+            while True:
+                item = in_queue.get()
+                if item is _SENTINEL:
+                    break
+
+                try:
+                    result = stage.func(item)
+                except Exception as e:
+                    self._handle_error(stage.name, item, e)
+                    continue
+
+                if out_queue is not None and result is not None:
+                    out_queue.put(result)
+        finally:
+            if stage.on_worker_exit is not None:
+                try:
+                    stage.on_worker_exit()
+                except Exception as e:
+                    logger.warning("ワーカー終了処理に失敗: %s: %s", stage.name, e)
+            self._worker_finished(index)
+
+    def _worker_finished(self, index: int) -> None:
+        """段の最後のワーカーが終了したら次の段に入力の終了を伝える。"""
+        with self._lock:
+            self._remaining_workers[index] -= 1
+            is_last = self._remaining_workers[index] == 0
+        if is_last and index + 1 < len(self._stages):
+            for _ in range(self._remaining_workers[index + 1]):
+                self._queues[index + 1].put(_SENTINEL)
+
+    def _handle_error(self, stage_name: str, item: Any, error: Exception) -> None:
+        if self._on_error is None:
+            logger.error("パイプライン処理失敗(%s): %s", stage_name, error)
+            return
+        try:
+            self._on_error(stage_name, item, error)
+        except Exception as e:
+            logger.exception("パイプラインのエラー処理に失敗(%s): %s", stage_name, e)
+
+
+class AsyncStagedPipeline:
+    """StagedPipeline の asyncio 版。段ごとに concurrency 個のワーカータスクを持つ。
+
+    各段の func はコルーチン関数とし、スレッドの代わりに1つのイベントループ上で
+    並行に処理する。段と段の間の上限付きキュー・バックプレッシャー・
+    on_error の扱いは StagedPipeline と同じ（on_error はコルーチン関数も指定できる）。
+    on_worker_exit は使わない。
+    """
+
+    def __init__(
+        self,
+        stages: list[Stage],
+        queue_size: int = DEFAULT_QUEUE_SIZE,
+        on_error: Optional[Callable[[str, Any, Exception], Any]] = None,
+    ):
+        if not stages:
+            raise ValueError("stagesが空です")
+        self._stages = stages
+        self._queue_size = max(1, queue_size)
+        self._queues: list[asyncio.Queue] = []
+        self._on_error = on_error
+        self._tasks: list[list[asyncio.Task]] = []
+        self._started = False
+        self._closed = False
+
+    def start(self) -> None:
+        """全段のワーカータスクを起動する。イベントループ内で呼ぶこと。"""
+        if self._started:
+            return
+        self._started = True
+        self._queues = [asyncio.Queue(maxsize=self._queue_size) for _ in self._stages]
+        for index, stage in enumerate(self._stages):
+            self._tasks.append(
+                [
+                    asyncio.create_task(self._run_worker(index), name=f"pipeline-{stage.name}-{n}")
+                    for n in range(max(1, stage.concurrency))
+                ]
+            )
+
+    async def submit(self, item: Any) -> None:
+        """先頭の段に要素を投入する。キューが一杯の場合は空くまで待つ。"""
+        if self._closed:
+            raise RuntimeError("close() 後のパイプラインには投入できません")
+        await self._queues[0].put(item)
+
+    async def join(self) -> None:
+        """入力の終了を通知し、全要素の処理が終わるまで待つ。"""
+        if not self._closed:
+            self._closed = True
+            for index, tasks in enumerate(self._tasks):
+                for _ in tasks:
+                    await self._queues[index].put(_SENTINEL)
+                # 前段のワーカーがすべて終了してから次段に入力の終了を伝える
+                await asyncio.gather(*tasks)
+
+    async def __aenter__(self) -> "AsyncStagedPipeline":
+        self.start()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.join()
+
+    async def _run_worker(self, index: int) -> None:
+        stage = self._stages[index]
+        in_queue = self._queues[index]
+        out_queue = self._queues[index + 1] if index + 1 < len(self._stages) else None
+
+        while True:
+            item = await in_queue.get()
+            if item is _SENTINEL:
+                return
+
+            try:
+                result = await stage.func(item)
+            except Exception as e:
+                await self._handle_error(stage.name, item, e)
+                continue
+
+            if out_queue is not None and result is not None:
+                await out_queue.put(result)
+
+    async def _handle_error(self, stage_name: str, item: Any, error: Exception) -> None:
+        if self._on_error is None:
+            logger.error("パイプライン処理失敗(%s): %s", stage_name, error)
+            return
+        try:
+            result = self._on_error(stage_name, item, error)
+            if inspect.isawaitable(result):
+                await result
+        except Exception as e:
+            logger.exception("パイプラインのエラー処理に失敗(%s): %s", stage_name, e)
@@ -0,0 +1,142 @@
+import json
+import logging
+import statistics
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MIN_INTERVAL_SECONDS = 5 * 60
+DEFAULT_MAX_INTERVAL_SECONDS = 6 * 60 * 60
+# 投稿間隔の目安に対して何回取得するか。多いほど新着の検出が早くなる
+POLLS_PER_UPLOAD_GAP = 10
+# 学習に使う公開日時の件数（RSSフィードの最大件数）
+MAX_PUBLISHED_SAMPLES = 15
+# cron の起動時刻の揺れで1周期分取得が遅れないよう、この秒数前から取得対象とする
+DUE_TOLERANCE_SECONDS = 60
+
+
+class PollScheduler:
+    """チャンネルごとの投稿頻度からフィードの取得間隔を決める。
+
+    RSSフィードに含まれる動画の公開日時から典型的な投稿間隔（中央値）を求め、
+    その 1/POLLS_PER_UPLOAD_GAP を取得間隔とする。最後の投稿からの経過時間が
+    典型的な間隔より長い場合は経過時間を基準にするため、休止中のチャンネルほど
+    取得間隔が延びる。取得間隔は [min_interval, max_interval] の範囲に収める。
+    投稿が2件未満で間隔を推定できないチャンネルは default_interval で取得する。
+    """
+
+    def __init__(
+        self,
+        data_path: str = "data/poll_schedule.json",
+        min_interval_seconds: float = DEFAULT_MIN_INTERVAL_SECONDS,
+        max_interval_seconds: float = DEFAULT_MAX_INTERVAL_SECONDS,
+        default_interval_seconds: Optional[float] = None,
+    ):
+        self._path = Path(data_path)
+        self._min_interval = min_interval_seconds
+        self._max_interval = max_interval_seconds
+        self._default_interval = (
+            min_interval_seconds if default_interval_seconds is None else default_interval_seconds
+        )
+        # channel_id -> {"published": [エポック秒, ...], "interval": 秒, "next_poll_at": エポック秒}
+        self._channels: dict[str, dict] = {}
+        self._lock = threading.Lock()
+
+    def load(self) -> None:
+        """スケジュールファイルを読み込む。存在しない・破損している場合は空で初期化する。"""
+        if not self._path.exists():
+            self._channels = {}
+            return
+
+        try:
+            with open(self._path, encoding="utf-8") as f:
+                data = json.load(f)
+            self._channels = data.get("channels", {})
+            logger.info("取得スケジュール読み込み完了 - チャンネル数: %d", len(self._channels))
+        except (json.JSONDecodeError, AttributeError) as e:
+            logger.warning("取得スケジュールが破損しています。空の状態で初期化します: %s", e)
+            self._channels = {}
+
+    def due(self, channel_ids: Iterable[str], now: Optional[float] = None) -> list[str]:
+        """取得予定時刻を過ぎた（または未登録の）チャンネルIDを返す。"""
+        now = time.time() if now is None else now
+        with self._lock:
+            return [
+                channel_id
+                for channel_id in channel_ids
+                if self._channels.get(channel_id, {}).get("next_poll_at", 0)
+                <= now + DUE_TOLERANCE_SECONDS
+            ]
+
+    def seconds_until_due(self, channel_id: str, now: Optional[float] = None) -> float:
+        """次の取得予定までの秒数を返す。取得予定を過ぎていれば0を返す。"""
+        now = time.time() if now is None else now
+        with self._lock:
+            next_poll_at = self._channels.get(channel_id, {}).get("next_poll_at", 0)
+        return max(0.0, next_poll_at - now)
+
+    @property
+    def max_interval(self) -> float:
+        """取得間隔の上限（秒）"""
+        return self._max_interval
+
+    def interval(self, channel_id: str) -> float:
+        """チャンネルの現在の取得間隔（秒）を返す。"""
+        with self._lock:
+            return self._channels.get(channel_id, {}).get("interval", self._default_interval)
+
+    def observe(
+        self,
+        channel_id: str,
+        published: Iterable[datetime],
+        now: Optional[float] = None,
+    ) -> float:
+        """取得したフィードの公開日時から取得間隔を更新し、次回の取得予定を記録する。
+
+        304 Not Modified などで公開日時が空の場合は、前回までに記録した公開日時で計算する。
+
+        Returns:
+            新しい取得間隔（秒）
+        """
+        now = time.time() if now is None else now
+        timestamps = [int(p.timestamp()) for p in published]
+        with self._lock:
+            entry = self._channels.setdefault(channel_id, {})
+            if timestamps:
+                merged = set(entry.get("published", [])) | set(timestamps)
+                entry["published"] = sorted(merged, reverse=True)[:MAX_PUBLISHED_SAMPLES]
+            interval = self._estimate_interval(entry.get("published", []), now)
+            entry["interval"] = interval
+            entry["next_poll_at"] = now + interval
+        return interval
+
+    def record_failure(self, channel_id: str, now: Optional[float] = None) -> None:
+        """取得に失敗したチャンネルを最短間隔で再取得するよう記録する。"""
+        now = time.time() if now is None else now
+        with self._lock:
+            entry = self._channels.setdefault(channel_id, {})
+            entry["next_poll_at"] = now + self._min_interval
+
+    def save(self) -> None:
+        """スケジュールをファイルに保存する。"""
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            data = {"channels": dict(self._channels)}
+        with open(self._path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False)
+        logger.info("取得スケジュール保存完了 - チャンネル数: %d", len(data["channels"]))
+
+    def _estimate_interval(self, published: list[int], now: float) -> float:
+        if len(published) < 2:
+            interval = self._default_interval
+        else:
+            gaps = [newer - older for newer, older in zip(published, published[1:])]
+            typical_gap = statistics.median(gaps)
+            # 最後の投稿から典型的な間隔以上が経過していれば、経過時間に合わせて間隔を延ばす
+            expected_gap = max(typical_gap, now - published[0])
+            interval = expected_gap / POLLS_PER_UPLOAD_GAP
+        return float(min(self._max_interval, max(self._min_interval, interval)))
@@ -1,11 +1,18 @@
+import asyncio
 import logging
 import time
 import xml.etree.ElementTree as ET
+from collections.abc import AsyncIterator, Callable, Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timezone
+from typing import Optional, Union
 
+import aiohttp
 import requests
 
 from src.exceptions import RSSFetchError
+from src.feed_cache import FeedCache
+from src.http_client import get_session
 from src.models import VideoEntry
 
 logger = logging.getLogger(__name__)
@@ -20,16 +27,40 @@ NS = {
     "media": "http://search.yahoo.com/mrss/",
 }
 
+# 名前空間を展開したタグ名。エントリごとに find で名前空間付きパスを解決しない
+ENTRY_TAG = f"{{{NS['atom']}}}entry"
+VIDEO_ID_TAG = f"{{{NS['yt']}}}videoId"
+CHANNEL_ID_TAG = f"{{{NS['yt']}}}channelId"
+TITLE_TAG = f"{{{NS['atom']}}}title"
+LINK_TAG = f"{{{NS['atom']}}}link"
+PUBLISHED_TAG = f"{{{NS['atom']}}}published"
+
+# ストリーミング解析でパーサーに1度に渡すバイト数
+PARSE_CHUNK_SIZE = 4096
+
 # リトライ設定
 MAX_RETRIES = 3
 BACKOFF_SECONDS = [5, 10, 20]
 
+# 並列取得のデフォルト同時実行数
+DEFAULT_MAX_CONCURRENCY = 8
+
 
-def fetch_feed(channel_id: str) -> list[VideoEntry]:
+def fetch_feed(
+    channel_id: str,
+    cache: Optional[FeedCache] = None,
+    session: Optional[requests.Session] = None,
+    stop_at: Optional[Callable[[VideoEntry], bool]] = None,
+) -> list[VideoEntry]:
     """指定チャンネルのRSSフィードを取得し、動画エントリを返す。
 
     Args:
         channel_id: YouTubeチャンネルID
+        cache: 条件付きGET用の検証子キャッシュ。指定時はフィードが
+            前回から変化していなければ（HTTP 304）空リストを返す
+        session: HTTPセッション。省略時はプロセス共通のセッションを使う
+        stop_at: 処理済みの動画かどうかを判定する関数。フィードは公開日時の
+            新しい順に並ぶため、最初に True を返したエントリ以降は解析しない
 
     Returns:
         動画エントリのリスト（公開日時の新しい順）
@@ -38,8 +69,47 @@ def fetch_feed(channel_id: str) -> list[VideoEntry]:
         RSSFetchError: フィード取得またはパースに失敗した場合
     """
     url = RSS_URL_TEMPLATE.format(channel_id=channel_id)
-    xml_text = _fetch_with_retry(url, channel_id)
-    videos = _parse_feed(xml_text, channel_id)
+    content = _fetch_with_retry(url, channel_id, cache, session)
+    return _videos_from_content(content, channel_id, cache, stop_at)
+
+
+async def fetch_feed_async(
+    channel_id: str,
+    session: aiohttp.ClientSession,
+    cache: Optional[FeedCache] = None,
+    stop_at: Optional[Callable[[VideoEntry], bool]] = None,
+) -> list[VideoEntry]:
+    """fetch_feed の asyncio 版。リトライ時のバックオフはイベントループを止めずに待つ。
+
+    Raises:
+        RSSFetchError: フィード取得またはパースに失敗した場合
+    """
+    url = RSS_URL_TEMPLATE.format(channel_id=channel_id)
+    content = await _fetch_with_retry_async(url, channel_id, session, cache)
+    return _videos_from_content(content, channel_id, cache, stop_at)
+
+
+def _videos_from_content(
+    content: Optional[bytes],
+    channel_id: str,
+    cache: Optional[FeedCache],
+    stop_at: Optional[Callable[[VideoEntry], bool]],
+) -> list[VideoEntry]:
+    """取得したフィードを解析し、公開日時の新しい順の動画エントリを返す。"""
+    if content is None:
+        logger.info("チャンネル(%s)のRSSフィードは前回から変更なし(HTTP 304)", channel_id)
+        return []
+    try:
+        videos = []
+        for video in iter_feed(content, channel_id):
+            if stop_at is not None and stop_at(video):
+                break
+            videos.append(video)
+    except RSSFetchError:
+        # 解析できなかった内容の検証子で次回304を受けないよう破棄する
+        if cache is not None:
+            cache.discard(channel_id)
+        raise
     videos.sort(key=lambda v: v.published, reverse=True)
     logger.info(
         "チャンネル(%s)のRSSフィード取得完了 - 動画数: %d", channel_id, len(videos)
@@ -47,16 +117,109 @@ def fetch_feed(channel_id: str) -> list[VideoEntry]:
     return videos
 
 
-def _fetch_with_retry(url: str, channel_id: str) -> str:
-    """リトライ付きでRSSフィードを取得する。"""
+def fetch_feeds(
+    channel_ids: Iterable[str],
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+    cache: Optional[FeedCache] = None,
+    session: Optional[requests.Session] = None,
+    stop_at: Optional[Callable[[VideoEntry], bool]] = None,
+) -> Iterator[tuple[str, Union[list[VideoEntry], RSSFetchError]]]:
+    """複数チャンネルのRSSフィードを並列に取得する。
+
+    チャンネルごとのリトライ・バックオフは各ワーカー内で行われるため、
+    応答の遅いチャンネルが他のチャンネルの取得を妨げない。
+    結果は取得が完了した順に返す。
+
+    Args:
+        channel_ids: YouTubeチャンネルIDのリスト
+        max_concurrency: 同時に取得するチャンネル数の上限
+        cache: 条件付きGET用の検証子キャッシュ（fetch_feed を参照）
+        session: HTTPセッション。全ワーカーで接続プールを共有する
+        stop_at: 処理済みの動画かどうかを判定する関数（fetch_feed を参照）
+
+    Yields:
+        (チャンネルID, 動画エントリのリスト または RSSFetchError) のタプル
+    """
+    channel_ids = list(channel_ids)
+    if not channel_ids:
+        return
+
+    if session is None:
+        session = get_session()
+
+    workers = max(1, min(max_concurrency, len(channel_ids)))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="rss") as executor:
+        futures = {
+            executor.submit(fetch_feed, channel_id, cache, session, stop_at): channel_id
+            for channel_id in channel_ids
+        }
+        for future in as_completed(futures):
+            channel_id = futures[future]
+            try:
+                yield channel_id, future.result()
+            except RSSFetchError as e:
+                yield channel_id, e
+
+
+async def fetch_feeds_async(
+    channel_ids: Iterable[str],
+    session: aiohttp.ClientSession,
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+    cache: Optional[FeedCache] = None,
+    stop_at: Optional[Callable[[VideoEntry], bool]] = None,
+) -> AsyncIterator[tuple[str, Union[list[VideoEntry], RSSFetchError]]]:
+    """fetch_feeds の asyncio 版。スレッドを使わずに最大 max_concurrency 件を同時に取得する。
+
+    Yields:
+        (チャンネルID, 動画エントリのリスト または RSSFetchError) のタプル（取得が完了した順）
+    """
+    semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+    async def fetch(channel_id: str) -> tuple[str, Union[list[VideoEntry], RSSFetchError]]:
+        async with semaphore:
+            try:
+                return channel_id, await fetch_feed_async(channel_id, session, cache, stop_at)
+            except RSSFetchError as e:
+                return channel_id, e
+
+    tasks = [asyncio.create_task(fetch(channel_id)) for channel_id in channel_ids]
+    try:
+        for completed in asyncio.as_completed(tasks):
+            yield await completed
+    finally:
+        # 呼び出し側が途中で打ち切った場合は残りの取得を取り消す
+        for task in tasks:
+            task.cancel()
+
+
+def _fetch_with_retry(
+    url: str,
+    channel_id: str,
+    cache: Optional[FeedCache] = None,
+    session: Optional[requests.Session] = None,
+) -> Optional[bytes]:
+    """リトライ付きでRSSフィードを取得する。変更なし(HTTP 304)の場合はNoneを返す。"""
+    if session is None:
+        session = get_session()
     last_error = None
+    headers = cache.conditional_headers(channel_id) if cache is not None else {}
 
     for attempt in range(MAX_RETRIES):
         try:
-            response = requests.get(url, timeout=TIMEOUT_SECONDS)
+            response = session.get(url, headers=headers, timeout=TIMEOUT_SECONDS)
 
             if response.status_code == 200:
-                return response.text
+                if cache is not None:
+                    cache.update(
+                        channel_id,
+                        response.headers.get("ETag"),
+                        response.headers.get("Last-Modified"),
+                    )
+                # 文字コードはXML宣言に従ってパーサーが判定するため、デコードせずに渡す
+                return response.content
+
+            if response.status_code == 304:
+                return None
 
             # 404はYouTube側の一時的エラーの可能性があるためリトライ対象
             # それ以外の4xx はリトライしない
@@ -91,48 +254,133 @@ def _fetch_with_retry(url: str, channel_id: str) -> str:
     raise last_error
 
 
-def _parse_feed(xml_text: str, channel_id: str) -> list[VideoEntry]:
-    """RSSフィードのXMLをパースして動画エントリのリストを返す。"""
+async def _fetch_with_retry_async(
+    url: str,
+    channel_id: str,
+    session: aiohttp.ClientSession,
+    cache: Optional[FeedCache] = None,
+) -> Optional[bytes]:
+    """_fetch_with_retry の asyncio 版。"""
+    last_error = None
+    headers = cache.conditional_headers(channel_id) if cache is not None else {}
+    timeout = aiohttp.ClientTimeout(total=TIMEOUT_SECONDS)
+
+    for attempt in range(MAX_RETRIES):
+        try:
+            async with session.get(url, headers=headers, timeout=timeout) as response:
+                if response.status == 200:
+                    content = await response.read()
+                    if cache is not None:
+                        cache.update(
+                            channel_id,
+                            response.headers.get("ETag"),
+                            response.headers.get("Last-Modified"),
+                        )
+                    return content
+
+                if response.status == 304:
+                    return None
+
+                # 404以外の4xxはリトライしない
+                if 400 <= response.status < 500 and response.status != 404:
+                    raise RSSFetchError(
+                        f"RSSフィード取得失敗(HTTP {response.status}): "
+                        f"チャンネル {channel_id}"
+                    )
+
+                last_error = RSSFetchError(
+                    f"RSSフィード取得失敗(HTTP {response.status}): "
+                    f"チャンネル {channel_id}"
+                )
+
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            last_error = RSSFetchError(
+                f"RSSフィード取得失敗(ネットワークエラー): チャンネル {channel_id}: {e}"
+            )
+
+        if attempt < MAX_RETRIES - 1:
+            wait = BACKOFF_SECONDS[attempt]
+            logger.warning(
+                "RSSフィード取得リトライ %d/%d - %d秒待機: %s",
+                attempt + 1,
+                MAX_RETRIES,
+                wait,
+                channel_id,
+            )
+            await asyncio.sleep(wait)
+
+    raise last_error
+
+
+def iter_feed(data: Union[str, bytes], channel_id: str) -> Iterator[VideoEntry]:
+    """RSSフィードのXMLを先頭から逐次解析し、動画エントリを文書の順に1件ずつ返す。
+
+    ツリー全体を構築せず、エントリの終了タグごとに動画エントリを生成して要素を破棄する。
+    呼び出し側が途中で打ち切った場合、残りの部分は解析しない。
+
+    Raises:
+        RSSFetchError: XMLのパースに失敗した場合
+    """
+    parser = ET.XMLPullParser(events=("end",))
+    for offset in range(0, len(data), PARSE_CHUNK_SIZE):
+        try:
+            parser.feed(data[offset:offset + PARSE_CHUNK_SIZE])
+            events = list(parser.read_events())
+        except ET.ParseError as e:
+            raise RSSFetchError(
+                f"RSSフィードのXMLパースに失敗: チャンネル {channel_id}: {e}"
+            ) from e
+        for _, elem in events:
+            if elem.tag != ENTRY_TAG:
+                continue
+            video = _parse_entry(elem, channel_id)
+            elem.clear()
+            if video is not None:
+                yield video
     try:
-        root = ET.fromstring(xml_text)
+        parser.close()
     except ET.ParseError as e:
         raise RSSFetchError(
             f"RSSフィードのXMLパースに失敗: チャンネル {channel_id}: {e}"
         ) from e
 
-    videos = []
-    for entry in root.findall("atom:entry", NS):
-        video_id_elem = entry.find("yt:videoId", NS)
-        title_elem = entry.find("atom:title", NS)
-        link_elem = entry.find("atom:link[@rel='alternate']", NS)
-        published_elem = entry.find("atom:published", NS)
-        channel_id_elem = entry.find("yt:channelId", NS)
-
-        if video_id_elem is None or title_elem is None:
-            continue
-
-        video_id = video_id_elem.text or ""
-        title = title_elem.text or ""
-        url = link_elem.get("href", "") if link_elem is not None else ""
-        published_str = published_elem.text or "" if published_elem is not None else ""
-        entry_channel_id = (
-            channel_id_elem.text or "" if channel_id_elem is not None else channel_id
-        )
 
-        try:
-            published = datetime.fromisoformat(published_str)
-        except (ValueError, TypeError):
-            published = datetime.now(timezone.utc)
-
-        if video_id and title:
-            videos.append(
-                VideoEntry(
-                    video_id=video_id,
-                    title=title,
-                    url=url,
-                    published=published,
-                    channel_id=entry_channel_id,
-                )
-            )
+def _parse_feed(xml_text: Union[str, bytes], channel_id: str) -> list[VideoEntry]:
+    """RSSフィードのXMLをパースして動画エントリのリストを返す。"""
+    return list(iter_feed(xml_text, channel_id))
 
-    return videos
+
+def _parse_entry(entry: ET.Element, channel_id: str) -> Optional[VideoEntry]:
+    """entry 要素を動画エントリに変換する。動画IDかタイトルがなければNoneを返す。"""
+    video_id = title = url = published_str = ""
+    entry_channel_id = None
+    # 子要素を1度だけ走査して必要な値を取り出す
+    for child in entry:
+        tag = child.tag
+        if tag == VIDEO_ID_TAG:
+            video_id = child.text or ""
+        elif tag == TITLE_TAG:
+            title = child.text or ""
+        elif tag == LINK_TAG:
+            if not url and child.get("rel") == "alternate":
+                url = child.get("href", "")
+        elif tag == PUBLISHED_TAG:
+            published_str = child.text or ""
+        elif tag == CHANNEL_ID_TAG:
+            entry_channel_id = child.text or ""
+
+    if not video_id or not title:
+        return None
+
+    try:
+        published = datetime.fromisoformat(published_str)
+    except (ValueError, TypeError):
+        published = datetime.now(timezone.utc)
+
+    return VideoEntry(
+        video_id=video_id,
+        title=title,
+        url=url,
+        published=published,
+        channel_id=channel_id if entry_channel_id is None else entry_channel_id,
+    )
@@ -0,0 +1,245 @@
+import dataclasses
+import hashlib
+import json
+import logging
+import os
+import re
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Iterable, Mapping, Optional
+
+from src.exceptions import ConfigError
+from src.history_manager import HistoryBackend, create_history_manager, history_paths
+from src.models import AppSettings, ChannelConfig
+
+logger = logging.getLogger(__name__)
+
+SHARD_INDEX_ENV = "SHARD_INDEX"
+SHARD_COUNT_ENV = "SHARD_COUNT"
+
+# シャードごとの状態ファイルを置くディレクトリ（data/shards/<番号>-of-<シャード数>/）
+SHARDS_DIR = "shards"
+_SHARD_DIR_PATTERN = re.compile(r"^(\d+)-of-(\d+)$")
+# 取り込み済みの以前の配置の記録（シャードのデータディレクトリに置き、履歴と一緒にコミットする）
+IMPORTED_LAYOUTS_FILE = "imported_layouts.json"
+
+
+@dataclass(frozen=True)
+class Shard:
+    """監視対象チャンネルを count 個に分けたうちの index 番目（0始まり）。
+
+    チャンネルの割り当てはチャンネルIDのハッシュで決まり（rendezvous hashing）、
+    プロセス・マシンをまたいで同じ結果になる。シャード数を増減しても
+    割り当てが変わるのは約 1/シャード数 のチャンネルだけ。
+    """
+    index: int = 0
+    count: int = 1
+
+    def __post_init__(self):
+        if self.count < 1:
+            raise ConfigError(f"シャード数は1以上で指定してください: {self.count}")
+        if not 0 <= self.index < self.count:
+            raise ConfigError(
+                f"シャード番号は0以上{self.count - 1}以下で指定してください: {self.index}"
+            )
+
+    @property
+    def enabled(self) -> bool:
+        """複数のシャードに分けているかどうか"""
+        return self.count > 1
+
+    def owns(self, channel_id: str) -> bool:
+        """チャンネルがこのシャードの担当かどうか"""
+        return shard_of(channel_id, self.count) == self.index
+
+    def select(self, channels: Iterable[ChannelConfig]) -> list[ChannelConfig]:
+        """担当するチャンネルだけを返す。"""
+        return [channel for channel in channels if self.owns(channel.channel_id)]
+
+    def data_dir(self, base_dir: str = "data") -> str:
+        """状態ファイル（履歴・ジョブ・各キャッシュ）を置くディレクトリ。
+
+        シャードに分けない場合は従来どおり base_dir を使う。
+        """
+        if not self.enabled:
+            return base_dir
+        return os.path.join(base_dir, SHARDS_DIR, f"{self.index}-of-{self.count}")
+
+    def __str__(self) -> str:
+        return f"{self.index}/{self.count}"
+
+
+def shard_settings(settings: AppSettings, shard: Shard) -> AppSettings:
+    """シャードごとの設定を返す。
+
+    全シャードが同じ Gemini APIキーを使うため、毎分のリクエスト数・トークン数の上限を
+    シャード数で分ける（全シャードの合計が設定値を超えないようにする）。
+    """
+    if not shard.enabled:
+        return settings
+    return dataclasses.replace(
+        settings,
+        gemini_requests_per_minute=max(1, settings.gemini_requests_per_minute // shard.count),
+        gemini_tokens_per_minute=max(1, settings.gemini_tokens_per_minute // shard.count),
+    )
+
+
+def shard_of(channel_id: str, count: int) -> int:
+    """チャンネルを担当するシャード番号を返す。
+
+    シャードごとにチャンネルIDとのハッシュ値を求め、最大のシャードに割り当てる。
+    組み込みの hash() はプロセスごとに値が変わるため使わない。
+    """
+    if count <= 1:
+        return 0
+    return max(range(count), key=lambda index: _weight(index, channel_id))
+
+
+def _weight(index: int, channel_id: str) -> int:
+    digest = hashlib.blake2b(f"{index}:{channel_id}".encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "big")
+
+
+def resolve_shard(
+    index: Optional[int] = None,
+    count: Optional[int] = None,
+    environ: Optional[Mapping[str, str]] = None,
+) -> Shard:
+    """引数、または環境変数 SHARD_INDEX / SHARD_COUNT からシャードを決める。
+
+    どちらも指定されていなければシャードに分けない。
+
+    Raises:
+        ConfigError: 値が整数でない・範囲外の場合
+    """
+    environ = os.environ if environ is None else environ
+    if index is None:
+        index = _int_from_env(environ, SHARD_INDEX_ENV, 0)
+    if count is None:
+        count = _int_from_env(environ, SHARD_COUNT_ENV, 1)
+    return Shard(index, count)
+
+
+def _int_from_env(environ: Mapping[str, str], name: str, default: int) -> int:
+    value = environ.get(name, "").strip()
+    if not value:
+        return default
+    try:
+        return int(value)
+    except ValueError:
+        raise ConfigError(f"環境変数 {name} は整数で指定してください: {value}") from None
+
+
+def import_history(
+    history: HistoryBackend,
+    shard: Shard,
+    backend: str,
+    retention_days: int,
+    base_dir: str = "data",
+) -> int:
+    """シャード数の異なる（以前の）配置の履歴から、担当チャンネルの通知済み動画を取り込む。
+
+    シャード数を変更するとチャンネルの担当が移るため、移った先の履歴には
+    通知済みの動画が含まれない。以前の配置の履歴ファイルから取り込み、
+    二重通知を防ぐ（取り込み済みのエントリは何もしない）。同じ配置の他シャードは
+    担当チャンネルが重ならないため読まない。新しい配置の全シャードが1回以上
+    実行された後は、以前の配置の履歴ファイルを削除してよい。
+    保持期間を過ぎたエントリは保存時に削除されるため取り込まない。
+
+    取り込んだ配置は履歴ファイルのサイズとともに imported_layouts.json に記録し、
+    以降の実行ではファイルが変わっていない配置を読み込まない。記録は取り込んだ
+    履歴を保存してから書き出す。
+
+    Returns:
+        取り込んだエントリ数
+    """
+    own_dir = Path(shard.data_dir(base_dir))
+    marker_path = own_dir / IMPORTED_LAYOUTS_FILE
+    recorded = _load_imported_layouts(marker_path)
+    layouts: dict[str, dict[str, int]] = {}
+    cutoff = datetime.now(timezone.utc) - timedelta(days=retention_days)
+    imported = 0
+    for source_dir in _other_layouts(shard, base_dir):
+        if source_dir == own_dir:
+            continue
+        paths = [path for path in history_paths(backend, str(source_dir)) if path.exists()]
+        if not paths:
+            continue
+        key = source_dir.relative_to(base_dir).as_posix()
+        layouts[key] = {path.name: path.stat().st_size for path in paths}
+        if recorded.get(key) == layouts[key]:
+            continue
+        source = create_history_manager(backend, str(source_dir))
+        source.load()
+        try:
+            for video_id, info in source.entries():
+                channel_id = info.get("channel_id", "")
+                # チャンネルIDのない古いエントリは担当が分からないため取り込んでおく
+                if channel_id and not shard.owns(channel_id):
+                    continue
+                if _notified_before(info.get("notified_at"), cutoff):
+                    continue
+                if history.adopt(video_id, info):
+                    imported += 1
+        finally:
+            close = getattr(source, "close", None)
+            if close is not None:
+                close()
+        logger.info(
+            "以前のシャード配置の履歴を確認しました: %s（不要になったら削除してください）", source_dir
+        )
+    if imported:
+        logger.info("以前のシャード配置から通知履歴を%d件取り込みました", imported)
+        history.save()
+    if layouts != recorded:
+        _save_imported_layouts(marker_path, layouts)
+    return imported
+
+
+def _load_imported_layouts(path: Path) -> dict[str, dict[str, int]]:
+    try:
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError) as e:
+        logger.warning("取り込み済みの配置の記録を読み込めません（すべて取り込み直します）: %s", e)
+        return {}
+    return data.get("layouts", {}) if isinstance(data, dict) else {}
+
+
+def _save_imported_layouts(path: Path, layouts: dict[str, dict[str, int]]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"layouts": layouts}, f, ensure_ascii=False, indent=2, sort_keys=True)
+
+
+def _notified_before(value, cutoff: datetime) -> bool:
+    try:
+        notified_at = datetime.fromisoformat(value)
+    except (ValueError, TypeError):
+        return True
+    if notified_at.tzinfo is None:
+        notified_at = notified_at.replace(tzinfo=timezone.utc)
+    return notified_at < cutoff
+
+
+def _other_layouts(shard: Shard, base_dir: str) -> list[Path]:
+    """シャード数が異なる配置のデータディレクトリを返す。
+
+    シャードに分けない場合の保存先は base_dir のため、shards/0-of-1 に残った
+    履歴も以前の配置として扱う。
+    """
+    dirs = []
+    if shard.enabled:
+        dirs.append(Path(base_dir))
+    shards_dir = Path(base_dir) / SHARDS_DIR
+    if shards_dir.is_dir():
+        for path in sorted(shards_dir.iterdir()):
+            match = _SHARD_DIR_PATTERN.match(path.name)
+            if not (path.is_dir() and match):
+                continue
+            if int(match.group(2)) != shard.count or not shard.enabled:
+                dirs.append(path)
+    return dirs
@@ -1,10 +1,21 @@
+import asyncio
+import json
 import logging
 import re
+import threading
 import time
+from typing import Callable, Optional
 
+import aiohttp
 import requests
 
-from src.exceptions import RateLimitError, SummarizerError, TokenLimitError
+from src.exceptions import (
+    RateLimitError,
+    SummarizerError,
+    SummarizerUnavailableError,
+    TokenLimitError,
+)
+from src.http_client import get_session
 
 logger = logging.getLogger(__name__)
 
@@ -15,12 +26,122 @@ ENDPOINT = f"https://generativelanguage.googleapis.com/v1beta/models/{MODEL}:gen
 MAX_RETRIES = 2
 BACKOFF_SECONDS = [10, 30]
 
+# レートリミット設定（Gemini API 無料枠の既定値）
+DEFAULT_REQUESTS_PER_MINUTE = 15
+DEFAULT_TOKENS_PER_MINUTE = 250000
+
+# 429応答時の再試行設定。再試行指示がこの秒数を超える場合（日次上限など）は再試行しない
+MAX_RATE_LIMIT_RETRIES = 2
+MAX_RATE_LIMIT_WAIT_SECONDS = 120
+DEFAULT_RATE_LIMIT_WAIT_SECONDS = 60
+
+
+class RateLimiter:
+    """Gemini APIのリクエスト数・トークン数の毎分上限を守るトークンバケット。
+
+    リクエスト数は呼び出し前に1つ消費し、トークン数は呼び出し後に
+    usageMetadata.totalTokenCount の実績値で消費する（残量がマイナスの間は
+    回復するまで次の呼び出しを待たせる）。サーバーから再試行までの待機を
+    指示された場合は defer() でその時刻まで全呼び出しを止める。
+
+    複数スレッドから共有できる。
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: int = DEFAULT_REQUESTS_PER_MINUTE,
+        tokens_per_minute: int = DEFAULT_TOKENS_PER_MINUTE,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self._requests_per_second = requests_per_minute / 60
+        self._tokens_per_second = tokens_per_minute / 60
+        self._max_requests = float(requests_per_minute)
+        self._max_tokens = float(tokens_per_minute)
+        self._clock = clock
+        self._available_requests = self._max_requests
+        self._available_tokens = self._max_tokens
+        self._blocked_until = 0.0
+        self._updated_at = clock()
+        self._lock = threading.Lock()
+
+    def try_acquire(self) -> float:
+        """空きがあればリクエスト枠を1つ消費して0を返す。なければ必要な待機秒数を返す。"""
+        with self._lock:
+            now = self._clock()
+            self._refill(now)
+
+            waits = [self._blocked_until - now]
+            if self._available_requests < 1:
+                waits.append((1 - self._available_requests) / self._requests_per_second)
+            if self._available_tokens < 0:
+                waits.append(-self._available_tokens / self._tokens_per_second)
+
+            wait = max(waits)
+            if wait > 0:
+                return wait
+            self._available_requests -= 1
+            return 0.0
+
+    def acquire(self) -> float:
+        """リクエスト枠が空くまでブロックして待つ。
+
+        Returns:
+            待機した秒数
+        """
+        waited = 0.0
+        while True:
+            wait = self.try_acquire()
+            if wait <= 0:
+                return waited
+            time.sleep(wait)
+            waited += wait
+
+    async def acquire_async(self) -> float:
+        """リクエスト枠が空くまで非同期に待つ（acquire の asyncio 版）。"""
+        waited = 0.0
+        while True:
+            wait = self.try_acquire()
+            if wait <= 0:
+                return waited
+            await asyncio.sleep(wait)
+            waited += wait
+
+    def record_usage(self, total_tokens: int) -> None:
+        """API呼び出しで消費したトークン数を記録する。"""
+        with self._lock:
+            self._refill(self._clock())
+            self._available_tokens -= total_tokens
+
+    def defer(self, seconds: float) -> None:
+        """指定秒数が経過するまで以降の呼び出しを待たせる（サーバーの再試行指示用）。"""
+        with self._lock:
+            self._blocked_until = max(self._blocked_until, self._clock() + seconds)
+
+    def deferred_seconds(self) -> float:
+        """defer() で指示された待機の残り秒数を返す。待機中でなければ0を返す。"""
+        with self._lock:
+            return max(0.0, self._blocked_until - self._clock())
+
+    def _refill(self, now: float) -> None:
+        elapsed = max(0.0, now - self._updated_at)
+        self._updated_at = now
+        self._available_requests = min(
+            self._max_requests,
+            self._available_requests + elapsed * self._requests_per_second,
+        )
+        self._available_tokens = min(
+            self._max_tokens,
+            self._available_tokens + elapsed * self._tokens_per_second,
+        )
+
 
 def summarize(
     video_url: str,
     prompt_template: str,
     api_key: str,
     max_length: int = 3500,
+    session: Optional[requests.Session] = None,
+    rate_limiter: Optional[RateLimiter] = None,
 ) -> str:
     """Gemini APIで動画を要約する。
 
@@ -29,6 +150,9 @@ def summarize(
         prompt_template: 要約プロンプト
         api_key: Gemini APIキー
         max_length: 要約の最大文字数
+        session: HTTPセッション。省略時はプロセス共通のセッションを使う
+        rate_limiter: 指定時はAPI呼び出しごとに枠が空くまで待ち、
+            レートリミット(429)の再試行指示に従って再試行する
 
     Returns:
         要約テキスト（Markdown形式）
@@ -40,34 +164,19 @@ def summarize(
     for is_fallback in [False, True]:
         prompt = _build_fallback_prompt(video_url) if is_fallback else prompt_template
 
-        request_body = {
-            "contents": [
-                {
-                    "parts": [
-                        {"text": prompt},
-                        {
-                            "fileData": {
-                                "mimeType": "video/*",
-                                "fileUri": video_url,
-                            }
-                        },
-                    ]
-                }
-            ],
-            "generationConfig": {
-                "temperature": 0.7,
-                "maxOutputTokens": 65536,
-            },
-        }
-
-        response_data = _call_api_with_retry(api_key, request_body, video_url)
+        request_body = _build_request_body(prompt, video_url)
+
+        response_data = _call_api_with_retry(
+            api_key, request_body, video_url, session, rate_limiter
+        )
         raw_output, finish_reason = _extract_summary(response_data, video_url)
 
         if finish_reason == "MAX_TOKENS" and not is_fallback:
             logger.warning(
                 "MAX_TOKENSで出力が途中終了 - 短縮プロンプトで再試行: %s", video_url
             )
-            time.sleep(4)
+            if rate_limiter is None:
+                time.sleep(4)
             continue
 
         # GeminiがMarkdownコードブロックで囲む場合があるので除去
@@ -85,15 +194,94 @@ def summarize(
     raise SummarizerError(f"HTML生成に失敗: {video_url}")
 
 
+async def summarize_async(
+    video_url: str,
+    prompt_template: str,
+    api_key: str,
+    session: aiohttp.ClientSession,
+    max_length: int = 3500,
+    rate_limiter: Optional[RateLimiter] = None,
+) -> str:
+    """summarize の asyncio 版。待機・再試行の間もイベントループを止めない。
+
+    Raises:
+        SummarizerError: API呼び出し失敗時
+        RateLimitError: レートリミット超過時（429）
+    """
+    for is_fallback in [False, True]:
+        prompt = _build_fallback_prompt(video_url) if is_fallback else prompt_template
+        request_body = _build_request_body(prompt, video_url)
+
+        response_data = await _call_api_with_retry_async(
+            api_key, request_body, video_url, session, rate_limiter
+        )
+        raw_output, finish_reason = _extract_summary(response_data, video_url)
+
+        if finish_reason == "MAX_TOKENS" and not is_fallback:
+            logger.warning(
+                "MAX_TOKENSで出力が途中終了 - 短縮プロンプトで再試行: %s", video_url
+            )
+            if rate_limiter is None:
+                await asyncio.sleep(4)
+            continue
+
+        html_content = _extract_html(raw_output)
+
+        logger.info(
+            "HTML生成完了 - 動画URL: %s (%d文字)%s",
+            video_url,
+            len(html_content),
+            " [短縮プロンプト]" if is_fallback else "",
+        )
+        return html_content
+
+    raise SummarizerError(f"HTML生成に失敗: {video_url}")
+
+
+def _build_request_body(prompt: str, video_url: str) -> dict:
+    return {
+        "contents": [
+            {
+                "parts": [
+                    {"text": prompt},
+                    {
+                        "fileData": {
+                            "mimeType": "video/*",
+                            "fileUri": video_url,
+                        }
+                    },
+                ]
+            }
+        ],
+        "generationConfig": {
+            "temperature": 0.7,
+            "maxOutputTokens": 65536,
+        },
+    }
+
+
 def _call_api_with_retry(
-    api_key: str, request_body: dict, video_url: str
+    api_key: str,
+    request_body: dict,
+    video_url: str,
+    session: Optional[requests.Session] = None,
+    rate_limiter: Optional[RateLimiter] = None,
 ) -> dict:
     """リトライ付きでGemini APIを呼び出す。"""
+    if session is None:
+        session = get_session()
     last_error = None
+    rate_limit_retries = 0
+    attempt = 0
+
+    while attempt < MAX_RETRIES:
+        if rate_limiter is not None:
+            waited = rate_limiter.acquire()
+            if waited > 0:
+                logger.info("%.1f秒待機（API レートリミット対策）", waited)
 
-    for attempt in range(MAX_RETRIES):
         try:
-            response = requests.post(
+            response = session.post(
                 ENDPOINT,
                 params={"key": api_key},
                 json=request_body,
@@ -101,17 +289,40 @@ def _call_api_with_retry(
             )
 
             if response.status_code == 200:
-                return response.json()
+                response_data = response.json()
+                if rate_limiter is not None:
+                    usage = response_data.get("usageMetadata", {})
+                    rate_limiter.record_usage(usage.get("totalTokenCount", 0))
+                return response_data
 
-            # 429: レートリミット — リトライせず即座に例外
+            # 429: レートリミット — 再試行指示の時刻まで以降の呼び出しを止め、指示が短ければ待って再試行
             if response.status_code == 429:
+                retry_after = _get_retry_delay(response)
+                wait = retry_after if retry_after is not None else DEFAULT_RATE_LIMIT_WAIT_SECONDS
+                if rate_limiter is not None:
+                    # 長い指示（1日の上限超過など）も記録し、以降の呼び出しを指示の時刻まで止める
+                    rate_limiter.defer(wait)
+                    if (
+                        rate_limit_retries < MAX_RATE_LIMIT_RETRIES
+                        and wait <= MAX_RATE_LIMIT_WAIT_SECONDS
+                    ):
+                        rate_limit_retries += 1
+                        logger.warning(
+                            "Gemini APIレートリミット - %.0f秒後に再試行 (%d/%d): %s",
+                            wait,
+                            rate_limit_retries,
+                            MAX_RATE_LIMIT_RETRIES,
+                            video_url,
+                        )
+                        continue
                 raise RateLimitError(
-                    f"Gemini APIレートリミット超過: {video_url}"
+                    f"Gemini APIレートリミット超過: {video_url}",
+                    retry_after=retry_after,
                 )
 
             # 403: APIキー無効 — リトライせず即座に例外
             if response.status_code == 403:
-                raise SummarizerError(
+                raise SummarizerUnavailableError(
                     f"Gemini APIキーが無効または権限不足(HTTP 403): {video_url}"
                 )
 
@@ -127,12 +338,12 @@ def _call_api_with_retry(
                 )
 
             # 5xx: サーバーエラー — リトライ
-            last_error = SummarizerError(
+            last_error = SummarizerUnavailableError(
                 f"Gemini APIエラー(HTTP {response.status_code}): {video_url}"
             )
 
         except requests.exceptions.RequestException as e:
-            last_error = SummarizerError(
+            last_error = SummarizerUnavailableError(
                 f"Gemini APIネットワークエラー: {video_url}: {e}"
             )
 
@@ -146,6 +357,106 @@ def _call_api_with_retry(
                 video_url,
             )
             time.sleep(wait)
+        attempt += 1
+
+    raise last_error
+
+
+async def _call_api_with_retry_async(
+    api_key: str,
+    request_body: dict,
+    video_url: str,
+    session: aiohttp.ClientSession,
+    rate_limiter: Optional[RateLimiter] = None,
+) -> dict:
+    """_call_api_with_retry の asyncio 版。応答ごとの扱いは同期版と同じ。"""
+    last_error = None
+    rate_limit_retries = 0
+    attempt = 0
+
+    while attempt < MAX_RETRIES:
+        if rate_limiter is not None:
+            waited = await rate_limiter.acquire_async()
+            if waited > 0:
+                logger.info("%.1f秒待機（API レートリミット対策）", waited)
+
+        try:
+            async with session.post(
+                ENDPOINT,
+                params={"key": api_key},
+                json=request_body,
+                timeout=aiohttp.ClientTimeout(total=600),
+            ) as response:
+                status = response.status
+                headers = response.headers
+                text = await response.text()
+
+            if status == 200:
+                response_data = _json_or_none(text)
+                if response_data is None:
+                    raise SummarizerError(f"Gemini APIレスポンスの解析に失敗: {video_url}")
+                if rate_limiter is not None:
+                    usage = response_data.get("usageMetadata", {})
+                    rate_limiter.record_usage(usage.get("totalTokenCount", 0))
+                return response_data
+
+            if status == 429:
+                retry_after = _retry_delay_from(headers, _json_or_none(text))
+                wait = retry_after if retry_after is not None else DEFAULT_RATE_LIMIT_WAIT_SECONDS
+                if rate_limiter is not None:
+                    # 長い指示（1日の上限超過など）も記録し、以降の呼び出しを指示の時刻まで止める
+                    rate_limiter.defer(wait)
+                    if (
+                        rate_limit_retries < MAX_RATE_LIMIT_RETRIES
+                        and wait <= MAX_RATE_LIMIT_WAIT_SECONDS
+                    ):
+                        rate_limit_retries += 1
+                        logger.warning(
+                            "Gemini APIレートリミット - %.0f秒後に再試行 (%d/%d): %s",
+                            wait,
+                            rate_limit_retries,
+                            MAX_RATE_LIMIT_RETRIES,
+                            video_url,
+                        )
+                        continue
+                raise RateLimitError(
+                    f"Gemini APIレートリミット超過: {video_url}",
+                    retry_after=retry_after,
+                )
+
+            if status == 403:
+                raise SummarizerUnavailableError(
+                    f"Gemini APIキーが無効または権限不足(HTTP 403): {video_url}"
+                )
+
+            if status == 400:
+                error_msg = _error_message_from(_json_or_none(text), text)
+                if "token" in error_msg.lower() and "exceed" in error_msg.lower():
+                    raise TokenLimitError(
+                        f"動画が長すぎてGemini APIのトークン上限を超過: {video_url}"
+                    )
+                raise SummarizerError(
+                    f"Gemini APIリクエストエラー(HTTP 400): {video_url}: {error_msg}"
+                )
+
+            last_error = SummarizerUnavailableError(f"Gemini APIエラー(HTTP {status}): {video_url}")
+
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            last_error = SummarizerUnavailableError(
+                f"Gemini APIネットワークエラー: {video_url}: {e}"
+            )
+
+        if attempt < MAX_RETRIES - 1:
+            wait = BACKOFF_SECONDS[attempt]
+            logger.warning(
+                "Gemini APIリトライ %d/%d - %d秒待機: %s",
+                attempt + 1,
+                MAX_RETRIES,
+                wait,
+                video_url,
+            )
+            await asyncio.sleep(wait)
+        attempt += 1
 
     raise last_error
 
@@ -243,10 +554,55 @@ def _extract_html(raw_output: str) -> str:
     raise SummarizerError("Gemini APIの出力にHTMLが含まれていません")
 
 
+def _get_retry_delay(response: requests.Response) -> Optional[float]:
+    """429応答から再試行までの秒数を取得する。指示がない場合はNoneを返す。
+
+    Retry-Afterヘッダ、またはエラー詳細の RetryInfo.retryDelay（例: "32s"）を参照する。
+    """
+    try:
+        data = response.json()
+    except ValueError:
+        data = None
+    return _retry_delay_from(response.headers, data)
+
+
+def _retry_delay_from(headers, data) -> Optional[float]:
+    """応答ヘッダとJSON本文から再試行までの秒数を取得する（同期版・非同期版で共通）。"""
+    retry_after = headers.get("Retry-After")
+    if retry_after:
+        try:
+            return float(retry_after)
+        except ValueError:
+            pass
+
+    try:
+        details = data.get("error", {}).get("details", [])
+        for detail in details:
+            if detail.get("@type", "").endswith("google.rpc.RetryInfo"):
+                return float(detail.get("retryDelay", "").rstrip("s"))
+    except (ValueError, AttributeError, TypeError):
+        pass
+    return None
+
+
 def _extract_error_message(response: requests.Response) -> str:
     """エラーレスポンスからメッセージを抽出する。"""
     try:
         data = response.json()
-        return data.get("error", {}).get("message", response.text[:200])
-    except (ValueError, KeyError):
-        return response.text[:200]
+    except ValueError:
+        data = None
+    return _error_message_from(data, response.text)
+
+
+def _error_message_from(data, text: str) -> str:
+    try:
+        return data.get("error", {}).get("message", text[:200])
+    except (AttributeError, KeyError):
+        return text[:200]
+
+
+def _json_or_none(text: str):
+    try:
+        return json.loads(text)
+    except ValueError:
+        return None
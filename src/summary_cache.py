@@ -0,0 +1,202 @@
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_ENTRIES = 200
+DEFAULT_MAX_AGE_DAYS = 7
+
+INDEX_FILE = "index.json"
+
+
+def prompt_hash(prompt: str) -> str:
+    """プロンプトを識別する短いハッシュ値を返す。"""
+    return hashlib.sha256(prompt.encode("utf-8")).hexdigest()[:16]
+
+
+class SummaryCache:
+    """Geminiが生成したHTMLを (動画ID, プロンプトのハッシュ, モデル) ごとに保存する。
+
+    要約後の画像生成・通知に失敗した動画を次回再処理する際に、
+    Gemini APIを再度呼び出さずに済ませるためのキャッシュ。
+    HTMLは1件1ファイルで保存し、メタデータは index.json で管理する。
+    保存時に最大保持日数を過ぎたもの・件数上限を超えた古いものから削除する。
+    """
+
+    def __init__(
+        self,
+        cache_dir: str = "data/summary_cache",
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        max_age_days: float = DEFAULT_MAX_AGE_DAYS,
+    ):
+        self._dir = Path(cache_dir)
+        self._max_entries = max_entries
+        self._max_age_seconds = max_age_days * 24 * 60 * 60
+        # キー -> {"video_id", "channel_id", "prompt_hash", "model", "created_at"}
+        self._index: dict[str, dict] = {}
+        self._lock = threading.Lock()
+
+    def load(self) -> None:
+        """インデックスを読み込む。存在しない・破損している場合は空で初期化する。"""
+        index_path = self._dir / INDEX_FILE
+        if not index_path.exists():
+            self._index = {}
+            return
+
+        try:
+            with open(index_path, encoding="utf-8") as f:
+                data = json.load(f)
+            self._index = data.get("entries", {})
+            logger.info("要約キャッシュ読み込み完了 - 登録数: %d", len(self._index))
+        except (json.JSONDecodeError, AttributeError) as e:
+            logger.warning("要約キャッシュが破損しています。空の状態で初期化します: %s", e)
+            self._index = {}
+
+    def get(self, video_id: str, prompt: str, model: str) -> Optional[str]:
+        """キャッシュ済みのHTMLを返す。未登録・期限切れの場合はNoneを返す。"""
+        key = _cache_key(video_id, prompt_hash(prompt), model)
+        with self._lock:
+            entry = self._index.get(key)
+            if entry is None or self._is_expired(entry, time.time()):
+                return None
+        try:
+            return self._html_path(key).read_text(encoding="utf-8")
+        except OSError:
+            with self._lock:
+                self._index.pop(key, None)
+            return None
+
+    def put(
+        self,
+        video_id: str,
+        channel_id: str,
+        prompt: str,
+        model: str,
+        html_content: str,
+    ) -> None:
+        """生成したHTMLを保存する。"""
+        digest = prompt_hash(prompt)
+        key = _cache_key(video_id, digest, model)
+        try:
+            self._dir.mkdir(parents=True, exist_ok=True)
+            _write_text_atomic(self._html_path(key), html_content)
+        except OSError as e:
+            logger.warning("要約キャッシュの保存に失敗: %s: %s", video_id, e)
+            return
+
+        with self._lock:
+            self._index[key] = {
+                "video_id": video_id,
+                "channel_id": channel_id,
+                "prompt_hash": digest,
+                "model": model,
+                "created_at": time.time(),
+            }
+        # 実行が途中で中断されても生成済みのHTMLを再利用できるよう、その都度書き出す
+        try:
+            self._write_index()
+        except OSError as e:
+            logger.warning("要約キャッシュのインデックス保存に失敗: %s", e)
+
+    def invalidate_changed_prompts(self, prompts: dict[str, str]) -> int:
+        """チャンネルのプロンプトが変更されたエントリを削除する。
+
+        Args:
+            prompts: チャンネルID -> 現在のプロンプト
+
+        Returns:
+            削除したエントリ数
+        """
+        current = {channel_id: prompt_hash(p) for channel_id, p in prompts.items()}
+        with self._lock:
+            stale = [
+                key
+                for key, entry in self._index.items()
+                if entry.get("channel_id") in current
+                and entry.get("prompt_hash") != current[entry["channel_id"]]
+            ]
+        self._remove(stale)
+        if stale:
+            logger.info("プロンプト変更により要約キャッシュを%d件削除しました", len(stale))
+        return len(stale)
+
+    def invalidate_channel(self, channel_id: str) -> int:
+        """指定チャンネルのエントリをすべて削除する。
+
+        Returns:
+            削除したエントリ数
+        """
+        with self._lock:
+            keys = [k for k, v in self._index.items() if v.get("channel_id") == channel_id]
+        self._remove(keys)
+        return len(keys)
+
+    def save(self) -> None:
+        """期限切れ・件数超過のエントリを削除してインデックスを保存する。"""
+        now = time.time()
+        with self._lock:
+            expired = [k for k, v in self._index.items() if self._is_expired(v, now)]
+            expired_keys = set(expired)
+            alive = sorted(
+                (k for k in self._index if k not in expired_keys),
+                key=lambda k: self._index[k].get("created_at", 0),
+            )
+            overflow = alive[: max(0, len(alive) - self._max_entries)]
+        self._remove(expired + overflow)
+        count = self._write_index()
+        logger.info("要約キャッシュ保存完了 - 登録数: %d", count)
+
+    def _write_index(self) -> int:
+        """インデックスをファイルに書き出し、登録数を返す。"""
+        self._dir.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            _write_text_atomic(
+                self._dir / INDEX_FILE,
+                json.dumps({"entries": self._index}, ensure_ascii=False, indent=2),
+            )
+            return len(self._index)
+
+    def _remove(self, keys: list[str]) -> None:
+        with self._lock:
+            for key in keys:
+                self._index.pop(key, None)
+        for key in keys:
+            try:
+                self._html_path(key).unlink(missing_ok=True)
+            except OSError as e:
+                logger.warning("要約キャッシュの削除に失敗: %s: %s", key, e)
+
+    def _is_expired(self, entry: dict, now: float) -> bool:
+        try:
+            return now - float(entry["created_at"]) >= self._max_age_seconds
+        except (KeyError, TypeError, ValueError):
+            return True
+
+    def _html_path(self, key: str) -> Path:
+        return self._dir / f"{key}.html"
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._index)
+
+
+def _cache_key(video_id: str, digest: str, model: str) -> str:
+    return hashlib.sha256(f"{video_id}\0{digest}\0{model}".encode("utf-8")).hexdigest()
+
+
+def _write_text_atomic(path: Path, text: str) -> None:
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=".tmp_")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(text)
+        os.replace(tmp_path, path)
+    except BaseException:
+        Path(tmp_path).unlink(missing_ok=True)
+        raise
@@ -1,33 +1,180 @@
+import asyncio
 import logging
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime
 from typing import Optional
 
+import aiohttp
 import requests
 
-from src.models import VideoEntry
+from src.http_client import get_session
+from src.models import FilterStats, VideoEntry
+from src.oembed_cache import OEmbedCache
 
 logger = logging.getLogger(__name__)
 
 OEMBED_URL = "https://www.youtube.com/oembed"
 TIMEOUT_SECONDS = 10
 
+# oEmbed並列取得の設定
+DEFAULT_MAX_WORKERS = 4
+DEFAULT_DEADLINE_SECONDS = 30
+
 LIVE_KEYWORDS = ["【live】", "【ライブ】", "live stream", "生配信", "生放送"]
 
 
-def filter_videos(videos: list[VideoEntry]) -> list[VideoEntry]:
+def filter_videos(
+    videos: list[VideoEntry],
+    session: Optional[requests.Session] = None,
+    cache: Optional[OEmbedCache] = None,
+    published_after: Optional[datetime] = None,
+    stats: Optional[FilterStats] = None,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    deadline_seconds: float = DEFAULT_DEADLINE_SECONDS,
+    unclassified: Optional[list[VideoEntry]] = None,
+) -> list[VideoEntry]:
     """Shorts・ライブ配信を除外する。
 
+    ネットワークを使わない判定（公開日時・タイトルのライブキーワード）を先に行い、
+    残った動画だけoEmbed APIで判定する。oEmbed APIは最大 max_workers 件を
+    並列に呼び出す。deadline_seconds を過ぎても応答のない動画はShorts・ライブか
+    判定できないため、戻り値に含めず unclassified に追加する（次回の実行で判定し直す）。
+    返すリストの順序は入力の順序を保つ。
+
     Args:
         videos: フィルタリング前の動画リスト
+        session: HTTPセッション。省略時はプロセス共通のセッションを使う
+        cache: oEmbedキャッシュ。指定時はキャッシュ済みの動画でAPIを呼ばない
+        published_after: この日時より前に公開された動画を除外する
+        stats: 指定時は段階ごとの除外件数・API呼び出し件数を加算する
+        max_workers: oEmbed APIの同時呼び出し数の上限（1以下で逐次実行）
+        deadline_seconds: oEmbed API呼び出し全体の制限時間（秒）
+        unclassified: 指定時は制限時間内に判定できなかった動画を入力順に追加する
 
     Returns:
         通常動画のみのリスト
     """
-    result = []
-    shorts_count = 0
+    if stats is None:
+        stats = FilterStats()
+
+    # 1. ローカル判定とキャッシュ参照
+    candidates, oembeds, to_fetch, old_count, live_count = _prefilter(
+        videos, cache, published_after, stats
+    )
+
+    # 2. キャッシュにない動画のみoEmbed APIで取得
+    stats.oembed_requests += len(to_fetch)
+    fetched, timed_out = _fetch_oembeds(to_fetch, session, max_workers, deadline_seconds)
+    _store_oembeds(fetched, oembeds, cache)
+
+    # 3. 入力順にShorts・ライブ判定
+    return _classify(candidates, oembeds, old_count, live_count, timed_out, unclassified)
+
+
+async def filter_videos_async(
+    videos: list[VideoEntry],
+    session: aiohttp.ClientSession,
+    cache: Optional[OEmbedCache] = None,
+    published_after: Optional[datetime] = None,
+    stats: Optional[FilterStats] = None,
+    max_concurrency: int = DEFAULT_MAX_WORKERS,
+    deadline_seconds: float = DEFAULT_DEADLINE_SECONDS,
+    unclassified: Optional[list[VideoEntry]] = None,
+) -> list[VideoEntry]:
+    """filter_videos の asyncio 版。oEmbed APIをスレッドを使わずに並列に呼び出す。
+
+    判定の順序・キャッシュ・集計・制限時間の扱いは filter_videos と同じ。
+    """
+    if stats is None:
+        stats = FilterStats()
+
+    candidates, oembeds, to_fetch, old_count, live_count = _prefilter(
+        videos, cache, published_after, stats
+    )
+
+    stats.oembed_requests += len(to_fetch)
+    fetched, timed_out = await _fetch_oembeds_async(
+        to_fetch, session, max_concurrency, deadline_seconds
+    )
+    _store_oembeds(fetched, oembeds, cache)
+
+    return _classify(candidates, oembeds, old_count, live_count, timed_out, unclassified)
+
+
+def _prefilter(
+    videos: list[VideoEntry],
+    cache: Optional[OEmbedCache],
+    published_after: Optional[datetime],
+    stats: FilterStats,
+) -> tuple[list[VideoEntry], dict[str, Optional[dict]], list[VideoEntry], int, int]:
+    """ネットワークを使わない判定とキャッシュ参照を行う。
+
+    Returns:
+        (判定対象の動画, 動画IDごとのoEmbed, oEmbed APIで取得する動画,
+         除外(公開日時)の件数, 除外(ライブ)の件数)
+    """
+    old_count = 0
     live_count = 0
+    candidates: list[VideoEntry] = []
+    oembeds: dict[str, Optional[dict]] = {}
+    to_fetch: list[VideoEntry] = []
 
     for video in videos:
-        oembed = _fetch_oembed(video)
+        if published_after is not None and video.published < published_after:
+            old_count += 1
+            stats.too_old_skipped += 1
+            continue
+        if _is_live_stream(video, None):
+            live_count += 1
+            stats.title_live_skipped += 1
+            continue
+
+        candidates.append(video)
+        cached = cache.get(video.video_id) if cache is not None else None
+        if cached is not None:
+            stats.oembed_cache_hits += 1
+            oembeds[video.video_id] = cached
+        elif video.video_id not in oembeds:
+            oembeds[video.video_id] = None
+            to_fetch.append(video)
+
+    return candidates, oembeds, to_fetch, old_count, live_count
+
+
+def _store_oembeds(
+    fetched: dict[str, Optional[dict]],
+    oembeds: dict[str, Optional[dict]],
+    cache: Optional[OEmbedCache],
+) -> None:
+    for video_id, oembed in fetched.items():
+        oembeds[video_id] = oembed
+        if oembed is not None and cache is not None:
+            cache.put(video_id, oembed)
+
+
+def _classify(
+    candidates: list[VideoEntry],
+    oembeds: dict[str, Optional[dict]],
+    old_count: int,
+    live_count: int,
+    timed_out: set[str],
+    unclassified: Optional[list[VideoEntry]],
+) -> list[VideoEntry]:
+    """入力順にShorts・ライブ判定を行い、通常動画のみ返す。
+
+    oEmbedの取得が制限時間に間に合わなかった動画は判定せず unclassified に追加する。
+    """
+    shorts_count = 0
+    unclassified_count = 0
+    result = []
+    for video in candidates:
+        if video.video_id in timed_out:
+            unclassified_count += 1
+            if unclassified is not None:
+                unclassified.append(video)
+            continue
+        oembed = oembeds.get(video.video_id)
         if _is_short(oembed):
             shorts_count += 1
             continue
@@ -37,18 +184,85 @@ def filter_videos(videos: list[VideoEntry]) -> list[VideoEntry]:
         result.append(video)
 
     logger.info(
-        "フィルタ後 - 通常動画: %d, 除外(Shorts): %d, 除外(ライブ): %d",
+        "フィルタ後 - 通常動画: %d, 除外(Shorts): %d, 除外(ライブ): %d, 除外(公開日時): %d, "
+        "判定保留(oEmbed制限時間超過): %d",
         len(result),
         shorts_count,
         live_count,
+        old_count,
+        unclassified_count,
     )
     return result
 
 
-def _fetch_oembed(video: VideoEntry) -> Optional[dict]:
+def _fetch_oembeds(
+    videos: list[VideoEntry],
+    session: Optional[requests.Session],
+    max_workers: int,
+    deadline_seconds: float,
+) -> tuple[dict[str, Optional[dict]], set[str]]:
+    """複数動画のoEmbed情報を取得する。
+
+    Returns:
+        (動画IDごとのoEmbed（取得失敗はNone）, 制限時間内に取得を終えられなかった動画ID)
+    """
+    results: dict[str, Optional[dict]] = {}
+    if not videos:
+        return results, set()
+
+    deadline = time.monotonic() + deadline_seconds
+
+    if max_workers <= 1 or len(videos) == 1:
+        for i, video in enumerate(videos):
+            if time.monotonic() >= deadline:
+                logger.warning(
+                    "oEmbed取得の制限時間(%.0f秒)を超過 - 未取得: %d件",
+                    deadline_seconds,
+                    len(videos) - i,
+                )
+                return results, {v.video_id for v in videos[i:]}
+            results[video.video_id] = _fetch_oembed(video, session)
+        return results, set()
+
+    executor = ThreadPoolExecutor(
+        max_workers=min(max_workers, len(videos)), thread_name_prefix="oembed"
+    )
+    pending: dict = {}
+    try:
+        pending = {
+            executor.submit(_fetch_oembed, video, session): video for video in videos
+        }
+        while pending:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            done, _ = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+            for future in done:
+                video = pending.pop(future)
+                results[video.video_id] = future.result()
+
+        if pending:
+            logger.warning(
+                "oEmbed取得の制限時間(%.0f秒)を超過 - 未取得: %d件",
+                deadline_seconds,
+                len(pending),
+            )
+    finally:
+        # 制限時間を過ぎた呼び出しの完了は待たない
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    return results, {video.video_id for video in pending.values()}
+
+
+def _fetch_oembed(
+    video: VideoEntry,
+    session: Optional[requests.Session] = None,
+) -> Optional[dict]:
     """oEmbed APIで動画情報を取得する。失敗時はNoneを返す。"""
+    if session is None:
+        session = get_session()
     try:
-        resp = requests.get(
+        resp = session.get(
             OEMBED_URL,
             params={"url": video.url, "format": "json"},
             timeout=TIMEOUT_SECONDS,
@@ -60,6 +274,55 @@ def _fetch_oembed(video: VideoEntry) -> Optional[dict]:
     return None
 
 
+async def _fetch_oembeds_async(
+    videos: list[VideoEntry],
+    session: aiohttp.ClientSession,
+    max_concurrency: int,
+    deadline_seconds: float,
+) -> tuple[dict[str, Optional[dict]], set[str]]:
+    """_fetch_oembeds の asyncio 版。戻り値は _fetch_oembeds と同じ。"""
+    results: dict[str, Optional[dict]] = {}
+    if not videos:
+        return results, set()
+
+    semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+    async def fetch(video: VideoEntry) -> None:
+        async with semaphore:
+            results[video.video_id] = await _fetch_oembed_async(video, session)
+
+    tasks = {asyncio.create_task(fetch(video)): video for video in videos}
+    _, pending = await asyncio.wait(tasks, timeout=deadline_seconds)
+    if pending:
+        logger.warning(
+            "oEmbed取得の制限時間(%.0f秒)を超過 - 未取得: %d件",
+            deadline_seconds,
+            len(pending),
+        )
+        # 制限時間を過ぎた呼び出しは取り消す
+        for task in pending:
+            task.cancel()
+    return results, {tasks[task].video_id for task in pending}
+
+
+async def _fetch_oembed_async(
+    video: VideoEntry,
+    session: aiohttp.ClientSession,
+) -> Optional[dict]:
+    """_fetch_oembed の asyncio 版。失敗時はNoneを返す。"""
+    try:
+        async with session.get(
+            OEMBED_URL,
+            params={"url": video.url, "format": "json"},
+            timeout=aiohttp.ClientTimeout(total=TIMEOUT_SECONDS),
+        ) as resp:
+            if resp.status == 200:
+                return await resp.json(content_type=None)
+    except (aiohttp.ClientError, asyncio.TimeoutError, ValueError):
+        pass
+    return None
+
+
 def _is_short(oembed: Optional[dict]) -> bool:
     """oEmbedレスポンスからShortsかどうか判定する。"""
     if oembed is None:
@@ -0,0 +1,330 @@
+import hashlib
+import hmac
+import logging
+import secrets
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Iterable, Optional
+from urllib.parse import parse_qs, urlencode, urlsplit
+
+import requests
+
+from src.exceptions import RSSFetchError, WebSubError
+from src.http_client import get_session
+from src.models import VideoEntry
+from src.rss_checker import _parse_feed
+
+logger = logging.getLogger(__name__)
+
+HUB_URL = "https://pubsubhubbub.appspot.com/subscribe"
+TOPIC_URL_TEMPLATE = "https://www.youtube.com/xml/feeds/videos.xml?channel_id={channel_id}"
+TIMEOUT_SECONDS = 30
+
+# 購読の有効期間（ハブが短い期間を返した場合はそちらに従う）
+DEFAULT_LEASE_SECONDS = 5 * 24 * 60 * 60
+# 有効期間の残りがこの割合を下回ったら購読を更新する
+RENEW_MARGIN_RATIO = 0.1
+# 購読要求後、この秒数以内にハブの確認要求が来なければ再度要求する
+VERIFY_TIMEOUT_SECONDS = 10 * 60
+# 通知本文の上限（YouTubeの通知は1動画分のAtomフィード）
+MAX_BODY_BYTES = 1024 * 1024
+
+
+class WebSubSubscriber:
+    """チャンネルのフィードをWebSubハブに購読し、購読状態を管理する。
+
+    購読要求はハブからのコールバックURLへの確認要求（hub.challenge）に
+    応答して初めて有効になる。有効期間が残り少ない購読・確認されなかった
+    購読は renewal_due() で更新対象として返す。
+    通知本文の改ざん検知には購読時にハブへ渡す secret の HMAC 署名を使う。
+    """
+
+    def __init__(
+        self,
+        callback_url: str,
+        hub_url: str = HUB_URL,
+        secret: Optional[str] = None,
+        lease_seconds: int = DEFAULT_LEASE_SECONDS,
+        session: Optional[requests.Session] = None,
+        clock: Callable[[], float] = time.time,
+    ):
+        self._callback_url = callback_url
+        self._hub_url = hub_url
+        # 起動ごとに生成する。前回のプロセスの購読は起動時の再購読で置き換わる
+        self._secret = secret or secrets.token_hex(20)
+        self._lease_seconds = lease_seconds
+        self._session = session
+        self._clock = clock
+        # channel_id -> {"mode": 要求中のモード, "requested_at": エポック秒, "expires_at": エポック秒}
+        self._subscriptions: dict[str, dict] = {}
+        self._lock = threading.Lock()
+
+    def callback_for(self, channel_id: str) -> str:
+        """チャンネルごとのコールバックURLを返す（通知元のチャンネルをクエリで識別する）。"""
+        separator = "&" if urlsplit(self._callback_url).query else "?"
+        return f"{self._callback_url}{separator}{urlencode({'channel_id': channel_id})}"
+
+    def subscribe(self, channel_id: str) -> None:
+        """ハブにチャンネルの購読を要求する。
+
+        Raises:
+            WebSubError: ハブが要求を受け付けなかった場合
+        """
+        self._request(channel_id, "subscribe")
+
+    def unsubscribe(self, channel_id: str) -> None:
+        """ハブにチャンネルの購読解除を要求する。
+
+        Raises:
+            WebSubError: ハブが要求を受け付けなかった場合
+        """
+        self._request(channel_id, "unsubscribe")
+
+    def verify(
+        self,
+        channel_id: str,
+        mode: str,
+        topic: str,
+        lease_seconds: Optional[int] = None,
+    ) -> bool:
+        """ハブからの確認要求が自身の要求と一致するか判定し、購読状態を更新する。
+
+        Returns:
+            確認要求に応じる（hub.challenge を返す）・拒否の通知を受け付けるかどうか
+        """
+        if topic != TOPIC_URL_TEMPLATE.format(channel_id=channel_id):
+            return False
+        now = self._clock()
+        with self._lock:
+            entry = self._subscriptions.get(channel_id)
+            if entry is None:
+                return False
+            if mode == "denied":
+                logger.warning("WebSub購読がハブに拒否されました: %s", channel_id)
+                # 購読を無効にし、確認待ちと同じく VERIFY_TIMEOUT_SECONDS 後に再度要求する
+                entry["mode"] = mode
+                entry["requested_at"] = now
+                entry.pop("expires_at", None)
+                return True
+            if mode != entry.get("mode"):
+                return False
+            if mode == "unsubscribe":
+                del self._subscriptions[channel_id]
+                return True
+            lease = lease_seconds if lease_seconds is not None else self._lease_seconds
+            entry["expires_at"] = now + lease
+        logger.info("WebSub購読確認 - チャンネル: %s, 有効期間: %d秒", channel_id, lease)
+        return True
+
+    def is_active(self, channel_id: str) -> bool:
+        """有効期間内の購読があるかどうか"""
+        with self._lock:
+            entry = self._subscriptions.get(channel_id, {})
+            return entry.get("expires_at", 0) > self._clock()
+
+    def renewal_due(self, channel_ids: Iterable[str]) -> list[str]:
+        """購読（更新）を要求すべきチャンネルIDを返す。
+
+        未購読、有効期間の残りが RENEW_MARGIN_RATIO を下回った、または
+        要求後 VERIFY_TIMEOUT_SECONDS 以内に確認されなかったチャンネルが対象。
+        """
+        now = self._clock()
+        margin = self._lease_seconds * RENEW_MARGIN_RATIO
+        due = []
+        with self._lock:
+            for channel_id in channel_ids:
+                entry = self._subscriptions.get(channel_id)
+                if entry is None:
+                    due.append(channel_id)
+                elif entry.get("expires_at", 0) - now < margin:
+                    # 確認待ちの要求は一定時間待ってから再度要求する
+                    if entry["requested_at"] + VERIFY_TIMEOUT_SECONDS <= now:
+                        due.append(channel_id)
+        return due
+
+    def verify_signature(self, body: bytes, signature: Optional[str]) -> bool:
+        """X-Hub-Signature ヘッダ（"sha1=<16進数>" 形式）を検証する。"""
+        if not signature or "=" not in signature:
+            return False
+        method, digest = signature.split("=", 1)
+        if method not in ("sha1", "sha256", "sha384", "sha512"):
+            return False
+        expected = hmac.new(self._secret.encode("utf-8"), body, getattr(hashlib, method))
+        return hmac.compare_digest(expected.hexdigest(), digest.strip().lower())
+
+    def __contains__(self, channel_id: str) -> bool:
+        with self._lock:
+            return channel_id in self._subscriptions
+
+    def _request(self, channel_id: str, mode: str) -> None:
+        # ハブは要求への応答前に確認要求を送ることがあるため、先に要求中として記録する
+        with self._lock:
+            entry = self._subscriptions.setdefault(channel_id, {})
+            entry["mode"] = mode
+            entry["requested_at"] = self._clock()
+
+        session = self._session or get_session()
+        data = {
+            "hub.callback": self.callback_for(channel_id),
+            "hub.mode": mode,
+            "hub.topic": TOPIC_URL_TEMPLATE.format(channel_id=channel_id),
+            "hub.verify": "async",
+        }
+        if mode == "subscribe":
+            data["hub.lease_seconds"] = str(self._lease_seconds)
+            data["hub.secret"] = self._secret
+        try:
+            response = session.post(self._hub_url, data=data, timeout=TIMEOUT_SECONDS)
+        except requests.exceptions.RequestException as e:
+            raise WebSubError(f"WebSub購読要求失敗(ネットワークエラー): チャンネル {channel_id}: {e}") from e
+        if not 200 <= response.status_code < 300:
+            raise WebSubError(
+                f"WebSub購読要求失敗(HTTP {response.status_code}): チャンネル {channel_id}"
+            )
+        logger.info("WebSub購読要求(%s) - チャンネル: %s", mode, channel_id)
+
+
+class WebSubServer:
+    """ハブからの確認要求（GET）と新着通知（POST）を受け付けるコールバックサーバー。
+
+    通知されたAtomフィードは rss_checker と同じ処理で動画エントリに変換し、
+    on_notification(channel_id, videos) に渡す。on_notification は
+    リクエスト処理スレッドから呼ばれるため、重い処理はキューに積んで別スレッドで行う。
+    """
+
+    def __init__(
+        self,
+        subscriber: WebSubSubscriber,
+        on_notification: Callable[[str, list[VideoEntry]], None],
+        host: str = "0.0.0.0",
+        port: int = 8080,
+    ):
+        self._subscriber = subscriber
+        self._on_notification = on_notification
+        self._server = ThreadingHTTPServer((host, port), self._make_handler())
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def port(self) -> int:
+        """待ち受けポート（port=0 の場合は割り当てられたポート）"""
+        return self._server.server_address[1]
+
+    def start(self) -> None:
+        """別スレッドで待ち受けを開始する。"""
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, name="websub", daemon=True
+        )
+        self._thread.start()
+        logger.info("WebSubコールバックサーバー起動 - ポート: %d", self.port)
+
+    def stop(self) -> None:
+        """待ち受けを終了する。"""
+        if self._thread is not None:
+            self._server.shutdown()
+            self._thread.join()
+            self._thread = None
+        self._server.server_close()
+
+    def __enter__(self) -> "WebSubServer":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def handle_verification(self, query: dict[str, list[str]]) -> Optional[str]:
+        """確認要求に応じる場合は返すべき hub.challenge を、応じない場合はNoneを返す。
+
+        ハブからの購読拒否の通知（hub.mode=denied）は hub.challenge を含まないため、
+        受け付けた場合は空文字列を返す。
+        """
+        channel_id = _first(query, "channel_id")
+        if not channel_id:
+            return None
+        mode = _first(query, "hub.mode") or ""
+        topic = _first(query, "hub.topic") or ""
+        if mode == "denied":
+            return "" if self._subscriber.verify(channel_id, mode, topic) else None
+        challenge = _first(query, "hub.challenge")
+        if challenge is None:
+            return None
+        lease = _first(query, "hub.lease_seconds")
+        try:
+            lease_seconds = int(lease) if lease else None
+        except ValueError:
+            lease_seconds = None
+        verified = self._subscriber.verify(channel_id, mode, topic, lease_seconds)
+        return challenge if verified else None
+
+    def handle_notification(
+        self, query: dict[str, list[str]], body: bytes, signature: Optional[str]
+    ) -> None:
+        """新着通知を検証・解析し、対象チャンネルの動画を on_notification に渡す。"""
+        channel_id = _first(query, "channel_id")
+        if not channel_id or channel_id not in self._subscriber:
+            logger.warning("購読していないチャンネルの通知を無視します: %s", channel_id)
+            return
+        if not self._subscriber.verify_signature(body, signature):
+            logger.warning("WebSub通知の署名が一致しないため無視します: %s", channel_id)
+            return
+        try:
+            videos = _parse_feed(body, channel_id)
+        except RSSFetchError as e:
+            logger.warning("WebSub通知の解析に失敗: %s", e)
+            return
+        # 削除通知（at:deleted-entry）は動画エントリを含まない
+        videos = [v for v in videos if v.channel_id == channel_id]
+        if not videos:
+            return
+        logger.info("WebSub通知受信 - チャンネル: %s, 動画数: %d", channel_id, len(videos))
+        self._on_notification(channel_id, videos)
+
+    def _make_handler(self) -> type[BaseHTTPRequestHandler]:
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                challenge = server.handle_verification(_query(self.path))
+                if challenge is None:
+                    self._respond(404)
+                    return
+                self._respond(200, challenge.encode("utf-8"))
+
+            def do_POST(self) -> None:
+                length = int(self.headers.get("Content-Length") or 0)
+                if length > MAX_BODY_BYTES:
+                    self._respond(413)
+                    return
+                body = self.rfile.read(length)
+                try:
+                    server.handle_notification(
+                        _query(self.path), body, self.headers.get("X-Hub-Signature")
+                    )
+                except Exception:
+                    logger.exception("WebSub通知の処理中にエラーが発生しました")
+                # 署名不一致・解析失敗でもハブに再送させないよう 2xx を返す
+                self._respond(204)
+
+            def _respond(self, status: int, body: bytes = b"") -> None:
+                self.send_response(status)
+                self.send_header("Content-Type", "text/plain; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                if body:
+                    self.wfile.write(body)
+
+            def log_message(self, format: str, *args) -> None:
+                logger.debug("WebSub %s - %s", self.address_string(), format % args)
+
+        return Handler
+
+
+def _query(path: str) -> dict[str, list[str]]:
+    return parse_qs(urlsplit(path).query)
+
+
+def _first(query: dict[str, list[str]], key: str) -> Optional[str]:
+    values = query.get(key)
+    return values[0] if values else None
@@ -145,3 +145,116 @@ class TestLoadConfigSettingsValidation:
 
         with pytest.raises(ConfigError, match="default_prompt_templateが未指定です"):
             load_config(str(path))
+
+    def test_oembed_cache設定の省略時はデフォルト値になる(self, tmp_path: Path):
+        path = tmp_path / "channels.yml"
+        path.write_text(VALID_YAML, encoding="utf-8")
+
+        _, settings = load_config(str(path))
+
+        assert settings.oembed_cache_ttl_hours == 168
+        assert settings.oembed_cache_max_entries == 5000
+
+    def test_oembed_cache_max_entriesが0の場合はConfigErrorになる(self, tmp_path: Path):
+        yaml_content = VALID_YAML + "  oembed_cache_max_entries: 0\n"
+        path = tmp_path / "channels.yml"
+        path.write_text(yaml_content, encoding="utf-8")
+
+        with pytest.raises(ConfigError, match="oembed_cache_max_entries"):
+            load_config(str(path))
+
+    def test_history_backendの省略時はjsonになる(self, tmp_path: Path):
+        path = tmp_path / "channels.yml"
+        path.write_text(VALID_YAML, encoding="utf-8")
+
+        _, settings = load_config(str(path))
+        assert settings.history_backend == "json"
+
+    def test_history_backendが不正な場合はConfigErrorになる(self, tmp_path: Path):
+        yaml_content = VALID_YAML + "  history_backend: csv\n"
+        path = tmp_path / "channels.yml"
+        path.write_text(yaml_content, encoding="utf-8")
+
+        with pytest.raises(ConfigError, match="history_backend"):
+            load_config(str(path))
+
+    def test_check_interval_minutesが0の場合はConfigErrorになる(self, tmp_path: Path):
+        yaml_content = VALID_YAML.replace("check_interval_minutes: 5", "check_interval_minutes: 0")
+        path = tmp_path / "channels.yml"
+        path.write_text(yaml_content, encoding="utf-8")
+
+        with pytest.raises(ConfigError, match="check_interval_minutes"):
+            load_config(str(path))
+
+    def test_max_poll_interval_minutesがmin未満の場合はConfigErrorになる(self, tmp_path: Path):
+        yaml_content = VALID_YAML + "  min_poll_interval_minutes: 30\n  max_poll_interval_minutes: 10\n"
+        path = tmp_path / "channels.yml"
+        path.write_text(yaml_content, encoding="utf-8")
+
+        with pytest.raises(ConfigError, match="max_poll_interval_minutes"):
+            load_config(str(path))
+
+    def test_websub_callback_urlの省略時はWebSubを使わない(self, tmp_path: Path):
+        path = tmp_path / "channels.yml"
+        path.write_text(VALID_YAML, encoding="utf-8")
+
+        _, settings = load_config(str(path))
+        assert settings.websub_callback_url == ""
+        assert settings.websub_port == 8080
+
+    def test_websub_callback_urlがURLでない場合はConfigErrorになる(self, tmp_path: Path):
+        yaml_content = VALID_YAML + "  websub_callback_url: example.com/websub\n"
+        path = tmp_path / "channels.yml"
+        path.write_text(yaml_content, encoding="utf-8")
+
+        with pytest.raises(ConfigError, match="websub_callback_url"):
+            load_config(str(path))
+
+    def test_websub_portが範囲外の場合はConfigErrorになる(self, tmp_path: Path):
+        yaml_content = VALID_YAML + "  websub_port: 70000\n"
+        path = tmp_path / "channels.yml"
+        path.write_text(yaml_content, encoding="utf-8")
+
+        with pytest.raises(ConfigError, match="websub_port"):
+            load_config(str(path))
+
+    def test_watermark_window_minutesが0の場合はConfigErrorになる(self, tmp_path: Path):
+        yaml_content = VALID_YAML + "  watermark_window_minutes: 0\n"
+        path = tmp_path / "channels.yml"
+        path.write_text(yaml_content, encoding="utf-8")
+
+        with pytest.raises(ConfigError, match="watermark_window_minutes"):
+            load_config(str(path))
+
+    def test_HTTP接続設定の省略時はデフォルト値になる(self, tmp_path: Path):
+        path = tmp_path / "channels.yml"
+        path.write_text(VALID_YAML, encoding="utf-8")
+
+        _, settings = load_config(str(path))
+        assert settings.http_pool_connections == 10
+        assert settings.http_pool_maxsize == 16
+        assert settings.http_connect_timeout_seconds == 30
+        assert settings.http_read_timeout_seconds == 30
+
+    def test_http_read_timeout_secondsが0の場合はConfigErrorになる(self, tmp_path: Path):
+        yaml_content = VALID_YAML + "  http_read_timeout_seconds: 0\n"
+        path = tmp_path / "channels.yml"
+        path.write_text(yaml_content, encoding="utf-8")
+
+        with pytest.raises(ConfigError, match="http_read_timeout_seconds"):
+            load_config(str(path))
+
+    def test_render_concurrencyの省略時は自動決定になる(self, tmp_path: Path):
+        path = tmp_path / "channels.yml"
+        path.write_text(VALID_YAML, encoding="utf-8")
+
+        _, settings = load_config(str(path))
+        assert settings.render_concurrency is None
+
+    def test_render_concurrencyが0の場合はConfigErrorになる(self, tmp_path: Path):
+        yaml_content = VALID_YAML + "  render_concurrency: 0\n"
+        path = tmp_path / "channels.yml"
+        path.write_text(yaml_content, encoding="utf-8")
+
+        with pytest.raises(ConfigError, match="render_concurrency"):
+            load_config(str(path))
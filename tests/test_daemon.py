@@ -0,0 +1,196 @@
+"""daemon モジュールの単体テスト"""
+import random
+import threading
+from unittest.mock import MagicMock
+
+from src.daemon import ChannelScheduler, Daemon
+from src.exceptions import WebSubError
+
+
+class FakeClock:
+    """テスト用の時計"""
+
+    def __init__(self, now: float = 0.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestChannelScheduler:
+    """ChannelScheduler のテスト"""
+
+    def test_登録直後のチャンネルは取得予定になる(self):
+        scheduler = ChannelScheduler(300, clock=FakeClock())
+        scheduler.add("UC001")
+        scheduler.add("UC002")
+
+        assert sorted(scheduler.due()) == ["UC001", "UC002"]
+        assert scheduler.due() == []
+
+    def test_取得予定時刻を過ぎたチャンネルだけを返す(self):
+        clock = FakeClock()
+        scheduler = ChannelScheduler(300, clock=clock)
+        scheduler.add("UC001", delay_seconds=10)
+        scheduler.add("UC002", delay_seconds=100)
+
+        clock.now = 50
+        assert scheduler.due() == ["UC001"]
+        assert scheduler.seconds_until_next() == 50
+
+    def test_再登録は取得間隔に揺らぎを加える(self):
+        clock = FakeClock()
+        scheduler = ChannelScheduler(300, jitter_ratio=0.1, clock=clock, rng=random.Random(0))
+
+        delays = [scheduler.reschedule(f"UC{i:03d}") for i in range(50)]
+
+        assert all(270 <= d <= 330 for d in delays)
+        assert len(set(delays)) > 1
+
+    def test_揺らぎなしの場合は取得間隔どおりに再登録する(self):
+        clock = FakeClock()
+        scheduler = ChannelScheduler(300, jitter_ratio=0, clock=clock)
+        scheduler.reschedule("UC001")
+
+        clock.now = 299
+        assert scheduler.due() == []
+        clock.now = 300
+        assert scheduler.due() == ["UC001"]
+
+    def test_登録がなければNoneを返す(self):
+        scheduler = ChannelScheduler(300, clock=FakeClock())
+        assert scheduler.seconds_until_next() is None
+
+
+def _make_notifier(interval: float = 300) -> MagicMock:
+    notifier = MagicMock()
+    notifier.poll_scheduler.interval.return_value = interval
+    return notifier
+
+
+class TestDaemon:
+    """Daemon のテスト"""
+
+    def test_周期処理で取得予定のチャンネルを取得して再登録する(self):
+        clock = FakeClock()
+        scheduler = ChannelScheduler(300, jitter_ratio=0, clock=clock)
+        notifier = _make_notifier()
+        daemon = Daemon(notifier, scheduler, clock=clock)
+        pipeline = MagicMock()
+
+        daemon.run_cycle(pipeline, ["UC001", "UC002"])
+
+        notifier.processor.reset_rate_limit.assert_called_once()
+        notifier.resume_jobs.assert_called_once_with(pipeline)
+        notifier.poll.assert_called_once_with(pipeline, ["UC001", "UC002"])
+        notifier.save_history.assert_called_once()
+        assert len(scheduler) == 2
+        assert scheduler.seconds_until_next() == 300
+
+    def test_投稿頻度に応じた取得間隔で再登録する(self):
+        clock = FakeClock()
+        scheduler = ChannelScheduler(300, jitter_ratio=0, clock=clock)
+        notifier = _make_notifier(interval=3600)
+        daemon = Daemon(notifier, scheduler, clock=clock)
+
+        daemon.run_cycle(MagicMock(), ["UC001"])
+
+        notifier.poll_scheduler.interval.assert_called_once_with("UC001")
+        assert scheduler.seconds_until_next() == 3600
+
+    def test_取得に失敗しても再登録する(self):
+        clock = FakeClock()
+        scheduler = ChannelScheduler(300, clock=clock)
+        notifier = _make_notifier()
+        notifier.poll.side_effect = RuntimeError("取得失敗")
+        daemon = Daemon(notifier, scheduler, clock=clock)
+
+        try:
+            daemon.run_cycle(MagicMock(), ["UC001"])
+        except RuntimeError:
+            pass
+
+        assert len(scheduler) == 1
+
+    def test_停止要求後は状態を書き出して終了する(self):
+        clock = FakeClock()
+        scheduler = ChannelScheduler(300, clock=clock)
+        scheduler.add("UC001")
+        notifier = _make_notifier()
+        daemon = Daemon(notifier, scheduler, clock=clock)
+        # 1回目の周期処理中に停止を要求する
+        notifier.poll.side_effect = lambda *args: daemon.request_stop()
+
+        daemon.run()
+
+        notifier.poll.assert_called_once()
+        notifier.processor.build_pipeline.return_value.__enter__.assert_called_once()
+        notifier.save_caches.assert_called()
+        assert notifier.save_history.call_count >= 2
+
+
+class TestDaemonWebSub:
+    """WebSub連携のテスト"""
+
+    def test_通知された動画をパイプラインに投入する(self):
+        notifier = _make_notifier()
+        daemon = Daemon(notifier, ChannelScheduler(300, clock=FakeClock()), clock=FakeClock())
+        pipeline = MagicMock()
+        videos = [MagicMock()]
+
+        daemon.push("UC001", videos)
+
+        assert daemon.ingest_pushed(pipeline) == 1
+        notifier.ingest.assert_called_once_with(pipeline, "UC001", videos)
+        assert daemon.ingest_pushed(pipeline) == 0
+
+    def test_購読が有効なチャンネルは取得間隔の上限で再登録する(self):
+        clock = FakeClock()
+        scheduler = ChannelScheduler(300, jitter_ratio=0, clock=clock)
+        notifier = _make_notifier(interval=600)
+        notifier.poll_scheduler.max_interval = 21600
+        websub = MagicMock()
+        websub.is_active.side_effect = lambda channel_id: channel_id == "UC001"
+        daemon = Daemon(notifier, scheduler, clock=clock, websub=websub)
+
+        daemon.run_cycle(MagicMock(), ["UC001", "UC002"])
+
+        clock.now = 600
+        assert scheduler.due() == ["UC002"]
+        assert scheduler.seconds_until_next() == 21600 - 600
+
+    def test_購読の更新に失敗しても続行する(self):
+        notifier = _make_notifier()
+        notifier.channels_by_id = {"UC001": MagicMock(), "UC002": MagicMock()}
+        websub = MagicMock()
+        websub.renewal_due.return_value = ["UC001", "UC002"]
+        websub.subscribe.side_effect = [WebSubError("購読失敗"), None]
+        daemon = Daemon(
+            notifier, ChannelScheduler(300, clock=FakeClock()), clock=FakeClock(), websub=websub
+        )
+
+        assert daemon.renew_subscriptions() == 2
+        daemon.shutdown_renewals()
+
+        assert websub.subscribe.call_count == 2
+
+    def test_購読要求の応答を待たずに戻り要求中のチャンネルは重ねて要求しない(self):
+        notifier = _make_notifier()
+        notifier.channels_by_id = {"UC001": MagicMock()}
+        websub = MagicMock()
+        websub.renewal_due.return_value = ["UC001"]
+        responded = threading.Event()
+        websub.subscribe.side_effect = lambda channel_id: responded.wait(5)
+        daemon = Daemon(
+            notifier, ChannelScheduler(300, clock=FakeClock()), clock=FakeClock(), websub=websub
+        )
+
+        try:
+            assert daemon.renew_subscriptions() == 1
+            # ハブが応答するまでは同じチャンネルを投入しない
+            assert daemon.renew_subscriptions() == 0
+        finally:
+            responded.set()
+            daemon.shutdown_renewals()
+
+        websub.subscribe.assert_called_once_with("UC001")
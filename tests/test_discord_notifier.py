@@ -0,0 +1,146 @@
+"""discord_notifier の単体テスト（asyncio 版はローカルのHTTPサーバーを使う）"""
+import asyncio
+import json
+from datetime import datetime, timezone
+from unittest.mock import patch
+
+import aiohttp
+import pytest
+from aiohttp import web
+
+from src.discord_notifier import (
+    COLOR_ERROR,
+    send_error_notification_async,
+    send_image_notification_async,
+)
+from src.exceptions import DiscordNotifyError
+from src.models import VideoEntry
+
+
+def _make_video() -> VideoEntry:
+    """テスト用 VideoEntry を生成するヘルパー"""
+    return VideoEntry(
+        video_id="vid001",
+        title="テスト動画",
+        url="https://www.youtube.com/watch?v=vid001",
+        published=datetime(2026, 1, 1, tzinfo=timezone.utc),
+        channel_id="UCtest",
+    )
+
+
+def _serve_webhook(statuses: list[int], call, received: list | None = None) -> list[dict]:
+    """ローカルのサーバーを Webhook の代わりに立てて call(url, session) を実行し、受信した内容を返す
+
+    受信した内容は JSON 本文、またはマルチパートのフィールド名 → (ファイル名, 内容) の辞書。
+    call が例外を送出する場合に備えて、受信した内容を入れるリストを渡せる。
+    """
+    if received is None:
+        received = []
+
+    async def handler(request: web.Request) -> web.Response:
+        if request.content_type == "application/json":
+            received.append(await request.json())
+        else:
+            fields = {}
+            async for part in await request.multipart():
+                fields[part.name] = (part.filename, await part.read())
+            received.append(fields)
+        return web.Response(status=statuses[len(received) - 1])
+
+    async def run():
+        app = web.Application()
+        app.router.add_post("/webhook", handler)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        try:
+            async with aiohttp.ClientSession() as session:
+                await call(f"http://127.0.0.1:{port}/webhook", session)
+        finally:
+            await runner.cleanup()
+
+    asyncio.run(run())
+    return received
+
+
+class TestSendImageNotificationAsync:
+    """send_image_notification_async() のテスト"""
+
+    def test_画像とメッセージをマルチパートで送信する(self, tmp_path):
+        image_path = tmp_path / "summary.png"
+        image_path.write_bytes(b"\x89PNG-test")
+
+        received = _serve_webhook(
+            [204],
+            lambda url, session: send_image_notification_async(
+                url, _make_video(), "テストチャンネル", str(image_path), session
+            ),
+        )
+
+        assert len(received) == 1
+        filename, body = received[0]["files[0]"]
+        assert filename == "summary.png"
+        assert body == b"\x89PNG-test"
+        payload = json.loads(received[0]["payload_json"][1])
+        assert "**テストチャンネル**" in payload["content"]
+        assert "https://www.youtube.com/watch?v=vid001" in payload["content"]
+
+    def test_5xx応答は同じ内容で再送する(self, tmp_path):
+        image_path = tmp_path / "summary.png"
+        image_path.write_bytes(b"\x89PNG-test")
+
+        with patch("src.discord_notifier.BACKOFF_SECONDS", [0, 0, 0]):
+            received = _serve_webhook(
+                [502, 204],
+                lambda url, session: send_image_notification_async(
+                    url, _make_video(), "テストチャンネル", str(image_path), session
+                ),
+            )
+
+        assert len(received) == 2
+        assert received[1]["files[0]"] == received[0]["files[0]"]
+
+    def test_4xx応答は再送せずDiscordNotifyError(self, tmp_path):
+        image_path = tmp_path / "summary.png"
+        image_path.write_bytes(b"\x89PNG-test")
+        received = []
+
+        with pytest.raises(DiscordNotifyError):
+            _serve_webhook(
+                [404, 204],
+                lambda url, session: send_image_notification_async(
+                    url, _make_video(), "テストチャンネル", str(image_path), session
+                ),
+                received,
+            )
+
+        assert len(received) == 1
+
+
+class TestSendErrorNotificationAsync:
+    """send_error_notification_async() のテスト"""
+
+    def test_エラー内容をEmbedで送信する(self):
+        received = _serve_webhook(
+            [204],
+            lambda url, session: send_error_notification_async(
+                url, "⚠️ エラー", "詳細" * 3000, session
+            ),
+        )
+
+        embed = received[0]["embeds"][0]
+        assert embed["title"] == "⚠️ エラー"
+        assert embed["color"] == COLOR_ERROR
+        assert len(embed["description"]) == 4096
+
+    def test_送信に失敗しても例外を送出しない(self):
+        received = _serve_webhook(
+            [400],
+            lambda url, session: send_error_notification_async(
+                url, "⚠️ エラー", "詳細", session
+            ),
+        )
+
+        assert len(received) == 1
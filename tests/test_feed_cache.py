@@ -0,0 +1,96 @@
+"""FeedCache の単体テスト"""
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from src.feed_cache import FeedCache
+from src.models import VideoEntry
+
+NOW = datetime(2026, 3, 1, 12, 0, tzinfo=timezone.utc)
+
+
+def _make_video(video_id: str, published: datetime) -> VideoEntry:
+    return VideoEntry(
+        video_id=video_id,
+        title=f"動画 {video_id}",
+        url=f"https://www.youtube.com/watch?v={video_id}",
+        published=published,
+        channel_id="UCtest",
+    )
+
+
+class TestFeedCache:
+    """FeedCache のテスト"""
+
+    def test_保存した検証子を読み込める(self, tmp_path: Path):
+        path = tmp_path / "feed_cache.json"
+        cache = FeedCache(str(path))
+        cache.update("UCtest", '"abc"', None)
+        cache.save()
+
+        loaded = FeedCache(str(path))
+        loaded.load()
+        assert loaded.conditional_headers("UCtest") == {"If-None-Match": '"abc"'}
+
+    def test_破損したファイルは空で初期化される(self, tmp_path: Path):
+        path = tmp_path / "feed_cache.json"
+        path.write_text("{ invalid json }", encoding="utf-8")
+        cache = FeedCache(str(path))
+        cache.load()
+        assert cache.conditional_headers("UCtest") == {}
+
+    def test_検証子がない場合はエントリが削除される(self, tmp_path: Path):
+        cache = FeedCache(str(tmp_path / "feed_cache.json"))
+        cache.update("UCtest", '"abc"', None)
+        cache.update("UCtest", None, None)
+        assert cache.conditional_headers("UCtest") == {}
+
+    def test_discardで検証子が破棄される(self, tmp_path: Path):
+        cache = FeedCache(str(tmp_path / "feed_cache.json"))
+        cache.update("UCtest", '"abc"', "Thu, 01 Jan 2026 00:00:00 GMT")
+        cache.discard("UCtest")
+        assert cache.conditional_headers("UCtest") == {}
+
+
+class TestFeedCacheWatermark:
+    """ウォーターマークのテスト"""
+
+    def test_記録がなければNoneを返す(self, tmp_path: Path):
+        cache = FeedCache(str(tmp_path / "feed_cache.json"))
+        assert cache.seen_until("UCtest") is None
+
+    def test_処理時刻から猶予時間をさかのぼった日時を返す(self, tmp_path: Path):
+        cache = FeedCache(str(tmp_path / "feed_cache.json"), watermark_window_seconds=3600)
+        cache.advance_watermark("UCtest", [], checked_at=NOW.timestamp())
+
+        assert cache.seen_until("UCtest") == NOW - timedelta(hours=1)
+
+    def test_最新の動画をウォーターマークとして除外する(self, tmp_path: Path):
+        cache = FeedCache(str(tmp_path / "feed_cache.json"))
+        latest = _make_video("vid002", NOW - timedelta(hours=1))
+        older = _make_video("vid001", NOW - timedelta(hours=2))
+        cache.advance_watermark("UCtest", [older, latest], checked_at=NOW.timestamp())
+
+        newer = _make_video("vid003", NOW)
+        assert cache.newer_than_watermark("UCtest", [newer, latest, older]) == [newer, older]
+
+    def test_古い動画ではウォーターマークを戻さない(self, tmp_path: Path):
+        cache = FeedCache(str(tmp_path / "feed_cache.json"), watermark_window_seconds=0)
+        cache.advance_watermark("UCtest", [_make_video("vid002", NOW)], checked_at=NOW.timestamp())
+        cache.advance_watermark(
+            "UCtest", [_make_video("vid001", NOW - timedelta(days=1))], checked_at=NOW.timestamp() - 60
+        )
+
+        assert cache.newer_than_watermark("UCtest", [_make_video("vid002", NOW)]) == []
+        assert cache.seen_until("UCtest") == NOW
+
+    def test_ウォーターマークを保存して読み込める(self, tmp_path: Path):
+        path = tmp_path / "feed_cache.json"
+        cache = FeedCache(str(path), watermark_window_seconds=0)
+        cache.advance_watermark("UCtest", [_make_video("vid001", NOW)], checked_at=NOW.timestamp())
+        cache.discard("UCtest")
+        cache.save()
+
+        loaded = FeedCache(str(path), watermark_window_seconds=0)
+        loaded.load()
+        assert loaded.seen_until("UCtest") == NOW
+        assert loaded.newer_than_watermark("UCtest", [_make_video("vid001", NOW)]) == []
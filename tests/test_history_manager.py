@@ -1,12 +1,19 @@
 """HistoryManager の単体テスト"""
+import heapq
 import json
 import tempfile
 from datetime import datetime, timezone, timedelta
 from pathlib import Path
+from unittest.mock import patch
 
 import pytest
 
-from src.history_manager import HistoryManager
+from src.history_manager import (
+    HistoryManager,
+    JournaledHistoryManager,
+    SQLiteHistoryManager,
+    create_history_manager,
+)
 from src.models import VideoEntry
 
 
@@ -27,7 +34,7 @@ class TestHistoryManagerLoad:
     def test_ファイルが存在しない場合は空で初期化される(self, tmp_path: Path):
         hm = HistoryManager(str(tmp_path / "notified.json"))
         hm.load()
-        assert hm._notified == {}
+        assert dict(hm.entries()) == {}
 
     def test_正常なJSONを読み込める(self, tmp_path: Path):
         path = tmp_path / "notified.json"
@@ -45,14 +52,14 @@ class TestHistoryManagerLoad:
         )
         hm = HistoryManager(str(path))
         hm.load()
-        assert "vid001" in hm._notified
+        assert hm.is_notified("vid001")
 
     def test_破損したJSONは空で初期化される(self, tmp_path: Path):
         path = tmp_path / "notified.json"
         path.write_text("{ invalid json }", encoding="utf-8")
         hm = HistoryManager(str(path))
         hm.load()
-        assert hm._notified == {}
+        assert dict(hm.entries()) == {}
 
 
 class TestHistoryManagerIsNotified:
@@ -60,12 +67,12 @@ class TestHistoryManagerIsNotified:
 
     def test_通知済み動画はTrueを返す(self, tmp_path: Path):
         hm = HistoryManager(str(tmp_path / "notified.json"))
-        hm._notified = {"vid001": {}}
+        hm.replace_entries({"vid001": {}})
         assert hm.is_notified("vid001") is True
 
     def test_未通知動画はFalseを返す(self, tmp_path: Path):
         hm = HistoryManager(str(tmp_path / "notified.json"))
-        hm._notified = {}
+        hm.replace_entries({})
         assert hm.is_notified("vid001") is False
 
 
@@ -74,7 +81,7 @@ class TestHistoryManagerFilterNew:
 
     def test_通知済み動画を除外して新着のみ返す(self, tmp_path: Path):
         hm = HistoryManager(str(tmp_path / "notified.json"))
-        hm._notified = {"vid001": {}}
+        hm.replace_entries({"vid001": {}})
 
         videos = [_make_video("vid001"), _make_video("vid002")]
         result = hm.filter_new(videos)
@@ -84,7 +91,7 @@ class TestHistoryManagerFilterNew:
 
     def test_全件新着の場合はそのまま返す(self, tmp_path: Path):
         hm = HistoryManager(str(tmp_path / "notified.json"))
-        hm._notified = {}
+        hm.replace_entries({})
 
         videos = [_make_video("vid001"), _make_video("vid002")]
         result = hm.filter_new(videos)
@@ -92,7 +99,7 @@ class TestHistoryManagerFilterNew:
 
     def test_空リストを渡すと空リストが返る(self, tmp_path: Path):
         hm = HistoryManager(str(tmp_path / "notified.json"))
-        hm._notified = {}
+        hm.replace_entries({})
         assert hm.filter_new([]) == []
 
 
@@ -101,15 +108,16 @@ class TestHistoryManagerMarkNotified:
 
     def test_動画が通知済みとして記録される(self, tmp_path: Path):
         hm = HistoryManager(str(tmp_path / "notified.json"))
-        hm._notified = {}
+        hm.replace_entries({})
         video = _make_video("vid001", "テスト動画")
 
         hm.mark_notified(video)
 
-        assert "vid001" in hm._notified
-        assert hm._notified["vid001"]["title"] == "テスト動画"
-        assert hm._notified["vid001"]["channel_id"] == "UCtest"
-        assert "notified_at" in hm._notified["vid001"]
+        assert hm.is_notified("vid001")
+        entry = dict(hm.entries())["vid001"]
+        assert entry["title"] == "テスト動画"
+        assert entry["channel_id"] == "UCtest"
+        assert "notified_at" in entry
 
 
 class TestHistoryManagerCleanupOldEntries:
@@ -119,49 +127,90 @@ class TestHistoryManagerCleanupOldEntries:
         hm = HistoryManager(str(tmp_path / "notified.json"))
         # 100日前のエントリ
         old_date = (datetime.now(timezone.utc) - timedelta(days=100)).isoformat()
-        hm._notified = {
+        hm.replace_entries({
             "old_vid": {"title": "古い動画", "channel_id": "UCtest", "notified_at": old_date},
-        }
+        })
 
         removed = hm.cleanup_old_entries(retention_days=90)
         assert removed == 1
-        assert "old_vid" not in hm._notified
+        assert not hm.is_notified("old_vid")
 
     def test_新しいエントリは削除されない(self, tmp_path: Path):
         hm = HistoryManager(str(tmp_path / "notified.json"))
         # 10日前のエントリ
         recent_date = (datetime.now(timezone.utc) - timedelta(days=10)).isoformat()
-        hm._notified = {
+        hm.replace_entries({
             "new_vid": {"title": "新しい動画", "channel_id": "UCtest", "notified_at": recent_date},
-        }
+        })
 
         removed = hm.cleanup_old_entries(retention_days=90)
         assert removed == 0
-        assert "new_vid" in hm._notified
+        assert hm.is_notified("new_vid")
 
     def test_パース不能な日付のエントリは削除される(self, tmp_path: Path):
         hm = HistoryManager(str(tmp_path / "notified.json"))
-        hm._notified = {
+        hm.replace_entries({
             "bad_vid": {"title": "壊れた動画", "channel_id": "UCtest", "notified_at": "invalid"},
-        }
+        })
 
         removed = hm.cleanup_old_entries(retention_days=90)
         assert removed == 1
 
 
+class TestHistoryManagerRetentionIndex:
+    """保持期間インデックス（ヒープ）のテスト"""
+
+    @staticmethod
+    def _make_entries(total: int, expired: int) -> dict:
+        now = datetime.now(timezone.utc)
+        return {
+            f"vid{i:06d}": {
+                "title": "",
+                "channel_id": "UCtest",
+                "notified_at": (
+                    now - timedelta(days=100 if i < expired else 1, seconds=i)
+                ).isoformat(),
+            }
+            for i in range(total)
+        }
+
+    @pytest.mark.parametrize("total", [1_000, 10_000, 100_000])
+    def test_クリーンアップは履歴の件数によらず期限切れの件数分だけ処理する(
+        self, tmp_path: Path, total: int
+    ):
+        hm = HistoryManager(str(tmp_path / "notified.json"))
+        hm.replace_entries(self._make_entries(total, expired=5))
+
+        with patch("src.history_manager.heapq.heappop", wraps=heapq.heappop) as heappop:
+            removed = hm.cleanup_old_entries(retention_days=90)
+
+        assert removed == 5
+        assert heappop.call_count == 5
+        assert len(hm._records) == total - 5
+
+    def test_削除後に再登録した動画は古い通知日時で削除されない(self, tmp_path: Path):
+        hm = HistoryManager(str(tmp_path / "notified.json"))
+        hm.replace_entries(self._make_entries(1, expired=1))
+        # 同じ動画を再度通知した場合は新しい通知日時が有効になる
+        hm.mark_notified(_make_video("vid000000"))
+
+        assert hm.cleanup_old_entries(retention_days=90) == 0
+        assert hm.is_notified("vid000000") is True
+
+
 class TestHistoryManagerSave:
     """save() のテスト"""
 
     def test_ファイルに保存される(self, tmp_path: Path):
         path = tmp_path / "notified.json"
         hm = HistoryManager(str(path))
-        hm._notified = {
+        hm.replace_entries({
             "vid001": {
                 "title": "テスト動画",
                 "channel_id": "UCtest",
                 "notified_at": "2026-01-01T00:00:00+00:00",
             }
-        }
+        })
 
         hm.save()
 
@@ -172,7 +221,264 @@ class TestHistoryManagerSave:
     def test_親ディレクトリが存在しなくても保存できる(self, tmp_path: Path):
         path = tmp_path / "new_dir" / "notified.json"
         hm = HistoryManager(str(path))
-        hm._notified = {}
+        hm.replace_entries({})
 
         hm.save()
         assert path.exists()
+
+
+class TestHistoryManagerCompactRepresentation:
+    """メモリ上のコンパクト表現のテスト"""
+
+    def test_チャンネルIDはintern済みの同一オブジェクトを共有する(self, tmp_path: Path):
+        hm = HistoryManager(str(tmp_path / "notified.json"))
+        hm.replace_entries({
+            "vid001": {"title": "動画1", "channel_id": "".join(["UC", "test"]), "notified_at": ""},
+            "vid002": {"title": "動画2", "channel_id": "".join(["UC", "test"]), "notified_at": ""},
+        })
+        assert hm._records["vid001"].channel_id is hm._records["vid002"].channel_id
+
+    def test_通知日時は整数のエポック秒で保持する(self, tmp_path: Path):
+        hm = HistoryManager(str(tmp_path / "notified.json"))
+        hm.replace_entries({
+            "vid001": {"title": "動画1", "channel_id": "UCtest", "notified_at": "2026-01-01T00:00:00+00:00"},
+        })
+        record = hm._records["vid001"]
+        assert record.notified_at == int(datetime(2026, 1, 1, tzinfo=timezone.utc).timestamp())
+        assert not hasattr(record, "__dict__")
+
+    def test_保存と再読み込みで内容が変わらない(self, tmp_path: Path):
+        path = tmp_path / "notified.json"
+        entries = {
+            "vid001": {
+                "title": "テスト動画",
+                "channel_id": "UCtest",
+                "notified_at": "2026-01-01T00:00:00+00:00",
+            }
+        }
+        hm = HistoryManager(str(path))
+        hm.replace_entries(entries)
+        hm.save()
+
+        reloaded = HistoryManager(str(path))
+        reloaded.load()
+        assert dict(reloaded.entries()) == entries
+
+
+class TestSQLiteHistoryManager:
+    """SQLiteHistoryManager のテスト"""
+
+    def _make_manager(self, tmp_path: Path, json_path: Path = None) -> SQLiteHistoryManager:
+        hm = SQLiteHistoryManager(
+            str(tmp_path / "notified.db"),
+            json_path=str(json_path or tmp_path / "notified.json"),
+        )
+        hm.load()
+        return hm
+
+    def test_記録した動画が通知済みになる(self, tmp_path: Path):
+        hm = self._make_manager(tmp_path)
+        hm.mark_notified(_make_video("vid001"))
+
+        assert hm.is_notified("vid001") is True
+        assert hm.is_notified("vid002") is False
+
+    def test_通知済み動画を除外して新着のみ返す(self, tmp_path: Path):
+        hm = self._make_manager(tmp_path)
+        hm.mark_notified(_make_video("vid001"))
+
+        result = hm.filter_new([_make_video("vid001"), _make_video("vid002")])
+        assert [v.video_id for v in result] == ["vid002"]
+
+    def test_保存した履歴を再読み込みできる(self, tmp_path: Path):
+        hm = self._make_manager(tmp_path)
+        hm.mark_notified(_make_video("vid001"))
+        hm.save()
+        hm.close()
+
+        reloaded = self._make_manager(tmp_path)
+        assert reloaded.is_notified("vid001") is True
+
+    def test_古いエントリが範囲削除される(self, tmp_path: Path):
+        hm = self._make_manager(tmp_path)
+        hm.mark_notified(_make_video("new_vid"))
+        with patch("src.history_manager.datetime") as mock_datetime:
+            mock_datetime.now.return_value = datetime.now(timezone.utc) - timedelta(days=100)
+            hm.mark_notified(_make_video("old_vid"))
+
+        removed = hm.cleanup_old_entries(retention_days=90)
+
+        assert removed == 1
+        assert hm.is_notified("old_vid") is False
+        assert hm.is_notified("new_vid") is True
+
+    def test_JSON形式の履歴を初回のみ取り込む(self, tmp_path: Path):
+        json_path = tmp_path / "notified.json"
+        recent = (datetime.now(timezone.utc) - timedelta(days=1)).isoformat()
+        json_path.write_text(
+            json.dumps({
+                "notified_videos": {
+                    "vid001": {"title": "動画1", "channel_id": "UCtest", "notified_at": recent},
+                    "bad_vid": {"title": "壊れた動画", "channel_id": "UCtest", "notified_at": "invalid"},
+                }
+            }),
+            encoding="utf-8",
+        )
+        hm = self._make_manager(tmp_path, json_path)
+        assert hm.is_notified("vid001") is True
+        # パースできない日時は次回のクリーンアップで削除される
+        assert hm.cleanup_old_entries(retention_days=90) == 1
+        hm.save()
+        hm.close()
+
+        # 取り込み後にJSONへ追加されたエントリは取り込まない
+        json_path.write_text(
+            json.dumps({"notified_videos": {"vid002": {"title": "動画2", "notified_at": recent}}}),
+            encoding="utf-8",
+        )
+        reloaded = self._make_manager(tmp_path, json_path)
+        assert reloaded.is_notified("vid001") is True
+        assert reloaded.is_notified("vid002") is False
+
+    def test_load前に使用するとRuntimeError(self, tmp_path: Path):
+        hm = SQLiteHistoryManager(str(tmp_path / "notified.db"), json_path=None)
+        with pytest.raises(RuntimeError):
+            hm.is_notified("vid001")
+
+
+class TestCreateHistoryManager:
+    """create_history_manager() のテスト"""
+
+    def test_保存形式に応じたマネージャーを返す(self):
+        assert isinstance(create_history_manager("json"), HistoryManager)
+        assert isinstance(create_history_manager("sqlite"), SQLiteHistoryManager)
+        assert isinstance(create_history_manager("journal"), JournaledHistoryManager)
+
+    def test_不明な保存形式はValueError(self):
+        with pytest.raises(ValueError):
+            create_history_manager("csv")
+
+    def test_指定したディレクトリに保存する(self, tmp_path: Path):
+        hm = create_history_manager("journal", str(tmp_path / "shard"))
+        hm.load()
+        hm.mark_notified(_make_video("vid001"))
+
+        assert (tmp_path / "shard" / "notified.journal").exists()
+
+
+class TestJournaledHistoryManager:
+    """JournaledHistoryManager のテスト"""
+
+    def _make_manager(self, tmp_path: Path, compact_threshold: int = 500) -> JournaledHistoryManager:
+        hm = JournaledHistoryManager(
+            str(tmp_path / "notified.json"),
+            journal_path=str(tmp_path / "notified.journal"),
+            compact_threshold=compact_threshold,
+        )
+        hm.load()
+        return hm
+
+    def test_記録した動画がジャーナルに追記される(self, tmp_path: Path):
+        hm = self._make_manager(tmp_path)
+        hm.mark_notified(_make_video("vid001"))
+        hm.mark_notified(_make_video("vid002"))
+
+        lines = (tmp_path / "notified.journal").read_text(encoding="utf-8").splitlines()
+        assert [json.loads(line)["video_id"] for line in lines] == ["vid001", "vid002"]
+
+    def test_保存せずに中断してもジャーナルから復元できる(self, tmp_path: Path):
+        hm = self._make_manager(tmp_path)
+        hm.mark_notified(_make_video("vid001"))
+
+        reloaded = self._make_manager(tmp_path)
+        assert reloaded.is_notified("vid001") is True
+
+    def test_スナップショットとジャーナルを合わせて読み込む(self, tmp_path: Path):
+        hm = self._make_manager(tmp_path, compact_threshold=0)
+        hm.mark_notified(_make_video("vid001"))
+        hm.save()
+        assert not (tmp_path / "notified.journal").exists()
+
+        hm = self._make_manager(tmp_path)
+        hm.mark_notified(_make_video("vid002"))
+
+        reloaded = self._make_manager(tmp_path)
+        assert reloaded.is_notified("vid001") is True
+        assert reloaded.is_notified("vid002") is True
+
+    def test_閾値以下ではスナップショットを書き直さない(self, tmp_path: Path):
+        hm = self._make_manager(tmp_path, compact_threshold=0)
+        hm.save()
+        snapshot = tmp_path / "notified.json"
+        before = snapshot.read_text(encoding="utf-8")
+
+        hm = self._make_manager(tmp_path, compact_threshold=10)
+        hm.mark_notified(_make_video("vid001"))
+        hm.save()
+
+        assert snapshot.read_text(encoding="utf-8") == before
+        assert (tmp_path / "notified.journal").exists()
+
+    def test_削除もジャーナルに記録される(self, tmp_path: Path):
+        hm = self._make_manager(tmp_path)
+        with patch("src.history_manager.datetime") as mock_datetime:
+            mock_datetime.now.return_value = datetime.now(timezone.utc) - timedelta(days=100)
+            mock_datetime.fromtimestamp = datetime.fromtimestamp
+            hm.mark_notified(_make_video("old_vid"))
+
+        assert hm.cleanup_old_entries(retention_days=90) == 1
+
+        reloaded = self._make_manager(tmp_path)
+        assert reloaded.is_notified("old_vid") is False
+
+    def test_途中で途切れた行は読み飛ばす(self, tmp_path: Path):
+        hm = self._make_manager(tmp_path)
+        hm.mark_notified(_make_video("vid001"))
+        with open(tmp_path / "notified.journal", "a", encoding="utf-8") as f:
+            f.write('{"op": "add", "video_id": "vid0')
+
+        reloaded = self._make_manager(tmp_path)
+        assert reloaded.is_notified("vid001") is True
+        assert len(dict(reloaded.entries())) == 1
+
+
+class TestHistoryAdopt:
+    """entries() / adopt() のテスト（保存形式ごと）"""
+
+    @pytest.mark.parametrize("backend", ["json", "journal", "sqlite"])
+    def test_通知日時を保ったまま取り込み再読み込み後も残る(self, tmp_path: Path, backend: str):
+        source = create_history_manager(backend, str(tmp_path / "source"))
+        source.load()
+        source.mark_notified(_make_video("vid001"))
+        entries = dict(source.entries())
+
+        hm = create_history_manager(backend, str(tmp_path / "target"))
+        hm.load()
+        assert hm.adopt("vid001", entries["vid001"]) is True
+        # 登録済みのエントリは取り込まない
+        assert hm.adopt("vid001", entries["vid001"]) is False
+        hm.save()
+
+        reloaded = create_history_manager(backend, str(tmp_path / "target"))
+        reloaded.load()
+        assert dict(reloaded.entries()) == entries
+
+    @pytest.mark.parametrize("backend", ["json", "journal", "sqlite"])
+    def test_置き換えた履歴が保存される(self, tmp_path: Path, backend: str):
+        hm = create_history_manager(backend, str(tmp_path))
+        hm.load()
+        hm.mark_notified(_make_video("vid001"))
+        entries = {
+            "vid002": {
+                "title": "動画2",
+                "channel_id": "UCtest",
+                "notified_at": "2026-01-01T00:00:00+00:00",
+            }
+        }
+
+        hm.replace_entries(entries)
+        hm.save()
+
+        reloaded = create_history_manager(backend, str(tmp_path))
+        reloaded.load()
+        assert dict(reloaded.entries()) == entries
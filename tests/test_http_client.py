@@ -0,0 +1,65 @@
+"""http_client の単体テスト"""
+import asyncio
+from unittest.mock import patch
+
+from src.http_client import close_session, create_async_session, create_session, get_session
+
+
+class TestCreateSession:
+    """create_session() のテスト"""
+
+    def test_接続プールのサイズが設定される(self):
+        session = create_session(pool_connections=3, pool_maxsize=7)
+        adapter = session.get_adapter("https://www.youtube.com/")
+
+        assert adapter._pool_connections == 3
+        assert adapter._pool_maxsize == 7
+
+    def test_timeout省略時はデフォルトタイムアウトが使われる(self):
+        session = create_session(timeout=12)
+
+        with patch("requests.Session.request") as mock_request:
+            session.get("https://www.youtube.com/")
+            assert mock_request.call_args.kwargs["timeout"] == 12
+
+            session.get("https://www.youtube.com/", timeout=3)
+            assert mock_request.call_args.kwargs["timeout"] == 3
+
+    def test_接続と読み取りのタイムアウトを別々に指定できる(self):
+        session = create_session(timeout=(5, 60))
+
+        with patch("requests.Session.request") as mock_request:
+            session.get("https://www.youtube.com/")
+            assert mock_request.call_args.kwargs["timeout"] == (5, 60)
+
+
+class TestCreateAsyncSession:
+    """create_async_session() のテスト"""
+
+    def test_接続プールとタイムアウトが設定される(self):
+        async def create():
+            async with create_async_session(limit=20, limit_per_host=4, timeout=(5, 60)) as session:
+                return session.connector.limit, session.connector.limit_per_host, session.timeout
+
+        limit, limit_per_host, timeout = asyncio.run(create())
+
+        assert (limit, limit_per_host) == (20, 4)
+        assert (timeout.sock_connect, timeout.sock_read) == (5, 60)
+
+
+class TestGetSession:
+    """get_session() のテスト"""
+
+    def test_同じセッションが再利用される(self):
+        try:
+            assert get_session() is get_session()
+        finally:
+            close_session()
+
+    def test_close後は新しいセッションが生成される(self):
+        first = get_session()
+        close_session()
+        try:
+            assert get_session() is not first
+        finally:
+            close_session()
@@ -0,0 +1,556 @@
+"""image_generator の単体テスト（Playwright はモック）"""
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
+
+from src.exceptions import ImageGenerationError
+from src.image_generator import (
+    AsyncBrowserRenderer,
+    BrowserRenderer,
+    FontCache,
+    RenderPool,
+    _handle_route,
+    _handle_route_async,
+    _wait_until_ready,
+    cleanup_temp_image,
+    default_render_concurrency,
+    generate_infographic,
+    generate_infographic_async,
+    generate_infographics,
+)
+
+
+def _mock_playwright() -> MagicMock:
+    """sync_playwright().start() が返すオブジェクトのモックを生成するヘルパー"""
+    playwright = MagicMock()
+    playwright.chromium.launch.side_effect = lambda **kwargs: _mock_browser()
+    return playwright
+
+
+def _mock_browser() -> MagicMock:
+    browser = MagicMock()
+    browser.is_connected.return_value = True
+    return browser
+
+
+class TestBrowserRenderer:
+    """BrowserRenderer のテスト"""
+
+    def test_複数回のレンダリングでブラウザは一度だけ起動される(self):
+        playwright = _mock_playwright()
+        with patch("src.image_generator.sync_playwright") as mock_sync:
+            mock_sync.return_value.start.return_value = playwright
+            renderer = BrowserRenderer()
+            renderer.render("<html></html>", "out1.png")
+            renderer.render("<html></html>", "out2.png")
+
+        assert playwright.chromium.launch.call_count == 1
+        browser = renderer._browser
+        assert browser.new_context.call_count == 2
+        assert browser.new_context.return_value.close.call_count == 2
+
+    def test_上限回数に達するとブラウザが再起動される(self):
+        playwright = _mock_playwright()
+        with patch("src.image_generator.sync_playwright") as mock_sync:
+            mock_sync.return_value.start.return_value = playwright
+            renderer = BrowserRenderer(max_renders=2)
+            for i in range(3):
+                renderer.render("<html></html>", f"out{i}.png")
+
+        assert playwright.chromium.launch.call_count == 2
+
+    def test_クラッシュ時はブラウザを再起動して再試行する(self):
+        crashed = _mock_browser()
+        crashed.new_context.side_effect = RuntimeError("Target closed")
+        crashed.is_connected.return_value = False
+        healthy = _mock_browser()
+        playwright = MagicMock()
+        playwright.chromium.launch.side_effect = [crashed, healthy]
+
+        with patch("src.image_generator.sync_playwright") as mock_sync:
+            mock_sync.return_value.start.return_value = playwright
+            renderer = BrowserRenderer()
+            renderer.render("<html></html>", "out.png")
+
+        assert playwright.chromium.launch.call_count == 2
+        assert healthy.new_context.call_count == 1
+
+    def test_ブラウザが正常な場合の例外はそのまま送出される(self):
+        playwright = _mock_playwright()
+        with patch("src.image_generator.sync_playwright") as mock_sync:
+            mock_sync.return_value.start.return_value = playwright
+            renderer = BrowserRenderer()
+            renderer._ensure_browser().new_context.side_effect = ValueError("bad html")
+            with pytest.raises(ValueError):
+                renderer.render("<html></html>", "out.png")
+
+        assert playwright.chromium.launch.call_count == 1
+
+    def test_closeでブラウザとPlaywrightが終了する(self):
+        playwright = _mock_playwright()
+        with patch("src.image_generator.sync_playwright") as mock_sync:
+            mock_sync.return_value.start.return_value = playwright
+            renderer = BrowserRenderer()
+            renderer.render("<html></html>", "out.png")
+            browser = renderer._browser
+            renderer.close()
+
+        browser.close.assert_called_once()
+        playwright.stop.assert_called_once()
+
+
+def _mock_async_playwright() -> AsyncMock:
+    """async_playwright().start() が返すオブジェクトのモックを生成するヘルパー"""
+    playwright = AsyncMock()
+    playwright.chromium.launch.side_effect = lambda **kwargs: _mock_async_browser()
+    return playwright
+
+
+def _mock_async_browser() -> AsyncMock:
+    browser = AsyncMock()
+    browser.is_connected = MagicMock(return_value=True)
+    browser.contexts = []
+    return browser
+
+
+def _render_async(renderer: AsyncBrowserRenderer, count: int) -> None:
+    """レンダラーで count 回レンダリングしてから終了する"""
+
+    async def run():
+        async with renderer:
+            for i in range(count):
+                await renderer.render("<html></html>", f"out{i}.png")
+
+    asyncio.run(run())
+
+
+class TestAsyncBrowserRenderer:
+    """AsyncBrowserRenderer のテスト"""
+
+    def test_複数回のレンダリングでブラウザは一度だけ起動され終了時に閉じられる(self, tmp_path: Path):
+        playwright = _mock_async_playwright()
+        with patch("src.image_generator.async_playwright") as mock_async:
+            mock_async.return_value.start = AsyncMock(return_value=playwright)
+            renderer = AsyncBrowserRenderer(font_cache=FontCache(str(tmp_path / "fonts")))
+            _render_async(renderer, 2)
+
+        assert playwright.chromium.launch.await_count == 1
+        assert renderer._browser is None
+        playwright.stop.assert_awaited_once()
+
+    def test_ページを描画してスクリーンショットを保存しコンテキストを閉じる(self, tmp_path: Path):
+        browser = _mock_async_browser()
+        playwright = AsyncMock()
+        playwright.chromium.launch.return_value = browser
+        with patch("src.image_generator.async_playwright") as mock_async:
+            mock_async.return_value.start = AsyncMock(return_value=playwright)
+            renderer = AsyncBrowserRenderer(font_cache=FontCache(str(tmp_path / "fonts")))
+            _render_async(renderer, 2)
+
+        context = browser.new_context.return_value
+        page = context.new_page.return_value
+        assert browser.new_context.await_count == 2
+        assert context.close.await_count == 2
+        page.set_content.assert_awaited_with("<html></html>", wait_until="domcontentloaded")
+        page.screenshot.assert_awaited_with(path="out1.png", full_page=True)
+        browser.close.assert_awaited_once()
+
+    def test_上限回数に達するとブラウザが差し替えられ古いブラウザも閉じられる(self, tmp_path: Path):
+        browsers = [_mock_async_browser(), _mock_async_browser()]
+        playwright = AsyncMock()
+        playwright.chromium.launch.side_effect = browsers
+        with patch("src.image_generator.async_playwright") as mock_async:
+            mock_async.return_value.start = AsyncMock(return_value=playwright)
+            renderer = AsyncBrowserRenderer(
+                max_renders=2, font_cache=FontCache(str(tmp_path / "fonts"))
+            )
+            _render_async(renderer, 3)
+
+        assert playwright.chromium.launch.await_count == 2
+        assert browsers[0].new_context.await_count == 2
+        assert browsers[1].new_context.await_count == 1
+        browsers[0].close.assert_awaited_once()
+        browsers[1].close.assert_awaited_once()
+
+    def test_クラッシュ時はブラウザを再起動して再試行する(self, tmp_path: Path):
+        crashed = _mock_async_browser()
+        crashed.new_context.side_effect = RuntimeError("Target closed")
+        crashed.is_connected.return_value = False
+        healthy = _mock_async_browser()
+        playwright = AsyncMock()
+        playwright.chromium.launch.side_effect = [crashed, healthy]
+        with patch("src.image_generator.async_playwright") as mock_async:
+            mock_async.return_value.start = AsyncMock(return_value=playwright)
+            renderer = AsyncBrowserRenderer(font_cache=FontCache(str(tmp_path / "fonts")))
+            _render_async(renderer, 1)
+
+        assert playwright.chromium.launch.await_count == 2
+        assert healthy.new_context.await_count == 1
+
+    def test_ブラウザが正常な場合の例外はそのまま送出される(self, tmp_path: Path):
+        browser = _mock_async_browser()
+        browser.new_context.side_effect = ValueError("bad html")
+        playwright = AsyncMock()
+        playwright.chromium.launch.return_value = browser
+        with patch("src.image_generator.async_playwright") as mock_async:
+            mock_async.return_value.start = AsyncMock(return_value=playwright)
+            renderer = AsyncBrowserRenderer(font_cache=FontCache(str(tmp_path / "fonts")))
+            with pytest.raises(ValueError):
+                _render_async(renderer, 1)
+
+        assert playwright.chromium.launch.await_count == 1
+
+
+class TestGenerateInfographic:
+    """generate_infographic() のテスト"""
+
+    def test_指定したレンダラーでPNGが生成される(self):
+        renderer = MagicMock()
+        renderer.render.side_effect = lambda html, path: open(path, "wb").write(b"png")
+
+        image_path = generate_infographic("<html></html>", "テスト動画", renderer=renderer)
+        try:
+            renderer.render.assert_called_once()
+            assert Path(image_path).read_bytes() == b"png"
+        finally:
+            cleanup_temp_image(image_path)
+
+    def test_レンダリング失敗はImageGenerationErrorになる(self):
+        renderer = MagicMock()
+        renderer.render.side_effect = RuntimeError("render failed")
+
+        with pytest.raises(ImageGenerationError, match="テスト動画"):
+            generate_infographic("<html></html>", "テスト動画", renderer=renderer)
+
+    def test_保存先を指定した場合はそのディレクトリ以下のパスを返す(self, tmp_path: Path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        (tmp_path / "rendered").mkdir()
+        renderer = MagicMock()
+        renderer.render.side_effect = lambda html, path: open(path, "wb").write(b"png")
+
+        image_path = generate_infographic(
+            "<html></html>", "テスト動画", renderer=renderer, output_dir="rendered"
+        )
+
+        assert Path(image_path).parent == Path("rendered")
+        assert (tmp_path / image_path).read_bytes() == b"png"
+
+
+class TestGenerateInfographicAsync:
+    """generate_infographic_async() のテスト"""
+
+    def test_指定したレンダラーでPNGが生成される(self, tmp_path: Path):
+        async def fake_render(html, path):
+            Path(path).write_bytes(b"png")
+
+        renderer = AsyncMock()
+        renderer.render.side_effect = fake_render
+
+        image_path = asyncio.run(
+            generate_infographic_async(
+                "<html></html>", "テスト動画", renderer, output_dir=str(tmp_path)
+            )
+        )
+
+        renderer.render.assert_awaited_once()
+        assert Path(image_path).parent == tmp_path
+        assert Path(image_path).read_bytes() == b"png"
+
+    def test_レンダリング失敗はImageGenerationErrorになる(self, tmp_path: Path):
+        renderer = AsyncMock()
+        renderer.render.side_effect = RuntimeError("render failed")
+
+        with pytest.raises(ImageGenerationError, match="テスト動画"):
+            asyncio.run(
+                generate_infographic_async(
+                    "<html></html>", "テスト動画", renderer, output_dir=str(tmp_path)
+                )
+            )
+
+
+class TestWaitUntilReady:
+    """_wait_until_ready() のテスト"""
+
+    def test_ネットワークアイドルと描画完了を待つ(self):
+        page = MagicMock()
+
+        _wait_until_ready(page, timeout_ms=5000)
+
+        page.wait_for_load_state.assert_called_once_with("networkidle", timeout=5000)
+        page.wait_for_function.assert_called_once()
+        assert page.wait_for_function.call_args.kwargs["timeout"] <= 5000
+        page.wait_for_timeout.assert_not_called()
+
+    def test_上限時間を超えても例外にせず続行する(self, caplog):
+        page = MagicMock()
+        page.wait_for_function.side_effect = PlaywrightTimeoutError("timeout")
+
+        with caplog.at_level("INFO", logger="src.image_generator"):
+            _wait_until_ready(page, timeout_ms=100)
+
+        assert "上限(100ms)" in caplog.text
+        assert "描画完了待機" in caplog.text
+
+
+def _mock_route(url: str) -> MagicMock:
+    route = MagicMock()
+    route.request.url = url
+    return route
+
+
+class TestFontCache:
+    """FontCache のテスト"""
+
+    def test_保存した内容を取得できる(self, tmp_path: Path):
+        cache = FontCache(str(tmp_path / "fonts"))
+        cache.put("https://fonts.gstatic.com/s/yomogi.woff2", b"font", "font/woff2")
+
+        assert cache.get("https://fonts.gstatic.com/s/yomogi.woff2") == (b"font", "font/woff2")
+
+    def test_未登録の場合はNoneを返す(self, tmp_path: Path):
+        cache = FontCache(str(tmp_path / "fonts"))
+        assert cache.get("https://fonts.gstatic.com/s/yomogi.woff2") is None
+
+
+class TestHandleRoute:
+    """_handle_route() のテスト"""
+
+    def test_キャッシュ済みのフォントはネットワークを使わず配信される(self, tmp_path: Path):
+        cache = FontCache(str(tmp_path / "fonts"))
+        url = "https://fonts.gstatic.com/s/yomogi.woff2"
+        cache.put(url, b"font", "font/woff2")
+        route = _mock_route(url)
+
+        _handle_route(route, cache)
+
+        route.fetch.assert_not_called()
+        kwargs = route.fulfill.call_args.kwargs
+        assert kwargs["body"] == b"font"
+        assert kwargs["headers"]["Content-Type"] == "font/woff2"
+
+    def test_未キャッシュのフォントは取得してキャッシュに保存される(self, tmp_path: Path):
+        cache = FontCache(str(tmp_path / "fonts"))
+        url = "https://fonts.googleapis.com/css2?family=Yomogi&display=swap"
+        route = _mock_route(url)
+        response = route.fetch.return_value
+        response.ok = True
+        response.body.return_value = b"@font-face {}"
+        response.headers = {"content-type": "text/css"}
+
+        _handle_route(route, cache)
+
+        route.fulfill.assert_called_once_with(response=response)
+        assert cache.get(url) == (b"@font-face {}", "text/css")
+
+    def test_フォント以外の外部リクエストは遮断される(self, tmp_path: Path):
+        route = _mock_route("https://example.com/image.png")
+
+        _handle_route(route, FontCache(str(tmp_path / "fonts")))
+
+        route.abort.assert_called_once()
+        route.fetch.assert_not_called()
+
+    def test_http以外のリクエストはそのまま通す(self, tmp_path: Path):
+        route = _mock_route("data:image/png;base64,xxxx")
+
+        _handle_route(route, FontCache(str(tmp_path / "fonts")))
+
+        route.continue_.assert_called_once()
+
+
+def _mock_async_route(url: str) -> AsyncMock:
+    route = AsyncMock()
+    route.request = MagicMock()
+    route.request.url = url
+    return route
+
+
+class TestHandleRouteAsync:
+    """_handle_route_async() のテスト"""
+
+    def test_キャッシュ済みのフォントはネットワークを使わず配信される(self, tmp_path: Path):
+        cache = FontCache(str(tmp_path / "fonts"))
+        url = "https://fonts.gstatic.com/s/yomogi.woff2"
+        cache.put(url, b"font", "font/woff2")
+        route = _mock_async_route(url)
+
+        asyncio.run(_handle_route_async(route, cache))
+
+        route.fetch.assert_not_awaited()
+        kwargs = route.fulfill.call_args.kwargs
+        assert kwargs["body"] == b"font"
+        assert kwargs["headers"]["Content-Type"] == "font/woff2"
+
+    def test_未キャッシュのフォントは取得してキャッシュに保存される(self, tmp_path: Path):
+        cache = FontCache(str(tmp_path / "fonts"))
+        url = "https://fonts.googleapis.com/css2?family=Yomogi&display=swap"
+        route = _mock_async_route(url)
+        response = MagicMock()
+        response.ok = True
+        response.body = AsyncMock(return_value=b"@font-face {}")
+        response.headers = {"content-type": "text/css"}
+        route.fetch.return_value = response
+
+        asyncio.run(_handle_route_async(route, cache))
+
+        route.fulfill.assert_awaited_once_with(response=response)
+        assert cache.get(url) == (b"@font-face {}", "text/css")
+
+    def test_キャッシュの読み書きはイベントループのスレッドで行わない(self, tmp_path: Path):
+        cache = FontCache(str(tmp_path / "fonts"))
+        url = "https://fonts.gstatic.com/s/yomogi.woff2"
+        route = _mock_async_route(url)
+        response = MagicMock()
+        response.ok = True
+        response.body = AsyncMock(return_value=b"font")
+        response.headers = {"content-type": "font/woff2"}
+        route.fetch.return_value = response
+        threads = []
+
+        def record_thread(method):
+            def wrapper(*args):
+                threads.append(threading.get_ident())
+                return method(*args)
+
+            return wrapper
+
+        async def run() -> int:
+            with patch.object(cache, "get", record_thread(cache.get)), patch.object(
+                cache, "put", record_thread(cache.put)
+            ):
+                await _handle_route_async(route, cache)
+            return threading.get_ident()
+
+        loop_thread = asyncio.run(run())
+
+        assert len(threads) == 2
+        assert loop_thread not in threads
+
+    def test_フォント以外の外部リクエストは遮断される(self, tmp_path: Path):
+        route = _mock_async_route("https://example.com/image.png")
+
+        asyncio.run(_handle_route_async(route, FontCache(str(tmp_path / "fonts"))))
+
+        route.abort.assert_awaited_once()
+        route.fetch.assert_not_awaited()
+
+
+def _thread_pool(max_workers, mp_context=None, initializer=None):
+    """ProcessPoolExecutor の代わりにスレッドプールを使うテスト用ファクトリ"""
+    return ThreadPoolExecutor(max_workers=max_workers)
+
+
+class TestGenerateInfographics:
+    """generate_infographics() のテスト"""
+
+    def test_入力順に結果と個別のエラーが返る(self):
+        def fake_generate(html_content, video_title, output_dir=None):
+            if video_title == "失敗動画":
+                raise ImageGenerationError("生成失敗")
+            return f"/tmp/{video_title}.png"
+
+        items = [("<html>1</html>", "動画1"), ("<html>2</html>", "失敗動画"), ("<html>3</html>", "動画3")]
+        with patch("src.image_generator.generate_infographic", side_effect=fake_generate), patch(
+            "src.image_generator.ProcessPoolExecutor", side_effect=_thread_pool
+        ) as mock_pool:
+            results = generate_infographics(items, max_concurrency=3)
+
+        assert mock_pool.call_args.kwargs["max_workers"] == 3
+        assert results[0] == "/tmp/動画1.png"
+        assert isinstance(results[1], ImageGenerationError)
+        assert results[2] == "/tmp/動画3.png"
+
+    def test_同時実行数1の場合はワーカープロセスを使わない(self):
+        with patch(
+            "src.image_generator.generate_infographic", return_value="/tmp/a.png"
+        ) as mock_generate, patch("src.image_generator.ProcessPoolExecutor") as mock_pool:
+            results = generate_infographics([("<html></html>", "動画")] * 2, max_concurrency=1)
+
+        assert results == ["/tmp/a.png", "/tmp/a.png"]
+        assert mock_generate.call_count == 2
+        mock_pool.assert_not_called()
+
+    def test_空リストの場合は空リストを返す(self):
+        assert generate_infographics([]) == []
+
+
+class TestDefaultRenderConcurrency:
+    """default_render_concurrency() のテスト"""
+
+    def test_空きメモリで同時実行数が制限される(self):
+        with patch("src.image_generator.os.cpu_count", return_value=8), patch(
+            "src.image_generator._available_memory_mb", return_value=1200
+        ):
+            assert default_render_concurrency() == 2
+
+    def test_CPU数で同時実行数が制限される(self):
+        with patch("src.image_generator.os.cpu_count", return_value=2), patch(
+            "src.image_generator._available_memory_mb", return_value=64000
+        ):
+            assert default_render_concurrency() == 2
+
+    def test_空きメモリが少なくても1以上になる(self):
+        with patch("src.image_generator.os.cpu_count", return_value=4), patch(
+            "src.image_generator._available_memory_mb", return_value=100
+        ):
+            assert default_render_concurrency() == 1
+
+
+class TestRenderPool:
+    """RenderPool のテスト"""
+
+    def test_ワーカープロセスで生成したパスを返す(self):
+        with patch(
+            "src.image_generator.generate_infographic", return_value="/tmp/a.png"
+        ), patch(
+            "src.image_generator.ProcessPoolExecutor", side_effect=_thread_pool
+        ) as mock_pool, RenderPool(max_workers=2) as pool:
+            assert pool.render("<html></html>", "動画1") == "/tmp/a.png"
+            assert pool.render("<html></html>", "動画2") == "/tmp/a.png"
+
+        # ワーカーは最初の生成時に1度だけ起動する
+        assert mock_pool.call_count == 1
+        assert mock_pool.call_args.kwargs["max_workers"] == 2
+
+    def test_生成失敗はImageGenerationErrorになる(self):
+        with patch(
+            "src.image_generator.generate_infographic", side_effect=ImageGenerationError("生成失敗")
+        ), patch(
+            "src.image_generator.ProcessPoolExecutor", side_effect=_thread_pool
+        ), RenderPool(max_workers=2) as pool:
+            with pytest.raises(ImageGenerationError):
+                pool.render("<html></html>", "動画")
+
+    def test_ワーカーが異常終了した場合は次の生成で起動し直す(self):
+        broken = MagicMock()
+        broken.submit.return_value.result.side_effect = BrokenProcessPool("異常終了")
+        with patch(
+            "src.image_generator.generate_infographic", return_value="/tmp/a.png"
+        ), patch(
+            "src.image_generator.ProcessPoolExecutor",
+            side_effect=[broken, ThreadPoolExecutor(max_workers=2)],
+        ), RenderPool(max_workers=2) as pool:
+            with pytest.raises(ImageGenerationError, match="ワーカー異常終了"):
+                pool.render("<html></html>", "動画")
+            assert pool.render("<html></html>", "動画") == "/tmp/a.png"
+
+        broken.shutdown.assert_called_once_with(wait=False)
+
+    def test_同時実行数1の場合は呼び出し元のスレッドで生成する(self):
+        with patch(
+            "src.image_generator.generate_infographic", return_value="/tmp/a.png"
+        ) as mock_generate, patch("src.image_generator.ProcessPoolExecutor") as mock_pool:
+            assert RenderPool(max_workers=1).render("<html></html>", "動画") == "/tmp/a.png"
+
+        mock_generate.assert_called_once_with("<html></html>", "動画", output_dir=None)
+        mock_pool.assert_not_called()
+
+    def test_同時実行数の省略時は空きメモリから決める(self):
+        with patch("src.image_generator.default_render_concurrency", return_value=3):
+            assert RenderPool().max_workers == 3
@@ -0,0 +1,151 @@
+"""JobStore の単体テスト"""
+import json
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pytest
+
+from src.job_store import (
+    DISCOVERED,
+    FILTERED,
+    POSTED,
+    RENDERED,
+    SKIPPED,
+    SUMMARIZED,
+    JobStore,
+)
+from src.models import VideoEntry
+
+
+def _make_video(video_id: str = "vid001", day: int = 1) -> VideoEntry:
+    return VideoEntry(
+        video_id=video_id,
+        title=f"動画 {video_id}",
+        url=f"https://www.youtube.com/watch?v={video_id}",
+        published=datetime(2026, 3, day, tzinfo=timezone.utc),
+        channel_id="UC001",
+    )
+
+
+class TestJobStoreDiscover:
+    """discover() のテスト"""
+
+    def test_未登録の動画をdiscovered段階で登録する(self, tmp_path: Path):
+        store = JobStore(str(tmp_path / "jobs.json"))
+        added = store.discover([_make_video("vid001"), _make_video("vid002")])
+
+        assert [v.video_id for v in added] == ["vid001", "vid002"]
+        assert store.get("vid001").stage == DISCOVERED
+
+    def test_登録済みの動画は段階を戻さない(self, tmp_path: Path):
+        store = JobStore(str(tmp_path / "jobs.json"))
+        store.discover([_make_video("vid001")])
+        store.advance("vid001", SUMMARIZED)
+
+        added = store.discover([_make_video("vid001"), _make_video("vid002")])
+
+        assert [v.video_id for v in added] == ["vid002"]
+        assert store.get("vid001").stage == SUMMARIZED
+
+
+class TestJobStoreAdvance:
+    """advance() のテスト"""
+
+    def test_段階を進めるたびにファイルへ書き出す(self, tmp_path: Path):
+        path = tmp_path / "jobs.json"
+        store = JobStore(str(path))
+        store.discover([_make_video("vid001")])
+        store.advance("vid001", FILTERED)
+
+        data = json.loads(path.read_text(encoding="utf-8"))
+        assert data["jobs"]["vid001"]["stage"] == FILTERED
+
+    def test_画像パスを記録できる(self, tmp_path: Path):
+        store = JobStore(str(tmp_path / "jobs.json"))
+        store.discover([_make_video("vid001")])
+        store.advance("vid001", RENDERED, image_path="/tmp/image.png")
+
+        job = store.get("vid001")
+        assert job.stage == RENDERED
+        assert job.image_path == "/tmp/image.png"
+
+    def test_記録済みの段階より前には戻さない(self, tmp_path: Path):
+        store = JobStore(str(tmp_path / "jobs.json"))
+        store.discover([_make_video("vid001")])
+        store.advance("vid001", RENDERED, image_path="/tmp/image.png")
+        store.advance("vid001", SUMMARIZED)
+
+        job = store.get("vid001")
+        assert job.stage == RENDERED
+        assert job.image_path == "/tmp/image.png"
+
+    def test_不明な段階はValueError(self, tmp_path: Path):
+        store = JobStore(str(tmp_path / "jobs.json"))
+        store.discover([_make_video("vid001")])
+        with pytest.raises(ValueError):
+            store.advance("vid001", "unknown")
+
+    def test_未登録のジョブは無視する(self, tmp_path: Path):
+        store = JobStore(str(tmp_path / "jobs.json"))
+        store.advance("vid999", POSTED)
+        assert "vid999" not in store
+
+    def test_書き出し後に一時ファイルが残らない(self, tmp_path: Path):
+        store = JobStore(str(tmp_path / "jobs.json"))
+        store.discover([_make_video("vid001")])
+        store.advance("vid001", FILTERED)
+        assert [p.name for p in tmp_path.iterdir()] == ["jobs.json"]
+
+
+class TestJobStoreResume:
+    """再起動後の再開に関するテスト"""
+
+    def test_再読み込み後も未完了ジョブと段階を復元できる(self, tmp_path: Path):
+        path = str(tmp_path / "jobs.json")
+        store = JobStore(path)
+        store.discover([_make_video("vid001"), _make_video("vid002"), _make_video("vid003")])
+        store.advance("vid001", SUMMARIZED)
+        store.advance("vid002", POSTED)
+
+        reloaded = JobStore(path)
+        reloaded.load()
+
+        unfinished = {job.video.video_id: job.stage for job in reloaded.unfinished()}
+        assert unfinished == {"vid001": SUMMARIZED, "vid003": DISCOVERED}
+        assert [job.video.video_id for job in reloaded.finished()] == ["vid002"]
+        assert reloaded.get("vid001").video.published == datetime(2026, 3, 1, tzinfo=timezone.utc)
+
+    def test_指定したジョブを削除できる(self, tmp_path: Path):
+        store = JobStore(str(tmp_path / "jobs.json"))
+        store.discover([_make_video("vid001"), _make_video("vid002"), _make_video("vid003")])
+        store.advance("vid001", POSTED)
+        store.advance("vid002", SKIPPED)
+
+        store.discard([job.video.video_id for job in store.finished()])
+        assert len(store) == 1
+        assert "vid003" in store
+
+    def test_公開日時が古い未完了ジョブを削除する(self, tmp_path: Path):
+        store = JobStore(str(tmp_path / "jobs.json"))
+        store.discover([_make_video("vid001", day=1), _make_video("vid002", day=10)])
+
+        removed = store.discard_published_before(datetime(2026, 3, 5, tzinfo=timezone.utc))
+
+        assert removed == 1
+        assert "vid001" not in store
+        assert "vid002" in store
+
+    def test_失敗回数を記録する(self, tmp_path: Path):
+        store = JobStore(str(tmp_path / "jobs.json"))
+        store.discover([_make_video("vid001")])
+
+        assert store.record_failure("vid001") == 1
+        assert store.record_failure("vid001") == 2
+        assert store.get("vid001").failures == 2
+
+    def test_破損したファイルは空で初期化される(self, tmp_path: Path):
+        path = tmp_path / "jobs.json"
+        path.write_text("{broken", encoding="utf-8")
+        store = JobStore(str(path))
+        store.load()
+        assert len(store) == 0
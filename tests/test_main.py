@@ -0,0 +1,600 @@
+"""main モジュール（VideoProcessor・Notifier・async_main）の単体テスト"""
+import asyncio
+import functools
+import os
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Optional
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.exceptions import (
+    DiscordNotifyError,
+    ImageGenerationError,
+    RateLimitError,
+    SummarizerError,
+    SummarizerUnavailableError,
+    TokenLimitError,
+)
+from src.history_manager import create_history_manager
+from src.job_store import DISCOVERED, FILTERED, POSTED, RENDERED, SKIPPED, SUMMARIZED, JobStore
+from src.main import GIVE_UP_TITLE, Notifier, VideoProcessor, async_main
+from src.models import AppSettings, ChannelConfig, VideoEntry, VideoJob
+from src.sharding import Shard
+from src.summarizer import RateLimiter
+from src.video_filter import filter_videos
+
+
+class FakeClock:
+    """テスト用の手動で進める時計"""
+
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _make_settings(**overrides) -> AppSettings:
+    values = dict(
+        check_interval_minutes=30,
+        max_summary_length=3500,
+        history_retention_days=30,
+        default_prompt_template="要約してください",
+    )
+    values.update(overrides)
+    return AppSettings(**values)
+
+
+def _make_video(
+    video_id: str = "vid001",
+    days_ago: float = 0,
+    channel_id: str = "UC001",
+    title: Optional[str] = None,
+) -> VideoEntry:
+    return VideoEntry(
+        video_id=video_id,
+        title=title or f"動画 {video_id}",
+        url=f"https://www.youtube.com/watch?v={video_id}",
+        published=datetime.now(timezone.utc) - timedelta(days=days_ago),
+        channel_id=channel_id,
+    )
+
+
+def _normal_oembed(video: VideoEntry, session=None) -> dict:
+    return {"title": video.title, "width": 1280, "height": 720}
+
+
+def _submitted(pipeline: MagicMock) -> list[str]:
+    return [call.args[0].video.video_id for call in pipeline.submit.call_args_list]
+
+
+def _make_channel() -> ChannelConfig:
+    return ChannelConfig(channel_id="UC001", name="テストチャンネル", prompt_template=None)
+
+
+def _make_job(video_id: str = "vid001") -> VideoJob:
+    return VideoJob(video=_make_video(video_id), channel=_make_channel(), prompt_template="要約してください")
+
+
+def _make_notifier(tmp_path: Path) -> Notifier:
+    return Notifier(
+        [_make_channel()],
+        _make_settings(render_concurrency=1),
+        gemini_api_key="key",
+        discord_webhook_url="https://discord.example/webhook",
+        http_session=MagicMock(),
+        data_dir=str(tmp_path),
+    )
+
+
+def _make_processor(
+    tmp_path: Path,
+    rate_limiter: Optional[RateLimiter] = None,
+    job_store: Optional[JobStore] = None,
+) -> VideoProcessor:
+    history = create_history_manager("json", str(tmp_path))
+    history.load()
+    return VideoProcessor(
+        settings=_make_settings(render_concurrency=1),
+        history=history,
+        gemini_api_key="key",
+        discord_webhook_url="https://discord.example/webhook",
+        http_session=MagicMock(),
+        rate_limiter=rate_limiter or RateLimiter(),
+        job_store=job_store,
+    )
+
+
+def _make_job_store(tmp_path: Path, *video_ids: str) -> JobStore:
+    job_store = JobStore(str(tmp_path / "jobs.json"))
+    job_store.discover([_make_video(video_id) for video_id in video_ids])
+    for video_id in video_ids:
+        job_store.advance(video_id, FILTERED)
+    return job_store
+
+
+class TestResetRateLimit:
+    """VideoProcessor.reset_rate_limit() のテスト"""
+
+    def test_サーバーから指示された待機が残っている間は解除しない(self, tmp_path: Path):
+        clock = FakeClock()
+        limiter = RateLimiter(clock=clock)
+        processor = _make_processor(tmp_path, limiter)
+        processor._handle_error("summarize", MagicMock(), RateLimitError("429"))
+        limiter.defer(3600)
+
+        processor.reset_rate_limit()
+        assert processor.rate_limited
+
+        clock.now += 3600
+        processor.reset_rate_limit()
+        assert not processor.rate_limited
+
+
+class TestRecordFailure:
+    """VideoProcessor.on_error() の失敗回数の記録と打ち切りのテスト"""
+
+    @pytest.mark.parametrize(
+        "error",
+        [SummarizerError("HTTP 400"), ImageGenerationError("描画失敗")],
+    )
+    def test_要約と画像生成が3回失敗したら通知して打ち切る(self, tmp_path: Path, error: Exception):
+        job_store = _make_job_store(tmp_path, "vid001")
+        processor = _make_processor(tmp_path, job_store=job_store)
+
+        with patch("src.main.send_error_notification") as send_error:
+            for _ in range(3):
+                processor.on_error("summarize", _make_job(), error)
+
+        assert job_store.get("vid001").stage == SKIPPED
+        assert processor._history.is_notified("vid001")
+        assert send_error.call_args.args[1] == GIVE_UP_TITLE
+
+    @pytest.mark.parametrize(
+        "error",
+        [
+            DiscordNotifyError("Discord障害"),
+            SummarizerUnavailableError("HTTP 503"),
+            RuntimeError("予期しないエラー"),
+        ],
+    )
+    def test_一時的な障害は回数に数えない(self, tmp_path: Path, error: Exception):
+        job_store = _make_job_store(tmp_path, "vid001")
+        processor = _make_processor(tmp_path, job_store=job_store)
+
+        with patch("src.main.send_error_notification"):
+            for _ in range(5):
+                processor.on_error("notify", _make_job(), error)
+
+        record = job_store.get("vid001")
+        assert record.stage == FILTERED
+        assert record.failures == 0
+        assert not processor._history.is_notified("vid001")
+
+
+class TestSummarize:
+    """VideoProcessor.summarize() のテスト"""
+
+    def test_画像まで生成済みのジョブは要約を省いて段階を戻さない(self, tmp_path: Path):
+        image_path = tmp_path / "image.png"
+        image_path.write_bytes(b"png")
+        job_store = _make_job_store(tmp_path, "vid001")
+        job_store.advance("vid001", RENDERED, image_path=str(image_path))
+        processor = _make_processor(tmp_path, job_store=job_store)
+        job = _make_job()
+        job.image_path = str(image_path)
+
+        with patch("src.main.summarize") as summarize:
+            assert processor.summarize(job) is job
+            assert processor.render(job) is job
+
+        summarize.assert_not_called()
+        assert job_store.get("vid001").stage == RENDERED
+
+
+class TestFilterAndSubmit:
+    """Notifier._filter_and_submit() のテスト"""
+
+    def test_oEmbedの制限時間に間に合わなかった動画は投入せず次回に持ち越す(self, tmp_path: Path):
+        notifier = _make_notifier(tmp_path)
+        videos = [_make_video("vid001"), _make_video("vid002")]
+        notifier.job_store.discover(videos)
+        release = threading.Event()
+
+        def fake_fetch(video, session=None):
+            if video.video_id == "vid002":
+                release.wait(timeout=5)
+            return _normal_oembed(video)
+
+        pipeline = MagicMock()
+        try:
+            with patch("src.video_filter._fetch_oembed", side_effect=fake_fetch), patch(
+                "src.main.filter_videos", functools.partial(filter_videos, deadline_seconds=0.2)
+            ):
+                notifier._filter_and_submit(pipeline, _make_channel(), videos)
+        finally:
+            release.set()
+
+        assert _submitted(pipeline) == ["vid001"]
+        assert notifier.job_store.get("vid001").stage == FILTERED
+        assert notifier.job_store.get("vid002").stage == DISCOVERED
+        assert not notifier.history.is_notified("vid002")
+
+
+class TestResumeJobs:
+    """Notifier.resume_jobs() / reconcile_jobs() のテスト（ジョブストア・履歴は実ファイル）"""
+
+    def test_未完了のジョブを途中の段階から再開する(self, tmp_path: Path):
+        image_path = tmp_path / "rendered.png"
+        image_path.write_bytes(b"png")
+        job_store = JobStore(str(tmp_path / "jobs.json"))
+        job_store.discover(
+            [_make_video(f"vid00{i}") for i in range(1, 6)]
+            + [_make_video("vid006", channel_id="UC999")]
+        )
+        job_store.advance("vid002", FILTERED)
+        job_store.advance("vid003", SUMMARIZED)
+        job_store.advance("vid004", RENDERED, image_path=str(image_path))
+        job_store.advance("vid005", POSTED)
+
+        notifier = _make_notifier(tmp_path)
+        pipeline = MagicMock()
+        with patch("src.video_filter._fetch_oembed", side_effect=_normal_oembed):
+            notifier.resume_jobs(pipeline)
+
+        # 段階の進んだジョブを先に、フィルタ前に中断された動画はフィルタしてから投入する
+        assert _submitted(pipeline) == ["vid002", "vid003", "vid004", "vid001"]
+        jobs = {call.args[0].video.video_id: call.args[0] for call in pipeline.submit.call_args_list}
+        assert jobs["vid004"].image_path == str(image_path)
+        assert jobs["vid003"].image_path is None
+        assert notifier.job_store.get("vid001").stage == FILTERED
+        # 監視対象から外れたチャンネルのジョブは破棄する
+        assert "vid006" not in notifier.job_store
+
+    def test_通知済みのジョブを履歴に反映し古い未完了ジョブを削除する(self, tmp_path: Path):
+        job_store = JobStore(str(tmp_path / "jobs.json"))
+        job_store.discover([_make_video("vid001"), _make_video("vid002", days_ago=40)])
+        job_store.advance("vid001", POSTED)
+
+        notifier = _make_notifier(tmp_path)
+        notifier.reconcile_jobs()
+
+        assert notifier.history.is_notified("vid001")
+        assert "vid002" not in notifier.job_store
+
+    def test_処理中の動画は重ねて投入しない(self, tmp_path: Path):
+        job_store = JobStore(str(tmp_path / "jobs.json"))
+        job_store.discover([_make_video("vid001")])
+        job_store.advance("vid001", FILTERED)
+
+        notifier = _make_notifier(tmp_path)
+        pipeline = MagicMock()
+        notifier.resume_jobs(pipeline)
+        notifier.resume_jobs(pipeline)
+
+        assert _submitted(pipeline) == ["vid001"]
+
+
+class TestSaveHistory:
+    """Notifier.save_history() のテスト"""
+
+    def test_履歴の保存後に履歴に反映済みの完了ジョブだけを削除する(self, tmp_path: Path):
+        notifier = _make_notifier(tmp_path)
+        notifier.job_store.discover([_make_video("vid001"), _make_video("vid002")])
+        notifier.job_store.advance("vid001", POSTED)
+        notifier.history.mark_notified(_make_video("vid001"))
+        # 通知済みだが履歴に記録される前に中断された動画
+        notifier.job_store.advance("vid002", POSTED)
+
+        discard = notifier.job_store.discard
+
+        def discard_after_saved(video_ids):
+            # ジョブを削除する時点で、履歴ファイルには保存済みであること
+            saved = create_history_manager("json", str(tmp_path))
+            saved.load()
+            assert saved.is_notified("vid001")
+            discard(video_ids)
+
+        with patch.object(notifier.job_store, "discard", side_effect=discard_after_saved):
+            notifier.save_history()
+
+        assert "vid001" not in notifier.job_store
+        assert notifier.job_store.get("vid002").stage == POSTED
+        # 次回の起動時に履歴に反映される
+        restarted = _make_notifier(tmp_path)
+        restarted.reconcile_jobs()
+        assert restarted.history.is_notified("vid002")
+
+
+class TestPipelineStages:
+    """VideoProcessor のパイプライン（要約 → 画像生成 → 通知）と段ごとのエラー処理のテスト
+
+    要約・画像生成・Discord送信はスタブに置き換え、ジョブストア・履歴は実ファイルを使う。
+    """
+
+    def _run(
+        self,
+        tmp_path: Path,
+        summarize=None,
+        render=None,
+        notify=None,
+        video_ids: tuple[str, ...] = ("vid001",),
+    ) -> tuple[VideoProcessor, JobStore, MagicMock]:
+        job_store = _make_job_store(tmp_path, *video_ids)
+        processor = _make_processor(tmp_path, job_store=job_store)
+        image_path = tmp_path / "image.png"
+
+        def default_render(html, title, output_dir=None):
+            image_path.write_bytes(b"png")
+            return str(image_path)
+
+        def default_summarize(**kwargs):
+            return "<html></html>"
+
+        with patch("src.main.summarize", side_effect=summarize or default_summarize), patch.object(
+            processor._render_pool, "render", side_effect=render or default_render
+        ), patch("src.main.send_image_notification", side_effect=notify), patch(
+            "src.main.send_error_notification"
+        ) as send_error:
+            with processor.build_pipeline() as pipeline:
+                for video_id in video_ids:
+                    processor.submit(pipeline, _make_job(video_id))
+        return processor, job_store, send_error
+
+    def test_全段を通過した動画は通知済みとして記録される(self, tmp_path: Path):
+        processor, job_store, send_error = self._run(tmp_path)
+
+        assert job_store.get("vid001").stage == POSTED
+        assert processor._history.is_notified("vid001")
+        # 通知後に画像を削除する
+        assert not (tmp_path / "image.png").exists()
+        send_error.assert_not_called()
+
+    def test_トークン上限超過は通知せずに完了扱いにする(self, tmp_path: Path):
+        def summarize(**kwargs):
+            raise TokenLimitError("長すぎる動画")
+
+        processor, job_store, send_error = self._run(tmp_path, summarize=summarize)
+
+        assert job_store.get("vid001").stage == SKIPPED
+        assert processor._history.is_notified("vid001")
+        send_error.assert_not_called()
+
+    def test_レートリミット超過後は残りの動画を投入せず次回に残す(self, tmp_path: Path):
+        def summarize(**kwargs):
+            raise RateLimitError("429")
+
+        processor, job_store, send_error = self._run(tmp_path, summarize=summarize)
+
+        assert processor.rate_limited
+        assert processor.submit(MagicMock(), _make_job("vid002")) is False
+        record = job_store.get("vid001")
+        assert record.stage == FILTERED
+        assert record.failures == 0
+        assert not processor._history.is_notified("vid001")
+
+    def test_要約の失敗はエラー通知して失敗回数を記録する(self, tmp_path: Path):
+        def summarize(**kwargs):
+            raise SummarizerError("HTTP 400")
+
+        processor, job_store, send_error = self._run(tmp_path, summarize=summarize)
+
+        assert send_error.call_args.args[1] == "\u26a0\ufe0f 要約生成エラー"
+        record = job_store.get("vid001")
+        assert record.stage == FILTERED
+        assert record.failures == 1
+        assert not processor._history.is_notified("vid001")
+
+    def test_画像生成の失敗は要約済みの段階で残る(self, tmp_path: Path):
+        def render(html, title, output_dir=None):
+            raise ImageGenerationError("描画失敗")
+
+        processor, job_store, send_error = self._run(tmp_path, render=render)
+
+        assert send_error.call_args.args[1] == "\u26a0\ufe0f 画像生成エラー"
+        assert job_store.get("vid001").stage == SUMMARIZED
+
+    def test_Discord通知の失敗は画像生成済みの段階で残り失敗回数に数えない(self, tmp_path: Path):
+        def notify(**kwargs):
+            raise DiscordNotifyError("Discord障害")
+
+        processor, job_store, send_error = self._run(tmp_path, notify=notify)
+
+        record = job_store.get("vid001")
+        assert record.stage == RENDERED
+        assert record.failures == 0
+        assert not processor._history.is_notified("vid001")
+
+
+def _fake_fetch_feeds(feed: list[VideoEntry], parsed: list[str]):
+    """新しい順のフィードを stop_at まで解析して返す fetch_feeds の代替"""
+
+    def fetch_feeds(channel_ids, cache=None, session=None, stop_at=None):
+        for channel_id in channel_ids:
+            videos = []
+            for video in feed:
+                if stop_at is not None and stop_at(video):
+                    break
+                parsed.append(video.video_id)
+                videos.append(video)
+            yield channel_id, videos
+
+    return fetch_feeds
+
+
+class TestPollWatermark:
+    """Notifier.poll() の処理済み範囲での解析打ち切りとウォーターマークのテスト"""
+
+    def _poll(self, notifier: Notifier, feed: list[VideoEntry]) -> tuple[list[str], list[str]]:
+        parsed: list[str] = []
+        pipeline = MagicMock()
+        with patch("src.main.fetch_feeds", side_effect=_fake_fetch_feeds(feed, parsed)), patch(
+            "src.video_filter._fetch_oembed", side_effect=_normal_oembed
+        ):
+            notifier.poll(pipeline, ["UC001"])
+        return parsed, _submitted(pipeline)
+
+    def test_ウォーターマークがなければ通知済みの動画で解析を打ち切らない(self, tmp_path: Path):
+        notifier = _make_notifier(tmp_path)
+        # 古い動画が更新されてフィードの上位に並び、その後ろに未通知の新着が続く
+        notifier.history.mark_notified(_make_video("vid001", days_ago=2))
+        feed = [
+            _make_video("vid001", days_ago=2),
+            _make_video("vid002", days_ago=1),
+            _make_video("vid003", days_ago=40),
+        ]
+
+        parsed, submitted = self._poll(notifier, feed)
+
+        # 保持期間より前の動画で打ち切り、通知済みの動画は履歴で除外する
+        assert parsed == ["vid001", "vid002"]
+        assert submitted == ["vid002"]
+        assert notifier.feed_cache.seen_until("UC001") is not None
+
+    def test_前回処理済みの範囲に入った動画以降は解析しない(self, tmp_path: Path):
+        notifier = _make_notifier(tmp_path)
+        notifier.feed_cache.advance_watermark(
+            "UC001", [_make_video("vid002", days_ago=1)], checked_at=time.time() - 86400
+        )
+        feed = [
+            _make_video("vid001", days_ago=0.1),
+            _make_video("vid002", days_ago=1),
+            _make_video("vid003", days_ago=2),
+        ]
+
+        parsed, submitted = self._poll(notifier, feed)
+
+        # vid002 は前回の処理時刻の揺らぎの範囲内のため解析し、ウォーターマークの動画として除外する
+        assert parsed == ["vid001", "vid002"]
+        assert submitted == ["vid001"]
+        # ウォーターマークは最新の動画に進む
+        assert notifier.feed_cache.newer_than_watermark("UC001", feed[:2]) == [feed[1]]
+
+
+class TestIngest:
+    """Notifier.ingest() の新着判定（oEmbed API呼び出し前の除外）のテスト"""
+
+    def test_通知済み_処理中_ライブの動画はoEmbed_APIを呼ばずに除外する(self, tmp_path: Path):
+        notifier = _make_notifier(tmp_path)
+        notifier.history.mark_notified(_make_video("vid001"))
+        notifier.job_store.discover([_make_video("vid002")])
+        videos = [
+            _make_video("vid001"),
+            _make_video("vid002"),
+            _make_video("vid003", title="【LIVE】配信"),
+            _make_video("vid004"),
+        ]
+        pipeline = MagicMock()
+
+        with patch("src.video_filter._fetch_oembed", side_effect=_normal_oembed) as fetch:
+            notifier.ingest(pipeline, "UC001", videos)
+
+        assert [call.args[0].video_id for call in fetch.call_args_list] == ["vid004"]
+        assert _submitted(pipeline) == ["vid004"]
+        assert notifier.filter_stats.history_skipped == 1
+        assert notifier.filter_stats.title_live_skipped == 1
+        # ライブとして除外した動画はジョブストアから削除し、処理中の動画は残す
+        assert "vid003" not in notifier.job_store
+        assert notifier.job_store.get("vid002").stage == DISCOVERED
+
+    def test_監視対象外のチャンネルの動画は無視する(self, tmp_path: Path):
+        notifier = _make_notifier(tmp_path)
+        pipeline = MagicMock()
+
+        with patch("src.video_filter._fetch_oembed") as fetch:
+            notifier.ingest(pipeline, "UC999", [_make_video("vid001", channel_id="UC999")])
+
+        fetch.assert_not_called()
+        pipeline.submit.assert_not_called()
+        assert "vid001" not in notifier.job_store
+
+
+class FakeAsyncRenderer:
+    """AsyncBrowserRenderer の代替（Chromiumを起動しない）"""
+
+    async def __aenter__(self) -> "FakeAsyncRenderer":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        pass
+
+
+class TestAsyncMain:
+    """async_main() のテスト（フィード・oEmbed・Gemini・描画・Discordはモック）"""
+
+    def _run(self, tmp_path: Path, monkeypatch, feed: list[VideoEntry], sent: list[str]) -> None:
+        monkeypatch.chdir(tmp_path)
+
+        async def fake_fetch_feeds_async(channel_ids, session, cache=None, stop_at=None):
+            for channel_id in channel_ids:
+                yield channel_id, [video for video in feed if not stop_at(video)]
+
+        async def fake_oembed(video, session):
+            return _normal_oembed(video)
+
+        async def fake_summarize(video_url, **kwargs):
+            return f"<html><body>{video_url}</body></html>"
+
+        async def fake_generate(html_content, video_title, renderer, output_dir=None):
+            path = os.path.join(output_dir, f"{len(sent)}-{abs(hash(video_title))}.png")
+            Path(path).write_bytes(b"png")
+            return path
+
+        async def fake_send(webhook_url, video, channel_name, image_path, session):
+            assert Path(image_path).exists()
+            sent.append(video.video_id)
+
+        with patch(
+            "src.main.load_environment", return_value=("key", "https://discord.example/webhook")
+        ), patch(
+            "src.main.load_config_or_exit",
+            return_value=([_make_channel()], _make_settings(render_concurrency=1)),
+        ), patch("src.main.create_http_session") as create_http_session, patch(
+            "src.main.fetch_feeds_async", side_effect=fake_fetch_feeds_async
+        ), patch(
+            "src.video_filter._fetch_oembed_async", side_effect=fake_oembed
+        ), patch(
+            "src.main.summarize_async", side_effect=fake_summarize
+        ), patch(
+            "src.main.AsyncBrowserRenderer", FakeAsyncRenderer
+        ), patch(
+            "src.main.generate_infographic_async", side_effect=fake_generate
+        ), patch(
+            "src.main.send_image_notification_async", side_effect=fake_send
+        ):
+            asyncio.run(async_main(Shard()))
+
+        # asyncio 版では同期用のHTTPセッションを作らない
+        create_http_session.assert_not_called()
+
+    def test_新着動画を要約して通知し履歴とジョブを保存する(self, tmp_path: Path, monkeypatch):
+        feed = [_make_video("vid002", days_ago=0.5), _make_video("vid001", days_ago=1)]
+        sent: list[str] = []
+
+        self._run(tmp_path, monkeypatch, feed, sent)
+
+        assert sorted(sent) == ["vid001", "vid002"]
+        history = create_history_manager("json", str(tmp_path / "data"))
+        history.load()
+        assert history.is_notified("vid001")
+        assert history.is_notified("vid002")
+        job_store = JobStore(str(tmp_path / "data" / "jobs.json"))
+        job_store.load()
+        assert len(job_store) == 0
+        assert list((tmp_path / "data" / "rendered").iterdir()) == []
+
+    def test_2回目の実行では通知済みの動画を再通知しない(self, tmp_path: Path, monkeypatch):
+        feed = [_make_video("vid001", days_ago=1)]
+        sent: list[str] = []
+        self._run(tmp_path, monkeypatch, feed, sent)
+
+        feed.insert(0, _make_video("vid002", days_ago=0.1))
+        # 前回の取得から取得間隔が経っていなくても取得させる
+        (tmp_path / "data" / "poll_schedule.json").unlink()
+        self._run(tmp_path, monkeypatch, feed, sent)
+
+        assert sent == ["vid001", "vid002"]
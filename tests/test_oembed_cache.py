@@ -0,0 +1,88 @@
+"""OEmbedCache の単体テスト"""
+from pathlib import Path
+from unittest.mock import patch
+
+from src.oembed_cache import OEmbedCache
+
+
+def _oembed(title: str = "通常動画") -> dict:
+    return {
+        "thumbnail_url": "https://i.ytimg.com/vi/xxx/hqdefault.jpg",
+        "width": 1280,
+        "height": 720,
+        "title": title,
+        "html": "<iframe></iframe>",
+    }
+
+
+class TestOEmbedCacheGetPut:
+    """get() / put() のテスト"""
+
+    def test_登録した情報を取得できる(self, tmp_path: Path):
+        cache = OEmbedCache(str(tmp_path / "oembed_cache.json"))
+        cache.put("vid001", _oembed())
+
+        cached = cache.get("vid001")
+        assert cached["width"] == 1280
+        assert cached["title"] == "通常動画"
+
+    def test_判定に不要なフィールドは保存されない(self, tmp_path: Path):
+        cache = OEmbedCache(str(tmp_path / "oembed_cache.json"))
+        cache.put("vid001", _oembed())
+        assert "html" not in cache.get("vid001")
+
+    def test_未登録の場合はNoneを返す(self, tmp_path: Path):
+        cache = OEmbedCache(str(tmp_path / "oembed_cache.json"))
+        assert cache.get("vid001") is None
+
+    def test_期限切れのエントリはNoneを返す(self, tmp_path: Path):
+        cache = OEmbedCache(str(tmp_path / "oembed_cache.json"), ttl_seconds=60)
+        with patch("src.oembed_cache.time.time", return_value=1000.0):
+            cache.put("vid001", _oembed())
+        with patch("src.oembed_cache.time.time", return_value=1060.0):
+            assert cache.get("vid001") is None
+        assert len(cache) == 0
+
+    def test_上限を超えると参照の古いエントリから削除される(self, tmp_path: Path):
+        cache = OEmbedCache(str(tmp_path / "oembed_cache.json"), max_entries=2)
+        cache.put("vid001", _oembed())
+        cache.put("vid002", _oembed())
+        cache.get("vid001")  # vid001 を最近参照したことにする
+        cache.put("vid003", _oembed())
+
+        assert cache.get("vid001") is not None
+        assert cache.get("vid002") is None
+        assert cache.get("vid003") is not None
+
+
+class TestOEmbedCacheLoadSave:
+    """load() / save() のテスト"""
+
+    def test_保存したキャッシュを読み込める(self, tmp_path: Path):
+        path = tmp_path / "oembed_cache.json"
+        cache = OEmbedCache(str(path))
+        cache.put("vid001", _oembed())
+        cache.save()
+
+        loaded = OEmbedCache(str(path))
+        loaded.load()
+        assert loaded.get("vid001")["title"] == "通常動画"
+
+    def test_期限切れのエントリは保存されない(self, tmp_path: Path):
+        path = tmp_path / "oembed_cache.json"
+        cache = OEmbedCache(str(path), ttl_seconds=60)
+        with patch("src.oembed_cache.time.time", return_value=1000.0):
+            cache.put("vid001", _oembed())
+        with patch("src.oembed_cache.time.time", return_value=2000.0):
+            cache.save()
+
+        loaded = OEmbedCache(str(path))
+        loaded.load()
+        assert len(loaded) == 0
+
+    def test_破損したファイルは空で初期化される(self, tmp_path: Path):
+        path = tmp_path / "oembed_cache.json"
+        path.write_text("{ invalid json }", encoding="utf-8")
+        cache = OEmbedCache(str(path))
+        cache.load()
+        assert len(cache) == 0
@@ -0,0 +1,187 @@
+"""StagedPipeline の単体テスト"""
+import asyncio
+import threading
+import time
+
+from src.pipeline import AsyncStagedPipeline, Stage, StagedPipeline
+
+
+class TestStagedPipeline:
+    """StagedPipeline のテスト"""
+
+    def test_全要素が全段を通過する(self):
+        results = []
+        lock = threading.Lock()
+
+        def collect(item):
+            with lock:
+                results.append(item)
+
+        stages = [
+            Stage("double", lambda x: x * 2, concurrency=2),
+            Stage("inc", lambda x: x + 1, concurrency=2),
+            Stage("collect", collect),
+        ]
+        with StagedPipeline(stages) as pipeline:
+            for i in range(10):
+                pipeline.submit(i)
+
+        assert sorted(results) == [i * 2 + 1 for i in range(10)]
+
+    def test_段ごとの処理が並行して進む(self):
+        # 1段目が2件目を処理している間に、2段目が1件目を処理できること
+        second_started = threading.Event()
+        overlapped = []
+
+        def first(item):
+            if item == 2:
+                second_started.set()
+            return item
+
+        def second(item):
+            if item == 1:
+                overlapped.append(second_started.wait(timeout=5))
+            return None
+
+        with StagedPipeline([Stage("first", first), Stage("second", second)]) as pipeline:
+            pipeline.submit(1)
+            pipeline.submit(2)
+
+        assert overlapped == [True]
+
+    def test_後段が詰まると投入が待たされる(self):
+        release = threading.Event()
+        submitted = []
+
+        def blocked(item):
+            release.wait(timeout=5)
+
+        pipeline = StagedPipeline([Stage("blocked", blocked)], queue_size=1)
+        pipeline.start()
+
+        def producer():
+            for i in range(3):
+                pipeline.submit(i)
+                submitted.append(i)
+
+        thread = threading.Thread(target=producer)
+        thread.start()
+        time.sleep(0.2)
+        # 処理中1件 + キュー1件までしか投入できない
+        assert len(submitted) == 2
+
+        release.set()
+        thread.join(timeout=5)
+        pipeline.join()
+        assert submitted == [0, 1, 2]
+
+    def test_例外が発生した要素はon_errorに渡され後段に進まない(self):
+        errors = []
+        passed = []
+
+        def fail_on_odd(item):
+            if item % 2:
+                raise ValueError(f"odd: {item}")
+            return item
+
+        stages = [Stage("check", fail_on_odd), Stage("collect", passed.append)]
+        pipeline = StagedPipeline(
+            stages, on_error=lambda stage, item, e: errors.append((stage, item))
+        )
+        with pipeline:
+            for i in range(4):
+                pipeline.submit(i)
+
+        assert sorted(passed) == [0, 2]
+        assert sorted(errors) == [("check", 1), ("check", 3)]
+
+    def test_Noneを返した要素は後段に渡されない(self):
+        passed = []
+        stages = [Stage("drop", lambda x: None), Stage("collect", passed.append)]
+        with StagedPipeline(stages) as pipeline:
+            pipeline.submit(1)
+
+        assert passed == []
+
+    def test_ワーカー終了時にon_worker_exitが呼ばれる(self):
+        exited = []
+        lock = threading.Lock()
+
+        def on_exit():
+            with lock:
+                exited.append(threading.current_thread().name)
+
+        stages = [Stage("work", lambda x: x, concurrency=3, on_worker_exit=on_exit)]
+        with StagedPipeline(stages) as pipeline:
+            pipeline.submit(1)
+
+        assert len(exited) == 3
+
+
+class TestAsyncStagedPipeline:
+    """AsyncStagedPipeline のテスト"""
+
+    def test_全要素が全段を通過する(self):
+        results = []
+
+        async def double(x):
+            await asyncio.sleep(0)
+            return x * 2
+
+        async def collect(x):
+            results.append(x)
+
+        async def run():
+            stages = [Stage("double", double, concurrency=3), Stage("collect", collect)]
+            async with AsyncStagedPipeline(stages) as pipeline:
+                for i in range(10):
+                    await pipeline.submit(i)
+
+        asyncio.run(run())
+
+        assert sorted(results) == [i * 2 for i in range(10)]
+
+    def test_同じ段のタスクが並行して処理する(self):
+        async def run():
+            barrier_count = 0
+            all_started = asyncio.Event()
+
+            async def wait_all(x):
+                nonlocal barrier_count
+                barrier_count += 1
+                if barrier_count == 3:
+                    all_started.set()
+                await asyncio.wait_for(all_started.wait(), timeout=5)
+
+            async with AsyncStagedPipeline([Stage("wait", wait_all, concurrency=3)]) as pipeline:
+                for i in range(3):
+                    await pipeline.submit(i)
+            return all_started.is_set()
+
+        assert asyncio.run(run())
+
+    def test_失敗した要素はon_errorに渡され他の要素は処理が続く(self):
+        errors = []
+        results = []
+
+        async def fail_odd(x):
+            if x % 2:
+                raise ValueError(f"odd {x}")
+            return x
+
+        async def collect(x):
+            results.append(x)
+
+        async def on_error(stage_name, item, error):
+            errors.append((stage_name, item, str(error)))
+
+        async def run():
+            stages = [Stage("check", fail_odd), Stage("collect", collect)]
+            async with AsyncStagedPipeline(stages, on_error=on_error) as pipeline:
+                for i in range(4):
+                    await pipeline.submit(i)
+
+        asyncio.run(run())
+
+        assert sorted(results) == [0, 2]
+        assert sorted(errors) == [("check", 1, "odd 1"), ("check", 3, "odd 3")]
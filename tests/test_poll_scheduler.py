@@ -0,0 +1,114 @@
+"""PollScheduler の単体テスト"""
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from src.poll_scheduler import PollScheduler
+
+NOW = datetime(2026, 3, 1, tzinfo=timezone.utc)
+MINUTE = 60
+HOUR = 60 * MINUTE
+
+
+def _published(gap: timedelta, count: int = 10, since_last: timedelta = timedelta(0)) -> list[datetime]:
+    """最新の投稿が since_last 前で、gap 間隔で投稿された公開日時のリスト"""
+    latest = NOW - since_last
+    return [latest - gap * i for i in range(count)]
+
+
+def _make_scheduler(tmp_path: Path, **kwargs) -> PollScheduler:
+    kwargs.setdefault("min_interval_seconds", 5 * MINUTE)
+    kwargs.setdefault("max_interval_seconds", 6 * HOUR)
+    return PollScheduler(str(tmp_path / "poll_schedule.json"), **kwargs)
+
+
+class TestPollSchedulerObserve:
+    """observe() のテスト"""
+
+    def test_投稿が多いチャンネルは最短間隔で取得する(self, tmp_path: Path):
+        scheduler = _make_scheduler(tmp_path)
+        interval = scheduler.observe("UC001", _published(timedelta(hours=1)), now=NOW.timestamp())
+        assert interval == 6 * MINUTE
+
+    def test_毎日投稿するチャンネルは投稿間隔に応じた間隔で取得する(self, tmp_path: Path):
+        scheduler = _make_scheduler(tmp_path)
+        interval = scheduler.observe("UC001", _published(timedelta(days=1)), now=NOW.timestamp())
+        assert interval == 24 * HOUR / 10
+
+    def test_投稿の少ないチャンネルは最長間隔に収める(self, tmp_path: Path):
+        scheduler = _make_scheduler(tmp_path)
+        interval = scheduler.observe("UC001", _published(timedelta(days=30)), now=NOW.timestamp())
+        assert interval == 6 * HOUR
+
+    def test_休止中のチャンネルは経過時間に応じて間隔を延ばす(self, tmp_path: Path):
+        scheduler = _make_scheduler(tmp_path)
+        active = scheduler.observe(
+            "UC001", _published(timedelta(hours=2)), now=NOW.timestamp()
+        )
+        dormant = scheduler.observe(
+            "UC002",
+            _published(timedelta(hours=2), since_last=timedelta(days=1)),
+            now=NOW.timestamp(),
+        )
+        assert active == 12 * MINUTE
+        assert dormant == 24 * HOUR / 10
+
+    def test_投稿が2件未満の場合はデフォルト間隔で取得する(self, tmp_path: Path):
+        scheduler = _make_scheduler(tmp_path, default_interval_seconds=15 * MINUTE)
+        assert scheduler.observe("UC001", [NOW], now=NOW.timestamp()) == 15 * MINUTE
+
+    def test_公開日時が空の場合は記録済みの公開日時で計算する(self, tmp_path: Path):
+        scheduler = _make_scheduler(tmp_path)
+        scheduler.observe("UC001", _published(timedelta(days=1)), now=NOW.timestamp())
+        # 304 Not Modified ではフィードの動画が空になる
+        interval = scheduler.observe("UC001", [], now=NOW.timestamp())
+        assert interval == 24 * HOUR / 10
+
+
+class TestPollSchedulerDue:
+    """due() / record_failure() のテスト"""
+
+    def test_未登録のチャンネルは取得対象になる(self, tmp_path: Path):
+        scheduler = _make_scheduler(tmp_path)
+        assert scheduler.due(["UC001", "UC002"], now=NOW.timestamp()) == ["UC001", "UC002"]
+
+    def test_取得予定時刻までは取得対象にならない(self, tmp_path: Path):
+        scheduler = _make_scheduler(tmp_path)
+        scheduler.observe("UC001", _published(timedelta(days=1)), now=NOW.timestamp())
+
+        assert scheduler.due(["UC001"], now=NOW.timestamp() + HOUR) == []
+        assert scheduler.due(["UC001"], now=NOW.timestamp() + 3 * HOUR) == ["UC001"]
+        assert scheduler.seconds_until_due("UC001", now=NOW.timestamp() + HOUR) == 24 * HOUR / 10 - HOUR
+
+    def test_取得予定時刻の直前に起動した場合も取得対象になる(self, tmp_path: Path):
+        scheduler = _make_scheduler(tmp_path)
+        scheduler.observe("UC001", _published(timedelta(hours=1)), now=NOW.timestamp())
+        # cron の起動が数秒早まっても次の実行まで持ち越さない
+        assert scheduler.due(["UC001"], now=NOW.timestamp() + 6 * MINUTE - 10) == ["UC001"]
+
+    def test_取得に失敗したチャンネルは最短間隔で再取得する(self, tmp_path: Path):
+        scheduler = _make_scheduler(tmp_path)
+        scheduler.observe("UC001", _published(timedelta(days=30)), now=NOW.timestamp())
+        scheduler.record_failure("UC001", now=NOW.timestamp())
+
+        assert scheduler.due(["UC001"], now=NOW.timestamp() + 5 * MINUTE) == ["UC001"]
+
+
+class TestPollSchedulerSaveLoad:
+    """save() / load() のテスト"""
+
+    def test_保存した内容を再読み込みできる(self, tmp_path: Path):
+        scheduler = _make_scheduler(tmp_path)
+        scheduler.observe("UC001", _published(timedelta(days=1)), now=NOW.timestamp())
+        scheduler.save()
+
+        reloaded = _make_scheduler(tmp_path)
+        reloaded.load()
+        assert reloaded.interval("UC001") == 24 * HOUR / 10
+        assert reloaded.due(["UC001"], now=NOW.timestamp() + HOUR) == []
+
+    def test_破損したファイルは空で初期化される(self, tmp_path: Path):
+        path = tmp_path / "poll_schedule.json"
+        path.write_text("{broken", encoding="utf-8")
+        scheduler = PollScheduler(str(path))
+        scheduler.load()
+        assert scheduler.due(["UC001"]) == ["UC001"]
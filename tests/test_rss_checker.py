@@ -0,0 +1,324 @@
+"""rss_checker の単体テスト"""
+import asyncio
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import aiohttp
+import pytest
+from aiohttp import web
+
+from src.exceptions import RSSFetchError
+from src.feed_cache import FeedCache
+from src.models import VideoEntry
+from src.rss_checker import (
+    fetch_feed,
+    fetch_feed_async,
+    fetch_feeds,
+    fetch_feeds_async,
+    iter_feed,
+)
+
+
+def _make_video(video_id: str = "vid001", channel_id: str = "UCtest") -> VideoEntry:
+    """テスト用 VideoEntry を生成するヘルパー"""
+    return VideoEntry(
+        video_id=video_id,
+        title="テスト動画",
+        url=f"https://www.youtube.com/watch?v={video_id}",
+        published=datetime(2026, 1, 1, tzinfo=timezone.utc),
+        channel_id=channel_id,
+    )
+
+
+class TestFetchFeeds:
+    """fetch_feeds() のテスト（fetch_feed はモック）"""
+
+    def test_全チャンネルの結果が返る(self):
+        def fake_fetch(channel_id: str, cache=None, session=None, stop_at=None) -> list[VideoEntry]:
+            return [_make_video(f"{channel_id}-vid", channel_id)]
+
+        with patch("src.rss_checker.fetch_feed", side_effect=fake_fetch):
+            results = dict(fetch_feeds(["UCa", "UCb", "UCc"], max_concurrency=2))
+
+        assert set(results) == {"UCa", "UCb", "UCc"}
+        assert results["UCb"][0].video_id == "UCb-vid"
+
+    def test_取得失敗はチャンネルごとにRSSFetchErrorとして返る(self):
+        def fake_fetch(channel_id: str, cache=None, session=None, stop_at=None) -> list[VideoEntry]:
+            if channel_id == "UCbad":
+                raise RSSFetchError("取得失敗")
+            return []
+
+        with patch("src.rss_checker.fetch_feed", side_effect=fake_fetch):
+            results = dict(fetch_feeds(["UCok", "UCbad"]))
+
+        assert results["UCok"] == []
+        assert isinstance(results["UCbad"], RSSFetchError)
+
+    def test_遅いチャンネルが他のチャンネルの結果を妨げない(self):
+        release = threading.Event()
+
+        def fake_fetch(channel_id: str, cache=None, session=None, stop_at=None) -> list[VideoEntry]:
+            if channel_id == "UCslow":
+                release.wait(timeout=5)
+            return []
+
+        with patch("src.rss_checker.fetch_feed", side_effect=fake_fetch):
+            results = fetch_feeds(["UCslow", "UCfast"], max_concurrency=2)
+            first_channel_id, _ = next(results)
+            release.set()
+            rest = [channel_id for channel_id, _ in results]
+
+        assert first_channel_id == "UCfast"
+        assert rest == ["UCslow"]
+
+    def test_空リストの場合は何も返さない(self):
+        assert list(fetch_feeds([])) == []
+
+
+SAMPLE_FEED = """<?xml version="1.0" encoding="UTF-8"?>
+<feed xmlns:yt="http://www.youtube.com/xml/schemas/2015" xmlns="http://www.w3.org/2005/Atom">
+ <entry>
+  <yt:videoId>vid001</yt:videoId>
+  <yt:channelId>UCtest</yt:channelId>
+  <title>テスト動画</title>
+  <link rel="alternate" href="https://www.youtube.com/watch?v=vid001"/>
+  <published>2026-01-01T00:00:00+00:00</published>
+ </entry>
+</feed>
+"""
+
+
+def _mock_response(status_code: int, text: str = "", headers: dict | None = None) -> MagicMock:
+    """テスト用 HTTP レスポンスを生成するヘルパー"""
+    response = MagicMock()
+    response.status_code = status_code
+    response.text = text
+    response.content = text.encode("utf-8")
+    response.headers = headers or {}
+    return response
+
+
+class TestFetchFeedConditionalGet:
+    """fetch_feed() の条件付きGETのテスト"""
+
+    def test_200応答の検証子がキャッシュに記録される(self, tmp_path: Path):
+        cache = FeedCache(str(tmp_path / "feed_cache.json"))
+        response = _mock_response(
+            200, SAMPLE_FEED, {"ETag": '"abc"', "Last-Modified": "Thu, 01 Jan 2026 00:00:00 GMT"}
+        )
+
+        session = MagicMock()
+        session.get.return_value = response
+
+        videos = fetch_feed("UCtest", cache, session)
+
+        assert [v.video_id for v in videos] == ["vid001"]
+        assert cache.conditional_headers("UCtest") == {
+            "If-None-Match": '"abc"',
+            "If-Modified-Since": "Thu, 01 Jan 2026 00:00:00 GMT",
+        }
+
+    def test_304応答ではパースせず空リストを返す(self, tmp_path: Path):
+        cache = FeedCache(str(tmp_path / "feed_cache.json"))
+        cache.update("UCtest", '"abc"', None)
+
+        session = MagicMock()
+        session.get.return_value = _mock_response(304)
+
+        with patch("src.rss_checker.iter_feed") as mock_parse:
+            videos = fetch_feed("UCtest", cache, session)
+
+        assert videos == []
+        mock_parse.assert_not_called()
+        assert session.get.call_args.kwargs["headers"] == {"If-None-Match": '"abc"'}
+
+    def test_パース失敗時は検証子が破棄される(self, tmp_path: Path):
+        cache = FeedCache(str(tmp_path / "feed_cache.json"))
+        response = _mock_response(200, "<broken", {"ETag": '"abc"'})
+
+        session = MagicMock()
+        session.get.return_value = response
+
+        with pytest.raises(RSSFetchError):
+            fetch_feed("UCtest", cache, session)
+
+        assert cache.conditional_headers("UCtest") == {}
+
+
+
+def _make_feed(count: int, tail: str = "</feed>") -> str:
+    """新しい順に count 件のエントリを持つフィードを生成するヘルパー"""
+    entries = "".join(
+        f"""
+ <entry>
+  <yt:videoId>vid{i:03d}</yt:videoId>
+  <yt:channelId>UCtest</yt:channelId>
+  <title>動画{i}</title>
+  <link rel="alternate" href="https://www.youtube.com/watch?v=vid{i:03d}"/>
+  <published>2026-01-{count - i:02d}T00:00:00+00:00</published>
+ </entry>"""
+        for i in range(count)
+    )
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?>\n'
+        '<feed xmlns:yt="http://www.youtube.com/xml/schemas/2015" xmlns="http://www.w3.org/2005/Atom">'
+        f"{entries}\n{tail}"
+    )
+
+
+class TestIterFeed:
+    """iter_feed() のテスト"""
+
+    def test_エントリを文書の順に返す(self):
+        videos = list(iter_feed(_make_feed(3).encode("utf-8"), "UCtest"))
+
+        assert [v.video_id for v in videos] == ["vid000", "vid001", "vid002"]
+        assert videos[0].title == "動画0"
+        assert videos[0].url == "https://www.youtube.com/watch?v=vid000"
+        assert videos[0].published == datetime(2026, 1, 3, tzinfo=timezone.utc)
+        assert videos[0].channel_id == "UCtest"
+
+    def test_文字列も解析できる(self):
+        assert [v.video_id for v in iter_feed(SAMPLE_FEED, "UCtest")] == ["vid001"]
+
+    def test_動画IDのないエントリは除外する(self):
+        feed = SAMPLE_FEED.replace("<yt:videoId>vid001</yt:videoId>", "")
+        assert list(iter_feed(feed, "UCtest")) == []
+
+    def test_チャンネルIDがなければ指定したチャンネルIDを使う(self):
+        feed = SAMPLE_FEED.replace("<yt:channelId>UCtest</yt:channelId>", "")
+        assert next(iter_feed(feed, "UCother")).channel_id == "UCother"
+
+    def test_途中で打ち切れば残りは解析しない(self):
+        # 末尾が壊れていても、先頭のエントリだけを取り出す場合はエラーにならない
+        feed = _make_feed(200, tail="<broken").encode("utf-8")
+        videos = iter_feed(feed, "UCtest")
+
+        assert next(videos).video_id == "vid000"
+        videos.close()
+
+    def test_最後まで解析すると壊れたXMLはRSSFetchError(self):
+        feed = _make_feed(3, tail="<broken").encode("utf-8")
+        with pytest.raises(RSSFetchError):
+            list(iter_feed(feed, "UCtest"))
+
+
+class TestFetchFeedStopAt:
+    """fetch_feed() の打ち切りのテスト"""
+
+    def test_処理済みの動画以降は返さない(self):
+        session = MagicMock()
+        session.get.return_value = _mock_response(200, _make_feed(15))
+
+        videos = fetch_feed("UCtest", session=session, stop_at=lambda v: v.video_id == "vid002")
+
+        assert [v.video_id for v in videos] == ["vid000", "vid001"]
+
+    def test_先頭が処理済みなら空リストを返す(self):
+        session = MagicMock()
+        session.get.return_value = _mock_response(200, _make_feed(15))
+
+        assert fetch_feed("UCtest", session=session, stop_at=lambda v: True) == []
+
+    def test_並列取得でも打ち切り条件を適用する(self):
+        session = MagicMock()
+        session.get.return_value = _mock_response(200, _make_feed(15))
+        cutoff = datetime(2026, 1, 14, tzinfo=timezone.utc)
+
+        results = dict(
+            fetch_feeds(["UCtest"], session=session, stop_at=lambda v: v.published < cutoff)
+        )
+
+        assert [v.video_id for v in results["UCtest"]] == ["vid000", "vid001"]
+
+
+async def _serve_feed(handler) -> tuple[web.AppRunner, str]:
+    """ローカルでフィードを配信するサーバーを起動し、(runner, URLテンプレート) を返す"""
+    app = web.Application()
+    app.router.add_get("/feeds/videos.xml", handler)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    return runner, f"http://127.0.0.1:{port}/feeds/videos.xml?channel_id={{channel_id}}"
+
+
+class TestFetchFeedAsync:
+    """fetch_feed_async() のテスト（ローカルのHTTPサーバーを使う）"""
+
+    def test_条件付きGETで304応答なら空リストを返す(self, tmp_path: Path):
+        cache = FeedCache(str(tmp_path / "feed_cache.json"))
+        requests_headers = []
+
+        async def handler(request: web.Request) -> web.Response:
+            requests_headers.append(request.headers.get("If-None-Match"))
+            if request.headers.get("If-None-Match") == '"abc"':
+                return web.Response(status=304)
+            return web.Response(body=SAMPLE_FEED.encode("utf-8"), headers={"ETag": '"abc"'})
+
+        async def run():
+            runner, url = await _serve_feed(handler)
+            try:
+                with patch("src.rss_checker.RSS_URL_TEMPLATE", url):
+                    async with aiohttp.ClientSession() as session:
+                        first = await fetch_feed_async("UCtest", session, cache)
+                        second = await fetch_feed_async("UCtest", session, cache)
+            finally:
+                await runner.cleanup()
+            return first, second
+
+        first, second = asyncio.run(run())
+
+        assert [v.video_id for v in first] == ["vid001"]
+        assert second == []
+        assert requests_headers == [None, '"abc"']
+
+    def test_4xx応答はリトライせずRSSFetchError(self):
+        calls = []
+
+        async def handler(request: web.Request) -> web.Response:
+            calls.append(request.query["channel_id"])
+            return web.Response(status=403)
+
+        async def run():
+            runner, url = await _serve_feed(handler)
+            try:
+                with patch("src.rss_checker.RSS_URL_TEMPLATE", url):
+                    async with aiohttp.ClientSession() as session:
+                        await fetch_feed_async("UCtest", session)
+            finally:
+                await runner.cleanup()
+
+        with pytest.raises(RSSFetchError):
+            asyncio.run(run())
+        assert calls == ["UCtest"]
+
+
+class TestFetchFeedsAsync:
+    """fetch_feeds_async() のテスト（fetch_feed_async はモック）"""
+
+    def test_全チャンネルの結果と取得失敗が返る(self):
+        async def fake_fetch(channel_id, session, cache=None, stop_at=None):
+            if channel_id == "UCbad":
+                raise RSSFetchError("取得失敗")
+            await asyncio.sleep(0)
+            return [_make_video(f"{channel_id}-vid", channel_id)]
+
+        async def run():
+            return {
+                channel_id: result
+                async for channel_id, result in fetch_feeds_async(
+                    ["UCa", "UCbad", "UCc"], session=MagicMock(), max_concurrency=2
+                )
+            }
+
+        with patch("src.rss_checker.fetch_feed_async", side_effect=fake_fetch):
+            results = asyncio.run(run())
+
+        assert set(results) == {"UCa", "UCbad", "UCc"}
+        assert results["UCc"][0].video_id == "UCc-vid"
+        assert isinstance(results["UCbad"], RSSFetchError)
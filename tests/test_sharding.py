@@ -0,0 +1,204 @@
+"""sharding モジュールの単体テスト"""
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from src.exceptions import ConfigError
+from src.history_manager import create_history_manager
+from src.models import AppSettings, ChannelConfig
+from src.sharding import Shard, import_history, resolve_shard, shard_of, shard_settings
+
+CHANNEL_IDS = [f"UC{i:022d}" for i in range(2000)]
+
+
+def _channel(channel_id: str) -> ChannelConfig:
+    return ChannelConfig(channel_id=channel_id, name=channel_id, prompt_template=None)
+
+
+def _entry(channel_id: str, days_ago: float = 1) -> dict:
+    notified_at = datetime.now(timezone.utc) - timedelta(days=days_ago)
+    return {"title": "テスト動画", "channel_id": channel_id, "notified_at": notified_at.isoformat()}
+
+
+class TestShardOf:
+    """shard_of() のテスト"""
+
+    def test_チャンネルはシャード数の範囲に偏りなく割り当てられる(self):
+        counts = [0] * 4
+        for channel_id in CHANNEL_IDS:
+            counts[shard_of(channel_id, 4)] += 1
+
+        # 2000件を4分割して各500件前後
+        assert all(400 <= count <= 600 for count in counts)
+
+    def test_同じチャンネルIDは常に同じシャードになる(self):
+        assert [shard_of(c, 8) for c in CHANNEL_IDS[:50]] == [shard_of(c, 8) for c in CHANNEL_IDS[:50]]
+
+    def test_シャードを増やすと新しいシャードに移るチャンネルだけ担当が変わる(self):
+        moved = [c for c in CHANNEL_IDS if shard_of(c, 4) != shard_of(c, 5)]
+
+        assert all(shard_of(c, 5) == 4 for c in moved)
+        assert len(moved) < len(CHANNEL_IDS) * 0.3
+
+
+class TestShard:
+    """Shard のテスト"""
+
+    def test_全シャードの担当チャンネルは重ならず全チャンネルを覆う(self):
+        channels = [_channel(c) for c in CHANNEL_IDS[:100]]
+        selected = [c.channel_id for index in range(3) for c in Shard(index, 3).select(channels)]
+
+        assert sorted(selected) == sorted(CHANNEL_IDS[:100])
+
+    def test_シャードに分けない場合は従来のディレクトリを使う(self):
+        assert Shard().data_dir() == "data"
+        assert Shard(2, 4).data_dir() == str(Path("data") / "shards" / "2-of-4")
+
+    @pytest.mark.parametrize("index,count", [(0, 0), (-1, 2), (2, 2)])
+    def test_範囲外の指定はConfigError(self, index: int, count: int):
+        with pytest.raises(ConfigError):
+            Shard(index, count)
+
+
+class TestShardSettings:
+    """shard_settings() のテスト"""
+
+    def _settings(self) -> AppSettings:
+        return AppSettings(
+            check_interval_minutes=30,
+            max_summary_length=3500,
+            history_retention_days=30,
+            default_prompt_template="要約してください",
+            gemini_requests_per_minute=15,
+            gemini_tokens_per_minute=250000,
+        )
+
+    def test_Gemini_APIの毎分上限をシャード数で分ける(self):
+        settings = shard_settings(self._settings(), Shard(1, 4))
+
+        assert settings.gemini_requests_per_minute == 3
+        assert settings.gemini_tokens_per_minute == 62500
+
+    def test_シャードに分けない場合は設定を変えない(self):
+        settings = self._settings()
+        assert shard_settings(settings, Shard()) is settings
+
+    def test_上限はシャード数より少なくても1以上になる(self):
+        assert shard_settings(self._settings(), Shard(0, 20)).gemini_requests_per_minute == 1
+
+
+class TestResolveShard:
+    """resolve_shard() のテスト"""
+
+    def test_環境変数からシャードを決める(self):
+        assert resolve_shard(environ={"SHARD_INDEX": "1", "SHARD_COUNT": "3"}) == Shard(1, 3)
+
+    def test_引数は環境変数より優先される(self):
+        assert resolve_shard(2, 4, environ={"SHARD_INDEX": "1", "SHARD_COUNT": "3"}) == Shard(2, 4)
+
+    def test_未設定ならシャードに分けない(self):
+        assert resolve_shard(environ={}) == Shard(0, 1)
+
+    def test_整数でない値はConfigError(self):
+        with pytest.raises(ConfigError):
+            resolve_shard(environ={"SHARD_COUNT": "four"})
+
+
+class TestImportHistory:
+    """import_history() のテスト"""
+
+    def _write_history(self, data_dir: Path, entries: dict[str, dict], backend: str = "json") -> None:
+        history = create_history_manager(backend, str(data_dir))
+        history.load()
+        for video_id, info in entries.items():
+            history.adopt(video_id, info)
+        history.save()
+
+    def test_以前の配置の履歴から担当チャンネルの動画だけを取り込む(self, tmp_path: Path):
+        shard = Shard(0, 2)
+        owned = next(c for c in CHANNEL_IDS if shard.owns(c))
+        other = next(c for c in CHANNEL_IDS if not shard.owns(c))
+        self._write_history(
+            tmp_path,
+            {"vid001": _entry(owned), "vid002": _entry(other), "vid003": _entry("")},
+        )
+
+        history = create_history_manager("json", shard.data_dir(str(tmp_path)))
+        history.load()
+        imported = import_history(history, shard, "json", retention_days=30, base_dir=str(tmp_path))
+
+        assert imported == 2
+        assert history.is_notified("vid001")
+        assert not history.is_notified("vid002")
+        # チャンネルIDのない古いエントリは取り込む
+        assert history.is_notified("vid003")
+
+    def test_シャード数を変更した場合は以前のシャードの履歴から引き継ぐ(self, tmp_path: Path):
+        # 4分割から5分割に変更し、新しいシャード4に移ったチャンネルの履歴を引き継ぐ
+        moved = next(c for c in CHANNEL_IDS if shard_of(c, 5) == 4)
+        old_dir = Shard(shard_of(moved, 4), 4).data_dir(str(tmp_path))
+        self._write_history(Path(old_dir), {"vid001": _entry(moved)}, backend="sqlite")
+
+        shard = Shard(4, 5)
+        history = create_history_manager("sqlite", shard.data_dir(str(tmp_path)))
+        history.load()
+
+        assert import_history(history, shard, "sqlite", retention_days=30, base_dir=str(tmp_path)) == 1
+        assert history.is_notified("vid001")
+        # 取り込み済みのエントリは再度取り込まない
+        assert import_history(history, shard, "sqlite", retention_days=30, base_dir=str(tmp_path)) == 0
+
+    def test_同じ配置の他シャードと保持期間を過ぎたエントリは取り込まない(self, tmp_path: Path):
+        shard = Shard(0, 2)
+        owned = next(c for c in CHANNEL_IDS if shard.owns(c))
+        self._write_history(Path(Shard(1, 2).data_dir(str(tmp_path))), {"vid001": _entry(owned)})
+        self._write_history(tmp_path, {"vid002": _entry(owned, days_ago=40)})
+
+        history = create_history_manager("json", shard.data_dir(str(tmp_path)))
+        history.load()
+
+        assert import_history(history, shard, "json", retention_days=30, base_dir=str(tmp_path)) == 0
+
+    def test_シャードに分けない場合はシャードごとの履歴をまとめて取り込む(self, tmp_path: Path):
+        for index, channel_id in enumerate(CHANNEL_IDS[:2]):
+            self._write_history(
+                Path(Shard(index, 2).data_dir(str(tmp_path))), {f"vid{index}": _entry(channel_id)}
+            )
+
+        history = create_history_manager("json", str(tmp_path))
+        history.load()
+
+        assert import_history(history, Shard(), "json", retention_days=30, base_dir=str(tmp_path)) == 2
+
+    def test_シャードを1つにした配置のディレクトリに残った履歴も取り込む(self, tmp_path: Path):
+        self._write_history(tmp_path / "shards" / "0-of-1", {"vid001": _entry(CHANNEL_IDS[0])})
+
+        history = create_history_manager("json", Shard(0, 1).data_dir(str(tmp_path)))
+        history.load()
+
+        assert Shard(0, 1).data_dir(str(tmp_path)) == str(tmp_path)
+        assert import_history(history, Shard(0, 1), "json", retention_days=30, base_dir=str(tmp_path)) == 1
+        assert history.is_notified("vid001")
+
+    def test_取り込み済みで変更のない配置は読み込まない(self, tmp_path: Path):
+        shard = Shard(0, 2)
+        owned = next(c for c in CHANNEL_IDS if shard.owns(c))
+        self._write_history(tmp_path, {"vid001": _entry(owned)})
+        history = create_history_manager("json", shard.data_dir(str(tmp_path)))
+        history.load()
+        assert import_history(history, shard, "json", retention_days=30, base_dir=str(tmp_path)) == 1
+
+        # 取り込んだ履歴は保存済みのため、次回の実行で読み込み直しても残っている
+        reloaded = create_history_manager("json", shard.data_dir(str(tmp_path)))
+        reloaded.load()
+        assert reloaded.is_notified("vid001")
+        with patch("src.sharding.create_history_manager") as create:
+            assert import_history(reloaded, shard, "json", retention_days=30, base_dir=str(tmp_path)) == 0
+        create.assert_not_called()
+
+        # 以前の配置の履歴が更新された場合は取り込み直す
+        self._write_history(tmp_path, {"vid002": _entry(owned)})
+        assert import_history(reloaded, shard, "json", retention_days=30, base_dir=str(tmp_path)) == 1
+        assert reloaded.is_notified("vid002")
@@ -0,0 +1,339 @@
+"""summarizer の単体テスト（Gemini API 呼び出しはモック）"""
+import asyncio
+from unittest.mock import MagicMock, patch
+
+import aiohttp
+import pytest
+from aiohttp import web
+
+from src.exceptions import RateLimitError, SummarizerError
+from src.summarizer import (
+    RateLimiter,
+    _call_api_with_retry,
+    _call_api_with_retry_async,
+    _get_retry_delay,
+    summarize_async,
+)
+
+
+class FakeClock:
+    """テスト用の手動で進める時計"""
+
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _mock_response(status_code: int, json_data: dict | None = None, headers: dict | None = None) -> MagicMock:
+    """テスト用 HTTP レスポンスを生成するヘルパー"""
+    response = MagicMock()
+    response.status_code = status_code
+    response.json.return_value = json_data or {}
+    response.headers = headers or {}
+    return response
+
+
+class TestRateLimiter:
+    """RateLimiter のテスト"""
+
+    def test_毎分上限までは待たずに取得できる(self):
+        limiter = RateLimiter(requests_per_minute=3, clock=FakeClock())
+
+        assert [limiter.try_acquire() for _ in range(3)] == [0.0, 0.0, 0.0]
+        assert limiter.try_acquire() == pytest.approx(20.0)
+
+    def test_時間経過でリクエスト枠が回復する(self):
+        clock = FakeClock()
+        limiter = RateLimiter(requests_per_minute=3, clock=clock)
+        for _ in range(3):
+            limiter.try_acquire()
+
+        clock.now += 20
+        assert limiter.try_acquire() == 0.0
+
+    def test_トークン超過分が回復するまで待たされる(self):
+        clock = FakeClock()
+        limiter = RateLimiter(requests_per_minute=60, tokens_per_minute=6000, clock=clock)
+        limiter.try_acquire()
+        limiter.record_usage(9000)  # 3000トークン超過 = 30秒分
+
+        assert limiter.try_acquire() == pytest.approx(30.0)
+        clock.now += 30
+        assert limiter.try_acquire() == 0.0
+
+    def test_deferで指定時刻まで待たされる(self):
+        clock = FakeClock()
+        limiter = RateLimiter(clock=clock)
+        limiter.defer(45)
+
+        assert limiter.try_acquire() == pytest.approx(45.0)
+        clock.now += 45
+        assert limiter.try_acquire() == 0.0
+
+    def test_deferの残り秒数を返す(self):
+        clock = FakeClock()
+        limiter = RateLimiter(clock=clock)
+        assert limiter.deferred_seconds() == 0.0
+
+        limiter.defer(45)
+        clock.now += 15
+        assert limiter.deferred_seconds() == pytest.approx(30.0)
+
+    def test_acquireは枠が空くまで待機する(self):
+        clock = FakeClock()
+        limiter = RateLimiter(requests_per_minute=1, clock=clock)
+        limiter.try_acquire()
+
+        def fake_sleep(seconds: float) -> None:
+            clock.now += seconds
+
+        with patch("src.summarizer.time.sleep", side_effect=fake_sleep):
+            waited = limiter.acquire()
+
+        assert waited == pytest.approx(60.0)
+
+    def test_acquire_asyncは非同期に待機する(self):
+        clock = FakeClock()
+        limiter = RateLimiter(requests_per_minute=1, clock=clock)
+        limiter.try_acquire()
+
+        async def fake_sleep(seconds: float) -> None:
+            clock.now += seconds
+
+        with patch("src.summarizer.asyncio.sleep", side_effect=fake_sleep):
+            waited = asyncio.run(limiter.acquire_async())
+
+        assert waited == pytest.approx(60.0)
+
+
+class TestGetRetryDelay:
+    """_get_retry_delay() のテスト"""
+
+    def test_RetryAfterヘッダから取得する(self):
+        assert _get_retry_delay(_mock_response(429, headers={"Retry-After": "12"})) == 12.0
+
+    def test_RetryInfoから取得する(self):
+        body = {
+            "error": {
+                "details": [
+                    {"@type": "type.googleapis.com/google.rpc.RetryInfo", "retryDelay": "32s"}
+                ]
+            }
+        }
+        assert _get_retry_delay(_mock_response(429, json_data=body)) == 32.0
+
+    def test_指示がない場合はNoneを返す(self):
+        assert _get_retry_delay(_mock_response(429)) is None
+
+
+class TestCallApiRateLimit:
+    """_call_api_with_retry() のレートリミット処理のテスト"""
+
+    def test_成功時にトークン使用量が記録される(self):
+        session = MagicMock()
+        session.post.return_value = _mock_response(200, {"usageMetadata": {"totalTokenCount": 1234}})
+        limiter = MagicMock()
+        limiter.acquire.return_value = 0.0
+
+        _call_api_with_retry("key", {}, "https://youtu.be/x", session, limiter)
+
+        limiter.acquire.assert_called_once()
+        limiter.record_usage.assert_called_once_with(1234)
+
+    def test_短い再試行指示の429は待機して再試行する(self):
+        session = MagicMock()
+        session.post.side_effect = [
+            _mock_response(429, headers={"Retry-After": "30"}),
+            _mock_response(200, {"candidates": []}),
+        ]
+        limiter = MagicMock()
+        limiter.acquire.return_value = 0.0
+
+        result = _call_api_with_retry("key", {}, "https://youtu.be/x", session, limiter)
+
+        assert result == {"candidates": []}
+        limiter.defer.assert_called_once_with(30.0)
+        assert limiter.acquire.call_count == 2
+
+    def test_長い再試行指示の429はRateLimitErrorになる(self):
+        session = MagicMock()
+        session.post.return_value = _mock_response(429, headers={"Retry-After": "3600"})
+        limiter = MagicMock()
+        limiter.acquire.return_value = 0.0
+
+        with pytest.raises(RateLimitError) as exc_info:
+            _call_api_with_retry("key", {}, "https://youtu.be/x", session, limiter)
+
+        assert exc_info.value.retry_after == 3600.0
+        assert session.post.call_count == 1
+        limiter.defer.assert_called_once_with(3600.0)
+
+    def test_長い再試行指示の429の後はレートリミッターが待たせる(self):
+        clock = FakeClock()
+        limiter = RateLimiter(clock=clock)
+        session = MagicMock()
+        session.post.return_value = _mock_response(429, headers={"Retry-After": "3600"})
+
+        with pytest.raises(RateLimitError):
+            _call_api_with_retry("key", {}, "https://youtu.be/x", session, limiter)
+
+        assert limiter.try_acquire() == pytest.approx(3600.0)
+        clock.now += 3600
+        assert limiter.try_acquire() == 0.0
+
+    def test_レートリミッターなしの429は即座にRateLimitErrorになる(self):
+        session = MagicMock()
+        session.post.return_value = _mock_response(429)
+
+        with pytest.raises(RateLimitError):
+            _call_api_with_retry("key", {}, "https://youtu.be/x", session)
+
+        assert session.post.call_count == 1
+
+
+def _serve_gemini(responses: list[web.Response], call) -> tuple[object, list[dict]]:
+    """ローカルのサーバーを Gemini API の代わりに立てて call(session) を実行し、(結果, 受信したリクエスト) を返す"""
+    received = []
+
+    async def handler(request: web.Request) -> web.Response:
+        received.append(await request.json())
+        return responses[len(received) - 1]
+
+    async def run():
+        app = web.Application()
+        app.router.add_post("/generate", handler)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        try:
+            with patch("src.summarizer.ENDPOINT", f"http://127.0.0.1:{port}/generate"):
+                async with aiohttp.ClientSession() as session:
+                    return await call(session)
+        finally:
+            await runner.cleanup()
+
+    return asyncio.run(run()), received
+
+
+def _call_async(responses: list[web.Response], limiter=None) -> tuple[dict, int]:
+    """ローカルのサーバーに対して _call_api_with_retry_async を呼び、(結果, 受信数) を返す"""
+    result, received = _serve_gemini(
+        responses,
+        lambda session: _call_api_with_retry_async(
+            "key", {"contents": []}, "https://youtu.be/x", session, limiter
+        ),
+    )
+    return result, len(received)
+
+
+def _gemini_response(text: str, finish_reason: str = "STOP") -> web.Response:
+    """テスト用の Gemini API の成功レスポンスを生成するヘルパー"""
+    return web.json_response(
+        {
+            "candidates": [
+                {"content": {"parts": [{"text": text}]}, "finishReason": finish_reason}
+            ],
+            "usageMetadata": {"totalTokenCount": 100},
+        }
+    )
+
+
+class TestCallApiAsync:
+    """_call_api_with_retry_async() のテスト（ローカルのHTTPサーバーを使う）"""
+
+    def test_成功時にトークン使用量が記録される(self):
+        limiter = RateLimiter(requests_per_minute=60, tokens_per_minute=10000)
+        with patch.object(limiter, "record_usage") as record_usage:
+            result, count = _call_async(
+                [web.json_response({"usageMetadata": {"totalTokenCount": 1234}})], limiter
+            )
+
+        assert result == {"usageMetadata": {"totalTokenCount": 1234}}
+        assert count == 1
+        record_usage.assert_called_once_with(1234)
+
+    def test_短い再試行指示の429は待機して再試行する(self):
+        limiter = RateLimiter(requests_per_minute=60, tokens_per_minute=10000)
+        with patch.object(limiter, "defer") as defer:
+            result, count = _call_async(
+                [
+                    web.json_response({}, status=429, headers={"Retry-After": "30"}),
+                    web.json_response({"candidates": []}),
+                ],
+                limiter,
+            )
+
+        assert result == {"candidates": []}
+        assert count == 2
+        defer.assert_called_once_with(30.0)
+
+    def test_長い再試行指示の429の後はレートリミッターが待たせる(self):
+        clock = FakeClock()
+        limiter = RateLimiter(clock=clock)
+        with pytest.raises(RateLimitError):
+            _call_async(
+                [web.json_response({}, status=429, headers={"Retry-After": "3600"})], limiter
+            )
+
+        assert limiter.try_acquire() == pytest.approx(3600.0)
+
+    def test_レートリミッターなしの429は即座にRateLimitErrorになる(self):
+        with pytest.raises(RateLimitError) as exc_info:
+            _call_async([web.json_response({}, status=429, headers={"Retry-After": "3600"})])
+
+        assert exc_info.value.retry_after == 3600.0
+
+    def test_403応答はリトライせずSummarizerError(self):
+        with pytest.raises(SummarizerError):
+            _call_async([web.json_response({}, status=403)])
+
+
+class TestSummarizeAsync:
+    """summarize_async() のテスト（ローカルのHTTPサーバーを使う）"""
+
+    def test_コードブロックを除いたHTMLを返す(self):
+        html, received = _serve_gemini(
+            [_gemini_response("```html\n<!DOCTYPE html><html><body>要約</body></html>\n```")],
+            lambda session: summarize_async(
+                "https://youtu.be/x",
+                "要約して",
+                "key",
+                session,
+                rate_limiter=RateLimiter(requests_per_minute=60),
+            ),
+        )
+
+        assert html == "<!DOCTYPE html><html><body>要約</body></html>"
+        parts = received[0]["contents"][0]["parts"]
+        assert parts[0] == {"text": "要約して"}
+        assert parts[1]["fileData"]["fileUri"] == "https://youtu.be/x"
+
+    def test_MAX_TOKENSで途中終了した場合は短縮プロンプトで再試行する(self):
+        html, received = _serve_gemini(
+            [
+                _gemini_response("<html><body>途中", finish_reason="MAX_TOKENS"),
+                _gemini_response("<html><body>短縮版</body></html>"),
+            ],
+            lambda session: summarize_async(
+                "https://youtu.be/x",
+                "要約して",
+                "key",
+                session,
+                rate_limiter=RateLimiter(requests_per_minute=60),
+            ),
+        )
+
+        assert html == "<html><body>短縮版</body></html>"
+        assert len(received) == 2
+        assert received[1]["contents"][0]["parts"][0]["text"] != "要約して"
+
+    def test_候補のないレスポンスはSummarizerError(self):
+        with pytest.raises(SummarizerError):
+            _serve_gemini(
+                [web.json_response({"candidates": []})],
+                lambda session: summarize_async("https://youtu.be/x", "要約して", "key", session),
+            )
@@ -0,0 +1,106 @@
+"""SummaryCache の単体テスト"""
+from pathlib import Path
+from unittest.mock import patch
+
+from src.summary_cache import SummaryCache
+
+MODEL = "gemini-2.5-flash"
+PROMPT = "以下の動画を要約してください"
+
+
+class TestSummaryCacheGetPut:
+    """get() / put() のテスト"""
+
+    def test_登録したHTMLを取得できる(self, tmp_path: Path):
+        cache = SummaryCache(str(tmp_path))
+        cache.put("vid001", "UC001", PROMPT, MODEL, "<html>要約</html>")
+        assert cache.get("vid001", PROMPT, MODEL) == "<html>要約</html>"
+
+    def test_プロンプトが異なる場合はNoneを返す(self, tmp_path: Path):
+        cache = SummaryCache(str(tmp_path))
+        cache.put("vid001", "UC001", PROMPT, MODEL, "<html></html>")
+        assert cache.get("vid001", "別のプロンプト", MODEL) is None
+
+    def test_モデルが異なる場合はNoneを返す(self, tmp_path: Path):
+        cache = SummaryCache(str(tmp_path))
+        cache.put("vid001", "UC001", PROMPT, MODEL, "<html></html>")
+        assert cache.get("vid001", PROMPT, "gemini-2.5-pro") is None
+
+    def test_期限切れのエントリはNoneを返す(self, tmp_path: Path):
+        cache = SummaryCache(str(tmp_path), max_age_days=1)
+        with patch("src.summary_cache.time.time", return_value=1000.0):
+            cache.put("vid001", "UC001", PROMPT, MODEL, "<html></html>")
+        with patch("src.summary_cache.time.time", return_value=1000.0 + 86400):
+            assert cache.get("vid001", PROMPT, MODEL) is None
+
+    def test_HTMLファイルが失われた場合はNoneを返す(self, tmp_path: Path):
+        cache = SummaryCache(str(tmp_path))
+        cache.put("vid001", "UC001", PROMPT, MODEL, "<html></html>")
+        for path in tmp_path.glob("*.html"):
+            path.unlink()
+
+        assert cache.get("vid001", PROMPT, MODEL) is None
+        assert len(cache) == 0
+
+
+class TestSummaryCacheInvalidate:
+    """invalidate_changed_prompts() / invalidate_channel() のテスト"""
+
+    def test_プロンプトが変更されたチャンネルのエントリを削除する(self, tmp_path: Path):
+        cache = SummaryCache(str(tmp_path))
+        cache.put("vid001", "UC001", PROMPT, MODEL, "<html>1</html>")
+        cache.put("vid002", "UC002", PROMPT, MODEL, "<html>2</html>")
+
+        removed = cache.invalidate_changed_prompts({"UC001": "新しいプロンプト", "UC002": PROMPT})
+
+        assert removed == 1
+        assert cache.get("vid001", PROMPT, MODEL) is None
+        assert cache.get("vid002", PROMPT, MODEL) == "<html>2</html>"
+        assert len(list(tmp_path.glob("*.html"))) == 1
+
+    def test_チャンネル単位で削除できる(self, tmp_path: Path):
+        cache = SummaryCache(str(tmp_path))
+        cache.put("vid001", "UC001", PROMPT, MODEL, "<html></html>")
+        cache.put("vid002", "UC001", PROMPT, MODEL, "<html></html>")
+
+        assert cache.invalidate_channel("UC001") == 2
+        assert len(cache) == 0
+
+
+class TestSummaryCacheSaveLoad:
+    """save() / load() のテスト"""
+
+    def test_保存した内容を再読み込みできる(self, tmp_path: Path):
+        cache = SummaryCache(str(tmp_path))
+        cache.put("vid001", "UC001", PROMPT, MODEL, "<html>要約</html>")
+        cache.save()
+
+        reloaded = SummaryCache(str(tmp_path))
+        reloaded.load()
+        assert reloaded.get("vid001", PROMPT, MODEL) == "<html>要約</html>"
+
+    def test_save前に中断されても登録済みのHTMLを再利用できる(self, tmp_path: Path):
+        cache = SummaryCache(str(tmp_path))
+        cache.put("vid001", "UC001", PROMPT, MODEL, "<html>要約</html>")
+
+        reloaded = SummaryCache(str(tmp_path))
+        reloaded.load()
+        assert reloaded.get("vid001", PROMPT, MODEL) == "<html>要約</html>"
+
+    def test_件数上限を超えた古いエントリを削除する(self, tmp_path: Path):
+        cache = SummaryCache(str(tmp_path), max_entries=2)
+        for i, now in enumerate((1000.0, 2000.0, 3000.0)):
+            with patch("src.summary_cache.time.time", return_value=now):
+                cache.put(f"vid00{i}", "UC001", PROMPT, MODEL, f"<html>{i}</html>")
+        with patch("src.summary_cache.time.time", return_value=3000.0):
+            cache.save()
+
+        assert len(cache) == 2
+        assert cache.get("vid000", PROMPT, MODEL) is None
+        assert len(list(tmp_path.glob("*.html"))) == 2
+
+    def test_破損したインデックスは空で初期化される(self, tmp_path: Path):
+        (tmp_path / "index.json").write_text("{broken", encoding="utf-8")
+        cache = SummaryCache(str(tmp_path))
+        cache.load()
+        assert len(cache) == 0
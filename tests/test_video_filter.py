@@ -1,11 +1,23 @@
 """video_filter の単体テスト"""
+import asyncio
+import threading
+import time
 from datetime import datetime, timezone
 from unittest.mock import patch, MagicMock
 
+import aiohttp
 import pytest
+from aiohttp import web
 
-from src.video_filter import filter_videos, _is_short, _is_live_stream
-from src.models import VideoEntry
+from src.video_filter import (
+    _fetch_oembeds_async,
+    _is_live_stream,
+    _is_short,
+    filter_videos,
+    filter_videos_async,
+)
+from src.models import FilterStats, VideoEntry
+from src.oembed_cache import OEmbedCache
 
 
 def _make_video(video_id: str = "vid001", title: str = "通常動画タイトル") -> VideoEntry:
@@ -141,3 +153,286 @@ class TestFilterVideos:
             result = filter_videos([])
 
         assert result == []
+
+    def test_キャッシュ済みの動画はoEmbedAPIを呼ばない(self, tmp_path):
+        cache = OEmbedCache(str(tmp_path / "oembed_cache.json"))
+        cache.put("vid001", _mock_oembed(thumbnail_url="https://i.ytimg.com/vi/xxx/shorts/default.jpg"))
+        videos = [_make_video("vid001", "Shorts動画"), _make_video("vid002", "普通の動画")]
+
+        with patch("src.video_filter._fetch_oembed", return_value=_mock_oembed()) as mock_fetch:
+            result = filter_videos(videos, cache=cache)
+
+        assert [v.video_id for v in result] == ["vid002"]
+        assert mock_fetch.call_count == 1
+        assert cache.get("vid002") is not None
+
+    def test_oEmbed取得失敗はキャッシュされない(self, tmp_path):
+        cache = OEmbedCache(str(tmp_path / "oembed_cache.json"))
+
+        with patch("src.video_filter._fetch_oembed", return_value=None):
+            filter_videos([_make_video("vid001", "普通の動画")], cache=cache)
+
+        assert cache.get("vid001") is None
+
+
+class TestFilterVideosLocalChecks:
+    """filter_videos() のローカル判定（oEmbed API呼び出し前）のテスト"""
+
+    def test_タイトルでライブ判定できる動画はoEmbedAPIを呼ばない(self):
+        videos = [_make_video("vid001", "【LIVE】テスト配信")]
+        stats = FilterStats()
+
+        with patch("src.video_filter._fetch_oembed") as mock_fetch:
+            result = filter_videos(videos, stats=stats)
+
+        assert result == []
+        mock_fetch.assert_not_called()
+        assert stats.title_live_skipped == 1
+
+    def test_公開日時がカットオフより前の動画は除外される(self):
+        old_video = _make_video("vid001", "普通の動画")
+        new_video = _make_video("vid002", "普通の動画2")
+        new_video.published = datetime(2026, 3, 1, tzinfo=timezone.utc)
+        stats = FilterStats()
+
+        with patch("src.video_filter._fetch_oembed", return_value=_mock_oembed()) as mock_fetch:
+            result = filter_videos(
+                [old_video, new_video],
+                published_after=datetime(2026, 2, 1, tzinfo=timezone.utc),
+                stats=stats,
+            )
+
+        assert [v.video_id for v in result] == ["vid002"]
+        assert mock_fetch.call_count == 1
+        assert stats.too_old_skipped == 1
+
+    def test_API呼び出し件数とキャッシュ利用件数が集計される(self, tmp_path):
+        cache = OEmbedCache(str(tmp_path / "oembed_cache.json"))
+        cache.put("vid001", _mock_oembed())
+        videos = [_make_video("vid001", "普通の動画"), _make_video("vid002", "普通の動画2")]
+        stats = FilterStats(history_skipped=3)
+
+        with patch("src.video_filter._fetch_oembed", return_value=_mock_oembed()):
+            filter_videos(videos, cache=cache, stats=stats)
+
+        assert stats.oembed_cache_hits == 1
+        assert stats.oembed_requests == 1
+        assert stats.oembed_calls_avoided == 4
+
+
+class TestFilterVideosConcurrent:
+    """filter_videos() の並列oEmbed取得のテスト"""
+
+    def test_並列取得でも入力順が保たれる(self):
+        videos = [_make_video(f"vid{i:03d}", f"普通の動画{i}") for i in range(8)]
+
+        def fake_fetch(video, session=None):
+            # 後ろの動画ほど早く応答させる
+            time.sleep(0.01 * (8 - int(video.video_id[3:])))
+            return _mock_oembed()
+
+        with patch("src.video_filter._fetch_oembed", side_effect=fake_fetch):
+            result = filter_videos(videos, max_workers=8)
+
+        assert [v.video_id for v in result] == [v.video_id for v in videos]
+
+    def test_並列取得が同時に実行される(self):
+        videos = [_make_video(f"vid{i:03d}", "普通の動画") for i in range(4)]
+        barrier = threading.Barrier(4, timeout=5)
+
+        def fake_fetch(video, session=None):
+            barrier.wait()
+            return _mock_oembed()
+
+        with patch("src.video_filter._fetch_oembed", side_effect=fake_fetch):
+            result = filter_videos(videos, max_workers=4)
+
+        assert len(result) == 4
+
+    def test_制限時間を超えた動画は判定を保留する(self):
+        videos = [
+            _make_video("vid001", "Shorts動画"),
+            _make_video("vid002", "遅い動画"),
+        ]
+        release = threading.Event()
+        unclassified = []
+
+        def fake_fetch(video, session=None):
+            if video.video_id == "vid002":
+                release.wait(timeout=5)
+            return _mock_oembed(thumbnail_url="https://i.ytimg.com/vi/xxx/shorts/default.jpg")
+
+        try:
+            with patch("src.video_filter._fetch_oembed", side_effect=fake_fetch):
+                result = filter_videos(
+                    videos, max_workers=2, deadline_seconds=0.2, unclassified=unclassified
+                )
+        finally:
+            release.set()
+
+        # vid001 は Shorts として除外、vid002 は判定できないため通常動画として扱わない
+        assert result == []
+        assert [v.video_id for v in unclassified] == ["vid002"]
+
+    def test_逐次取得でも制限時間を超えた残りの動画は判定を保留する(self):
+        videos = [_make_video("vid001", "遅い動画"), _make_video("vid002", "普通の動画")]
+        unclassified = []
+
+        def fake_fetch(video, session=None):
+            time.sleep(0.2)
+            return _mock_oembed()
+
+        with patch("src.video_filter._fetch_oembed", side_effect=fake_fetch):
+            result = filter_videos(
+                videos, max_workers=1, deadline_seconds=0.1, unclassified=unclassified
+            )
+
+        assert [v.video_id for v in result] == ["vid001"]
+        assert [v.video_id for v in unclassified] == ["vid002"]
+
+    def test_Shortsとライブの件数がログ出力される(self, caplog):
+        videos = [
+            _make_video("vid001", "Shorts動画"),
+            _make_video("vid002", "【LIVE】配信"),
+            _make_video("vid003", "普通の動画"),
+        ]
+
+        def fake_fetch(video, session=None):
+            if video.video_id == "vid001":
+                return _mock_oembed(width=720, height=1280)
+            return _mock_oembed()
+
+        with caplog.at_level("INFO", logger="src.video_filter"):
+            with patch("src.video_filter._fetch_oembed", side_effect=fake_fetch):
+                filter_videos(videos, max_workers=4)
+
+        assert "通常動画: 1, 除外(Shorts): 1, 除外(ライブ): 1" in caplog.text
+
+
+class TestFilterVideosAsync:
+    """filter_videos_async() のテスト（_fetch_oembed_async はモック）"""
+
+    def test_並行取得でも入力順が保たれShortsが除外される(self):
+        videos = [_make_video(f"vid{i:03d}", f"普通の動画{i}") for i in range(6)]
+
+        async def fake_fetch(video, session):
+            index = int(video.video_id[3:])
+            # 後ろの動画ほど早く応答させる
+            await asyncio.sleep(0.01 * (6 - index))
+            if index == 2:
+                return _mock_oembed(thumbnail_url="https://i.ytimg.com/vi/xxx/shorts/default.jpg")
+            return _mock_oembed()
+
+        stats = FilterStats()
+        with patch("src.video_filter._fetch_oembed_async", side_effect=fake_fetch):
+            result = asyncio.run(filter_videos_async(videos, MagicMock(), stats=stats))
+
+        assert [v.video_id for v in result] == ["vid000", "vid001", "vid003", "vid004", "vid005"]
+        assert stats.oembed_requests == 6
+
+    def test_キャッシュ済みの動画はAPIを呼ばない(self, tmp_path):
+        cache = OEmbedCache(str(tmp_path / "oembed_cache.json"))
+        cache.put("vid001", _mock_oembed())
+        videos = [_make_video("vid001", "普通の動画")]
+
+        with patch("src.video_filter._fetch_oembed_async") as mock_fetch:
+            result = asyncio.run(filter_videos_async(videos, MagicMock(), cache=cache))
+
+        assert len(result) == 1
+        mock_fetch.assert_not_called()
+
+    def test_制限時間を超えた動画は判定を保留する(self):
+        videos = [
+            _make_video("vid001", "Shorts動画"),
+            _make_video("vid002", "遅い動画"),
+        ]
+        unclassified = []
+
+        async def fake_fetch(video, session):
+            if video.video_id == "vid002":
+                await asyncio.sleep(5)
+            return _mock_oembed(thumbnail_url="https://i.ytimg.com/vi/xxx/shorts/default.jpg")
+
+        with patch("src.video_filter._fetch_oembed_async", side_effect=fake_fetch):
+            result = asyncio.run(
+                filter_videos_async(
+                    videos, MagicMock(), deadline_seconds=0.1, unclassified=unclassified
+                )
+            )
+
+        # 取得できた vid001 は Shorts として除外、制限時間を超えた vid002 は判定を保留する
+        assert result == []
+        assert [v.video_id for v in unclassified] == ["vid002"]
+
+
+def _serve_oembed(handler, videos, max_concurrency=4, deadline_seconds=5.0):
+    """ローカルのサーバーを oEmbed API の代わりに立てて _fetch_oembeds_async を呼ぶ"""
+
+    async def run():
+        app = web.Application()
+        app.router.add_get("/oembed", handler)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        try:
+            with patch("src.video_filter.OEMBED_URL", f"http://127.0.0.1:{port}/oembed"):
+                async with aiohttp.ClientSession() as session:
+                    return await _fetch_oembeds_async(
+                        videos, session, max_concurrency, deadline_seconds
+                    )
+        finally:
+            await runner.cleanup()
+
+    return asyncio.run(run())
+
+
+class TestFetchOEmbedsAsync:
+    """_fetch_oembeds_async() のテスト（ローカルのHTTPサーバーを使う）"""
+
+    def test_同時リクエスト数を上限以下に抑えて全件取得する(self):
+        videos = [_make_video(f"vid{i:03d}") for i in range(6)]
+        in_flight = 0
+        max_in_flight = 0
+
+        async def handler(request: web.Request) -> web.Response:
+            nonlocal in_flight, max_in_flight
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+            await asyncio.sleep(0.02)
+            in_flight -= 1
+            return web.json_response(_mock_oembed(title=request.query["url"]))
+
+        results, timed_out = _serve_oembed(handler, videos, max_concurrency=2)
+
+        assert max_in_flight == 2
+        assert timed_out == set()
+        assert results["vid003"]["title"] == "https://www.youtube.com/watch?v=vid003"
+        assert set(results) == {v.video_id for v in videos}
+
+    def test_エラー応答と不正な本文はNoneになる(self):
+        videos = [_make_video("vid001"), _make_video("vid002")]
+
+        async def handler(request: web.Request) -> web.Response:
+            if request.query["url"].endswith("vid001"):
+                return web.Response(status=404)
+            return web.Response(text="not json")
+
+        results, timed_out = _serve_oembed(handler, videos)
+
+        assert results == {"vid001": None, "vid002": None}
+        assert timed_out == set()
+
+    def test_制限時間を超えた動画は取得を取り消して返す(self):
+        videos = [_make_video("vid001"), _make_video("vid002")]
+
+        async def handler(request: web.Request) -> web.Response:
+            if request.query["url"].endswith("vid002"):
+                await asyncio.sleep(1)
+            return web.json_response(_mock_oembed())
+
+        results, timed_out = _serve_oembed(handler, videos, deadline_seconds=0.2)
+
+        assert results == {"vid001": _mock_oembed()}
+        assert timed_out == {"vid002"}
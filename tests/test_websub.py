@@ -0,0 +1,370 @@
+"""websub モジュールの単体テスト（ローカルで起動した代替ハブを使う）"""
+import hashlib
+import hmac
+import secrets
+import socket
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+from urllib.parse import parse_qs
+
+import pytest
+import requests
+
+from src.exceptions import WebSubError
+from src.models import VideoEntry
+from src.websub import (
+    TOPIC_URL_TEMPLATE,
+    VERIFY_TIMEOUT_SECONDS,
+    WebSubServer,
+    WebSubSubscriber,
+)
+
+PUSHED_FEED = """<?xml version="1.0" encoding="UTF-8"?>
+<feed xmlns:yt="http://www.youtube.com/xml/schemas/2015" xmlns="http://www.w3.org/2005/Atom">
+  <link rel="hub" href="https://pubsubhubbub.appspot.com"/>
+  <link rel="self" href="https://www.youtube.com/xml/feeds/videos.xml?channel_id={channel_id}"/>
+  <title>YouTube video feed</title>
+  <entry>
+    <id>yt:video:{video_id}</id>
+    <yt:videoId>{video_id}</yt:videoId>
+    <yt:channelId>{channel_id}</yt:channelId>
+    <title>新着動画</title>
+    <link rel="alternate" href="https://www.youtube.com/watch?v={video_id}"/>
+    <published>2026-03-01T09:00:00+00:00</published>
+    <updated>2026-03-01T09:00:05+00:00</updated>
+  </entry>
+</feed>
+"""
+
+DELETED_FEED = """<?xml version="1.0" encoding="UTF-8"?>
+<feed xmlns:at="http://purl.org/atompub/tombstones/1.0" xmlns="http://www.w3.org/2005/Atom">
+  <at:deleted-entry ref="yt:video:vid001" when="2026-03-01T10:00:00+00:00"/>
+</feed>
+"""
+
+
+class FakeClock:
+    """テスト用の時計"""
+
+    def __init__(self, now: float = 1_000_000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class FakeHub:
+    """購読要求を受けてコールバックURLに確認要求を送り、購読者に通知を配信する代替ハブ"""
+
+    def __init__(self, lease_seconds: Optional[int] = None, status: int = 202):
+        self.lease_seconds = lease_seconds
+        self.status = status
+        # topic -> {"callback": URL, "secret": str}
+        self.subscriptions: dict[str, dict] = {}
+        self.verified: list[tuple[str, int]] = []
+        hub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self) -> None:
+                length = int(self.headers.get("Content-Length") or 0)
+                form = {k: v[0] for k, v in parse_qs(self.rfile.read(length).decode()).items()}
+                if hub.status < 300:
+                    hub.verify(form)
+                self.send_response(hub.status)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+
+            def log_message(self, format: str, *args) -> None:
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True
+        )
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self._server.server_address[1]}/subscribe"
+
+    def verify(self, form: dict[str, str]) -> None:
+        challenge = secrets.token_hex(8)
+        lease = self.lease_seconds or int(form.get("hub.lease_seconds", 0))
+        response = requests.get(
+            form["hub.callback"],
+            params={
+                "hub.mode": form["hub.mode"],
+                "hub.topic": form["hub.topic"],
+                "hub.challenge": challenge,
+                "hub.lease_seconds": str(lease),
+            },
+            timeout=5,
+        )
+        if response.status_code == 200 and response.text == challenge:
+            self.subscriptions[form["hub.topic"]] = {
+                "callback": form["hub.callback"],
+                "secret": form.get("hub.secret", ""),
+            }
+            self.verified.append((form["hub.topic"], lease))
+
+    def publish(self, topic: str, body: str, secret: Optional[str] = None) -> requests.Response:
+        subscription = self.subscriptions[topic]
+        data = body.encode("utf-8")
+        key = subscription["secret"] if secret is None else secret
+        signature = hmac.new(key.encode("utf-8"), data, hashlib.sha1).hexdigest()
+        return requests.post(
+            subscription["callback"],
+            data=data,
+            headers={
+                "Content-Type": "application/atom+xml",
+                "X-Hub-Signature": f"sha1={signature}",
+            },
+            timeout=5,
+        )
+
+    def __enter__(self) -> "FakeHub":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+
+def _topic(channel_id: str) -> str:
+    return TOPIC_URL_TEMPLATE.format(channel_id=channel_id)
+
+
+@pytest.fixture
+def received() -> list[tuple[str, list[VideoEntry]]]:
+    return []
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _start(hub: FakeHub, received: list, clock: Optional[FakeClock] = None):
+    """購読者とコールバックサーバーを生成して待ち受けを開始する"""
+    port = _free_port()
+    subscriber = WebSubSubscriber(
+        f"http://127.0.0.1:{port}/websub",
+        hub_url=hub.url,
+        lease_seconds=3600,
+        clock=clock or FakeClock(),
+    )
+    server = WebSubServer(
+        subscriber,
+        lambda channel_id, videos: received.append((channel_id, videos)),
+        host="127.0.0.1",
+        port=port,
+    )
+    server.start()
+    return subscriber, server
+
+
+class TestWebSubSubscription:
+    """購読要求・確認要求のテスト"""
+
+    def test_ハブの確認要求に応答して購読が有効になる(self, received):
+        with FakeHub() as hub:
+            subscriber, server = _start(hub, received)
+            try:
+                subscriber.subscribe("UC001")
+            finally:
+                server.stop()
+
+        assert hub.verified == [(_topic("UC001"), 3600)]
+        assert subscriber.is_active("UC001")
+        assert not subscriber.is_active("UC002")
+
+    def test_ハブが短い有効期間を返した場合はそれに従う(self, received):
+        clock = FakeClock()
+        with FakeHub(lease_seconds=600) as hub:
+            subscriber, server = _start(hub, received, clock)
+            try:
+                subscriber.subscribe("UC001")
+            finally:
+                server.stop()
+
+        clock.now += 601
+        assert not subscriber.is_active("UC001")
+
+    def test_要求していないトピックの確認要求には応じない(self, received):
+        with FakeHub() as hub:
+            subscriber, server = _start(hub, received)
+            try:
+                response = requests.get(
+                    subscriber.callback_for("UC001"),
+                    params={
+                        "hub.mode": "subscribe",
+                        "hub.topic": _topic("UC001"),
+                        "hub.challenge": "abc",
+                    },
+                    timeout=5,
+                )
+            finally:
+                server.stop()
+
+        assert response.status_code == 404
+        assert not subscriber.is_active("UC001")
+
+    def test_ハブが要求を拒否した場合はWebSubError(self, received):
+        with FakeHub(status=400) as hub:
+            subscriber, server = _start(hub, received)
+            try:
+                with pytest.raises(WebSubError):
+                    subscriber.subscribe("UC001")
+            finally:
+                server.stop()
+
+    def test_ハブが購読を拒否した場合は購読を無効にして一定時間後に再要求する(self, received):
+        clock = FakeClock()
+        with FakeHub() as hub:
+            subscriber, server = _start(hub, received, clock)
+            try:
+                subscriber.subscribe("UC001")
+                assert subscriber.is_active("UC001")
+                # 拒否の通知は hub.challenge を含まない
+                response = requests.get(
+                    subscriber.callback_for("UC001"),
+                    params={
+                        "hub.mode": "denied",
+                        "hub.topic": _topic("UC001"),
+                        "hub.reason": "unauthorized",
+                    },
+                    timeout=5,
+                )
+            finally:
+                server.stop()
+
+        assert response.status_code == 200
+        assert not subscriber.is_active("UC001")
+        assert subscriber.renewal_due(["UC001"]) == []
+        clock.now += VERIFY_TIMEOUT_SECONDS
+        assert subscriber.renewal_due(["UC001"]) == ["UC001"]
+
+    def test_購読解除が確認されると購読状態を削除する(self, received):
+        with FakeHub() as hub:
+            subscriber, server = _start(hub, received)
+            try:
+                subscriber.subscribe("UC001")
+                subscriber.unsubscribe("UC001")
+            finally:
+                server.stop()
+
+        assert "UC001" not in subscriber
+
+
+class TestWebSubRenewal:
+    """renewal_due() のテスト"""
+
+    def test_未購読と有効期間の残り少ないチャンネルを返す(self, received):
+        clock = FakeClock()
+        with FakeHub() as hub:
+            subscriber, server = _start(hub, received, clock)
+            try:
+                subscriber.subscribe("UC001")
+            finally:
+                server.stop()
+
+        assert subscriber.renewal_due(["UC001", "UC002"]) == ["UC002"]
+        # 有効期間 3600秒の残りが 10% を下回ったら更新対象
+        clock.now += 3600 * 0.95
+        assert subscriber.renewal_due(["UC001"]) == ["UC001"]
+
+    def test_確認待ちの購読は一定時間経過後に再要求する(self):
+        clock = FakeClock()
+        subscriber = WebSubSubscriber(
+            "http://127.0.0.1:1/websub", hub_url="http://127.0.0.1:1/subscribe", clock=clock
+        )
+        with pytest.raises(WebSubError):
+            subscriber.subscribe("UC001")
+
+        assert subscriber.renewal_due(["UC001"]) == []
+        clock.now += 600
+        assert subscriber.renewal_due(["UC001"]) == ["UC001"]
+
+
+class TestWebSubNotification:
+    """通知受信のテスト"""
+
+    def test_署名付きの通知を動画エントリに変換して渡す(self, received):
+        with FakeHub() as hub:
+            subscriber, server = _start(hub, received)
+            try:
+                subscriber.subscribe("UC001")
+                response = hub.publish(
+                    _topic("UC001"), PUSHED_FEED.format(channel_id="UC001", video_id="vid001")
+                )
+            finally:
+                server.stop()
+
+        assert response.status_code == 204
+        assert len(received) == 1
+        channel_id, videos = received[0]
+        assert channel_id == "UC001"
+        assert [v.video_id for v in videos] == ["vid001"]
+        assert videos[0].title == "新着動画"
+        assert videos[0].url == "https://www.youtube.com/watch?v=vid001"
+
+    def test_署名が一致しない通知は無視する(self, received):
+        with FakeHub() as hub:
+            subscriber, server = _start(hub, received)
+            try:
+                subscriber.subscribe("UC001")
+                response = hub.publish(
+                    _topic("UC001"),
+                    PUSHED_FEED.format(channel_id="UC001", video_id="vid001"),
+                    secret="wrong",
+                )
+            finally:
+                server.stop()
+
+        # ハブに再送させないよう 2xx を返す
+        assert response.status_code == 204
+        assert received == []
+
+    def test_他チャンネルの動画を含む通知は除外する(self, received):
+        with FakeHub() as hub:
+            subscriber, server = _start(hub, received)
+            try:
+                subscriber.subscribe("UC001")
+                hub.publish(_topic("UC001"), PUSHED_FEED.format(channel_id="UC999", video_id="vid001"))
+            finally:
+                server.stop()
+
+        assert received == []
+
+    def test_削除通知は無視する(self, received):
+        with FakeHub() as hub:
+            subscriber, server = _start(hub, received)
+            try:
+                subscriber.subscribe("UC001")
+                response = hub.publish(_topic("UC001"), DELETED_FEED)
+            finally:
+                server.stop()
+
+        assert response.status_code == 204
+        assert received == []
+
+
+class TestWebSubSignature:
+    """verify_signature() のテスト"""
+
+    def test_sha1とsha256の署名を検証できる(self):
+        subscriber = WebSubSubscriber("http://localhost/websub", secret="secret")
+        body = b"<feed/>"
+        sha1 = hmac.new(b"secret", body, hashlib.sha1).hexdigest()
+        sha256 = hmac.new(b"secret", body, hashlib.sha256).hexdigest()
+
+        assert subscriber.verify_signature(body, f"sha1={sha1}")
+        assert subscriber.verify_signature(body, f"sha256={sha256}")
+        assert not subscriber.verify_signature(body, f"md5={sha1}")
+        assert not subscriber.verify_signature(body, None)
+
+    def test_コールバックURLにチャンネルIDを付与する(self):
+        subscriber = WebSubSubscriber("https://example.com/websub?token=x")
+        assert subscriber.callback_for("UC001") == "https://example.com/websub?token=x&channel_id=UC001"